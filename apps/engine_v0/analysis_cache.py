@@ -0,0 +1,119 @@
+"""
+Analysis Cache - Bar-close keyed results for the advanced analysis tools
+Fibonacci/FVG/HTF/session/patterns/pivots only change when a bar of their input
+timeframe closes, so each (symbol, tool) result is reused until the last closed
+bar of one of its inputs moves. Price-relative fields are re-derived on a hit.
+"""
+import time
+import threading
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+from candle_archive import INTERVAL_MS
+
+
+def last_closed_bar_time(candles: List[Dict[str, Any]], interval: str, now_ms: Optional[int] = None) -> Optional[int]:
+    """Open time of the newest closed bar (the last candle is usually still forming)"""
+    if not candles:
+        return None
+    now_ms = now_ms or int(time.time() * 1000)
+    last_t = int(candles[-1].get("t", 0))
+    if last_t + INTERVAL_MS.get(interval, 60 * 1000) <= now_ms:
+        return last_t
+    return int(candles[-2].get("t", 0)) if len(candles) > 1 else None
+
+
+def last_price(candles: List[Dict[str, Any]]) -> Optional[float]:
+    """Close of the newest candle (what the tools use as current price)"""
+    if not candles:
+        return None
+    c = candles[-1]
+    return float(c.get("c", c.get("close", 0)) or 0) or None
+
+
+class AnalysisCache:
+    """
+    One entry per (symbol, tool): the dependency key it was computed for and the result.
+
+    The dependency key is a tuple of (timeframe, last closed bar time, last bar
+    time) for every input timeframe; anything else (forming bar, current price)
+    is handled by the tool's refresh function.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], Tuple[tuple, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, symbol: str, tool: str, deps: tuple) -> Tuple[bool, Any]:
+        """(True, result) when an entry matches deps, else (False, None). Counts hits/misses."""
+        with self._lock:
+            entry = self._entries.get((symbol, tool))
+        if entry is not None and entry[0] == deps:
+            self.hits += 1
+            return True, entry[1]
+        self.misses += 1
+        return False, None
+
+    def store(self, symbol: str, tool: str, deps: tuple, result: Any) -> None:
+        with self._lock:
+            self._entries[(symbol, tool)] = (deps, result)
+
+    def get_or_compute(self, symbol: str, tool: str, deps: tuple, compute: Callable[[], Any],
+                       refresh: Optional[Callable[[Any], Any]] = None) -> Any:
+        """
+        Cached result when deps match (passed through refresh), else compute() and store.
+
+        Args:
+            symbol: Coin
+            tool: Tool name
+            deps: Dependency key (see dependency_key)
+            compute: Full computation
+            refresh: Optional cheap update of price-relative fields on a hit
+        """
+        hit, result = self.lookup(symbol, tool, deps)
+        if hit:
+            return refresh(result) if refresh else result
+        result = compute()
+        self.store(symbol, tool, deps, result)
+        return result
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Drop entries for one symbol (or everything)"""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == symbol]:
+                    del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0}
+
+
+def dependency_key(candles_by_tf: Dict[str, List[Dict[str, Any]]], timeframes: List[str],
+                   now_ms: Optional[int] = None) -> tuple:
+    """
+    (tf, last closed bar time, last bar time) for each input timeframe.
+    The last bar time tells "forming bar present" apart from "exactly at the close"
+    (tools treat candles[-1] as the current bar).
+    """
+    key = []
+    for tf in timeframes:
+        candles = candles_by_tf.get(tf, [])
+        key.append((tf, last_closed_bar_time(candles, tf, now_ms), int(candles[-1].get("t", 0)) if candles else None))
+    return tuple(key)
+
+
+# Shared instance
+_cache: Optional[AnalysisCache] = None
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """Get the global AnalysisCache instance"""
+    global _cache
+    if _cache is None:
+        _cache = AnalysisCache()
+    return _cache
@@ -0,0 +1,413 @@
+"""
+Analysis Pipeline - Per-symbol market vision shared by the live loop and replay
+Candles for every timeframe, indicators, orderbook, funding and the v19 advanced
+tools (fibonacci/FVG/HTF/session/patterns/pivots) for the scan candidates.
+"""
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+# v17: Optimized timeframes for H4 swing trading (removed 1m/5m noise)
+# v17.3: Added Monthly for macro regime identification
+TIMEFRAMES_CONFIG = {
+    "15m": 60,  # 15 hours - entry precision
+    "1h": 60,   # 2.5 days - swing structure
+    "4h": 60,   # 10 days - intermediate trend
+    "1d": 90,   # 3 months - primary trend
+    "1w": 52,   # 1 year - macro context
+    "1M": 24    # 2 years - regime/cycle
+}
+
+
+@contextmanager
+def stage_timer(timings: Optional[Dict[str, float]], name: str):
+    """Accumulate wall time of a block into timings[name] (no-op when timings is None)"""
+    if timings is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + (time.perf_counter() - t0)
+
+
+# v19 advanced tools: name -> (vision section, input timeframes). Results are cached per
+# symbol until a bar of one of the inputs closes (analysis_cache.py)
+ADVANCED_TOOLS = {
+    "fibonacci": ("fibonacci_by_symbol", ("4h",)),  # 4h swing range
+    "fvg": ("fvg_by_symbol", ("1h",)),  # 1h for more recent gaps
+    "htf_levels": ("htf_levels_by_symbol", ("1w", "1M")),
+    "session_levels": ("session_levels_by_symbol", ("1h",)),  # Sessions start on the hour
+    "patterns": ("patterns_by_symbol", ("4h",)),
+    "pivots_daily": ("pivots_by_symbol", ("1d",)),
+    "pivots_weekly": ("pivots_by_symbol", ("1w",))
+}
+
+
+def advanced_tools_for(symbol_candles: Dict[str, List[Dict[str, Any]]]) -> List[str]:
+    """Advanced tools that have input candles for a symbol"""
+    tools = []
+    if symbol_candles.get("4h"):
+        tools += ["fibonacci", "patterns"]
+    if symbol_candles.get("1h"):
+        tools += ["fvg", "session_levels"]
+    if symbol_candles.get("1w") or symbol_candles.get("1M"):
+        tools.append("htf_levels")
+    if symbol_candles.get("1d"):
+        tools.append("pivots_daily")
+        if symbol_candles.get("1w"):
+            tools.append("pivots_weekly")
+    return tools
+
+
+def run_advanced_tool(tool: str, symbol_candles: Dict[str, List[Dict[str, Any]]], now_ms: Optional[int] = None) -> Any:
+    """Full computation of one advanced tool (in-process or in an analysis_pool worker)"""
+    if tool == "fibonacci":
+        from fibonacci import calculate_fibonacci_levels
+        return calculate_fibonacci_levels(symbol_candles["4h"])
+    if tool == "fvg":
+        from fvg_detector import analyze_fvg_zones
+        return analyze_fvg_zones(symbol_candles["1h"])
+    if tool == "htf_levels":
+        from htf_levels import calculate_htf_levels
+        return calculate_htf_levels(symbol_candles.get("1w", []), symbol_candles.get("1M", []))
+    if tool == "session_levels":
+        from session_levels import calculate_session_levels
+        now = datetime.fromtimestamp(now_ms / 1000, tz=timezone.utc) if now_ms else None
+        return calculate_session_levels(symbol_candles["1h"], now=now)
+    if tool == "patterns":
+        # Closed bars only - a pattern exists once its bar closes
+        from candle_patterns import detect_candle_patterns
+        from analysis_cache import last_closed_bar_time
+        candles_4h = symbol_candles["4h"]
+        closed_4h = candles_4h if candles_4h[-1]["t"] == last_closed_bar_time(candles_4h, "4h", now_ms) else candles_4h[:-1]
+        return detect_candle_patterns(closed_4h)
+    if tool == "pivots_daily":
+        from pivot_points import calculate_pivot_points
+        return calculate_pivot_points(symbol_candles["1d"], "daily")
+    if tool == "pivots_weekly":
+        from pivot_points import calculate_pivot_points
+        return calculate_pivot_points(symbol_candles["1w"], "weekly")
+    raise ValueError(f"unknown advanced tool: {tool}")
+
+
+def refresh_advanced_tool(tool: str, result: Any, symbol_candles: Dict[str, List[Dict[str, Any]]]) -> Any:
+    """Re-derive the price/forming-bar fields of a cached result"""
+    from analysis_cache import last_price
+    if tool == "fibonacci":
+        from fibonacci import refresh_fibonacci_price
+        price = last_price(symbol_candles.get("4h", []))
+        return refresh_fibonacci_price(result, price) if price else result
+    if tool == "fvg":
+        from fvg_detector import refresh_fvg_zones
+        return refresh_fvg_zones(result, symbol_candles.get("1h", []))
+    if tool == "htf_levels":
+        from htf_levels import refresh_htf_levels
+        return refresh_htf_levels(result, symbol_candles.get("1w", []), symbol_candles.get("1M", []))
+    if tool == "session_levels":
+        from session_levels import refresh_session_levels
+        return refresh_session_levels(result, symbol_candles.get("1h", []))
+    if tool in ("pivots_daily", "pivots_weekly"):
+        from pivot_points import refresh_pivot_price
+        price = last_price(symbol_candles.get("1d" if tool == "pivots_daily" else "1w", []))
+        return refresh_pivot_price(result, price) if price else result
+    return result
+
+
+def analyze_symbol(symbol_candles: Dict[str, List[Dict[str, Any]]], tools: List[str],
+                   now_ms: Optional[int] = None) -> Dict[str, Any]:
+    """{tool: result} for one symbol"""
+    return {tool: run_advanced_tool(tool, symbol_candles, now_ms) for tool in tools}
+
+
+def build_market_vision(hl, scan_candidates: List[str], timeframes: Dict[str, int] = TIMEFRAMES_CONFIG,
+                        request_spacing: float = 0.1, now_ms: Optional[int] = None,
+                        timings: Optional[Dict[str, float]] = None, advanced: bool = True,
+                        cache=None, pool=None) -> Dict[str, Any]:
+    """
+    Fetch candles and run every analysis module for the scan candidates.
+
+    Args:
+        hl: HLClient (or a drop-in with the same read methods)
+        scan_candidates: Symbols to analyze
+        timeframes: {interval: candle limit}
+        request_spacing: Sleep between API calls (429 prevention, 0 for replay)
+        now_ms: Clock for time-of-day tools (None = wall clock)
+        timings: Optional dict accumulating seconds per stage
+        advanced: Run the v19 advanced tools (False = degraded tick)
+        cache: AnalysisCache for the advanced tools (None = shared instance)
+        pool: Optional AnalysisPool for cache misses (None = in-process)
+
+    Returns:
+        State sections: candles_by_symbol, indicators_by_symbol, orderbook_by_symbol,
+        funding_by_symbol and, when the advanced tools import, fibonacci/fvg/htf_levels/
+        session_levels/patterns/pivots _by_symbol
+    """
+    # Resilient to import errors - graceful degradation
+    try:
+        from indicators import calculate_indicators
+        indicators_available = True
+    except ImportError as e:
+        print(f"[VISION][WARN] indicators disabled: {e}")
+        indicators_available = False
+    except Exception as e:
+        print(f"[VISION][WARN] indicators import failed: {e}")
+        indicators_available = False
+
+    # v19.0: Advanced analysis tools imports
+    try:
+        import fibonacci, fvg_detector, htf_levels, session_levels, candle_patterns, pivot_points  # noqa: F401
+        from analysis_cache import get_analysis_cache, dependency_key
+        advanced_tools_available = True
+    except ImportError as e:
+        print(f"[VISION][WARN] advanced tools disabled: {e}")
+        advanced_tools_available = False
+
+    vision = {}
+    candles_by_symbol = {}
+    indicators_by_symbol = {}
+
+    for symbol in scan_candidates:
+        candles_by_symbol[symbol] = {}
+
+        # Fetch all timeframes
+        with stage_timer(timings, "candles"):
+            for tf, limit in timeframes.items():
+                try:
+                    # Request spacing to prevent 429
+                    if request_spacing:
+                        time.sleep(request_spacing)
+                    candles = hl.get_candles(symbol, tf, limit=limit)
+                    candles_by_symbol[symbol][tf] = candles if candles else []
+                except Exception as e:
+                    print(f"[VISION][WARN] Failed to get {tf} candles for {symbol}: {e}")
+                    candles_by_symbol[symbol][tf] = []
+
+        # Calculate indicators from 15m if available
+        with stage_timer(timings, "indicators"):
+            symbol_15m = candles_by_symbol[symbol].get("15m", [])
+            if indicators_available and symbol_15m:
+                try:
+                    indicators_by_symbol[symbol] = calculate_indicators(symbol_15m)
+                except Exception as e:
+                    print(f"[VISION][WARN] indicators calc failed for {symbol}: {e}")
+                    indicators_by_symbol[symbol] = {}
+            else:
+                indicators_by_symbol[symbol] = {}
+
+    vision["candles_by_symbol"] = candles_by_symbol
+    vision["indicators_by_symbol"] = indicators_by_symbol
+
+    # Orderbook + funding for scan candidates
+    with stage_timer(timings, "orderbook"):
+        orderbook_by_symbol = {}
+        for symbol in scan_candidates:
+            if request_spacing:
+                time.sleep(request_spacing)
+            orderbook_by_symbol[symbol] = hl.get_orderbook(symbol, depth=5)
+        vision["orderbook_by_symbol"] = orderbook_by_symbol
+
+    with stage_timer(timings, "funding"):
+        funding_by_symbol = {}
+        for symbol in scan_candidates:
+            if request_spacing:
+                time.sleep(request_spacing)
+            funding_by_symbol[symbol] = hl.get_funding_info(symbol)
+        vision["funding_by_symbol"] = funding_by_symbol
+
+    # v19.0: Calculate Fibonacci and FVG for scan candidates
+    if advanced_tools_available and advanced:
+        with stage_timer(timings, "advanced"):
+            # Each tool reruns only when a bar of its input timeframe closes (analysis_cache.py)
+            cache = cache or get_analysis_cache()
+            results = {}
+            pending = {}
+            deps_by_key = {}
+            for symbol in scan_candidates:
+                symbol_candles = candles_by_symbol.get(symbol, {})
+                for tool in advanced_tools_for(symbol_candles):
+                    deps = dependency_key(symbol_candles, list(ADVANCED_TOOLS[tool][1]), now_ms)
+                    hit, result = cache.lookup(symbol, tool, deps)
+                    if hit:
+                        results[(symbol, tool)] = refresh_advanced_tool(tool, result, symbol_candles)
+                    else:
+                        pending.setdefault(symbol, []).append(tool)
+                        deps_by_key[(symbol, tool)] = deps
+
+            # Misses: worker processes when there are enough of them (analysis_pool.py)
+            computed = {}
+            if pending and pool is not None and len(pending) >= pool.min_symbols:
+                computed = pool.run(candles_by_symbol, pending, now_ms)
+            for symbol, tools in pending.items():
+                done = computed.get(symbol, {})
+                missing = [t for t in tools if t not in done]
+                if missing:
+                    done.update(analyze_symbol(candles_by_symbol[symbol], missing, now_ms))
+                for tool in tools:
+                    cache.store(symbol, tool, deps_by_key[(symbol, tool)], done[tool])
+                    results[(symbol, tool)] = done[tool]
+
+            for section, _ in ADVANCED_TOOLS.values():
+                vision[section] = {}
+            for symbol in scan_candidates:
+                for tool in ADVANCED_TOOLS:
+                    if (symbol, tool) not in results:
+                        continue
+                    if tool.startswith("pivots_"):
+                        pivots = vision["pivots_by_symbol"].setdefault(symbol, {"daily": {}, "weekly": {}})
+                        pivots[tool[len("pivots_"):]] = results[(symbol, tool)]
+                    else:
+                        vision[ADVANCED_TOOLS[tool][0]][symbol] = results[(symbol, tool)]
+
+            cached = len(results) - len(deps_by_key)
+            where = f", {len(pending)} in pool" if computed else ""
+            print(f"[VISION] Advanced tools for {len(scan_candidates)} symbols ({cached} cached, bar-close keyed{where})")
+
+    return vision
+
+
+def build_trigger_status(positions_by_symbol: Dict[str, Dict], open_orders: List[Dict],
+                         prices: Dict[str, float]) -> Dict[str, Any]:
+    """
+    Match reduce-only orders to positions (SL vs TP) and build per-position details.
+
+    Returns:
+        {"open_orders_by_symbol", "position_details", "trigger_status"}
+    """
+    # Group open orders by symbol
+    open_orders_by_symbol = {}
+    for order in open_orders:
+        coin = order.get("coin", "")
+        if coin not in open_orders_by_symbol:
+            open_orders_by_symbol[coin] = []
+        open_orders_by_symbol[coin].append(order)
+
+    # Build trigger status for each position
+    trigger_status_lines = []
+    position_details = {}
+
+    for pos_symbol, pos_data in positions_by_symbol.items():
+        symbol_orders = open_orders_by_symbol.get(pos_symbol, [])
+        has_sl = False
+        has_tp = False
+        sl_price = None
+        tp_price = None
+
+        entry_px = pos_data.get("entry_price", 0)
+        mark_px = prices.get(pos_symbol, entry_px)
+        pos_side = pos_data.get("side", "LONG")
+        pnl_pct = pos_data.get("unrealized_pnl_pct", 0)
+
+        # Calculate PnL % if not provided
+        if entry_px > 0 and mark_px > 0 and pnl_pct == 0:
+            if pos_side == "LONG":
+                pnl_pct = ((mark_px - entry_px) / entry_px) * 100
+            else:
+                pnl_pct = ((entry_px - mark_px) / entry_px) * 100
+
+        for order in symbol_orders:
+            if order.get("reduceOnly"):
+                trigger_px = order.get("triggerPx") or order.get("trigger_px") or order.get("limitPx")
+                if trigger_px:
+                    trigger_px = float(trigger_px)
+
+                    # FIX: Determine if SL or TP based on trigger vs MARK price
+                    # BE SL can be ABOVE entry (with offset), so use mark price for comparison
+                    # For LONG: SL triggers when price DROPS to trigger_px
+                    # For SHORT: SL triggers when price RISES to trigger_px
+                    if pos_side == "LONG":
+                        # For LONG, if trigger is at or below current mark - it's a SL
+                        # (includes BE SL which is slightly above entry)
+                        if trigger_px <= mark_px or trigger_px < entry_px * 1.005:  # 0.5% tolerance
+                            has_sl = True
+                            sl_price = trigger_px
+                        else:
+                            has_tp = True
+                            tp_price = trigger_px
+                    else:  # SHORT
+                        # For SHORT, if trigger is at or above current mark - it's a SL
+                        if trigger_px >= mark_px or trigger_px > entry_px * 0.995:  # 0.5% tolerance
+                            has_sl = True
+                            sl_price = trigger_px
+                        else:
+                            has_tp = True
+                            tp_price = trigger_px
+
+        # Build simple status line
+        sl_str = f"SL=${sl_price:.2f}" if has_sl else "SL=None"
+        tp_str = f"TP=${tp_price:.2f}" if has_tp else "TP=None"
+        trigger_status_lines.append(f"  - {pos_symbol}: {sl_str} | {tp_str} | PnL={pnl_pct:.2f}%")
+
+        # Store position info for LLM context
+        position_details[pos_symbol] = {
+            "pnl_pct": pnl_pct,
+            "entry_price": entry_px,
+            "current_sl": sl_price,
+            "current_tp": tp_price,
+            "side": pos_side
+        }
+
+    return {
+        "open_orders_by_symbol": open_orders_by_symbol,
+        "position_details": position_details,
+        "trigger_status": "\n".join(trigger_status_lines) if trigger_status_lines else "(no positions)"
+    }
+
+
+def setup_snapshot(state: Dict[str, Any], symbol: str) -> Dict[str, Any]:
+    """Current conditions of a symbol in the trade journal's market_snapshot schema (for similar-setup lookups)"""
+    inds = state.get("indicators_by_symbol", {}).get(symbol, {})
+    funding = state.get("funding_by_symbol", {}).get(symbol, {})
+    try:
+        funding_rate = float(funding.get("fundingRate", 0)) if isinstance(funding, dict) else 0.0
+    except (TypeError, ValueError):
+        funding_rate = 0.0
+    return {
+        "funding_rate": funding_rate,
+        "relative_volume": inds.get("relative_volume", 1.0),
+        "rsi_14": inds.get("rsi_14", 50),
+        "trend": inds.get("trend", "UNKNOWN"),
+        "bos_status": inds.get("bos_status", "UNKNOWN"),
+        "choch_detected": inds.get("choch_detected", False),
+        "atr_pct": inds.get("atr_pct", 0),
+        "fear_greed": state.get("market", {}).get("fear_greed")
+    }
+
+
+def tag_actions(actions: List[Dict[str, Any]], decision: Dict[str, Any], state: Dict[str, Any]) -> None:
+    """Tag LLM actions with source and inject market data for the trade journal (in place)"""
+    for action in actions:
+        action["source"] = "LLM"
+
+        # INJECT MARKET DATA FOR TRADE JOURNAL
+        sym = action.get("symbol")
+        if sym:
+            # 1. Indicators
+            inds = state.get("indicators_by_symbol", {}).get(sym, {})
+            action["_rsi"] = inds.get("rsi_14", 50)
+            action["_trend"] = inds.get("trend", "UNKNOWN")
+            action["_bos"] = inds.get("bos_status", "UNKNOWN") # check key in executor (it expects _bos)
+            action["_choch"] = inds.get("choch_detected", False)
+            action["_atr_pct"] = inds.get("atr_pct", 0)
+            action["_relative_volume"] = inds.get("relative_volume", 1.0)
+
+            # 2. Funding/OI
+            funding = state.get("funding_by_symbol", {}).get(sym, {})
+            if isinstance(funding, dict):
+                # HL API usually returns string values
+                try:
+                    action["_funding_rate"] = float(funding.get("fundingRate", 0))
+                    action["_open_interest"] = float(funding.get("openInterest", 0))
+                except:
+                    pass
+
+            # 3. Sentiment
+            action["_fear_greed"] = state.get("market", {}).get("fear_greed")
+
+        # 4. Decision Context
+        if "reason" not in action:
+            action["reason"] = decision.get("summary", "AI Decision")
+        if "confidence" not in action:
+            action["confidence"] = decision.get("confidence", 0)
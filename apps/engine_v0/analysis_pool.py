@@ -0,0 +1,306 @@
+"""
+Analysis Pool - Advanced analysis tools in worker processes
+Workers get candles as candle_archive records: series already in the on-disk
+archive are memmapped straight from its files (page cache, no copy), the rest
+are packed once per run into a shared memory block. Tools run outside the
+engine process, so Flask and the Telegram loop keep the GIL.
+"""
+import os
+import sys
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from candle_archive import RECORD_DTYPE, INTERVAL_MS, CandleArchive, candles_to_records, records_to_candles
+from config import ANALYSIS_POOL_WORKERS, ANALYSIS_POOL_MIN_SYMBOLS
+
+# {symbol: {tf: ("shm", offset, count) | ("archive", first_t, last_t, count, last_close)}}
+Index = Dict[str, Dict[str, tuple]]
+
+
+def pack_candles(candles_by_symbol: Dict[str, Dict[str, List[Dict[str, Any]]]],
+                 timeframes_by_symbol: Dict[str, List[str]],
+                 archive: Optional[CandleArchive] = None) -> Tuple[Optional[shared_memory.SharedMemory], Index, int]:
+    """
+    Reference series in the archive, or copy them into one shared memory block.
+
+    With an archive every series is passed by reference (HLClient returns vision
+    candles read back from the archive); workers check the slice still matches.
+
+    Returns:
+        (block or None, index, records in the block) - the caller unlinks the block
+    """
+    index: Index = {}
+    chunks = []
+    offset = 0
+    for symbol, tfs in timeframes_by_symbol.items():
+        index[symbol] = {}
+        for tf in tfs:
+            candles = candles_by_symbol.get(symbol, {}).get(tf, [])
+            if archive is not None and candles:
+                index[symbol][tf] = ("archive", int(candles[0]["t"]), int(candles[-1]["t"]), len(candles),
+                                     float(candles[-1]["c"]))
+                continue
+            records = candles_to_records(candles)
+            index[symbol][tf] = ("shm", offset, len(records))
+            chunks.append(records)
+            offset += len(records)
+    if not offset:
+        return None, index, 0
+    block = shared_memory.SharedMemory(create=True, size=offset * RECORD_DTYPE.itemsize)
+    shared = np.ndarray((offset,), dtype=RECORD_DTYPE, buffer=block.buf)
+    pos = 0
+    for records in chunks:
+        shared[pos:pos + len(records)] = records
+        pos += len(records)
+    del shared  # Release the buffer export so the block can be closed
+    return block, index, offset
+
+
+def _warm_up() -> None:
+    """Worker initializer: import the tool modules once per process"""
+    import analysis_pipeline  # noqa: F401
+    import fibonacci, fvg_detector, htf_levels, session_levels, candle_patterns, pivot_points  # noqa: F401
+
+
+def _symbol_candles(symbol: str, entries: Dict[str, tuple], shared: Optional[np.ndarray],
+                    archive: Optional[CandleArchive]) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """Rebuild {tf: candles} from the index; None if an archived series is missing or changed"""
+    out = {}
+    for tf, entry in entries.items():
+        if entry[0] == "shm":
+            _, off, n = entry
+            out[tf] = records_to_candles(shared[off:off + n], symbol, tf)
+            continue
+        _, first_t, last_t, n, last_close = entry
+        records = archive.load(symbol, tf, first_t, last_t)
+        if len(records) != n or int(records["t"][0]) != first_t or float(records["c"][-1]) != last_close:
+            return None
+        out[tf] = records_to_candles(records, symbol, tf)
+    return out
+
+
+def _run_chunk(block_name: Optional[str], count: int, archive_root: Optional[str], index: Index,
+               jobs: List[Tuple[str, List[str]]], now_ms: Optional[int]) -> Dict[str, Dict[str, Any]]:
+    """Worker side: attach to the block, rebuild candles per symbol and run its tools"""
+    from analysis_pipeline import run_advanced_tool
+
+    block = shared_memory.SharedMemory(name=block_name) if block_name else None
+    archive = CandleArchive(archive_root) if archive_root else None
+    try:
+        shared = np.ndarray((count,), dtype=RECORD_DTYPE, buffer=block.buf) if block else None
+        out = {}
+        for symbol, tools in jobs:
+            symbol_candles = _symbol_candles(symbol, index[symbol], shared, archive)
+            if symbol_candles is None:
+                continue  # Archive moved on; the engine recomputes in-process
+            out[symbol] = {}
+            for tool in tools:
+                try:
+                    out[symbol][tool] = run_advanced_tool(tool, symbol_candles, now_ms)
+                except Exception as e:
+                    # Left out of the result; the engine recomputes it in-process
+                    print(f"[POOL][WARN] {symbol} {tool} failed in worker: {e}")
+        del shared
+        return out
+    finally:
+        if block:
+            block.close()
+
+
+class AnalysisPool:
+    """
+    Process pool for advanced-tool cache misses.
+
+        pool = AnalysisPool()
+        results = pool.run(candles_by_symbol, {"BTC": ["fibonacci", "fvg"], ...}, now_ms)
+
+    Workers are spawned (not forked - the engine has Flask/Telegram threads) on
+    first use and kept for the life of the engine. A failed pool returns {} and is
+    restarted on the next run, so callers always fall back to in-process work.
+    """
+
+    def __init__(self, max_workers: int = ANALYSIS_POOL_WORKERS, min_symbols: int = ANALYSIS_POOL_MIN_SYMBOLS,
+                 archive: Optional[CandleArchive] = None):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.min_symbols = min_symbols
+        self.archive = archive
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.runs = 0
+        self.failures = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=mp.get_context("spawn"),
+                                                 initializer=_warm_up)
+        return self._executor
+
+    def run(self, candles_by_symbol: Dict[str, Dict[str, List[Dict[str, Any]]]], jobs: Dict[str, List[str]],
+            now_ms: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Run the given tools per symbol in the workers.
+
+        Args:
+            candles_by_symbol: {symbol: {tf: candles}} (vision candles)
+            jobs: {symbol: [tool, ...]} (analysis_pipeline.ADVANCED_TOOLS names)
+            now_ms: Clock for time-of-day tools
+
+        Returns:
+            {symbol: {tool: result}} - tools that failed are missing
+        """
+        from analysis_pipeline import ADVANCED_TOOLS
+
+        if not jobs:
+            return {}
+        timeframes_by_symbol = {
+            symbol: sorted({tf for tool in tools for tf in ADVANCED_TOOLS[tool][1]})
+            for symbol, tools in jobs.items()
+        }
+        block, index, count = pack_candles(candles_by_symbol, timeframes_by_symbol, self.archive)
+        block_name = block.name if block else None
+        archive_root = self.archive.root if self.archive else None
+        try:
+            # ~2 chunks per worker evens out symbols with different tool counts
+            items = list(jobs.items())
+            n_chunks = min(len(items), self.max_workers * 2)
+            chunks = [items[i::n_chunks] for i in range(n_chunks)]
+            executor = self._get_executor()
+            futures = [
+                executor.submit(_run_chunk, block_name, count, archive_root, {s: index[s] for s, _ in chunk}, chunk, now_ms)
+                for chunk in chunks
+            ]
+            results = {}
+            for future in futures:
+                results.update(future.result())
+            self.runs += 1
+            return results
+        except Exception as e:
+            self.failures += 1
+            print(f"[POOL][WARN] analysis pool failed, running in-process: {e}")
+            self.close()
+            return {}
+        finally:
+            if block:
+                block.close()
+                block.unlink()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+# Shared instance
+_pool: Optional[AnalysisPool] = None
+
+
+def get_analysis_pool() -> AnalysisPool:
+    """Get the global AnalysisPool instance"""
+    global _pool
+    if _pool is None:
+        from config import CANDLE_ARCHIVE_ENABLED
+        from candle_archive import get_candle_archive
+        _pool = AnalysisPool(archive=get_candle_archive() if CANDLE_ARCHIVE_ENABLED else None)
+    return _pool
+
+
+def _synthetic_candles(symbols: int, now_ms: int, bars: int = 1, seed: int = 7) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """Random-walk candles for every vision timeframe (benchmark input)"""
+    from analysis_pipeline import TIMEFRAMES_CONFIG
+
+    rng = np.random.default_rng(seed)
+    out = {}
+    for i in range(symbols):
+        symbol = f"SYM{i}"
+        out[symbol] = {}
+        base = float(rng.uniform(0.5, 50000))
+        for tf, limit in TIMEFRAMES_CONFIG.items():
+            limit *= bars
+            step = INTERVAL_MS[tf]
+            start = (now_ms // step) * step - (limit - 1) * step
+            closes = base * np.exp(np.cumsum(rng.normal(0, 0.01, limit)))
+            opens = np.concatenate(([base], closes[:-1]))
+            wick = np.abs(rng.normal(0, 0.004, (2, limit))) * closes
+            out[symbol][tf] = [
+                {"t": start + k * step, "T": start + (k + 1) * step - 1, "s": symbol, "i": tf,
+                 "o": float(opens[k]), "h": float(max(opens[k], closes[k]) + wick[0, k]),
+                 "l": float(min(opens[k], closes[k]) - wick[1, k]), "c": float(closes[k]),
+                 "v": float(rng.uniform(10, 1000)), "n": int(rng.integers(10, 500))}
+                for k in range(limit)
+            ]
+    return out
+
+
+def _bench(symbols: int, worker_counts: List[int], repeat: int, bars: int) -> None:
+    import shutil
+    import tempfile
+    from analysis_pipeline import advanced_tools_for, analyze_symbol
+
+    now_ms = int(time.time() * 1000)
+    candles_by_symbol = _synthetic_candles(symbols, now_ms, bars)
+    jobs = {symbol: advanced_tools_for(c) for symbol, c in candles_by_symbol.items()}
+    n_tools = sum(len(t) for t in jobs.values())
+    print(f"{symbols} symbols x {len(next(iter(candles_by_symbol.values())))} timeframes (x{bars} candles), "
+          f"{n_tools} tool runs per pass, {os.cpu_count()} CPUs")
+
+    def best_of(fn) -> Tuple[float, float]:
+        """(wall, engine-process CPU) of the fastest run"""
+        runs = []
+        for _ in range(repeat):
+            t0, c0 = time.perf_counter(), time.process_time()
+            fn()
+            runs.append((time.perf_counter() - t0, time.process_time() - c0))
+        return min(runs)
+
+    expected = {s: analyze_symbol(candles_by_symbol[s], tools, now_ms) for s, tools in jobs.items()}
+    serial, serial_cpu = best_of(lambda: {s: analyze_symbol(candles_by_symbol[s], tools, now_ms) for s, tools in jobs.items()})
+    print(f"  in-process        {serial * 1000:8.1f} ms  {symbols / serial:7.1f} symbols/s  engine CPU {serial_cpu * 1000:6.1f} ms")
+
+    # Same candles through a scratch archive, the way HLClient hands them out
+    root = tempfile.mkdtemp(prefix="analysis_pool_bench_")
+    archive = CandleArchive(root)
+    for symbol, by_tf in candles_by_symbol.items():
+        for tf, candles in by_tf.items():
+            archive.merge(symbol, tf, candles)
+    try:
+        timeframes_by_symbol = {s: list(c) for s, c in candles_by_symbol.items()}
+        for label, source in (("shm", None), ("archive", archive)):
+            t0 = time.perf_counter()
+            block, _, count = pack_candles(candles_by_symbol, timeframes_by_symbol, source)
+            print(f"  pack {label:<8}     {(time.perf_counter() - t0) * 1000:8.1f} ms  ({count} records copied)")
+            if block:
+                block.close()
+                block.unlink()
+
+        for workers in worker_counts:
+            for label, source in (("shm", None), ("archive", archive)):
+                pool = AnalysisPool(max_workers=workers, min_symbols=1, archive=source)
+                results = pool.run(candles_by_symbol, jobs, now_ms)  # Spawn + warm up outside the timing
+                elapsed, cpu = best_of(lambda: pool.run(candles_by_symbol, jobs, now_ms))
+                pool.close()
+                match = "ok" if results == expected else "MISMATCH"
+                print(f"  pool x{workers:<2} {label:<8}  {elapsed * 1000:8.1f} ms  {symbols / elapsed:7.1f} symbols/s  "
+                      f"engine CPU {cpu * 1000:6.1f} ms  speedup {serial / elapsed:4.2f}x  results {match}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Advanced analysis process pool")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    bench = sub.add_parser("bench", help="In-process vs pool on synthetic candles")
+    bench.add_argument("--symbols", type=int, default=60)
+    bench.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts")
+    bench.add_argument("--repeat", type=int, default=3)
+    bench.add_argument("--bars", type=int, default=1, help="Multiplier on the vision candle limits")
+    args = parser.parse_args()
+
+    if args.cmd == "bench":
+        _bench(args.symbols, [int(w) for w in args.workers.split(",") if w], args.repeat, args.bars)
+        sys.exit(0)
@@ -0,0 +1,275 @@
+"""
+Candle Archive - On-disk OHLCV history per symbol/interval
+Fixed-size binary records read through numpy memmap, so years of candles load
+without parsing and a warm restart can serve candles with zero API calls.
+HLClient writes through to it on every fetch; `python candle_archive.py backfill`
+pages candles_snapshot back in time to build history for replay/backtests.
+"""
+import os
+import sys
+import time
+import threading
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
+
+from config import CANDLE_ARCHIVE_PATH
+
+# One record per candle (56 bytes). Open time is the key.
+RECORD_DTYPE = np.dtype([
+    ("t", "<i8"),
+    ("o", "<f8"),
+    ("h", "<f8"),
+    ("l", "<f8"),
+    ("c", "<f8"),
+    ("v", "<f8"),
+    ("n", "<i8")
+])
+
+INTERVAL_MS = {
+    "1m": 60 * 1000,
+    "3m": 3 * 60 * 1000,
+    "5m": 5 * 60 * 1000,
+    "15m": 15 * 60 * 1000,
+    "30m": 30 * 60 * 1000,
+    "1h": 60 * 60 * 1000,
+    "2h": 2 * 60 * 60 * 1000,
+    "4h": 4 * 60 * 60 * 1000,
+    "8h": 8 * 60 * 60 * 1000,
+    "12h": 12 * 60 * 60 * 1000,
+    "1d": 24 * 60 * 60 * 1000,
+    "3d": 3 * 24 * 60 * 60 * 1000,
+    "1w": 7 * 24 * 60 * 60 * 1000,
+    "1M": 30 * 24 * 60 * 60 * 1000  # Approximate, only used for range math
+}
+
+MAX_CANDLES_PER_REQUEST = 5000  # Hyperliquid candleSnapshot cap
+
+
+def candles_to_records(candles: List[Dict[str, Any]]) -> np.ndarray:
+    """Hyperliquid candle dicts -> sorted, de-duplicated record array"""
+    records = np.array([
+        (
+            int(c.get("t", 0)),
+            float(c.get("o", 0) or 0),
+            float(c.get("h", 0) or 0),
+            float(c.get("l", 0) or 0),
+            float(c.get("c", 0) or 0),
+            float(c.get("v", 0) or 0),
+            int(c.get("n", 0) or 0)
+        )
+        for c in candles
+    ], dtype=RECORD_DTYPE)
+    records = records[np.argsort(records["t"], kind="stable")]
+    # Keep the last occurrence of each open time (latest data wins)
+    keep = np.append(records["t"][1:] != records["t"][:-1], True) if len(records) else np.array([], dtype=bool)
+    return records[keep]
+
+
+def records_to_candles(records: np.ndarray, symbol: str, interval: str) -> List[Dict[str, Any]]:
+    """Record array -> Hyperliquid-style candle dicts (what the analysis modules expect)"""
+    step = INTERVAL_MS.get(interval, 60 * 1000)
+    # tolist() converts to Python scalars in one pass (per-field numpy access is much slower)
+    return [
+        {"t": t, "T": t + step - 1, "s": symbol, "i": interval, "o": o, "h": h, "l": l, "c": c, "v": v, "n": n}
+        for t, o, h, l, c, v, n in records.tolist()
+    ]
+
+
+class CandleArchive:
+    """
+    Append-mostly candle files: {root}/{interval}/{symbol}.bin
+
+    Every merge writes the whole series to a temp file and renames it into
+    place: readers (other processes included, tools/candle_cache.py can share
+    this directory) memmap the file without a lock, so it is never truncated
+    or modified in place. New candles that extend the tail are spliced on
+    without a sort; anything else (backfill, gaps) goes through a full merge.
+    """
+
+    def __init__(self, root: str = CANDLE_ARCHIVE_PATH):
+        self.root = root
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _path(self, symbol: str, interval: str) -> str:
+        safe = symbol.replace("/", "_").replace(":", "_")
+        # Case-sensitive names ("1m" vs "1M") share a directory on some filesystems
+        folder = "1mo" if interval == "1M" else interval
+        return os.path.join(self.root, folder, f"{safe}.bin")
+
+    def _lock(self, symbol: str, interval: str) -> threading.Lock:
+        key = (symbol, interval)
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def load(self, symbol: str, interval: str, start_ms: Optional[int] = None,
+             end_ms: Optional[int] = None) -> np.ndarray:
+        """
+        Read-only memmap view of archived records (optionally sliced by open time).
+        Returns an empty array when nothing is archived.
+        """
+        path = self._path(symbol, interval)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        count = size // RECORD_DTYPE.itemsize  # Ignore a partially written trailing record
+        if count == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(count,))
+        lo = 0 if start_ms is None else int(np.searchsorted(records["t"], start_ms, side="left"))
+        hi = count if end_ms is None else int(np.searchsorted(records["t"], end_ms, side="right"))
+        return records[lo:hi]
+
+    def load_candles(self, symbol: str, interval: str, start_ms: Optional[int] = None,
+                     end_ms: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Archived candles as Hyperliquid-style dicts (for indicators/fibonacci/etc.)"""
+        return records_to_candles(self.load(symbol, interval, start_ms, end_ms), symbol, interval)
+
+    def coverage(self, symbol: str, interval: str) -> Optional[Tuple[int, int]]:
+        """(first open time, last open time) or None"""
+        records = self.load(symbol, interval)
+        if not len(records):
+            return None
+        return int(records["t"][0]), int(records["t"][-1])
+
+    def last_write_time(self, symbol: str, interval: str) -> float:
+        """mtime of the archive file (0 if missing)"""
+        try:
+            return os.path.getmtime(self._path(symbol, interval))
+        except OSError:
+            return 0.0
+
+    def merge(self, symbol: str, interval: str, candles: List[Dict[str, Any]]) -> int:
+        """
+        Upsert candles (by open time).
+
+        Returns:
+            Number of records in the archive after the merge
+        """
+        if not candles:
+            return len(self.load(symbol, interval))
+        new = candles_to_records(candles)
+        path = self._path(symbol, interval)
+
+        with self._lock(symbol, interval):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            existing = self.load(symbol, interval)
+            n = len(existing)
+
+            # Fast path: new data starts inside/after the tail and reaches past it
+            cut = None
+            if n and new["t"][0] >= existing["t"][0] and new["t"][-1] >= existing["t"][-1]:
+                cut = int(np.searchsorted(existing["t"], new["t"][0], side="left"))
+
+            if n == 0:
+                merged = new
+            elif cut is not None and n - cut <= len(new):
+                # The new block is contiguous over what it replaces: splice it on the kept head
+                merged = np.concatenate([np.asarray(existing[:cut]), new])
+            else:
+                # Slow path: full merge, new values win on equal open times
+                merged = np.concatenate([np.asarray(existing), new])
+                order = np.argsort(merged["t"], kind="stable")
+                merged = merged[order]
+                keep = np.append(merged["t"][1:] != merged["t"][:-1], True)
+                merged = merged[keep]
+            del existing
+
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(merged.tobytes())
+            os.replace(tmp_path, path)
+            return len(merged)
+
+
+# Shared instance
+_archive: Optional[CandleArchive] = None
+
+
+def get_candle_archive() -> CandleArchive:
+    """Get the global CandleArchive instance"""
+    global _archive
+    if _archive is None:
+        _archive = CandleArchive()
+    return _archive
+
+
+def backfill(info_client, symbol: str, interval: str, days: int, pause: float = 0.5) -> int:
+    """
+    Page candles_snapshot backwards until `days` of history are archived.
+
+    Args:
+        info_client: hyperliquid.info.Info
+        symbol: Coin
+        interval: Candle interval
+        days: History depth to reach
+        pause: Seconds between requests (rate limit courtesy)
+
+    Returns:
+        Total candles archived for symbol/interval
+    """
+    archive = get_candle_archive()
+    step = INTERVAL_MS[interval]
+    now_ms = int(time.time() * 1000)
+    target_ms = now_ms - days * 24 * 60 * 60 * 1000
+
+    # Top up the recent end first, then walk back from the oldest archived bar
+    covered = archive.coverage(symbol, interval)
+    end_ms = now_ms
+    total = 0
+    while end_ms > target_ms:
+        start_ms = max(target_ms, end_ms - MAX_CANDLES_PER_REQUEST * step)
+        candles = info_client.candles_snapshot(symbol, interval, start_ms, end_ms)
+        if not candles:
+            break
+        total = archive.merge(symbol, interval, candles)
+        oldest = min(int(c["t"]) for c in candles)
+        print(f"[ARCHIVE] {symbol} {interval}: +{len(candles)} candles back to {time.strftime('%Y-%m-%d', time.gmtime(oldest / 1000))} (total {total})")
+
+        if covered and oldest <= covered[1]:
+            # Recent end now joins the archived range: jump to before its start
+            end_ms = min(oldest, covered[0]) - 1
+            covered = None
+        else:
+            end_ms = oldest - 1
+        if len(candles) < 2:
+            break
+        time.sleep(pause)
+    return total
+
+
+def _main(argv: List[str]) -> int:
+    """CLI: python candle_archive.py backfill --symbols BTC,ETH --intervals 1h,4h,1d --days 365"""
+    import argparse
+    from hyperliquid.info import Info
+    from config import HYPERLIQUID_NETWORK
+
+    parser = argparse.ArgumentParser(description="Candle archive tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bf = sub.add_parser("backfill", help="Page candle history into the archive")
+    bf.add_argument("--symbols", required=True, help="Comma-separated coins, e.g. BTC,ETH")
+    bf.add_argument("--intervals", default="15m,1h,4h,1d", help="Comma-separated intervals")
+    bf.add_argument("--days", type=int, default=365, help="History depth in days")
+    bf.add_argument("--pause", type=float, default=0.5, help="Seconds between requests")
+    args = parser.parse_args(argv)
+
+    api_url = "https://api.hyperliquid.xyz" if HYPERLIQUID_NETWORK == "mainnet" else "https://api.hyperliquid-testnet.xyz"
+    info = Info(api_url, skip_ws=True)
+    for symbol in [s.strip().upper() for s in args.symbols.split(",") if s.strip()]:
+        for interval in [i.strip() for i in args.intervals.split(",") if i.strip()]:
+            if interval not in INTERVAL_MS:
+                print(f"[ARCHIVE][WARN] Unknown interval {interval}, skipping")
+                continue
+            try:
+                backfill(info, symbol, interval, args.days, args.pause)
+            except Exception as e:
+                print(f"[ARCHIVE][ERROR] backfill {symbol} {interval} failed: {e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
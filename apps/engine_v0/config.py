@@ -43,6 +43,46 @@ SNAPSHOT_MODE = os.getenv("SNAPSHOT_MODE", "TOP_N")  # TOP_N | ROTATE | ALL
 ROTATE_PER_TICK = int(os.getenv("ROTATE_PER_TICK", "5"))
 ALLOW_SYMBOL_NOT_IN_SNAPSHOT = os.getenv("ALLOW_SYMBOL_NOT_IN_SNAPSHOT", "true").lower() == "true"
 
+# Universe Scoring (scoring_engine.py) - score every perp, pick scan candidates from the top
+SCORING_ENGINE_ENABLED = os.getenv("SCORING_ENGINE_ENABLED", "true").lower() == "true"
+SCORING_WEIGHT_PER_MIN = int(os.getenv("SCORING_WEIGHT_PER_MIN", "300"))  # Share of HL's 1200/min info weight the candle refresh may use
+SCORING_FETCH_BUDGET = int(os.getenv("SCORING_FETCH_BUDGET", "0"))  # Extra cap on candle series per refresh (0 = weight budget only)
+SCORING_TOP_N = int(os.getenv("SCORING_TOP_N", "20"))  # Universe briefs passed on to the AI
+DEEP_SCAN_MAX_K = int(os.getenv("DEEP_SCAN_MAX_K", "6"))  # Max symbols getting the full multi-TF scan per tick
+DEEP_SCAN_WEIGHT_PER_MIN = int(os.getenv("DEEP_SCAN_WEIGHT_PER_MIN", "600"))  # Share of HL's 1200/min info weight the scan may use
+
+# Candle Archive (candle_archive.py) - on-disk history, HLClient writes through and warm-starts from it
+CANDLE_ARCHIVE_ENABLED = os.getenv("CANDLE_ARCHIVE_ENABLED", "true").lower() == "true"
+CANDLE_ARCHIVE_PATH = os.getenv("CANDLE_ARCHIVE_PATH", os.path.join(
+    os.getenv("DATA_VOLUME_PATH", os.path.join(os.path.dirname(__file__), "data")), "candles"))
+
+# Replay recording (replay.py) - live decisions/orderbooks appended to data/replay/*.jsonl
+REPLAY_RECORD_DECISIONS = os.getenv("REPLAY_RECORD_DECISIONS", "false").lower() == "true"  # Opt-in: the file is not rotated
+REPLAY_RECORD_BOOKS = os.getenv("REPLAY_RECORD_BOOKS", "false").lower() == "true"  # ~1KB/symbol/tick
+
+# Execution - wait after leverage updates / trigger cancels for the exchange to reflect them (0 against exchange_sim)
+EXEC_PROPAGATION_DELAY_SECONDS = float(os.getenv("EXEC_PROPAGATION_DELAY_SECONDS", "0.5"))
+
+# Sliced entries (exec_algo.py) - large market entries go out as IOC children sized to the book instead of one sweep
+EXEC_SLICE_MIN_NOTIONAL_USD = float(os.getenv("EXEC_SLICE_MIN_NOTIONAL_USD", "0"))  # Entries at/above this notional are sliced (0 = off)
+EXEC_SLICE_MAX_SLIPPAGE_BPS = float(os.getenv("EXEC_SLICE_MAX_SLIPPAGE_BPS", "10"))  # Children never cross further than this from mid
+EXEC_SLICE_INTERVAL_SECONDS = float(os.getenv("EXEC_SLICE_INTERVAL_SECONDS", "2"))  # Wait between children (book refills)
+EXEC_SLICE_MAX_CHILDREN = int(os.getenv("EXEC_SLICE_MAX_CHILDREN", "8"))  # Then the remainder goes out as a market order
+
+# Tick profiler (tick_profiler.py) - per-stage loop timings on /api/metrics
+TICK_PROFILE_WINDOW = int(os.getenv("TICK_PROFILE_WINDOW", "500"))  # Ticks kept per stage for percentiles
+
+# Loop scheduler (loop_scheduler.py) - fixed tick cadence, fast lane between ticks, slow lanes on their own cadence
+FAST_LANE_SECONDS = float(os.getenv("FAST_LANE_SECONDS", "2"))  # Positions/prices/stop checks while waiting (0 = off)
+VISION_LANE_SECONDS = int(os.getenv("VISION_LANE_SECONDS", "30"))  # Candles, indicators, advanced tools
+EXTERNAL_DATA_SECONDS = int(os.getenv("EXTERNAL_DATA_SECONDS", "300"))  # F&G, macro, news
+SLOW_LANE_MAX_DEFER = int(os.getenv("SLOW_LANE_MAX_DEFER", "3"))  # Ticks a due slow lane may be skipped before it runs degraded
+
+# Analysis pool (analysis_pool.py) - advanced-tool cache misses in worker processes
+ANALYSIS_POOL_ENABLED = os.getenv("ANALYSIS_POOL_ENABLED", "false").lower() == "true"
+ANALYSIS_POOL_WORKERS = int(os.getenv("ANALYSIS_POOL_WORKERS", "0"))  # 0 = CPU count - 1
+ANALYSIS_POOL_MIN_SYMBOLS = int(os.getenv("ANALYSIS_POOL_MIN_SYMBOLS", "3"))  # Fewer symbols with misses run in-process
+
 # ============================================================
 # 💰 TRADE SIZING - AI decides sizing, these are just minimums
 # ============================================================
@@ -70,6 +110,24 @@ STATE_INCLUDE_RECENT_ACTIONS = os.getenv("STATE_INCLUDE_RECENT_ACTIONS", "true")
 MAX_API_CONCURRENCY = int(os.getenv("MAX_API_CONCURRENCY", "3"))
 API_TIMEOUT_SECONDS = float(os.getenv("API_TIMEOUT_SECONDS", "5.0"))
 
+# Rate limiter (rate_limiter.py) - Hyperliquid REST weight budget shared by every HLClient call
+RATE_LIMIT_WEIGHT_PER_MINUTE = int(os.getenv("RATE_LIMIT_WEIGHT_PER_MINUTE", "1200"))  # Per-IP budget (0 = no throttling)
+RATE_LIMIT_HEADROOM_PCT = float(os.getenv("RATE_LIMIT_HEADROOM_PCT", "5"))  # Never used (other clients on the IP, clock skew)
+RATE_LIMIT_TRADE_RESERVE_PCT = float(os.getenv("RATE_LIMIT_TRADE_RESERVE_PCT", "10"))  # Only orders/cancels may use it
+RATE_LIMIT_SYNC_SECONDS = int(os.getenv("RATE_LIMIT_SYNC_SECONDS", "300"))  # userRateLimit poll (address action budget)
+
+# Dashboard Server
+# dev = Flask dev server in a daemon thread (legacy)
+# gunicorn = multi-worker WSGI in a separate process, state shared via snapshot file
+DASHBOARD_SERVER_MODE = os.getenv("DASHBOARD_SERVER_MODE", "dev").lower()
+DASHBOARD_WORKERS = int(os.getenv("DASHBOARD_WORKERS", "2"))
+DASHBOARD_THREADS = int(os.getenv("DASHBOARD_THREADS", "8"))  # Threads per worker (slow endpoints don't block others)
+DASHBOARD_WORKER_TIMEOUT = int(os.getenv("DASHBOARD_WORKER_TIMEOUT", "60"))
+DASHBOARD_SNAPSHOT_PATH = os.getenv("DASHBOARD_SNAPSHOT_PATH", "")  # Empty = /dev/shm or tmp dir
+DASHBOARD_PERSIST_INTERVAL = float(os.getenv("DASHBOARD_PERSIST_INTERVAL", "5"))  # Min seconds between dashboard_state.json writes
+DASHBOARD_COMPRESS_MIN_BYTES = int(os.getenv("DASHBOARD_COMPRESS_MIN_BYTES", "1024"))  # gzip/brotli API bodies above this size
+DASHBOARD_ANALYTICS_TTL = int(os.getenv("DASHBOARD_ANALYTICS_TTL", "30"))  # /api/analytics rebuilt at most this often (seconds)
+
 # ============================================================
 # 🤖 AI AUTONOMY - NO HARD LIMITS on trading decisions
 # ============================================================
@@ -107,6 +165,8 @@ VISION_CANDLES_INTERVALS = os.getenv("VISION_CANDLES_INTERVALS", "1m,5m,15m,1h,4
 VISION_CANDLES_LIMIT = int(os.getenv("VISION_CANDLES_LIMIT", "60"))
 VISION_ORDERBOOK_DEPTH = int(os.getenv("VISION_ORDERBOOK_DEPTH", "5"))
 VISION_RECENT_FILLS_LIMIT = int(os.getenv("VISION_RECENT_FILLS_LIMIT", "10"))
+SIMILAR_SETUPS_K = int(os.getenv("SIMILAR_SETUPS_K", "5"))  # Closest past journal setups shown per symbol (0 = off)
+SIMILAR_SETUPS_SYMBOLS = int(os.getenv("SIMILAR_SETUPS_SYMBOLS", "4"))  # Top-scored analyzed symbols that get them
 
 # Symbol Configuration
 SYMBOL_ALLOWLIST = [s.strip() for s in os.getenv("SYMBOL_ALLOWLIST", "").split(",") if s.strip()]
@@ -142,7 +202,8 @@ def print_config():
     print(f"[ENV] ⚙️ OPERATIONAL:")
     print(f"[ENV]   API_CONCURRENCY={MAX_API_CONCURRENCY}")
     print(f"[ENV]   API_TIMEOUT={API_TIMEOUT_SECONDS}s")
-    
+    print(f"[ENV]   DASHBOARD_SERVER_MODE={DASHBOARD_SERVER_MODE}")
+
     # Validate critical configs
     if HYPERLIQUID_WALLET_ADDRESS:
         print(f"[ENV] HYPERLIQUID_WALLET_ADDRESS=***{HYPERLIQUID_WALLET_ADDRESS[-6:]}")
@@ -3,9 +3,14 @@ Dashboard API - Flask server for Engine V0 Dashboard
 """
 import os
 import json
+import sys
 import time
 import re
+import copy
+import gzip
+import hashlib
 import threading
+from functools import wraps
 from datetime import datetime, timezone
 import requests
 from flask import Flask, jsonify, send_from_directory, request
@@ -14,10 +19,24 @@ from config import (
     TG_CHAT_MODEL,
     HYPERLIQUID_WALLET_ADDRESS,
     DEFAULT_SL_DISTANCE,
-    AI_TEMPERATURE
+    AI_TEMPERATURE,
+    DASHBOARD_SERVER_MODE,
+    DASHBOARD_WORKERS,
+    DASHBOARD_THREADS,
+    DASHBOARD_WORKER_TIMEOUT,
+    DASHBOARD_SNAPSHOT_PATH,
+    DASHBOARD_PERSIST_INTERVAL,
+    DASHBOARD_COMPRESS_MIN_BYTES,
+    DASHBOARD_ANALYTICS_TTL
 )
 from openai import OpenAI
 
+# Optional brotli (falls back to gzip)
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 # State file for persistence
 STATE_FILE = os.path.join(os.path.dirname(__file__), "dashboard_state.json")
 
@@ -31,21 +50,163 @@ try:
 except Exception as e:
     print(f"[DASHBOARD] OpenAI init failed: {e}")
 
+# Clock of every response from conditional_json views (kept out of the cached body)
+SERVER_TIME_HEADER = 'X-Server-Time-Ms'
+
 # Create Flask app
 app = Flask(__name__, static_folder='dashboard', static_url_path='')
-CORS(app)
+CORS(app, expose_headers=[SERVER_TIME_HEADER])
+
+
+@app.before_request
+def sync_engine_state():
+    """Reader workers pick up the latest engine snapshot before serving"""
+    if _snapshot_reader is not None:
+        _sync_from_engine()
 
 
 @app.after_request
 def add_cache_headers(response):
     """Add no-cache headers to API responses"""
     if '/api/' in request.path:
-        response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, proxy-revalidate'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
+        if response.headers.get('ETag'):
+            # Let the browser keep the body but revalidate every poll (If-None-Match -> 304)
+            response.headers['Cache-Control'] = 'no-cache, must-revalidate'
+        else:
+            response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, proxy-revalidate'
+            response.headers['Pragma'] = 'no-cache'
+            response.headers['Expires'] = '0'
     return response
 
 
+# ============================================================================
+# CONDITIONAL GET / COMPRESSION
+# Responses are pre-serialized per (endpoint, query) and rebuilt only when the
+# version of the data behind them changes. Unchanged polls get a 304 or the
+# cached (compressed) bytes without re-running the view.
+# ============================================================================
+
+_response_cache = {}
+_response_cache_lock = threading.Lock()
+
+
+def _encode_body(entry: dict, encoding: str) -> bytes:
+    """Compressed body for an entry, computed once per version"""
+    encoded = entry["encoded"].get(encoding)
+    if encoded is None:
+        if encoding == "br":
+            encoded = brotli.compress(entry["body"], quality=5)
+        else:
+            encoded = gzip.compress(entry["body"], compresslevel=6)
+        entry["encoded"][encoding] = encoded
+    return encoded
+
+
+def _pick_encoding(body_size: int):
+    """Choose a content encoding supported by the client, or None"""
+    if body_size < DASHBOARD_COMPRESS_MIN_BYTES:
+        return None
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def conditional_json(version_func, refresh_version: bool = False):
+    """
+    Cache a JSON view's serialized response keyed on a data version.
+    
+    version_func() returns any hashable value that changes whenever the data
+    behind the endpoint changes. A rebuilt body is stored under the version
+    read before the view ran, so an update landing mid-rebuild invalidates it.
+    Views that refresh their own source cache pass refresh_version=True to
+    store the version read after the rebuild instead (otherwise the next
+    request would always miss).
+    Only 200 responses are cached; errors always go through the view.
+    The cached body must not carry the server clock: every response (304s
+    included) gets it fresh in the SERVER_TIME_HEADER header instead.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = (request.endpoint, request.query_string)
+            version = version_func()
+            
+            with _response_cache_lock:
+                entry = _response_cache.get(key)
+            
+            if entry is None or entry["version"] != version:
+                response = app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                body = response.get_data()
+                entry = {
+                    "version": version_func() if refresh_version else version,
+                    "body": body,
+                    "etag": hashlib.sha1(body).hexdigest()[:20],
+                    "mimetype": response.mimetype,
+                    "encoded": {}
+                }
+                with _response_cache_lock:
+                    _response_cache[key] = entry
+            
+            etag = entry["etag"]
+            if etag in request.if_none_match:
+                response = app.response_class(status=304)
+                response.set_etag(etag)
+                response.headers['Vary'] = 'Accept-Encoding'
+                response.headers[SERVER_TIME_HEADER] = str(int(time.time() * 1000))
+                return response
+            
+            body = entry["body"]
+            encoding = _pick_encoding(len(body))
+            if encoding:
+                body = _encode_body(entry, encoding)
+            
+            response = app.response_class(body, mimetype=entry["mimetype"])
+            response.set_etag(etag)
+            response.headers['Vary'] = 'Accept-Encoding'
+            response.headers[SERVER_TIME_HEADER] = str(int(time.time() * 1000))
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+            return response
+        return wrapper
+    return decorator
+
+
+def _state_version():
+    """Version of the engine-pushed dashboard state"""
+    return _dashboard_state_version
+
+
+def _api_cache_version(key):
+    """Version of an _api_cache entry: its fill time while valid, None once expired"""
+    entry = _api_cache.get(key)
+    if entry and time.time() - entry[1] < entry[2]:
+        return entry[1]
+    return None
+
+
+def _dashboard_user_address():
+    """Wallet shown on the dashboard"""
+    return os.getenv("HYPERLIQUID_WALLET_ADDRESS", "0x96E09Fb536CfB0E424Df3B496F9353b98704bA24")
+
+
+def _clearinghouse_cache_key():
+    return f"hl_clearinghouse_{_dashboard_user_address()}"
+
+
+def _journal_version():
+    """Version of the trade journal: its file signature, which every worker can see (changes on every save)"""
+    try:
+        from trade_journal import journal_file_signature
+        return journal_file_signature()
+    except Exception:
+        return None
+
+
 # In-memory state (updated by main loop)
 _dashboard_state = {
     "last_update": None,
@@ -63,36 +224,111 @@ _dashboard_state = {
 }
 
 _state_lock = threading.Lock()
+_dashboard_state_version = 0  # Bumped on every state change (ETags / response cache)
+
+# Process role: "engine" owns the state, "reader" is a gunicorn worker that
+# mirrors the engine's snapshot (see dashboard_bridge.py)
+DASHBOARD_ROLE = os.getenv("DASHBOARD_ROLE", "engine")
+_snapshot_path = DASHBOARD_SNAPSHOT_PATH or None
+_snapshot_publisher = None
+_snapshot_reader = None
+
+if DASHBOARD_ROLE == "reader":
+    from dashboard_bridge import SnapshotReader
+    _snapshot_reader = SnapshotReader(_snapshot_path)
+elif DASHBOARD_SERVER_MODE == "gunicorn":
+    from dashboard_bridge import SnapshotPublisher
+    _snapshot_publisher = SnapshotPublisher(_snapshot_path)
+
+
+def _collect_sections(sections: set) -> dict:
+    """Persister callback: shallow-copy the requested sections (lock held for microseconds)"""
+    with _state_lock:
+        return {k: copy.copy(_dashboard_state[k]) for k in sections if k in _dashboard_state}
+
+
+# Debounced state persistence (engine role only; workers never write the state file)
+_state_persister = None
+if DASHBOARD_ROLE != "reader":
+    from dashboard_bridge import StatePersister
+    _state_persister = StatePersister(STATE_FILE, _collect_sections, interval=DASHBOARD_PERSIST_INTERVAL)
+
+
+def _mark_dirty(sections):
+    """Schedule sections for the next persistence pass"""
+    if _state_persister is None:
+        return
+    _state_persister.mark_dirty(sections)
+    _state_persister.start()
+
+
+def _publish_snapshot():
+    """Publish engine state for dashboard worker processes (gunicorn mode only)"""
+    if _snapshot_publisher is None:
+        return
+    # Shallow copies under the lock, serialize outside it
+    with _state_lock:
+        snapshot = {
+            "state": dict(_dashboard_state),
+            "ai_thoughts": list(_ai_thoughts),
+            "trade_logs": list(_trade_logs)
+        }
+    _snapshot_publisher.publish(json.dumps(snapshot, default=str).encode("utf-8"))
+
+
+def _sync_from_engine():
+    """Reader role: refresh local state from the engine snapshot (and the journal file) if they changed"""
+    global _ai_thoughts, _trade_logs, _dashboard_state_version
+    # The journal is not in the snapshot: the engine saves it to its own file, and
+    # a worker that already loaded it reloads when that file changes
+    trade_journal = sys.modules.get("trade_journal")
+    if trade_journal is not None:
+        try:
+            trade_journal.get_journal().reload_if_changed()
+        except Exception as e:
+            print(f"[DASHBOARD][BRIDGE] Journal reload failed: {e}")
+    
+    snapshot = _snapshot_reader.load() if _snapshot_reader else None
+    if not snapshot:
+        return
+    with _state_lock:
+        _dashboard_state.clear()
+        _dashboard_state.update(snapshot.get("state", {}))
+        _ai_thoughts = snapshot.get("ai_thoughts", [])
+        _trade_logs = snapshot.get("trade_logs", [])
+        _dashboard_state_version += 1
 
 
 def update_dashboard_state(state_data: dict):
     """Update dashboard state from main loop"""
-    global _dashboard_state
+    global _dashboard_state, _dashboard_state_version
     with _state_lock:
         _dashboard_state.update(state_data)
+        _dashboard_state_version += 1
         _dashboard_state["last_update"] = datetime.now(timezone.utc).isoformat()
         _dashboard_state["last_update_ms"] = int(time.time() * 1000)
         _dashboard_state["engine_status"] = "running"
-        
-        # Save to file for persistence
-        try:
-            with open(STATE_FILE, 'w') as f:
-                json.dump(_dashboard_state, f)
-        except Exception as e:
-            print(f"[DASHBOARD] Failed to save state: {e}")
+    
+    # Persisted by the background writer (debounced, atomic)
+    _mark_dirty(list(state_data.keys()) + ["last_update", "last_update_ms", "engine_status"])
+    _publish_snapshot()
 
 
 def add_ai_action(action: dict):
     """Add AI action to history (keep last 50)"""
-    global _dashboard_state
+    global _dashboard_state, _dashboard_state_version
     with _state_lock:
         # Deduplicate: Don't add if identical to the last one
         if _dashboard_state["ai_actions"] and _dashboard_state["ai_actions"][0]["reason"] == action["reason"]:
             return
+        _dashboard_state_version += 1
 
         action["timestamp"] = datetime.now(timezone.utc).isoformat()
-        _dashboard_state["ai_actions"].insert(0, action)
-        _dashboard_state["ai_actions"] = _dashboard_state["ai_actions"][:50]
+        # New list instead of in-place insert: snapshots taken under the lock stay immutable
+        _dashboard_state["ai_actions"] = ([action] + _dashboard_state["ai_actions"])[:50]
+    
+    _mark_dirty(["ai_actions"])
+    _publish_snapshot()
 
 
 # API Routes
@@ -201,6 +437,7 @@ def serve_static(filename):
 
 
 @app.route('/api/status')
+@conditional_json(_state_version)
 def api_status():
     """Get current bot status"""
     with _state_lock:
@@ -227,7 +464,6 @@ def api_status():
                 "engine_status": _dashboard_state.get("engine_status", "stopped"),
                 "last_update": _dashboard_state.get("last_update", ""),
                 "last_update_ms": _dashboard_state.get("last_update_ms", 0),
-                "server_time_ms": int(time.time() * 1000),
                 "market_data": _dashboard_state.get("market", {}),
                 "account_summary": account
             }
@@ -235,6 +471,7 @@ def api_status():
 
 
 @app.route('/api/positions')
+@conditional_json(lambda: (_state_version(), _api_cache_version(_clearinghouse_cache_key())), refresh_version=True)
 def api_positions():
     """Get open positions (merged with real-time leverage from HL)"""
     with _state_lock:
@@ -242,9 +479,9 @@ def api_positions():
     
     # Try to fetch real positions for leverage data if needed
     try:
-        user_address = os.getenv("HYPERLIQUID_WALLET_ADDRESS", "0x96E09Fb536CfB0E424Df3B496F9353b98704bA24")
+        user_address = _dashboard_user_address()
         # Cache the HL clearinghouse request to avoid rate limits
-        cache_key = f"hl_clearinghouse_{user_address}"
+        cache_key = _clearinghouse_cache_key()
         cached_hl = _get_cache(cache_key)
         if cached_hl:
              hl_data = cached_hl
@@ -610,6 +847,30 @@ def api_health():
     })
 
 
+@app.route('/api/metrics')
+def api_metrics():
+    """
+    Main loop stage timings (p50/p95/p99 per stage) and Hyperliquid request budget.
+    JSON by default; Prometheus text with ?format=prometheus or a text/plain Accept header.
+    """
+    with _state_lock:
+        metrics = _dashboard_state.get("tick_metrics") or {"ticks": 0, "stages": {}}
+        rate_limit = _dashboard_state.get("rate_limit")
+
+    wants_text = request.args.get("format") == "prometheus" or (
+        "text/plain" in request.headers.get("Accept", "") or "openmetrics" in request.headers.get("Accept", "")
+    )
+    if wants_text:
+        from flask import Response
+        from tick_profiler import render_prometheus
+        text = render_prometheus(metrics)
+        if rate_limit:
+            from rate_limiter import render_prometheus as render_rate_limit
+            text += render_rate_limit(rate_limit)
+        return Response(text, mimetype="text/plain; version=0.0.4")
+    return jsonify({"ok": True, "data": {**metrics, "rate_limit": rate_limit}})
+
+
 @app.route('/api/pnl-summary')
 def api_pnl_summary():
     """
@@ -668,6 +929,7 @@ def api_pnl_summary():
 
 
 @app.route('/api/analytics')
+@conditional_json(lambda: int(time.time() // DASHBOARD_ANALYTICS_TTL))
 def api_analytics():
     """
     Get comprehensive analytics data from Hyperliquid blockchain.
@@ -747,89 +1009,34 @@ def api_analytics():
         
         
         
-        # Initialize metrics
-        total_trades = 0
-        wins = 0
-        losses = 0
-        volume = 0
-        best_trade_pnl = 0
-        worst_trade_pnl = 0
-        total_profit = 0
-        total_loss = 0
-        trade_durations = []
-        
-        # Fetch fills directly from Hyperliquid
-        wallet = os.environ.get("HYPERLIQUID_WALLET_ADDRESS", "")
+        # Metrics from the local fills store (synced incrementally, aggregates precomputed)
+        total_trades = wins = losses = 0
+        volume = best_trade_pnl = worst_trade_pnl = 0
+        total_profit = total_loss = 0
+        win_rate = avg_duration = 0
+        profit_factor = 1.0
+        windows, by_coin = {}, {}
         if wallet:
             try:
-                fills_url = "https://api.hyperliquid.xyz/info"
-                fills_resp = requests.post(fills_url, json={
-                    "type": "userFills",
-                    "user": wallet
-                }, timeout=15)
-                
-                if fills_resp.status_code == 200:
-                    fills = fills_resp.json()
-                    
-                    # Group fills by position (symbol + side)
-                    positions = {}
-                    for fill in fills:
-                        key = f"{fill.get('coin')}_{fill.get('dir')}"
-                        if key not in positions:
-                            positions[key] = []
-                        positions[key].append(fill)
-                    
-                    # Analyze each closed position
-                    for key, position_fills in positions.items():
-                        if len(position_fills) >= 2:
-                            # Calculate PnL for this position
-                            pnl = sum(float(f.get("closedPnl", 0)) for f in position_fills)
-                            fill_value = sum(abs(float(f.get("sz", 0)) * float(f.get("px", 0))) for f in position_fills)
-                            volume += fill_value
-                            
-                            if pnl != 0:
-                                total_trades += 1
-                                if pnl > 0:
-                                    wins += 1
-                                    total_profit += pnl
-                                    if pnl > best_trade_pnl:
-                                        best_trade_pnl = pnl
-                                else:
-                                    losses += 1
-                                    total_loss += abs(pnl)
-                                    if pnl < worst_trade_pnl:
-                                        worst_trade_pnl = pnl
-                                
-                                # Calculate duration if timestamps available
-                                times = [int(f.get("time", 0)) for f in position_fills if f.get("time")]
-                                if len(times) >= 2:
-                                    duration_ms = max(times) - min(times)
-                                    duration_min = duration_ms / 60000
-                                    if duration_min > 0:
-                                        trade_durations.append(duration_min)
-                    
-                    # Also count individual fills with closedPnl
-                    for fill in fills:
-                        closed_pnl = float(fill.get("closedPnl", 0))
-                        if closed_pnl != 0 and total_trades == 0:
-                            total_trades += 1
-                            volume += abs(float(fill.get("sz", 0)) * float(fill.get("px", 0)))
-                            if closed_pnl > 0:
-                                wins += 1
-                                total_profit += closed_pnl
-                                best_trade_pnl = max(best_trade_pnl, closed_pnl)
-                            else:
-                                losses += 1
-                                total_loss += abs(closed_pnl)
-                                worst_trade_pnl = min(worst_trade_pnl, closed_pnl)
-                                
+                from fills_store import get_fills_store
+                store = get_fills_store(wallet)
+                store.sync()
+                fill_stats = store.get_stats()
+                total_trades = fill_stats["total_trades"]
+                wins = fill_stats["wins"]
+                losses = fill_stats["losses"]
+                volume = fill_stats["volume"]
+                best_trade_pnl = fill_stats["best_trade_pnl"]
+                worst_trade_pnl = fill_stats["worst_trade_pnl"]
+                total_profit = fill_stats["total_profit"]
+                total_loss = fill_stats["total_loss"]
+                win_rate = fill_stats["win_rate"]
+                profit_factor = fill_stats["profit_factor"]
+                avg_duration = fill_stats["avg_duration_minutes"]
+                windows = fill_stats["windows"]
+                by_coin = fill_stats["by_coin"]
             except Exception as e:
-                print(f"[ANALYTICS] Fills fetch error: {e}")
-        
-        # Calculate derived metrics
-        win_rate = (wins / total_trades * 100) if total_trades > 0 else 0
-        profit_factor = (total_profit / total_loss) if total_loss > 0 else (1.0 if total_profit == 0 else 2.0)
-        avg_duration = (sum(trade_durations) / len(trade_durations)) if trade_durations else 0
+                print(f"[ANALYTICS] Fills store error: {e}")
         
         # Fallback: if Portfolio API returned 0, use fills-based calculation
         fills_pnl = total_profit - total_loss
@@ -858,9 +1065,11 @@ def api_analytics():
                 "worst_trade_pnl": round(worst_trade_pnl, 2),
                 "avg_duration_minutes": round(avg_duration, 1),
                 "total_profit": round(total_profit, 2),
-                "total_loss": round(total_loss, 2)
-            },
-            "server_time_ms": int(time.time() * 1000)
+                "total_loss": round(total_loss, 2),
+                # Rolling 24h/7d/30d fill stats, in total and per coin (all-time included per coin)
+                "windows": windows,
+                "by_coin": by_coin
+            }
         })
     except Exception as e:
         print(f"[DASHBOARD][ERROR] Analytics failed: {e}")
@@ -1016,11 +1225,7 @@ def api_full_analytics():
             journal_stats = journal.get_stats()
             real_win_rate = journal_stats.get("win_rate", 0)
             real_total_trades = journal_stats.get("closed_trades", 0)
-            real_profit_factor = 1.0
-            if journal_stats.get("losses", 0) > 0 and journal_stats.get("wins", 0) > 0:
-                # Calculate profit factor from actual data
-                # For now, use a simple approximation
-                real_profit_factor = round((journal_stats.get("wins", 0) / max(1, journal_stats.get("losses", 1))) * 1.2, 2)
+            real_profit_factor = round(journal_stats.get("profit_factor") or 1.0, 2)
             print(f"[ANALYTICS] Real stats from journal: {real_total_trades} trades, {real_win_rate}% win rate")
         except Exception as je:
             print(f"[ANALYTICS] Journal stats error: {je}")
@@ -1118,114 +1323,91 @@ def api_open_orders():
         return jsonify({"ok": False, "error": str(e)}), 500
 
 
-@app.route('/api/user/trades')
-def api_user_trades():
-    """Get recent fills/trades from Hyperliquid (cached 60s)"""
-    user_address = os.getenv("HYPERLIQUID_WALLET_ADDRESS", "0x96E09Fb536CfB0E424Df3B496F9353b98704bA24")
+def _format_fill(fill: dict) -> dict:
+    """Hyperliquid fill -> dashboard trade row"""
+    return {
+        "symbol": fill.get("coin", ""),
+        "side": "BUY" if str(fill.get("side", "")).upper() == "B" else "SELL",
+        "price": float(fill.get("px", 0)),
+        "size": float(fill.get("sz", 0)),
+        "value": float(fill.get("px", 0)) * float(fill.get("sz", 0)),
+        "fee": float(fill.get("fee", 0)),
+        "timestamp": fill.get("time"),
+        "hash": fill.get("hash"),
+        "closed_pnl": float(fill.get("closedPnl")) if fill.get("closedPnl") is not None else None,
+        "dir": fill.get("dir", ""),
+        "oid": fill.get("oid")
+    }
+
+
+def _format_completed_trade(fill: dict) -> dict:
+    """Closing fill (closedPnl != 0) -> completed trade row"""
+    return {
+        "symbol": fill.get("coin", ""),
+        "side": "BUY" if str(fill.get("side", "")).upper() == "B" else "SELL",
+        "entry_price": float(fill.get("startPositionPx", 0)) if fill.get("startPositionPx") else float(fill.get("px", 0)),
+        "exit_price": float(fill.get("px", 0)),
+        "size": float(fill.get("sz", 0)),
+        "pnl": float(fill.get("closedPnl", 0)),
+        "timestamp": fill.get("time"),
+        "dir": fill.get("dir", "")
+    }
+
+
+def _fills_page_response(closed_only: bool, formatter, default_limit: int, label: str):
+    """
+    Cursor-paginated fills from the local store.
     
-    def fetch_trades():
-        response = requests.post(
-            "https://api.hyperliquid.xyz/info",
-            json={"type": "userFills", "user": user_address},
-            timeout=10
+    Query params: limit (max 500), cursor (next_cursor of the previous page), coin
+    """
+    try:
+        from fills_store import get_fills_store
+        store = get_fills_store(_dashboard_user_address())
+        store.sync()
+        
+        limit = max(1, min(request.args.get('limit', default_limit, type=int), 500))
+        page = store.page(
+            coin=request.args.get('coin') or None,
+            closed_only=closed_only,
+            cursor=request.args.get('cursor'),
+            limit=limit
         )
-        if not response.ok:
-            return None
         
-        fills = response.json()
-        formatted_fills = []
-        for fill in fills[:50]:
-            formatted_fills.append({
-                "symbol": fill.get("coin", ""),
-                "side": "BUY" if str(fill.get("side", "")).upper() == "B" else "SELL",
-                "price": float(fill.get("px", 0)),
-                "size": float(fill.get("sz", 0)),
-                "value": float(fill.get("px", 0)) * float(fill.get("sz", 0)),
-                "fee": float(fill.get("fee", 0)),
-                "timestamp": fill.get("time"),
-                "hash": fill.get("hash"),
-                "closed_pnl": float(fill.get("closedPnl")) if fill.get("closedPnl") is not None else None,
-                "dir": fill.get("dir", ""),
-                "oid": fill.get("oid")
-            })
-        return formatted_fills
-
-    try:
-        data = get_cached_response(f"trades_{user_address}", fetch_trades, ttl=60)
-        if data is None:
-             return jsonify({"ok": False, "error": "Hyperliquid API error"}), 502
-
         return jsonify({
             "ok": True,
-            "data": data,
+            "data": [formatter(f) for f in page["fills"]],
+            "next_cursor": page["next_cursor"],
+            "total": page["total"],
             "server_time_ms": int(time.time() * 1000)
         })
         
     except Exception as e:
-        print(f"[DASHBOARD] User trades error: {e}")
+        print(f"[DASHBOARD] {label} error: {e}")
         return jsonify({"ok": False, "error": str(e)}), 500
 
 
-@app.route('/api/user/completed_trades')
-def api_user_completed_trades():
-    """Get aggregated completed trades from fills (cached 60s)"""
-    user_address = os.getenv("HYPERLIQUID_WALLET_ADDRESS", "0x96E09Fb536CfB0E424Df3B496F9353b98704bA24")
+def _fills_version():
+    """Version of the local fills store (syncs first, throttled)"""
+    try:
+        from fills_store import get_fills_store
+        store = get_fills_store(_dashboard_user_address())
+        store.sync()
+        return store.version
+    except Exception:
+        return None
 
-    def fetch_completed_trades():
-        response = requests.post(
-            "https://api.hyperliquid.xyz/info",
-            json={"type": "userFills", "user": user_address},
-            timeout=10
-        )
-        if not response.ok:
-            return None
-        
-        fills = response.json()
-        
-        # Group fills by position (symbol + direction strategy)
-        # Simple aggregation: group by symbol and roughly time proximity or just by symbol?
-        # Better approach: Group by symbol and closedPnl events.
-        
-        completed_trades = []
-        
-        # We will scan for fills with closedPnl != 0, implying a realization.
-        # This is a simplification. For full trade reconstruction we need more complex logic.
-        # But for "Completed Trades" list, listing the closing fills (or aggregated closing fills) is often what's desired.
-        
-        # Let's aggregate by Symbol + Side + Time proximity (within 1 min)
-        
-        # Alternative: Return the closedPnl fills as "Completed Trades", but aggregated.
-        
-        processed_fills = []
-        for fill in fills:
-             if fill.get("closedPnl") is not None and float(fill.get("closedPnl")) != 0:
-                 processed_fills.append({
-                     "symbol": fill.get("coin", ""),
-                     "side": "BUY" if str(fill.get("side", "")).upper() == "B" else "SELL",
-                     "entry_price": float(fill.get("startPositionPx", 0)) if fill.get("startPositionPx") else float(fill.get("px", 0)),
-                     "exit_price": float(fill.get("px", 0)),
-                     "size": float(fill.get("sz", 0)),
-                     "pnl": float(fill.get("closedPnl", 0)),
-                     "timestamp": fill.get("time"),
-                     "dir": fill.get("dir", "")
-                 })
-                 
-        return processed_fills
 
-    try:
-        data = get_cached_response(f"completed_trades_{user_address}", fetch_completed_trades, ttl=60)
-        if data is None:
-             return jsonify({"ok": False, "error": "Hyperliquid API error"}), 502
+@app.route('/api/user/trades')
+def api_user_trades():
+    """Get recent fills/trades (local fills store, cursor paginated)"""
+    return _fills_page_response(False, _format_fill, 50, "User trades")
 
-        return jsonify({
-            "ok": True,
-            "data": data,
-            "server_time_ms": int(time.time() * 1000)
-        })
-        
-    except Exception as e:
-        print(f"[DASHBOARD] Completed trades error: {e}")
-        return jsonify({"ok": False, "error": str(e)}), 500
+
+@app.route('/api/user/completed_trades')
+@conditional_json(_fills_version)
+def api_user_completed_trades():
+    """Get completed trades (closing fills) from the local fills store, cursor paginated"""
+    return _fills_page_response(True, _format_completed_trade, 100, "Completed trades")
 
 
 @app.route('/api/transfers')
@@ -1302,6 +1484,8 @@ def add_ai_thought(thought: dict):
     thought['timestamp'] = datetime.now(timezone.utc).isoformat()
     _ai_thoughts.insert(0, thought)
     _ai_thoughts = _ai_thoughts[:100]
+    
+    _publish_snapshot()
 
 
 # Enhanced trade logs storage
@@ -1325,6 +1509,8 @@ def add_trade_log(log: dict):
     
     _trade_logs.insert(0, log)
     _trade_logs = _trade_logs[:50]
+    
+    _publish_snapshot()
 
 
 # AI Analysis Cache (60s TTL per symbol)
@@ -1910,6 +2096,7 @@ Keep answers concise and practical."""
 # ============================================================================
 
 @app.route('/api/journal')
+@conditional_json(_journal_version)
 def api_journal():
     """Get all trades from the trade journal"""
     try:
@@ -1924,8 +2111,7 @@ def api_journal():
         return jsonify({
             "ok": True,
             "data": trades,
-            "count": len(trades),
-            "server_time_ms": int(time.time() * 1000)
+            "count": len(trades)
         })
     except Exception as e:
         print(f"[API][ERROR] journal: {e}")
@@ -1989,7 +2175,19 @@ def api_journal_export():
 
 
 def run_dashboard_server(port: int = 8080, host: str = "0.0.0.0"):
-    """Run dashboard server in background thread"""
+    """
+    Run dashboard server.
+    
+    DASHBOARD_SERVER_MODE=dev: Flask dev server in a background thread (shares the engine process)
+    DASHBOARD_SERVER_MODE=gunicorn: multi-worker gunicorn in a separate process; workers
+    read engine state from the snapshot file, so dashboard load never touches the engine tick
+    """
+    if DASHBOARD_SERVER_MODE == "gunicorn":
+        process = _start_gunicorn(port, host)
+        if process is not None:
+            return process
+        print("[DASHBOARD][WARN] gunicorn unavailable, falling back to dev server")
+    
     def _run():
         print(f"[DASHBOARD] Starting on http://{host}:{port}")
         app.run(host=host, port=port, debug=False, use_reloader=False)
@@ -1999,6 +2197,53 @@ def run_dashboard_server(port: int = 8080, host: str = "0.0.0.0"):
     return thread
 
 
+def _start_gunicorn(port: int, host: str):
+    """Spawn gunicorn workers serving this app in reader role"""
+    import sys
+    import atexit
+    import subprocess
+    import importlib.util
+    
+    if importlib.util.find_spec("gunicorn") is None:
+        return None
+    
+    # Publish once so workers have state before the first engine tick
+    _publish_snapshot()
+    
+    env = os.environ.copy()
+    env["DASHBOARD_ROLE"] = "reader"
+    env["DASHBOARD_SNAPSHOT_PATH"] = _snapshot_publisher.path
+    
+    cmd = [
+        sys.executable, "-m", "gunicorn", "dashboard_api:app",
+        "--bind", f"{host}:{port}",
+        "--workers", str(DASHBOARD_WORKERS),
+        "--worker-class", "gthread",
+        "--threads", str(DASHBOARD_THREADS),
+        "--timeout", str(DASHBOARD_WORKER_TIMEOUT),
+        "--log-level", "warning"
+    ]
+    
+    try:
+        process = subprocess.Popen(cmd, cwd=os.path.dirname(os.path.abspath(__file__)), env=env)
+    except Exception as e:
+        print(f"[DASHBOARD][ERROR] Failed to spawn gunicorn: {e}")
+        return None
+    
+    def _stop():
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    
+    atexit.register(_stop)
+    print(f"[DASHBOARD] gunicorn started on http://{host}:{port} "
+          f"(pid={process.pid}, workers={DASHBOARD_WORKERS}, threads={DASHBOARD_THREADS})")
+    return process
+
+
 
 # Mock trade log removed - let real AI decisions populate this
 
@@ -2012,5 +2257,9 @@ try:
             # Clear volatile market data on startup to avoid stale UI
             _dashboard_state["market"] = {}
             print(f"[DASHBOARD] Loaded saved state (market data cleared)")
+    # Seed the persister with every section so the next write keeps unchanged ones
+    if _state_persister is not None:
+        with _state_lock:
+            _state_persister.mark_dirty(list(_dashboard_state.keys()))
 except Exception as e:
     print(f"[DASHBOARD] Failed to load saved state: {e}")
@@ -0,0 +1,189 @@
+"""
+Dashboard Bridge - Engine <-> Dashboard process state sharing
+Lets the dashboard run in separate WSGI worker processes (gunicorn) while the
+engine keeps ownership of the state. The engine publishes a JSON snapshot to a
+file on tmpfs (/dev/shm when available); workers re-read it only when it changes.
+Also hosts the debounced state persister used for dashboard_state.json.
+"""
+import os
+import json
+import time
+import atexit
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+
+def default_snapshot_path() -> str:
+    """Snapshot location: tmpfs if available so reads never touch the disk"""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "inspetor_dashboard_snapshot.json")
+
+
+def write_atomic(path: str, payload: bytes) -> None:
+    """
+    Write bytes to path via temp file + rename.
+    Readers see either the old or the new file, never a partial write.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SnapshotPublisher:
+    """Engine side: publishes the dashboard snapshot for worker processes"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_snapshot_path()
+        self._lock = threading.Lock()
+        self.publish_count = 0
+
+    def publish(self, payload: bytes) -> bool:
+        """Publish a pre-serialized snapshot. Returns False on failure."""
+        try:
+            with self._lock:
+                write_atomic(self.path, payload)
+                self.publish_count += 1
+            return True
+        except Exception as e:
+            print(f"[DASHBOARD][BRIDGE] Failed to publish snapshot: {e}")
+            return False
+
+
+class SnapshotReader:
+    """Worker side: loads the snapshot only when the file changed"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_snapshot_path()
+        self._lock = threading.Lock()
+        self._last_signature = None  # (inode, mtime_ns, size) of the last loaded file
+        self._data: Optional[Dict[str, Any]] = None
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest snapshot.
+
+        Returns:
+            dict if a new snapshot was loaded since the last call, None if
+            nothing changed (or the engine has not published yet)
+        """
+        # Every publish renames a fresh temp file into place, so the inode changes
+        # even when two publishes land within the filesystem's mtime granularity
+        try:
+            signature = self._signature(os.stat(self.path))
+        except OSError:
+            return None
+
+        with self._lock:
+            if signature == self._last_signature:
+                return None
+            try:
+                with open(self.path, "rb") as f:
+                    signature = self._signature(os.fstat(f.fileno()))
+                    data = json.loads(f.read())
+            except Exception as e:
+                print(f"[DASHBOARD][BRIDGE] Failed to read snapshot: {e}")
+                return None
+            self._last_signature = signature
+            self._data = data
+            return data
+
+    @staticmethod
+    def _signature(st: os.stat_result) -> tuple:
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class StatePersister:
+    """
+    Engine side: coalesces dashboard state updates into periodic atomic writes.
+
+    Callers only mark top-level sections dirty (cheap, safe under their own lock).
+    A background thread writes at most once every `interval` seconds, re-encoding
+    only the dirty sections and reusing the cached JSON of the others, then
+    replaces the file via temp + rename so a crash never leaves a partial file.
+    """
+
+    def __init__(self, path: str, collect: Callable[[Set[str]], Dict[str, Any]], interval: float = 5.0):
+        """
+        Args:
+            path: State file path
+            collect: Called with the dirty section names, returns {section: value}
+                     (copied under the caller's lock). Missing sections are dropped.
+            interval: Minimum seconds between writes
+        """
+        self.path = path
+        self.interval = interval
+        self._collect = collect
+        self._dirty: Set[str] = set()
+        self._fragments: Dict[str, bytes] = {}
+        self._dirty_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._last_write = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self.write_count = 0
+
+    def mark_dirty(self, sections: Iterable[str]) -> None:
+        """Flag sections as changed; the worker picks them up on its next pass"""
+        with self._dirty_lock:
+            self._dirty.update(sections)
+        self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the background writer (idempotent)"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="dashboard-persist", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            # Debounce: let further updates within the interval coalesce into one write
+            wait = self.interval - (time.monotonic() - self._last_write)
+            if wait > 0:
+                time.sleep(wait)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> bool:
+        """Write pending changes now. Returns False on failure."""
+        with self._write_lock:
+            with self._dirty_lock:
+                dirty, self._dirty = self._dirty, set()
+            if not dirty:
+                return True
+
+            try:
+                values = self._collect(dirty)
+                for section in dirty:
+                    if section in values:
+                        self._fragments[section] = json.dumps(values[section], default=str).encode("utf-8")
+                    else:
+                        self._fragments.pop(section, None)
+
+                payload = b"{" + b",".join(
+                    json.dumps(section).encode("utf-8") + b":" + fragment
+                    for section, fragment in self._fragments.items()
+                ) + b"}"
+                write_atomic(self.path, payload)
+                self.write_count += 1
+                return True
+            except Exception as e:
+                print(f"[DASHBOARD][PERSIST] Failed to save state: {e}")
+                # Retry these sections on the next pass
+                with self._dirty_lock:
+                    self._dirty.update(dirty)
+                return False
+            finally:
+                self._last_write = time.monotonic()
@@ -0,0 +1,668 @@
+"""
+Exchange Simulator - In-process stand-in for the Hyperliquid Info/Exchange SDK clients
+Implements the subset used by HLClient, executor.py and tools/trading_tools.py
+(market/limit/trigger orders, reduce-only, leverage, fills, positions, open orders,
+dead man's switch) with SDK-shaped responses, plus optional 429 injection.
+
+    info, exchange, sim = create_simulator({"BTC": 60000, "ETH": 3000})
+    hl = sim_hl_client(info, exchange)      # HLClient running against the simulator
+    sim.set_price("BTC", 59000)             # moves marks, fills resting/trigger orders
+
+`python exchange_sim.py bench` measures the HLClient execution path offline.
+"""
+import sys
+import time
+import random
+import threading
+from typing import Dict, Any, List, Optional, Callable
+
+try:
+    from hyperliquid.utils.error import ClientError
+except ImportError:  # SDK not installed: same str() shape, so "429" in str(e) still works
+    class ClientError(Exception):
+        def __init__(self, status_code, error_code, error_message, header, error_data=None):
+            super().__init__(status_code, error_code, error_message, header, error_data)
+            self.status_code = status_code
+
+SIM_ADDRESS = "0x" + "51" * 20  # Account address the simulator answers for
+
+# Hyperliquid request weights (info light/heavy, exchange actions; rate_limiter.py has the full table)
+WEIGHT_INFO_LIGHT = 2
+WEIGHT_INFO = 20
+WEIGHT_EXCHANGE = 1
+
+
+class SimRateLimiter:
+    """
+    429 injection: a per-minute weight budget (like Hyperliquid's 1200/min per IP)
+    and/or a random failure rate (seeded, so runs are reproducible).
+    """
+
+    def __init__(self, weight_per_minute: int = 1200, fail_rate: float = 0.0, seed: int = 0,
+                 clock: Callable[[], float] = time.time):
+        self.weight_per_minute = weight_per_minute
+        self.fail_rate = fail_rate
+        self.clock = clock
+        self._rng = random.Random(seed)
+        self._window_start = clock()
+        self._used = 0
+        self.rejected = 0
+
+    def _roll(self) -> None:
+        now = self.clock()
+        if now - self._window_start >= 60:
+            self._window_start = now
+            self._used = 0
+
+    def check(self, weight: int) -> None:
+        self._roll()
+        over_budget = self.weight_per_minute and self._used + weight > self.weight_per_minute
+        if over_budget or (self.fail_rate and self._rng.random() < self.fail_rate):
+            self.rejected += 1
+            raise ClientError(429, None, "Too many requests (simulated)", {})
+        self._used += weight
+
+    def add(self, weight: int) -> None:
+        """Count weight without rejecting (charged after the response)"""
+        self._roll()
+        self._used += weight
+
+
+class SimExchangeState:
+    """
+    Shared matching/account state behind SimInfo and SimExchange.
+
+    Single cross-margin account. No L2 depth: taker orders fill at the simulated
+    bid/ask (mid +/- half spread), resting limits fill at their price when the
+    mid crosses them, trigger orders fire on the mark.
+    """
+
+    def __init__(self, prices: Dict[str, float], starting_balance: float = 10000.0,
+                 meta: Optional[Dict[str, Any]] = None, taker_fee: float = 0.00045,
+                 maker_fee: float = 0.00015, half_spread_bps: float = 1.0,
+                 clock: Callable[[], float] = time.time, rate_limiter: Optional[SimRateLimiter] = None,
+                 candles: Optional[Callable[[str, str, int, int], list]] = None):
+        """
+        Args:
+            prices: Initial mid price per coin (also defines the universe if meta is None)
+            starting_balance: USDC collateral
+            meta: Optional Info.meta()-shaped universe (szDecimals, maxLeverage)
+            taker_fee / maker_fee: Fee rates
+            half_spread_bps: Simulated half spread around the mid
+            clock: Time source in seconds (replay passes its simulated clock)
+            rate_limiter: Optional SimRateLimiter for 429 injection
+            candles: Optional candles_snapshot provider(coin, interval, start_ms, end_ms)
+        """
+        self.mids: Dict[str, float] = {c: float(p) for c, p in prices.items()}
+        self.meta = meta or {"universe": [{"name": c, "szDecimals": 5, "maxLeverage": 50} for c in prices]}
+        self._assets = {a["name"]: a for a in self.meta["universe"]}
+        self.balance = float(starting_balance)
+        self.taker_fee = taker_fee
+        self.maker_fee = maker_fee
+        self.half_spread = half_spread_bps / 10000
+        self.clock = clock
+        self.rate_limiter = rate_limiter
+        self.candles = candles
+        self.lock = threading.RLock()
+
+        self.positions: Dict[str, Dict[str, Any]] = {}  # coin -> {szi, entry_px, leverage, is_cross}
+        self.leverage: Dict[str, Dict[str, Any]] = {}   # coin -> {"value", "is_cross"}
+        self.orders: Dict[int, Dict[str, Any]] = {}     # oid -> resting order (limit or trigger)
+        self.fills: List[Dict[str, Any]] = []           # oldest first
+        self.cancel_at_ms: Optional[int] = None
+        self._next_oid = 1
+        self._next_tid = 1
+        self.stats = {"orders": 0, "fills": 0, "cancels": 0, "rejects": 0}
+
+    # ---------- helpers ----------
+    def now_ms(self) -> int:
+        return int(self.clock() * 1000)
+
+    def charge(self, weight: int) -> None:
+        if self.rate_limiter:
+            self.rate_limiter.check(weight)
+
+    def surcharge(self, weight: int) -> None:
+        """Per-item weight of a response that was already served"""
+        if self.rate_limiter and weight:
+            self.rate_limiter.add(weight)
+
+    def bbo(self, coin: str) -> tuple:
+        mid = self.mids[coin]
+        return mid * (1 - self.half_spread), mid * (1 + self.half_spread)
+
+    def _lev(self, coin: str) -> Dict[str, Any]:
+        return self.leverage.get(coin) or {"value": min(20, self._assets[coin].get("maxLeverage", 50)), "is_cross": True}
+
+    def _upnl(self, coin: str, pos: Dict[str, Any]) -> float:
+        return (self.mids.get(coin, pos["entry_px"]) - pos["entry_px"]) * pos["szi"]
+
+    def account_value(self) -> float:
+        return self.balance + sum(self._upnl(c, p) for c, p in self.positions.items())
+
+    def margin_used(self) -> float:
+        return sum(abs(p["szi"]) * self.mids.get(c, p["entry_px"]) / p["leverage"] for c, p in self.positions.items())
+
+    def _check_schedule(self) -> None:
+        """Dead man's switch: cancel everything once the scheduled time passes"""
+        if self.cancel_at_ms and self.now_ms() >= self.cancel_at_ms:
+            self.orders.clear()
+            self.cancel_at_ms = None
+
+    # ---------- matching ----------
+    def _apply_fill(self, coin: str, is_buy: bool, sz: float, px: float, oid: int, crossed: bool,
+                    cloid: Optional[str] = None) -> None:
+        pos = self.positions.get(coin)
+        start = pos["szi"] if pos else 0.0
+        signed = sz if is_buy else -sz
+        closed_pnl = 0.0
+
+        if pos and (start > 0) != is_buy:
+            # Reducing (possibly flipping)
+            closing = min(abs(start), sz)
+            closed_pnl = (px - pos["entry_px"]) * (closing if start > 0 else -closing)
+            pos["szi"] = start + signed
+            if abs(pos["szi"]) < 1e-12:
+                del self.positions[coin]
+            elif (pos["szi"] > 0) != (start > 0):
+                pos["entry_px"] = px  # Flipped: remainder opened at this fill
+        elif pos:
+            total = abs(start) + sz
+            pos["entry_px"] = (pos["entry_px"] * abs(start) + px * sz) / total
+            pos["szi"] = start + signed
+        else:
+            lev = self._lev(coin)
+            self.positions[coin] = {"szi": signed, "entry_px": px, "leverage": lev["value"], "is_cross": lev["is_cross"]}
+
+        fee = sz * px * (self.taker_fee if crossed else self.maker_fee)
+        self.balance += closed_pnl - fee
+        side_word = "Long" if (start > 0 or (start == 0 and is_buy)) else "Short"
+        direction = ("Close " if closed_pnl or (start and (start > 0) != is_buy) else "Open ") + side_word
+        self.fills.append({
+            "coin": coin, "px": f"{px:.8g}", "sz": f"{sz:.8g}", "side": "B" if is_buy else "A",
+            "time": self.now_ms(), "startPosition": f"{start:.8g}", "dir": direction,
+            "closedPnl": f"{closed_pnl:.6f}", "hash": f"0xsim{self._next_tid:x}", "oid": oid,
+            "crossed": crossed, "fee": f"{fee:.6f}", "tid": self._next_tid, "feeToken": "USDC",
+            **({"cloid": cloid} if cloid else {})
+        })
+        self._next_tid += 1
+        self.stats["fills"] += 1
+
+    def _reduce_only_size(self, coin: str, is_buy: bool, sz: float) -> float:
+        pos = self.positions.get(coin)
+        if not pos or (pos["szi"] > 0) == is_buy:
+            return 0.0
+        return min(sz, abs(pos["szi"]))
+
+    def place(self, coin: str, is_buy: bool, sz: float, limit_px: float, order_type: Any = None,
+              reduce_only: bool = False, cloid: Optional[str] = None, tif: Optional[str] = None) -> Dict[str, Any]:
+        """Place one order; returns a single SDK order status ({"resting"}, {"filled"} or {"error"})"""
+        self.stats["orders"] += 1
+        self._check_schedule()
+        if coin not in self._assets or coin not in self.mids:
+            self.stats["rejects"] += 1
+            return {"error": f"Unknown asset {coin}"}
+        sz = float(sz)
+        limit_px = float(limit_px)
+        decimals = self._assets[coin].get("szDecimals", 5)
+        if sz <= 0 or abs(round(sz, decimals) - sz) > 1e-12:
+            self.stats["rejects"] += 1
+            return {"error": "Order has invalid size."}
+
+        # Normalize order type: SDK dict, trading_tools strings ("limit"/"market") + tif kwarg
+        trigger = None
+        if isinstance(order_type, dict):
+            if "trigger" in order_type:
+                trigger = order_type["trigger"]
+            else:
+                tif = order_type.get("limit", {}).get("tif", tif or "Gtc")
+        elif order_type == "market":
+            tif = "Ioc"
+        tif = tif or "Gtc"
+
+        oid = self._next_oid
+        self._next_oid += 1
+
+        if trigger:
+            self.orders[oid] = {
+                "coin": coin, "is_buy": is_buy, "sz": sz, "orig_sz": sz, "limit_px": limit_px,
+                "trigger_px": float(trigger["triggerPx"]), "is_market": bool(trigger.get("isMarket", True)),
+                "tpsl": trigger.get("tpsl", "sl"), "reduce_only": reduce_only, "tif": None,
+                "cloid": cloid, "timestamp": self.now_ms()
+            }
+            return {"resting": {"oid": oid, **({"cloid": cloid} if cloid else {})}}
+
+        if reduce_only:
+            sz = self._reduce_only_size(coin, is_buy, sz)
+            if sz <= 0:
+                self.stats["rejects"] += 1
+                return {"error": "Reduce only order would increase position."}
+
+        bid, ask = self.bbo(coin)
+        marketable = (is_buy and limit_px >= ask) or (not is_buy and limit_px <= bid)
+        if tif == "Alo" and marketable:
+            self.stats["rejects"] += 1
+            return {"error": f"Post only order would have immediately matched, bbo was {bid:.8g}@{ask:.8g}. asset={coin}"}
+        if not marketable and tif == "Ioc":
+            self.stats["rejects"] += 1
+            return {"error": f"Order could not immediately match against any resting orders. asset={coin}"}
+
+        if not reduce_only:
+            px = (ask if is_buy else bid) if marketable else limit_px
+            pos = self.positions.get(coin)
+            increasing = not pos or (pos["szi"] > 0) == is_buy
+            if increasing and sz * px / self._lev(coin)["value"] > self.account_value() - self.margin_used():
+                self.stats["rejects"] += 1
+                return {"error": f"Insufficient margin to place order. asset={coin}"}
+
+        if marketable:
+            px = ask if is_buy else bid
+            self._apply_fill(coin, is_buy, sz, px, oid, crossed=True, cloid=cloid)
+            return {"filled": {"totalSz": f"{sz:.8g}", "avgPx": f"{px:.8g}", "oid": oid,
+                               **({"cloid": cloid} if cloid else {})}}
+
+        self.orders[oid] = {
+            "coin": coin, "is_buy": is_buy, "sz": sz, "orig_sz": sz, "limit_px": limit_px,
+            "trigger_px": None, "reduce_only": reduce_only, "tif": tif, "cloid": cloid,
+            "timestamp": self.now_ms()
+        }
+        return {"resting": {"oid": oid, **({"cloid": cloid} if cloid else {})}}
+
+    def cancel(self, coin: str, oid: int) -> Any:
+        self._check_schedule()
+        order = self.orders.get(int(oid)) if oid is not None else None
+        if not order or order["coin"] != coin:
+            return {"error": f"Order was never placed, already canceled, or filled. asset={coin}"}
+        del self.orders[int(oid)]
+        self.stats["cancels"] += 1
+        return "success"
+
+    def set_price(self, coin: str, px: float) -> None:
+        """Move the mid/mark and run resting limit + trigger orders against it"""
+        with self.lock:
+            self.mids[coin] = float(px)
+            self._check_schedule()
+            bid, ask = self.bbo(coin)
+            for oid, order in sorted(self.orders.items()):
+                if order["coin"] != coin or oid not in self.orders:
+                    continue
+                if order["trigger_px"] is not None:
+                    trig = order["trigger_px"]
+                    # Stops fire against the move, take-profits with it
+                    if order["tpsl"] == "sl":
+                        fired = px >= trig if order["is_buy"] else px <= trig
+                    else:
+                        fired = px <= trig if order["is_buy"] else px >= trig
+                    if not fired:
+                        continue
+                    del self.orders[oid]
+                    sz = self._reduce_only_size(coin, order["is_buy"], order["sz"]) if order["reduce_only"] else order["sz"]
+                    if sz <= 0:
+                        continue
+                    if order["is_market"]:
+                        self._apply_fill(coin, order["is_buy"], sz, ask if order["is_buy"] else bid, oid, True, order["cloid"])
+                    else:
+                        order.update(trigger_px=None, sz=sz, tif="Gtc")
+                        self.orders[oid] = order  # Becomes a resting limit
+                elif (order["is_buy"] and ask <= order["limit_px"]) or (not order["is_buy"] and bid >= order["limit_px"]):
+                    del self.orders[oid]
+                    sz = self._reduce_only_size(coin, order["is_buy"], order["sz"]) if order["reduce_only"] else order["sz"]
+                    if sz > 0:
+                        self._apply_fill(coin, order["is_buy"], sz, order["limit_px"], oid, False, order["cloid"])
+
+    def set_prices(self, prices: Dict[str, float]) -> None:
+        for coin, px in prices.items():
+            self.set_price(coin, px)
+
+
+def _ok(kind: str, statuses: Optional[List[Any]] = None) -> Dict[str, Any]:
+    """SDK-shaped success envelope"""
+    if statuses is None:
+        return {"status": "ok", "response": {"type": kind}}
+    return {"status": "ok", "response": {"type": kind, "data": {"statuses": statuses}}}
+
+
+class SimInfo:
+    """hyperliquid.info.Info subset backed by SimExchangeState"""
+
+    def __init__(self, state: SimExchangeState):
+        self.state = state
+
+    def all_mids(self, dex: str = "") -> Dict[str, str]:
+        s = self.state
+        with s.lock:
+            s.charge(WEIGHT_INFO_LIGHT)
+            return {c: f"{p:.8g}" for c, p in s.mids.items()}
+
+    def meta(self, dex: str = "") -> Dict[str, Any]:
+        self.state.charge(WEIGHT_INFO)
+        return self.state.meta
+
+    def meta_and_asset_ctxs(self) -> list:
+        s = self.state
+        with s.lock:
+            s.charge(WEIGHT_INFO)
+            ctxs = [{"markPx": f"{s.mids.get(a['name'], 0):.8g}", "midPx": f"{s.mids.get(a['name'], 0):.8g}",
+                     "prevDayPx": f"{s.mids.get(a['name'], 0):.8g}", "funding": "0.0", "openInterest": "0.0",
+                     "dayNtlVlm": "0.0", "premium": "0.0", "oraclePx": f"{s.mids.get(a['name'], 0):.8g}"}
+                    for a in s.meta["universe"]]
+            return [s.meta, ctxs]
+
+    def user_state(self, address: str, dex: str = "") -> Dict[str, Any]:
+        s = self.state
+        with s.lock:
+            s.charge(WEIGHT_INFO_LIGHT)
+            s._check_schedule()
+            account_value = s.account_value()
+            margin_used = s.margin_used()
+            ntl = sum(abs(p["szi"]) * s.mids.get(c, p["entry_px"]) for c, p in s.positions.items())
+            summary = {"accountValue": f"{account_value:.6f}", "totalNtlPos": f"{ntl:.6f}",
+                       "totalRawUsd": f"{s.balance:.6f}", "totalMarginUsed": f"{margin_used:.6f}"}
+            asset_positions = []
+            for coin, p in s.positions.items():
+                upnl = s._upnl(coin, p)
+                pos_margin = abs(p["szi"]) * s.mids.get(coin, p["entry_px"]) / p["leverage"]
+                asset_positions.append({"type": "oneWay", "position": {
+                    "coin": coin, "szi": f"{p['szi']:.8g}", "entryPx": f"{p['entry_px']:.8g}",
+                    "positionValue": f"{abs(p['szi']) * s.mids.get(coin, p['entry_px']):.6f}",
+                    "unrealizedPnl": f"{upnl:.6f}",
+                    "returnOnEquity": f"{upnl / pos_margin if pos_margin else 0:.6f}",
+                    "liquidationPx": None,
+                    "leverage": {"type": "cross" if p["is_cross"] else "isolated", "value": p["leverage"]},
+                    "marginUsed": f"{pos_margin:.6f}",
+                    "maxLeverage": s._assets[coin].get("maxLeverage", 50)
+                }})
+            return {"marginSummary": summary, "crossMarginSummary": dict(summary),
+                    "withdrawable": f"{max(0.0, account_value - margin_used):.6f}",
+                    "assetPositions": asset_positions, "time": s.now_ms()}
+
+    def _order_row(self, oid: int, o: Dict[str, Any], frontend: bool) -> Dict[str, Any]:
+        row = {"coin": o["coin"], "side": "B" if o["is_buy"] else "A", "limitPx": f"{o['limit_px']:.8g}",
+               "sz": f"{o['sz']:.8g}", "oid": oid, "timestamp": o["timestamp"], "origSz": f"{o['orig_sz']:.8g}",
+               "reduceOnly": o["reduce_only"]}
+        if o.get("cloid"):
+            row["cloid"] = o["cloid"]
+        if frontend:
+            is_trigger = o["trigger_px"] is not None
+            row.update({
+                "isTrigger": is_trigger,
+                "triggerPx": f"{o['trigger_px']:.8g}" if is_trigger else "0.0",
+                "triggerCondition": (("Price above " if o["is_buy"] == (o["tpsl"] == "sl") else "Price below ")
+                                     + f"{o['trigger_px']:.8g}") if is_trigger else "N/A",
+                "orderType": ("Stop Market" if o["tpsl"] == "sl" else "Take Profit Market") if is_trigger else "Limit",
+                "isPositionTpsl": False, "tif": o["tif"]
+            })
+        return row
+
+    def open_orders(self, address: str, dex: str = "") -> List[Dict[str, Any]]:
+        s = self.state
+        with s.lock:
+            s.charge(WEIGHT_INFO)
+            s._check_schedule()
+            return [self._order_row(oid, o, frontend=False) for oid, o in sorted(s.orders.items(), reverse=True)]
+
+    def frontend_open_orders(self, address: str, dex: str = "") -> List[Dict[str, Any]]:
+        s = self.state
+        with s.lock:
+            s.charge(WEIGHT_INFO)
+            s._check_schedule()
+            return [self._order_row(oid, o, frontend=True) for oid, o in sorted(s.orders.items(), reverse=True)]
+
+    def user_fills(self, address: str) -> List[Dict[str, Any]]:
+        s = self.state
+        with s.lock:
+            s.charge(WEIGHT_INFO)
+            fills = list(reversed(s.fills[-2000:]))  # Newest first, capped like the API
+            s.surcharge(len(fills) // 20)
+            return fills
+
+    def user_fills_by_time(self, address: str, start_time: int, end_time: Optional[int] = None,
+                           aggregate_by_time: Optional[bool] = False) -> List[Dict[str, Any]]:
+        s = self.state
+        with s.lock:
+            s.charge(WEIGHT_INFO)
+            end_time = end_time or s.now_ms()
+            fills = [f for f in s.fills if start_time <= f["time"] <= end_time][:2000]
+            s.surcharge(len(fills) // 20)
+            return fills
+
+    def l2_snapshot(self, name: str) -> Dict[str, Any]:
+        s = self.state
+        with s.lock:
+            s.charge(WEIGHT_INFO_LIGHT)
+            bid, ask = s.bbo(name)
+            step = s.mids[name] * s.half_spread
+            return {"coin": name, "time": s.now_ms(), "levels": [
+                [{"px": f"{bid - i * step:.8g}", "sz": "1.0", "n": 1} for i in range(20)],
+                [{"px": f"{ask + i * step:.8g}", "sz": "1.0", "n": 1} for i in range(20)]
+            ]}
+
+    def candles_snapshot(self, name: str, interval: str, startTime: int, endTime: int) -> list:
+        self.state.charge(WEIGHT_INFO)
+        candles = self.state.candles(name, interval, startTime, endTime) if self.state.candles else []
+        self.state.surcharge(len(candles) // 60)
+        return candles
+
+    def query_order_by_oid(self, user: str, oid: int) -> Dict[str, Any]:
+        s = self.state
+        with s.lock:
+            s.charge(WEIGHT_INFO_LIGHT)
+            o = s.orders.get(int(oid))
+            if not o:
+                return {"status": "unknownOid"}
+            return {"status": "order", "order": {"order": self._order_row(int(oid), o, frontend=True), "status": "open"}}
+
+    def user_rate_limit(self, user: str) -> Dict[str, Any]:
+        s = self.state
+        s.charge(WEIGHT_INFO)
+        return {"cumVlm": "0.0", "nRequestsUsed": s.stats["orders"] + s.stats["cancels"], "nRequestsCap": 10000}
+
+    def subaccounts(self, user: str) -> list:
+        self.state.charge(WEIGHT_INFO)
+        return []
+
+    def name_to_asset(self, name: str) -> int:
+        return [a["name"] for a in self.state.meta["universe"]].index(name)
+
+
+class SimExchange:
+    """hyperliquid.exchange.Exchange subset backed by SimExchangeState"""
+
+    def __init__(self, state: SimExchangeState):
+        self.state = state
+
+    def order(self, name: str = None, is_buy: bool = True, sz: float = 0.0, limit_px: float = 0.0,
+              order_type: Any = None, reduce_only: bool = False, cloid: Any = None, builder: Any = None,
+              coin: Optional[str] = None, tif: Optional[str] = None) -> Dict[str, Any]:
+        s = self.state
+        with s.lock:
+            s.charge(WEIGHT_EXCHANGE)
+            status = s.place(name or coin, is_buy, sz, limit_px, order_type, reduce_only,
+                             str(cloid) if cloid else None, tif)
+            return _ok("order", [status])
+
+    def bulk_orders(self, order_requests: List[Dict[str, Any]], builder: Any = None, grouping: str = "na") -> Dict[str, Any]:
+        s = self.state
+        with s.lock:
+            s.charge(WEIGHT_EXCHANGE + len(order_requests) // 40)
+            statuses = []
+            for req in order_requests:
+                if req.get("error"):
+                    statuses.append({"error": req["error"]})
+                    continue
+                statuses.append(s.place(
+                    req.get("coin") or req.get("name"), req["is_buy"], req["sz"], req["limit_px"],
+                    req.get("order_type"), req.get("reduce_only", False),
+                    str(req["cloid"]) if req.get("cloid") else None, req.get("tif")
+                ))
+            return _ok("order", statuses)
+
+    def market_open(self, name: str, is_buy: bool, sz: float, px: Optional[float] = None,
+                    slippage: float = 0.05, cloid: Any = None, builder: Any = None) -> Dict[str, Any]:
+        # Same as the SDK: aggressive IOC limit at mid +/- slippage
+        mid = px or self.state.mids.get(name, 0)
+        limit_px = mid * (1 + slippage) if is_buy else mid * (1 - slippage)
+        return self.order(name, is_buy, sz, limit_px, {"limit": {"tif": "Ioc"}}, False, cloid)
+
+    def market_close(self, coin: str, sz: Optional[float] = None, px: Optional[float] = None,
+                     slippage: float = 0.05, cloid: Any = None, builder: Any = None) -> Any:
+        s = self.state
+        with s.lock:
+            pos = s.positions.get(coin)
+            if not pos:
+                return None  # SDK returns None when there is nothing to close
+            is_buy = pos["szi"] < 0
+            mid = px or s.mids[coin]
+            limit_px = mid * (1 + slippage) if is_buy else mid * (1 - slippage)
+            return self.order(coin, is_buy, sz or abs(pos["szi"]), limit_px, {"limit": {"tif": "Ioc"}}, True, cloid)
+
+    def cancel(self, name: str = None, oid: int = None, coin: Optional[str] = None, cloid: Any = None) -> Dict[str, Any]:
+        s = self.state
+        with s.lock:
+            s.charge(WEIGHT_EXCHANGE)
+            name = name or coin
+            if oid is None and cloid is not None:
+                oid = next((i for i, o in s.orders.items() if o.get("cloid") == str(cloid)), None)
+            return _ok("cancel", [s.cancel(name, oid)])
+
+    def bulk_cancel(self, cancel_requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        s = self.state
+        with s.lock:
+            s.charge(WEIGHT_EXCHANGE + len(cancel_requests) // 40)
+            return _ok("cancel", [s.cancel(r.get("coin") or r.get("name"), r.get("oid")) for r in cancel_requests])
+
+    def bulk_cancel_by_cloid(self, cancel_requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        s = self.state
+        with s.lock:
+            s.charge(WEIGHT_EXCHANGE + len(cancel_requests) // 40)
+            statuses = []
+            for r in cancel_requests:
+                cloid = str(r.get("cloid"))
+                oid = next((i for i, o in s.orders.items() if o.get("cloid") == cloid), None)
+                statuses.append(s.cancel(r.get("coin") or r.get("name"), oid))
+            return _ok("cancel", statuses)
+
+    def modify_order(self, oid: int, name: str = None, is_buy: Optional[bool] = None, sz: Optional[float] = None,
+                     limit_px: Optional[float] = None, order_type: Any = None, reduce_only: Optional[bool] = None,
+                     cloid: Any = None, coin: Optional[str] = None) -> Dict[str, Any]:
+        s = self.state
+        with s.lock:
+            s.charge(WEIGHT_EXCHANGE)
+            name = name or coin
+            old = s.orders.get(int(oid))
+            if not old or old["coin"] != name:
+                return {"status": "err", "response": f"Cannot modify canceled or filled order. oid={oid}"}
+            # Cancel + replace (new oid), defaults from the resting order
+            del s.orders[int(oid)]
+            if order_type is None:
+                order_type = ({"trigger": {"triggerPx": old["trigger_px"], "isMarket": old.get("is_market", True),
+                                           "tpsl": old.get("tpsl", "sl")}}
+                              if old["trigger_px"] is not None else {"limit": {"tif": old["tif"] or "Gtc"}})
+            status = s.place(name, old["is_buy"] if is_buy is None else is_buy, old["sz"] if sz is None else sz,
+                             old["limit_px"] if limit_px is None else limit_px, order_type,
+                             old["reduce_only"] if reduce_only is None else reduce_only, old.get("cloid"))
+            return _ok("order", [status])
+
+    def update_leverage(self, leverage: int, name: str = None, is_cross: bool = True,
+                        coin: Optional[str] = None) -> Dict[str, Any]:
+        s = self.state
+        with s.lock:
+            s.charge(WEIGHT_EXCHANGE)
+            name = name or coin
+            max_lev = s._assets.get(name, {}).get("maxLeverage", 50)
+            if name not in s._assets or not 1 <= int(leverage) <= max_lev:
+                return {"status": "err", "response": f"Invalid leverage value. asset={name}"}
+            s.leverage[name] = {"value": int(leverage), "is_cross": bool(is_cross)}
+            if name in s.positions:
+                s.positions[name]["leverage"] = int(leverage)
+                s.positions[name]["is_cross"] = bool(is_cross)
+            return _ok("default")
+
+    def update_isolated_margin(self, amount: float = 0.0, name: str = None, coin: Optional[str] = None,
+                               is_buy: Optional[bool] = None, ntli: Optional[float] = None) -> Dict[str, Any]:
+        # Margin is pooled in the simulator; accepted for API compatibility
+        self.state.charge(WEIGHT_EXCHANGE)
+        if (name or coin) not in self.state.positions:
+            return {"status": "err", "response": "No position to add margin to."}
+        return _ok("default")
+
+    def schedule_cancel(self, time: Optional[int]) -> Dict[str, Any]:
+        s = self.state
+        with s.lock:
+            s.charge(WEIGHT_EXCHANGE)
+            s.cancel_at_ms = int(time) if time else None
+            return _ok("default")
+
+    def update_dead_mans_switch(self, timeout: int) -> Dict[str, Any]:
+        """trading_tools name for schedule_cancel (timeout in seconds from now)"""
+        return self.schedule_cancel(self.state.now_ms() + int(timeout) * 1000 if timeout else None)
+
+    def twap_order(self, coin: str, is_buy: bool, sz: float, duration: int, randomize: bool = False) -> Dict[str, Any]:
+        # No time slicing in the simulator: executes immediately as one taker order
+        result = self.market_open(coin, is_buy, sz)
+        status = result["response"]["data"]["statuses"][0]
+        if "error" in status:
+            return {"status": "err", "response": status["error"]}
+        return {"status": "ok", "response": {"type": "twapOrder",
+                                             "data": {"status": {"running": {"twapId": status["filled"]["oid"]}}}}}
+
+
+def create_simulator(prices: Dict[str, float], **kwargs) -> tuple:
+    """
+    Build a connected (SimInfo, SimExchange, SimExchangeState) triple.
+    kwargs go to SimExchangeState.
+    """
+    state = SimExchangeState(prices, **kwargs)
+    return SimInfo(state), SimExchange(state), state
+
+
+def sim_hl_client(info: SimInfo, exchange: SimExchange, limiter=None):
+    """HLClient wired to the simulator (no network; no throttling unless a limiter is given)"""
+    from hl_client import HLClient
+    from rate_limiter import WeightLimiter
+    return HLClient(info_client=info, exchange_client=exchange, wallet_address=SIM_ADDRESS,
+                    limiter=limiter or WeightLimiter(weight_per_minute=0))
+
+
+def _bench(argv: List[str]) -> int:
+    """Offline latency/throughput benchmark of the HLClient order path"""
+    import argparse
+    import contextlib
+    import io
+    parser = argparse.ArgumentParser(description="Exchange simulator benchmark")
+    parser.add_argument("--orders", type=int, default=5000, help="Orders per scenario")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Random 429 rate")
+    args = parser.parse_args(argv)
+
+    info, exchange, sim = create_simulator(
+        {"BTC": 60000.0, "ETH": 3000.0}, starting_balance=10_000_000,
+        rate_limiter=SimRateLimiter(weight_per_minute=0, fail_rate=args.fail_rate, seed=1)
+    )
+    hl = sim_hl_client(info, exchange)
+
+    def timed(label: str, fn: Callable[[int], Any], n: int) -> None:
+        latencies = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(n):
+                t0 = time.perf_counter()
+                fn(i)
+                latencies.append(time.perf_counter() - t0)
+        latencies.sort()
+        total = sum(latencies)
+        print(f"[SIM][BENCH] {label:<16} n={n} {n / total:,.0f}/s "
+              f"p50={latencies[n // 2] * 1e6:.0f}us p99={latencies[int(n * 0.99)] * 1e6:.0f}us")
+
+    n = args.orders
+    timed("market_open", lambda i: hl.place_market_order("BTC", i % 2 == 0, 0.001), n)
+    timed("trigger_order", lambda i: hl.place_trigger_order("ETH", False, 2000 + i % 100, 0.01), n)
+    oids = [o["oid"] for o in info.open_orders(SIM_ADDRESS)]
+    timed("cancel_order", lambda i: hl.cancel_order("ETH", oids[i]), min(n, len(oids)))
+    timed("positions+orders", lambda i: (hl.get_positions_by_symbol(), hl.get_open_orders()), n)
+    print(f"[SIM][BENCH] stats={sim.stats} 429s={sim.rate_limiter.rejected}")
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        sys.exit(_bench(sys.argv[2:]))
+    print("usage: python exchange_sim.py bench [--orders N] [--fail-rate F]")
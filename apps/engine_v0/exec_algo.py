@@ -0,0 +1,141 @@
+"""
+Exec Algo - Sliced market entries against live book depth
+Instead of one market order sweeping the book, a large entry goes out as IOC
+limit children, each sized to the depth within EXEC_SLICE_MAX_SLIPPAGE_BPS of
+the mid, with a short pause for the book to refill between them.
+"""
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from config import (
+    EXEC_SLICE_MAX_SLIPPAGE_BPS,
+    EXEC_SLICE_INTERVAL_SECONDS,
+    EXEC_SLICE_MAX_CHILDREN
+)
+
+EXCHANGE_MIN_NOTIONAL = 10.0  # Hyperliquid rejects smaller orders
+
+
+def slice_against_book(levels: List[List[float]], mid: float, is_buy: bool,
+                       size: float, max_slippage_bps: float) -> Tuple[float, Optional[float]]:
+    """
+    Largest child up to size that the book fills within max_slippage_bps of mid.
+    levels is the opposite side ([px, sz], best first). Returns (size, limit px).
+    """
+    cap = mid * (1 + max_slippage_bps / 10000) if is_buy else mid * (1 - max_slippage_bps / 10000)
+    available = 0.0
+    limit_px = None
+    for px, sz in levels:
+        if (px > cap) if is_buy else (px < cap):
+            break
+        available += sz
+        limit_px = px
+        if available >= size:
+            break
+    return min(size, available), limit_px
+
+
+def _floor_size(size: float, sz_decimals: int) -> float:
+    factor = 10 ** sz_decimals
+    return int(size * factor + 1e-9) / factor
+
+
+def _filled(resp: Dict[str, Any]) -> Tuple[float, float, Optional[int], Optional[str]]:
+    """(size, avg px, oid, error) from a single-order exchange response"""
+    if not isinstance(resp, dict) or resp.get("status") != "ok":
+        return 0.0, 0.0, None, str(resp.get("response") if isinstance(resp, dict) else resp)
+    statuses = resp.get("response", {}).get("data", {}).get("statuses", [])
+    status = statuses[0] if statuses else {}
+    if isinstance(status, dict) and "filled" in status:
+        f = status["filled"]
+        return float(f.get("totalSz", 0)), float(f.get("avgPx", 0)), f.get("oid"), None
+    return 0.0, 0.0, None, status.get("error") if isinstance(status, dict) else str(status)
+
+
+def sliced_market_order(hl_client, symbol: str, is_buy: bool, size: float,
+                        max_slippage_bps: float = EXEC_SLICE_MAX_SLIPPAGE_BPS,
+                        interval: float = EXEC_SLICE_INTERVAL_SECONDS,
+                        max_children: int = EXEC_SLICE_MAX_CHILDREN,
+                        sleep=time.sleep) -> Dict[str, Any]:
+    """
+    Fill size with IOC children sized to the book, then send any remainder as a market order.
+
+    Returns:
+        dict: Exchange-shaped response (one aggregated "filled" status, so the
+        executor's parsing is unchanged) plus "execution" with the child log and
+        implementation shortfall vs the arrival mid
+    """
+    constraints = hl_client.get_symbol_constraints(symbol)
+    sz_decimals = constraints.get("szDecimals", 3) if constraints else 3
+
+    arrival = None
+    mid = None
+    filled = 0.0
+    notional = 0.0
+    last_oid = None
+    children = []
+
+    for i in range(max_children):
+        remaining = _floor_size(size - filled, sz_decimals)
+        book = hl_client.get_orderbook(symbol, depth=20, fresh=True)
+        bids, asks = book.get("bids") or [], book.get("asks") or []
+        if not bids or not asks:
+            break
+        mid = (bids[0][0] + asks[0][0]) / 2
+        arrival = arrival or mid
+        if remaining * mid < EXCHANGE_MIN_NOTIONAL:
+            break
+
+        child, limit_px = slice_against_book(asks if is_buy else bids, mid, is_buy, remaining, max_slippage_bps)
+        child = _floor_size(child, sz_decimals)
+        if child * mid >= EXCHANGE_MIN_NOTIONAL and limit_px:
+            resp = hl_client.place_limit_order(symbol, is_buy, child, limit_px, tif="Ioc")
+            sz, px, oid, error = _filled(resp)
+            children.append({"size": child, "limit_px": limit_px, "filled": sz, "avg_px": px, "error": error})
+            if sz:
+                filled += sz
+                notional += sz * px
+                last_oid = oid
+            print(f"[EXEC_ALGO] {symbol} child {i + 1}: {child} @ <= {limit_px} filled={sz}"
+                  + (f" error={error}" if error else ""))
+
+        if _floor_size(size - filled, sz_decimals) * mid < EXCHANGE_MIN_NOTIONAL:
+            break
+        if i < max_children - 1:
+            sleep(interval)
+
+    # Whatever the book could not absorb within the band goes out as one market order
+    remaining = _floor_size(size - filled, sz_decimals)
+    fallback = None
+    if remaining > 0 and (not mid or remaining * mid >= EXCHANGE_MIN_NOTIONAL):
+        print(f"[EXEC_ALGO] {symbol} sending remainder {remaining} as market order")
+        fallback = hl_client.place_market_order(symbol=symbol, is_buy=is_buy, size=remaining)
+        sz, px, oid, error = _filled(fallback)
+        children.append({"size": remaining, "limit_px": None, "filled": sz, "avg_px": px, "error": error})
+        if sz:
+            filled += sz
+            notional += sz * px
+            last_oid = oid
+
+    if not filled:
+        # Nothing executed: hand back the exchange's own rejection
+        return fallback or {"status": "error", "response": children[-1]["error"] if children else "no liquidity"}
+
+    avg_px = notional / filled
+    sign = 1 if is_buy else -1
+    shortfall_bps = sign * (avg_px - arrival) / arrival * 10000 if arrival else None
+    print(f"[EXEC_ALGO] {symbol} filled {filled}/{size} avg={avg_px:.6g} in {len(children)} orders"
+          + (f" shortfall={shortfall_bps:.2f}bps" if shortfall_bps is not None else ""))
+    return {
+        "status": "ok",
+        "response": {"type": "order", "data": {"statuses": [
+            {"filled": {"totalSz": f"{filled:.8g}", "avgPx": f"{avg_px:.8g}", "oid": last_oid}}
+        ]}},
+        "execution": {
+            "children": children,
+            "arrival_px": arrival,
+            "avg_px": avg_px,
+            "filled": filled,
+            "shortfall_bps": round(shortfall_bps, 2) if shortfall_bps is not None else None
+        }
+    }
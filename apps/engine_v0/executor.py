@@ -20,7 +20,9 @@ from config import (
     MIN_STOP_LOSS_PCT,
     DEFAULT_LEVERAGE,
     MARGIN_BUFFER_FACTOR,
-    TRIGGER_TOLERANCE_PCT
+    TRIGGER_TOLERANCE_PCT,
+    EXEC_PROPAGATION_DELAY_SECONDS,
+    EXEC_SLICE_MIN_NOTIONAL_USD
 )
 
 
@@ -212,28 +214,32 @@ def _cleanup_all_triggers(hl_client, symbol, trigger_type=None, mark_price=None,
         canceled_count = 0
         failed_cancels = []
         
+        to_cancel = []
         for t in triggers:
+            oid = t.get("oid") or t.get("id") or t.get("order_id")
+            if not oid:
+                print(f"[BRACKET][ERROR] Trigger missing OID: {t}")
+                failed_cancels.append("missing_oid")
+                continue
+            to_cancel.append((oid, t))
+        
+        # All triggers go out in one signed batch (one round trip instead of N)
+        if to_cancel:
             try:
-                oid = t.get("oid") or t.get("id") or t.get("order_id")
-                if not oid:
-                    print(f"[BRACKET][ERROR] Trigger missing OID: {t}")
-                    failed_cancels.append("missing_oid")
-                    continue
-                
-                # Call cancel_order (which NOW EXISTS!)
-                success = hl_client.cancel_order(symbol, oid)
-                
-                if success:
+                results = hl_client.bulk_cancel([(symbol, oid) for oid, _ in to_cancel])
+            except Exception as e:
+                print(f"[BRACKET][ERROR] Exception canceling {len(to_cancel)} triggers: {e}")
+                results = {}
+            
+            for oid, t in to_cancel:
+                key = int(oid) if str(oid).isdigit() else oid
+                if results.get(key):
                     canceled_count += 1
                     trigger_info = t.get("triggerPx") or t.get("limitPx") or t.get("order_type") or "unknown"
                     print(f"[BRACKET] Canceled oid={oid} info={trigger_info}")
                 else:
                     failed_cancels.append(oid)
                     print(f"[BRACKET][FAIL] Could not cancel oid={oid}")
-                    
-            except Exception as e:
-                failed_cancels.append(str(e))
-                print(f"[BRACKET][ERROR] Exception canceling {t.get('oid')}: {e}")
         
         # ABORT CHECK: If any cancels failed, return error
         if failed_cancels:
@@ -244,7 +250,7 @@ def _cleanup_all_triggers(hl_client, symbol, trigger_type=None, mark_price=None,
         print(f"[BRACKET][OK] Successfully canceled {canceled_count}/{len(triggers)} triggers")
         
         import time
-        time.sleep(0.5)  # Propagation delay
+        time.sleep(EXEC_PROPAGATION_DELAY_SECONDS)  # Propagation delay
         
         return canceled_count
         
@@ -742,7 +748,7 @@ def _execute_place_order(action: Dict[str, Any], is_paper: bool, hl_client) -> N
             is_cross = (margin_mode == "cross")
             print(f"[LIVE] Ensuring {target_leverage}x {margin_mode} for {symbol}...")
             hl_client.update_leverage(symbol, target_leverage, is_cross)
-            time.sleep(0.5)
+            time.sleep(EXEC_PROPAGATION_DELAY_SECONDS)
         except Exception as e:
             print(f"[LIVE][WARN] Update leverage failed: {e}")
             
@@ -836,11 +842,16 @@ def _execute_place_order(action: Dict[str, Any], is_paper: bool, hl_client) -> N
         # DEBUG: Log side before API call (for flip bug diagnosis)
         print(f"[LIVE][PRE-ORDER] {symbol} side={side} is_buy={is_buy} size={normalized['size']}")
         
-        resp = hl_client.place_market_order(
-            symbol=symbol,
-            is_buy=is_buy,
-            size=normalized["size"]
-        )
+        if EXEC_SLICE_MIN_NOTIONAL_USD > 0 and normalized["size"] * price >= EXEC_SLICE_MIN_NOTIONAL_USD:
+            # Large entry: IOC children sized to the book instead of one sweep
+            from exec_algo import sliced_market_order
+            resp = sliced_market_order(hl_client, symbol, is_buy, normalized["size"])
+        else:
+            resp = hl_client.place_market_order(
+                symbol=symbol,
+                is_buy=is_buy,
+                size=normalized["size"]
+            )
         
         # DEBUG: Log response to detect side flips
         print(f"[LIVE][POST-ORDER] {symbol} response_status={resp.get('status', '?')}")
@@ -876,7 +887,8 @@ def _execute_place_order(action: Dict[str, Any], is_paper: bool, hl_client) -> N
                 "trend": action.get("_trend", "UNKNOWN"),
                 "bos_status": action.get("_bos", "UNKNOWN"),
                 "choch_detected": action.get("_choch", False),
-                "atr_pct": action.get("_atr_pct", 0)
+                "atr_pct": action.get("_atr_pct", 0),
+                "fear_greed": action.get("_fear_greed")
             }
             
             journal.record_entry(
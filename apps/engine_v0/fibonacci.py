@@ -128,32 +128,41 @@ def calculate_fibonacci_levels(candles: List[Dict], lookback: int = 50) -> Dict[
     # Current price
     current_price = float(candles[-1].get('c', candles[-1].get('close', 0)))
     
-    # Determine price position relative to fibs
-    price_position = None
-    all_levels = sorted(list(retracements.values()) + [swing_high, swing_low])
-    
-    for i in range(len(all_levels) - 1):
-        if all_levels[i] <= current_price <= all_levels[i + 1]:
-            price_position = f"between ${all_levels[i]:.0f} and ${all_levels[i+1]:.0f}"
-            break
-    
-    if price_position is None:
-        if current_price > max(all_levels):
-            price_position = f"above all levels (>${max(all_levels):.0f})"
-        else:
-            price_position = f"below all levels (<${min(all_levels):.0f})"
-    
     return {
         "swing_high": round(swing_high, 2),
         "swing_low": round(swing_low, 2),
         "retracements": retracements,
         "extensions": extensions,
         "current_price": round(current_price, 2),
-        "price_position": price_position,
+        "price_position": _price_position(retracements, swing_high, swing_low, current_price),
         "trend_context": trend_context
     }
 
 
+def _price_position(retracements: Dict, swing_high: float, swing_low: float, current_price: float) -> str:
+    """Where price sits relative to the fib levels"""
+    all_levels = sorted(list(retracements.values()) + [swing_high, swing_low])
+    
+    for i in range(len(all_levels) - 1):
+        if all_levels[i] <= current_price <= all_levels[i + 1]:
+            return f"between ${all_levels[i]:.0f} and ${all_levels[i+1]:.0f}"
+    
+    if current_price > max(all_levels):
+        return f"above all levels (>${max(all_levels):.0f})"
+    return f"below all levels (<${min(all_levels):.0f})"
+
+
+def refresh_fibonacci_price(fib_data: Dict[str, Any], current_price: float) -> Dict[str, Any]:
+    """Re-derive the price-relative fields of a cached result (levels unchanged)"""
+    if fib_data.get("swing_high") is None or not fib_data.get("retracements"):
+        return fib_data
+    return {
+        **fib_data,
+        "current_price": round(current_price, 2),
+        "price_position": _price_position(fib_data["retracements"], fib_data["swing_high"], fib_data["swing_low"], current_price)
+    }
+
+
 def format_fibonacci_for_prompt(symbol: str, fib_data: Dict) -> str:
     """Format Fibonacci data for LLM prompt"""
     if not fib_data or fib_data.get("swing_high") is None:
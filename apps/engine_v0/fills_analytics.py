@@ -0,0 +1,32 @@
+"""
+Fills Analytics - Incremental rolling-window trade statistics
+The implementation is tools/fills_analytics.py, shared with the MCP account
+tools. The engine runs from its own directory, where config.py shadows the
+root config package, so the dependency-free module is loaded by file path
+instead of through the tools package.
+"""
+import importlib.util
+import os
+import sys
+
+_MODULE_NAME = "_shared_fills_analytics"
+_MODULE_PATH = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "tools", "fills_analytics.py"))
+
+
+def _load():
+    module = sys.modules.get(_MODULE_NAME)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(_MODULE_NAME, _MODULE_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[_MODULE_NAME] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+_shared = _load()
+
+WINDOWS_MS = _shared.WINDOWS_MS
+ALL_TIME = _shared.ALL_TIME
+RollingAnalytics = _shared.RollingAnalytics
+FillsAnalytics = _shared.FillsAnalytics
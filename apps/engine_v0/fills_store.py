@@ -0,0 +1,281 @@
+"""
+Fills Store - Local, incrementally synced copy of the account's Hyperliquid fills
+Keeps fills indexed by coin and time, with rolling aggregates (fills_analytics) so
+the dashboard can page through trades and read win rate / profit factor without
+re-downloading and re-scanning the full userFills history on every request.
+"""
+import os
+import json
+import time
+import bisect
+import threading
+from typing import Dict, Any, Optional, List, Tuple
+
+import requests
+
+from dashboard_bridge import write_atomic
+from fills_analytics import FillsAnalytics, WINDOWS_MS
+
+# Store file path - Use environment variable for Railway Volume persistence
+_DATA_DIR = os.environ.get("DATA_VOLUME_PATH", os.path.join(os.path.dirname(__file__), "data"))
+FILLS_FILE = os.path.join(_DATA_DIR, "fills_store.json")
+
+HL_INFO_URL = "https://api.hyperliquid.xyz/info"
+SYNC_INTERVAL = 15      # Min seconds between syncs with Hyperliquid
+PAGE_SIZE_HL = 2000     # userFillsByTime returns at most 2000 fills per call
+MAX_SYNC_PAGES = 10     # Hyperliquid only serves the latest 10k fills anyway
+
+
+def _fill_key(fill: dict) -> Tuple[int, int]:
+    """Sort/cursor key: (time, tid)"""
+    return int(fill.get("time", 0)), int(fill.get("tid", 0) or 0)
+
+
+def _closed_pnl(fill: dict) -> float:
+    try:
+        return float(fill.get("closedPnl") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def encode_cursor(key: Tuple[int, int]) -> str:
+    return f"{key[0]}:{key[1]}"
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[int, int]]:
+    if not cursor:
+        return None
+    try:
+        t, tid = cursor.split(":", 1)
+        return int(t), int(tid)
+    except ValueError:
+        return None
+
+
+class _Index:
+    """Time-ordered fills with a parallel key list for bisect"""
+
+    __slots__ = ("keys", "fills")
+
+    def __init__(self):
+        self.keys: List[Tuple[int, int]] = []
+        self.fills: List[dict] = []
+
+    def add(self, key: Tuple[int, int], fill: dict):
+        if not self.keys or key > self.keys[-1]:
+            self.keys.append(key)
+            self.fills.append(fill)
+        else:
+            pos = bisect.bisect_left(self.keys, key)
+            self.keys.insert(pos, key)
+            self.fills.insert(pos, fill)
+
+    def page_before(self, cursor: Optional[Tuple[int, int]], limit: int) -> List[dict]:
+        """Newest-first page of fills strictly older than cursor"""
+        end = len(self.keys) if cursor is None else bisect.bisect_left(self.keys, cursor)
+        start = max(0, end - limit)
+        return self.fills[start:end][::-1]
+
+
+class FillsStore:
+    """
+    Local fills store for one wallet.
+
+    - sync() pulls only fills newer than the latest stored one (userFillsByTime)
+    - indexes: all fills, closing fills (closedPnl != 0), and both per coin
+    - aggregates: FillsAnalytics, updated once per new fill, keeps all-time and
+      24h/7d/30d totals per coin, so stats are reads instead of scans
+    """
+
+    def __init__(self, user: str, path: str = FILLS_FILE):
+        self.user = user
+        self.path = path
+        self.version = 0  # Bumped whenever new fills are added
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._last_sync = 0.0
+        self._seen = set()
+        self._indexes: Dict[Tuple[Optional[str], bool], _Index] = {}
+        self.analytics = FillsAnalytics()
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+                if data.get("user", "").lower() != self.user.lower():
+                    print("[FILLS] Store belongs to another wallet, starting fresh")
+                    return
+                self._add_fills(data.get("fills", []))
+                print(f"[FILLS] Loaded {self.analytics.count} fills from disk")
+        except Exception as e:
+            print(f"[FILLS][ERROR] Failed to load: {e}")
+
+    def _save(self):
+        try:
+            with self._lock:
+                payload = json.dumps({
+                    "user": self.user,
+                    "fills": self._index(None, False).fills
+                }).encode("utf-8")
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            write_atomic(self.path, payload)
+        except Exception as e:
+            print(f"[FILLS][ERROR] Failed to save: {e}")
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def _index(self, coin: Optional[str], closed_only: bool) -> _Index:
+        idx = self._indexes.get((coin, closed_only))
+        if idx is None:
+            idx = self._indexes[(coin, closed_only)] = _Index()
+        return idx
+
+    def _add_fills(self, fills: List[dict]) -> int:
+        """Insert new fills (deduplicated), updating indexes and aggregates. Returns count added."""
+        added = 0
+        with self._lock:
+            for fill in sorted(fills, key=_fill_key):
+                key = _fill_key(fill)
+                uid = (key[1], fill.get("hash"), key[0])
+                if uid in self._seen:
+                    continue
+                self._seen.add(uid)
+
+                coin = fill.get("coin", "")
+                self._index(None, False).add(key, fill)
+                self._index(coin, False).add(key, fill)
+                if _closed_pnl(fill) != 0:
+                    self._index(None, True).add(key, fill)
+                    self._index(coin, True).add(key, fill)
+                self.analytics.add_fill(fill)
+                added += 1
+
+            if added:
+                self.version += 1
+        return added
+
+    def _fetch_since(self, start_ms: int) -> List[dict]:
+        """Fetch fills with time >= start_ms, paging forward in 2000-fill chunks"""
+        fetched = []
+        for _ in range(MAX_SYNC_PAGES):
+            response = requests.post(
+                HL_INFO_URL,
+                json={"type": "userFillsByTime", "user": self.user, "startTime": start_ms},
+                timeout=10
+            )
+            response.raise_for_status()
+            batch = response.json() or []
+            fetched.extend(batch)
+            if len(batch) < PAGE_SIZE_HL:
+                break
+            start_ms = max(int(f.get("time", 0)) for f in batch)
+        return fetched
+
+    def sync(self, force: bool = False) -> int:
+        """
+        Pull fills newer than the latest stored one.
+
+        Throttled to once per SYNC_INTERVAL unless force=True. Concurrent callers
+        don't queue up: if a sync is already running they return immediately.
+
+        Returns:
+            Number of new fills added
+        """
+        if not self.user:
+            return 0
+        if not force and time.time() - self._last_sync < SYNC_INTERVAL:
+            return 0
+        if not self._sync_lock.acquire(blocking=False):
+            return 0
+        try:
+            with self._lock:
+                keys = self._index(None, False).keys
+                # Re-request the last millisecond: fills sharing it are deduplicated
+                start_ms = keys[-1][0] if keys else 0
+            added = self._add_fills(self._fetch_since(start_ms))
+            self._last_sync = time.time()
+            if added:
+                print(f"[FILLS] Synced {added} new fills ({self.analytics.count} total)")
+                self._save()
+            return added
+        except Exception as e:
+            print(f"[FILLS][ERROR] Sync failed: {e}")
+            return 0
+        finally:
+            self._sync_lock.release()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def page(self, coin: Optional[str] = None, closed_only: bool = False,
+             cursor: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+        """
+        Newest-first page of fills.
+
+        Args:
+            coin: Filter by coin (None = all)
+            closed_only: Only fills that realized PnL
+            cursor: next_cursor from the previous page (None = newest)
+            limit: Page size
+
+        Returns:
+            {"fills": [...], "next_cursor": str or None, "total": int}
+        """
+        with self._lock:
+            idx = self._indexes.get((coin, closed_only))
+            if idx is None:
+                return {"fills": [], "next_cursor": None, "total": 0}
+            fills = idx.page_before(decode_cursor(cursor), limit)
+            has_more = bool(fills) and _fill_key(fills[-1]) > idx.keys[0]
+            return {
+                "fills": fills,
+                "next_cursor": encode_cursor(_fill_key(fills[-1])) if has_more else None,
+                "total": len(idx.keys)
+            }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """All-time aggregates, 24h/7d/30d windows and the same windows per coin"""
+        windows = self.analytics.summary()
+        t = windows["all"]
+        trades = t["trades"]
+        return {
+            "total_fills": t["fills"],
+            "total_trades": trades,
+            "wins": t["wins"],
+            "losses": t["losses"],
+            "win_rate": t["win_rate"],
+            "profit_factor": t["profit_factor"] if t["profit_factor"] is not None else (1.0 if t["profit"] == 0 else 2.0),
+            "total_profit": t["profit"],
+            "total_loss": t["loss"],
+            "realized_pnl": t["pnl"],
+            "best_trade_pnl": t["best"] if trades else 0.0,
+            "worst_trade_pnl": t["worst"] if trades else 0.0,
+            "volume": t["volume"],
+            "fees": t["fees"],
+            "avg_duration_minutes": t["avg_duration_minutes"] or 0,
+            "windows": {name: windows[name] for name in WINDOWS_MS},
+            "by_coin": self.analytics.by_coin()
+        }
+
+
+# Singleton per wallet
+_stores: Dict[str, FillsStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_fills_store(user: str) -> FillsStore:
+    """Get (or create) the FillsStore for a wallet"""
+    with _stores_lock:
+        store = _stores.get(user)
+        if store is None:
+            store = _stores[user] = FillsStore(user)
+        return store
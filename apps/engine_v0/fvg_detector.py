@@ -133,7 +133,17 @@ def analyze_fvg_zones(candles: List[Dict], lookback: int = 50) -> Dict[str, Any]
     unfilled_bullish = [f for f in fvgs if f["type"] == "BULLISH" and not f["filled"]]
     unfilled_bearish = [f for f in fvgs if f["type"] == "BEARISH" and not f["filled"]]
     
-    # Find nearest FVGs
+    return {
+        "unfilled_bullish": unfilled_bullish,
+        "unfilled_bearish": unfilled_bearish,
+        **_nearest_fvgs(unfilled_bullish, unfilled_bearish, current_price),
+        "current_price": round(current_price, 2),
+        "total_fvgs": len(fvgs)
+    }
+
+
+def _nearest_fvgs(unfilled_bullish: List[Dict], unfilled_bearish: List[Dict], current_price: float) -> Dict[str, Any]:
+    """Nearest unfilled FVGs on each side of price"""
     nearest_bullish = None
     nearest_bearish = None
     
@@ -147,13 +157,28 @@ def analyze_fvg_zones(candles: List[Dict], lookback: int = 50) -> Dict[str, Any]
     if bear_above:
         nearest_bearish = min(bear_above, key=lambda x: x["gap_bottom"])
     
+    return {"nearest_bullish": nearest_bullish, "nearest_bearish": nearest_bearish}
+
+
+def refresh_fvg_zones(fvg_data: Dict[str, Any], candles: List[Dict]) -> Dict[str, Any]:
+    """
+    Update a cached result with the forming candle: drop zones it has filled and
+    re-derive the nearest zones for its close. Gap sizes stay as computed.
+    """
+    if fvg_data.get("current_price") is None or not candles:
+        return fvg_data
+    bar = candles[-1]
+    current_price = float(bar.get('c', bar.get('close', 0)))
+    bar_high = float(bar.get('h', bar.get('high', 0)))
+    bar_low = float(bar.get('l', bar.get('low', 0)))
+    unfilled_bullish = [f for f in fvg_data["unfilled_bullish"] if bar_low > f["gap_bottom"]]
+    unfilled_bearish = [f for f in fvg_data["unfilled_bearish"] if bar_high < f["gap_top"]]
     return {
+        **fvg_data,
         "unfilled_bullish": unfilled_bullish,
         "unfilled_bearish": unfilled_bearish,
-        "nearest_bullish": nearest_bullish,
-        "nearest_bearish": nearest_bearish,
-        "current_price": round(current_price, 2),
-        "total_fvgs": len(fvgs)
+        **_nearest_fvgs(unfilled_bullish, unfilled_bearish, current_price),
+        "current_price": round(current_price, 2)
     }
 
 
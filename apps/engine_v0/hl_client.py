@@ -15,7 +15,17 @@ from config import (
     HYPERLIQUID_PRIVATE_KEY,
     HYPERLIQUID_NETWORK,
     MAX_API_CONCURRENCY,
-    API_TIMEOUT_SECONDS
+    API_TIMEOUT_SECONDS,
+    CANDLE_ARCHIVE_ENABLED
+)
+from candle_archive import INTERVAL_MS, get_candle_archive
+from rate_limiter import (
+    PRIORITY_TRADE,
+    PRIORITY_ACCOUNT,
+    PRIORITY_MARKET,
+    info_weight,
+    exchange_weight,
+    get_rate_limiter
 )
 
 
@@ -61,9 +71,17 @@ def quantize_to_tick(price: float, tick_size: float, mode: str = "nearest") -> f
 class HLClient:
     """Hyperliquid client for read-only operations"""
     
-    def __init__(self):
-        """Initialize Hyperliquid clients"""
-        self.wallet_address = HYPERLIQUID_WALLET_ADDRESS
+    def __init__(self, info_client=None, exchange_client=None, wallet_address: Optional[str] = None,
+                 limiter=None):
+        """
+        Initialize Hyperliquid clients
+
+        Args:
+            info_client / exchange_client: Pre-built SDK clients (e.g. exchange_sim) instead of live ones
+            wallet_address: Account address for the injected clients
+            limiter: WeightLimiter (None = the process-wide one, rate_limiter.py)
+        """
+        self.wallet_address = wallet_address or HYPERLIQUID_WALLET_ADDRESS
         self.private_key = HYPERLIQUID_PRIVATE_KEY
         self.network = HYPERLIQUID_NETWORK
         
@@ -79,8 +97,8 @@ class HLClient:
         # Throttling Semaphore (Limit parallel API calls)
         self._api_semaphore = threading.Semaphore(MAX_API_CONCURRENCY)
         self._last_429_time = 0
-        self._last_request_time = 0
-        self._min_request_gap = 0.2  # 200ms gap between requests
+        # Request weight budget (Hyperliquid 1200/min per IP), trading actions first
+        self._limiter = limiter or get_rate_limiter()
         
         # Meta cache for symbol constraints
         self._meta_cache = None
@@ -110,8 +128,16 @@ class HLClient:
         self._funding_cache = {}
         self._funding_ttl = 60  # 1 min - funding rates stable
         
-        # Initialize clients
-        self._init_clients()
+        # Asset contexts for the whole universe (one metaAndAssetCtxs call): (data, timestamp)
+        self._asset_ctx_cache = None
+        self._asset_ctx_ttl = 30  # 30 sec - feeds the universe screener + funding info
+        
+        # Initialize clients (unless injected)
+        if info_client is not None:
+            self.info_client = info_client
+            self.exchange_client = exchange_client
+        else:
+            self._init_clients()
     
     def _init_clients(self):
         """Initialize Hyperliquid SDK clients with retry for rate limits"""
@@ -157,25 +183,66 @@ class HLClient:
                 print(f"[HL][ERROR] Failed to initialize clients: {e}")
                 traceback.print_exc()
                 return
-    def _wait_for_rate_limit(self):
-        """Enforce strict rate limiting between requests"""
+    def _wait_for_rate_limit(self, request_type: str = "info", priority: int = PRIORITY_MARKET,
+                             action: Optional[str] = None, batch_length: int = 1):
+        """
+        Wait for room in the request weight budget and charge this request
+        
+        Args:
+            request_type: Info request type ("l2Book", "candleSnapshot", ...) - sets the weight
+            priority: PRIORITY_TRADE / PRIORITY_ACCOUNT / PRIORITY_MARKET
+            action: "order" / "cancel" for exchange actions (weight 1 + batch_length // 40)
+            batch_length: Orders or cancels in the action
+        """
         try:
-            current_time = time.time()
-            time_since_last = current_time - self._last_request_time
-            
-            # If 429 received recently, wait longer
-            if current_time - self._last_429_time < 10:
-                time.sleep(1.0)
-            
-            # Enforce minimum gap
-            elif time_since_last < self._min_request_gap:
-                sleep_time = self._min_request_gap - time_since_last
-                time.sleep(sleep_time)
-            
-            self._last_request_time = time.time()
-            
+            weight = exchange_weight(batch_length) if action else info_weight(request_type)
+            waited = self._limiter.acquire(weight, priority, action)
+            if waited > 1:
+                print(f"[HL][RATE] waited {waited:.1f}s for {action or request_type} (budget {self._limiter.used():.0f}/{self._limiter.capacity:.0f})")
         except Exception:
             pass  # Ensure throttling never crashes the bot
+    
+    def _record_items(self, request_type: str, items: int):
+        """Charge the per-item surcharge once the response size is known"""
+        try:
+            self._limiter.record(info_weight(request_type, items) - info_weight(request_type))
+        except Exception:
+            pass
+    
+    def _record_429(self):
+        """Note a 429 (scoring_engine reads _last_429_time) and pause the limiter"""
+        self._last_429_time = time.time()
+        pause = self._limiter.on_429()
+        print(f"[HL][RATE] 429 received, pausing requests {pause:.0f}s")
+    
+    def sync_rate_limit(self, force: bool = False) -> Optional[dict]:
+        """
+        Refresh the address action budget from userRateLimit (every RATE_LIMIT_SYNC_SECONDS)
+        
+        Returns:
+            The userRateLimit response when a sync ran
+        """
+        if not self.info_client or not self.wallet_address or not (force or self._limiter.sync_due()):
+            return None
+        try:
+            self._wait_for_rate_limit("userRateLimit", PRIORITY_ACCOUNT)
+            response = self.info_client.user_rate_limit(self.wallet_address)
+            self._limiter.sync(response or {})
+            return response
+        except Exception as e:
+            if "429" in str(e):
+                self._record_429()
+            self._limiter.sync({})  # Retry on the next interval, not every call
+            print(f"[HL][WARN] user_rate_limit sync failed: {e}")
+            return None
+    
+    def get_rate_limit_stats(self) -> Dict[str, Any]:
+        """Limiter stats for /api/metrics"""
+        return self._limiter.stats()
+
+    def get_rate_limit_remaining(self) -> float:
+        """Market-data weight still available in the limiter's rolling minute"""
+        return self._limiter.remaining(PRIORITY_MARKET)
 
     def get_account_summary(self) -> Dict[str, Any]:
         """
@@ -193,12 +260,11 @@ class HLClient:
                     "positions_count": 0
                 }
             
-            # Backoff if we recently had a 429
-            if time.time() - self._last_429_time < 5:
-                time.sleep(1)
+            # Once per tick anyway - piggyback the periodic address budget sync
+            self.sync_rate_limit()
 
             with self._api_semaphore:
-                self._wait_for_rate_limit()
+                self._wait_for_rate_limit("clearinghouseState", PRIORITY_ACCOUNT)
                 # Get user state from Hyperliquid
                 user_state = self.info_client.user_state(self.wallet_address)
             
@@ -230,6 +296,8 @@ class HLClient:
             }
             
         except Exception as e:
+            if "429" in str(e):
+                self._record_429()
             print(f"[HL][ERROR] get_account_summary failed: {e}")
             traceback.print_exc()
             return {
@@ -239,23 +307,28 @@ class HLClient:
                 "positions_count": 0
             }
     
-    def get_positions(self) -> List[Dict[str, Any]]:
+    def get_positions(self, strict: bool = False) -> Optional[List[Dict[str, Any]]]:
         """
         Get simplified list of open positions
         
+        Args:
+            strict: Return None instead of [] when the read fails, so callers can
+                    tell "no positions" from "couldn't read positions"
+        
         Returns:
             list: [{coin, size, entry_price, unrealized_pnl}, ...]
         """
+        failed = None if strict else []
         try:
             if not self.info_client or not self.wallet_address:
-                return []
+                return failed
             
             with self._api_semaphore:
-                self._wait_for_rate_limit()
+                self._wait_for_rate_limit("clearinghouseState", PRIORITY_ACCOUNT)
                 user_state = self.info_client.user_state(self.wallet_address)
             
             if not user_state:
-                return []
+                return failed
             
             asset_positions = user_state.get("assetPositions", [])
             positions = []
@@ -284,9 +357,11 @@ class HLClient:
             return positions
             
         except Exception as e:
+            if "429" in str(e):
+                self._record_429()
             print(f"[HL][ERROR] get_positions failed: {e}")
             traceback.print_exc()
-            return []
+            return failed
     
     def get_last_price(self, symbol: str) -> Optional[float]:
         """
@@ -302,12 +377,8 @@ class HLClient:
             if not self.info_client:
                 return None
             
-            # Backoff if recently limited
-            if time.time() - self._last_429_time < 5:
-                time.sleep(0.5)
-
             with self._api_semaphore:
-                self._wait_for_rate_limit()
+                self._wait_for_rate_limit("allMids")
                 # Get all mid prices
                 all_mids = self.info_client.all_mids()
             
@@ -324,7 +395,7 @@ class HLClient:
             
         except Exception as e:
             if "429" in str(e):
-                self._last_429_time = time.time()
+                self._record_429()
             print(f"[HL][ERROR] get_last_price({symbol}) failed: {e}")
             traceback.print_exc()
             return None
@@ -345,7 +416,9 @@ class HLClient:
                 return prices
             
             # Get all mid prices at once (more efficient)
-            all_mids = self.info_client.all_mids()
+            with self._api_semaphore:
+                self._wait_for_rate_limit("allMids")
+                all_mids = self.info_client.all_mids()
             
             if not all_mids:
                 return prices
@@ -358,20 +431,27 @@ class HLClient:
             return prices
             
         except Exception as e:
+            if "429" in str(e):
+                self._record_429()
             print(f"[HL][ERROR] get_prices failed: {e}")
             traceback.print_exc()
             return prices
     
-    def get_positions_by_symbol(self) -> dict[str, dict]:
+    def get_positions_by_symbol(self, strict: bool = False) -> Optional[dict[str, dict]]:
         """
         Get positions mapped by symbol
         
+        Args:
+            strict: Return None instead of {} when the read fails (see get_positions)
+        
         Returns:
             dict: {symbol: {size, side, entry_price, unrealized_pnl, ...}}
         """
         positions_map = {}
         try:
-            positions = self.get_positions()
+            positions = self.get_positions(strict=strict)
+            if positions is None:
+                return None
             
             for pos in positions:
                 symbol = pos["coin"]
@@ -390,7 +470,7 @@ class HLClient:
         except Exception as e:
             print(f"[HL][ERROR] get_positions_by_symbol failed: {e}")
             traceback.print_exc()
-            return positions_map
+            return None if strict else positions_map
     
     def get_meta_cached(self, ttl_seconds: int = 300) -> Optional[dict]:
         """
@@ -414,6 +494,7 @@ class HLClient:
             if not self.info_client:
                 return None
             
+            self._wait_for_rate_limit("meta")
             meta = self.info_client.meta()
             
             if meta:
@@ -423,6 +504,8 @@ class HLClient:
             return meta
             
         except Exception as e:
+            if "429" in str(e):
+                self._record_429()
             print(f"[HL][ERROR] get_meta_cached failed: {e}")
             traceback.print_exc()
             return None
@@ -501,16 +584,19 @@ class HLClient:
             if not self.info_client or not self.wallet_address:
                 return []
             
-            self._wait_for_rate_limit()
+            self._wait_for_rate_limit("userFills", PRIORITY_ACCOUNT)
             user_fills = self.info_client.user_fills(self.wallet_address)
             
             if not user_fills:
                 return []
+            self._record_items("userFills", len(user_fills))
             
             # Return most recent fills
             return user_fills[:limit]
             
         except Exception as e:
+            if "429" in str(e):
+                self._record_429()
             print(f"[HL][ERROR] get_recent_fills failed: {e}")
             traceback.print_exc()
             return []
@@ -529,13 +615,15 @@ class HLClient:
                 return {"error": "No wallet address"}
             
             import httpx
-            self._wait_for_rate_limit()
+            self._wait_for_rate_limit("portfolio", PRIORITY_ACCOUNT)
             with httpx.Client(timeout=API_TIMEOUT_SECONDS) as client:
                 resp = client.post(
                     f"{self.api_url}/info",
                     json={"type": "portfolio", "user": self.wallet_address}
                 )
                 
+                if resp.status_code == 429:
+                    self._record_429()
                 if resp.status_code != 200:
                     print(f"[PNL][ERROR] Portfolio API returned {resp.status_code}")
                     return {"error": f"HTTP {resp.status_code}"}
@@ -584,19 +672,22 @@ class HLClient:
             print(f"[PNL][ERROR] get_portfolio_pnl failed: {e}")
             return {"error": str(e)}
     
-    def get_open_orders(self) -> list:
+    def get_open_orders(self, strict: bool = False) -> Optional[list]:
         """
         Get open orders (MCP-first: using info_client.open_orders)
         
+        Args:
+            strict: Return None instead of [] when the read fails (see get_positions)
+        
         Returns:
             list: Open orders with details
         """
         try:
             if not self.info_client or not self.wallet_address:
-                return []
+                return None if strict else []
             
             # Use MCP info_client.open_orders
-            self._wait_for_rate_limit()
+            self._wait_for_rate_limit("openOrders", PRIORITY_ACCOUNT)
             open_orders_response = self.info_client.open_orders(self.wallet_address)
             
             if not open_orders_response:
@@ -605,14 +696,18 @@ class HLClient:
             return open_orders_response
             
         except Exception as e:
+            if "429" in str(e):
+                self._record_429()
             print(f"[HL][ERROR] get_open_orders failed: {e}")
             traceback.print_exc()
-            return []
+            return None if strict else []
     
     def get_candles(self, symbol: str, interval: str, limit: int = 100) -> list:
         """
         Get historical candles with intelligent caching
         Cache TTL varies by timeframe: 1w/1d=5min, 4h/1h=2min, 15m/5m=30s, 1m=10s
+        Fetches are written through to the candle archive; on a memory-cache miss
+        a fresh archive is served directly and a stale one only fetches the tail.
         
         Args:
             symbol: Trading symbol
@@ -639,7 +734,26 @@ class HLClient:
                     # Cache hit!
                     return cached_data
             
-            # Cache miss or expired - fetch fresh data
+            # Cache miss or expired - try the on-disk archive before the API
+            now_ms = int(current_time * 1000)
+            interval_ms = INTERVAL_MS.get(interval, 60 * 1000)
+            start_ms = now_ms - (limit * interval_ms)
+            fetch_start_ms = start_ms
+            archive = None
+            if CANDLE_ARCHIVE_ENABLED:
+                archive = get_candle_archive()
+                written_at = archive.last_write_time(symbol, interval)
+                coverage = archive.coverage(symbol, interval)
+                covers_range = bool(coverage) and coverage[0] <= start_ms + interval_ms and coverage[1] >= start_ms
+                if covers_range and (current_time - written_at) < self._candle_ttl.get(interval, 60):
+                    # Warm restart: archive is as fresh as the memory cache would be
+                    candles = archive.load_candles(symbol, interval, start_ms)
+                    self._candles_cache[cache_key] = (candles, written_at)
+                    return candles
+                if covers_range:
+                    # Only fetch the tail (re-fetch the last archived bar, it may have been forming)
+                    fetch_start_ms = coverage[1]
+            
             # Detect signature once
             if not hasattr(self, '_candles_sig_detected'):
                 import inspect
@@ -648,27 +762,14 @@ class HLClient:
                 self._candles_sig_detected = True
                 print(f"[HL] candles_signature={self._candles_params}")
             
-            # Calculate time range
-            now_ms = int(current_time * 1000)
-            
-            interval_ms = {
-                "1m": 60 * 1000,
-                "5m": 5 * 60 * 1000,
-                "15m": 15 * 60 * 1000,
-                "1h": 60 * 60 * 1000,
-                "4h": 4 * 60 * 60 * 1000,
-                "1d": 24 * 60 * 60 * 1000,
-                "1w": 7 * 24 * 60 * 60 * 1000
-            }.get(interval, 60 * 1000)
-            
-            start_ms = now_ms - (limit * interval_ms)
-            
             # Try positional args first (most common)
             try:
                 with self._api_semaphore:
-                    self._wait_for_rate_limit()
-                    candles = self.info_client.candles_snapshot(symbol, interval, start_ms, now_ms)
+                    self._wait_for_rate_limit("candleSnapshot")
+                    candles = self.info_client.candles_snapshot(symbol, interval, fetch_start_ms, now_ms)
                 if candles:
+                    self._record_items("candleSnapshot", len(candles))
+                    candles = self._archive_candles(archive, symbol, interval, candles, start_ms)
                     # Cache the result
                     self._candles_cache[cache_key] = (candles, current_time)
                     print(f"[HL][CACHE] Stored {symbol} {interval} ({len(candles)} candles, TTL={self._candle_ttl.get(interval, 60)}s)")
@@ -677,19 +778,22 @@ class HLClient:
                 pass  # Try fallback
             except Exception as e:
                 if "429" in str(e):
-                    self._last_429_time = time.time()
+                    self._record_429()
                 raise e
             
             # Fallback: try with named params
             try:
-                self._wait_for_rate_limit()
-                candles = self.info_client.candles_snapshot(
-                    coin=symbol, 
-                    interval=interval, 
-                    startTime=start_ms, 
-                    endTime=now_ms
-                )
+                with self._api_semaphore:
+                    self._wait_for_rate_limit("candleSnapshot")
+                    candles = self.info_client.candles_snapshot(
+                        coin=symbol, 
+                        interval=interval, 
+                        startTime=fetch_start_ms, 
+                        endTime=now_ms
+                    )
                 if candles:
+                    self._record_items("candleSnapshot", len(candles))
+                    candles = self._archive_candles(archive, symbol, interval, candles, start_ms)
                     # Cache the result
                     self._candles_cache[cache_key] = (candles, current_time)
                     print(f"[HL][CACHE] Stored {symbol} {interval} ({len(candles)} candles, TTL={self._candle_ttl.get(interval, 60)}s)")
@@ -703,8 +807,25 @@ class HLClient:
             print(f"[HL][ERROR] get_candles({symbol}, {interval}) failed: {e}")
             return []
 
+    def _archive_candles(self, archive, symbol: str, interval: str, candles: list, start_ms: int) -> list:
+        """
+        Write fetched candles through to the on-disk archive.
+        
+        Returns the requested window (from start_ms) read back from the archive,
+        so a tail-only fetch still yields the full series. Falls back to the
+        fetched candles if the archive is disabled or fails.
+        """
+        if archive is None:
+            return candles
+        try:
+            archive.merge(symbol, interval, candles)
+            return archive.load_candles(symbol, interval, start_ms) or candles
+        except Exception as e:
+            print(f"[HL][WARN] candle archive write failed {symbol} {interval}: {e}")
+            return candles
+
     
-    def get_orderbook(self, symbol: str, depth: int = 10) -> dict:
+    def get_orderbook(self, symbol: str, depth: int = 10, fresh: bool = False) -> dict:
         """
         Get L2 orderbook snapshot with 15s caching
         Reduces API spam while keeping data reasonably fresh
@@ -712,6 +833,7 @@ class HLClient:
         Args:
             symbol: Trading symbol
             depth: Number of levels per side
+            fresh: Skip the cache (order slicing needs the live book)
         
         Returns:
             dict: Orderbook with bids, asks, spread, imbalance
@@ -724,14 +846,14 @@ class HLClient:
             current_time = time.time()
             
             # Check cache
-            if symbol in self._orderbook_cache:
+            if not fresh and symbol in self._orderbook_cache:
                 cached_data, cached_time = self._orderbook_cache[symbol]
                 if (current_time - cached_time) < self._orderbook_ttl:
                     return cached_data
             
             # Use MCP info_client.l2_snapshot
             with self._api_semaphore:
-                self._wait_for_rate_limit()
+                self._wait_for_rate_limit("l2Book")
                 snapshot = self.info_client.l2_snapshot(symbol)
             
             if not snapshot:
@@ -800,11 +922,75 @@ class HLClient:
             
         except Exception as e:
             if "429" in str(e):
-                self._last_429_time = time.time()
+                self._record_429()
             print(f"[HL][ERROR] get_orderbook({symbol}) failed: {e}")
             traceback.print_exc()
             return {}
     
+    def is_candles_cached(self, symbol: str, interval: str) -> bool:
+        """True if get_candles(symbol, interval) would be served from cache (no API weight)"""
+        cached = self._candles_cache.get((symbol, interval))
+        return bool(cached) and (time.time() - cached[1]) < self._candle_ttl.get(interval, 60)
+    
+    def is_orderbook_cached(self, symbol: str) -> bool:
+        """True if get_orderbook(symbol) would be served from cache"""
+        cached = self._orderbook_cache.get(symbol)
+        return bool(cached) and (time.time() - cached[1]) < self._orderbook_ttl
+    
+    def get_asset_contexts(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get asset contexts for every perp in a single metaAndAssetCtxs call (30s cache)
+        
+        Returns:
+            dict: {symbol: {mark_price, mid_price, prev_day_price, funding, open_interest,
+                            day_volume_usd, premium}}
+        """
+        try:
+            if not self.info_client:
+                return {}
+            
+            current_time = time.time()
+            if self._asset_ctx_cache and (current_time - self._asset_ctx_cache[1]) < self._asset_ctx_ttl:
+                return self._asset_ctx_cache[0]
+            
+            with self._api_semaphore:
+                self._wait_for_rate_limit("metaAndAssetCtxs")
+                meta_and_ctxs = self.info_client.meta_and_asset_ctxs()
+            
+            if not meta_and_ctxs or len(meta_and_ctxs) < 2:
+                return {}
+            
+            def _f(value):
+                try:
+                    return float(value) if value is not None else 0.0
+                except (TypeError, ValueError):
+                    return 0.0
+            
+            # Contexts are positional: ctxs[i] belongs to universe[i]
+            contexts = {}
+            for asset, ctx in zip(meta_and_ctxs[0].get("universe", []), meta_and_ctxs[1]):
+                name = asset.get("name")
+                if not name or asset.get("isDelisted"):
+                    continue
+                contexts[name] = {
+                    "mark_price": _f(ctx.get("markPx")),
+                    "mid_price": _f(ctx.get("midPx")),
+                    "prev_day_price": _f(ctx.get("prevDayPx")),
+                    "funding": _f(ctx.get("funding")),
+                    "open_interest": _f(ctx.get("openInterest")),
+                    "day_volume_usd": _f(ctx.get("dayNtlVlm")),
+                    "premium": _f(ctx.get("premium"))
+                }
+            
+            self._asset_ctx_cache = (contexts, current_time)
+            return contexts
+            
+        except Exception as e:
+            if "429" in str(e):
+                self._record_429()
+            print(f"[HL][ERROR] get_asset_contexts failed: {e}")
+            return self._asset_ctx_cache[0] if self._asset_ctx_cache else {}
+    
     def get_funding_info(self, symbol: str) -> dict:
         """
         Get funding rate and market info with 60s caching
@@ -829,38 +1015,22 @@ class HLClient:
                 if (current_time - cached_time) < self._funding_ttl:
                     return cached_data
             
-            # Fetch fresh data
-            self._wait_for_rate_limit()
-            meta_and_ctxs = self.info_client.meta_and_asset_ctxs()
-            
-            if not meta_and_ctxs:
+            # Served from the shared universe snapshot (asset contexts are positional,
+            # they carry no "coin" field, so look up by symbol name there)
+            ctx = self.get_asset_contexts().get(symbol)
+            if not ctx:
                 return {}
             
-            # Find symbol in contexts
-            for ctx in meta_and_ctxs[1]:  # Asset contexts
-                if ctx.get("coin") == symbol:
-                    funding_rate = float(ctx.get("funding", 0)) * 100  # Convert to %
-                    mark_price = float(ctx.get("markPx", 0))
-                    
-                    result = {
-                        "funding_rate": funding_rate,
-                        "mark_price": mark_price
-                    }
-                    
-                    # Add next funding time if available
-                    if "nextFundingTime" in ctx:
-                        result["next_funding_time"] = ctx["nextFundingTime"]
-                    
-                    # Add open interest if available
-                    if "openInterest" in ctx:
-                        result["open_interest"] = float(ctx["openInterest"])
-                    
-                    # Cache the result
-                    self._funding_cache[symbol] = (result, current_time)
-                    
-                    return result
+            result = {
+                "funding_rate": ctx["funding"] * 100,  # Convert to %
+                "mark_price": ctx["mark_price"],
+                "open_interest": ctx["open_interest"]
+            }
             
-            return {}
+            # Cache the result
+            self._funding_cache[symbol] = (result, current_time)
+            
+            return result
             
         except Exception as e:
             print(f"[HL][ERROR] get_funding_info({symbol}) failed: {e}")
@@ -876,8 +1046,11 @@ class HLClient:
             if not self.info_client or not self.wallet_address:
                 return {}
             
+            self._wait_for_rate_limit("clearinghouseState", PRIORITY_ACCOUNT)
             return self.info_client.user_state(self.wallet_address)
         except Exception as e:
+            if "429" in str(e):
+                self._record_429()
             print(f"[HL][ERROR] get_account_state failed: {e}")
             return {}
 
@@ -931,6 +1104,10 @@ class HLClient:
                 from config import ORDER_SLIPPAGE
                 slippage = ORDER_SLIPPAGE
             
+            # The SDK prices the IOC from allMids before sending the order
+            self._wait_for_rate_limit("allMids", PRIORITY_TRADE)
+            self._wait_for_rate_limit(priority=PRIORITY_TRADE, action="order")
+            
             # Use market_open for opening positions (SDK handles tick size)
             # Signature: market_open(name, is_buy, sz, px=None, slippage=0.05, cloid, builder)
             response = self.exchange_client.market_open(
@@ -944,10 +1121,53 @@ class HLClient:
             return response
             
         except Exception as e:
+            if "429" in str(e):
+                self._record_429()
             print(f"[HL][ERROR] place_market_order failed: {e}")
             traceback.print_exc()
             return {"status": "error", "response": str(e)}
     
+    def place_limit_order(self, symbol: str, is_buy: bool, size: float, price: float,
+                          tif: str = "Ioc", reduce_only: bool = False) -> dict:
+        """
+        Place a limit order (IOC by default - used for sliced entries)
+        
+        Args:
+            symbol: Trading symbol
+            is_buy: True for BUY, False for SELL
+            size: Order size
+            price: Limit price (must already be a valid tick, e.g. a book level)
+            tif: "Ioc", "Gtc" or "Alo"
+            reduce_only: If True, can only reduce position
+        
+        Returns:
+            dict: Exchange response
+        """
+        try:
+            if not self.exchange_client:
+                return {"status": "error", "response": "exchange_client not initialized"}
+            
+            self._wait_for_rate_limit(priority=PRIORITY_TRADE, action="order")
+            
+            # Signature: order(name, is_buy, sz, limit_px, order_type, reduce_only, cloid, builder)
+            response = self.exchange_client.order(
+                name=symbol,
+                is_buy=is_buy,
+                sz=float(size),
+                limit_px=float(price),
+                order_type={"limit": {"tif": tif}},
+                reduce_only=reduce_only
+            )
+            
+            return response
+            
+        except Exception as e:
+            if "429" in str(e):
+                self._record_429()
+            print(f"[HL][ERROR] place_limit_order failed: {e}")
+            traceback.print_exc()
+            return {"status": "error", "response": str(e)}
+    
     def close_position_market(self, symbol: str, size: float = None, slippage: float = None) -> dict:
         """
         Close position using SDK market_close
@@ -968,6 +1188,11 @@ class HLClient:
                 from config import ORDER_SLIPPAGE
                 slippage = ORDER_SLIPPAGE
             
+            # The SDK reads user_state (position size) and allMids (price) before sending
+            self._wait_for_rate_limit("clearinghouseState", PRIORITY_TRADE)
+            self._wait_for_rate_limit("allMids", PRIORITY_TRADE)
+            self._wait_for_rate_limit(priority=PRIORITY_TRADE, action="order")
+            
             # Signature: market_close(coin, sz=None, px=None, slippage=0.05, cloid, builder)
             response = self.exchange_client.market_close(
                 coin=symbol,
@@ -979,6 +1204,8 @@ class HLClient:
             return response
             
         except Exception as e:
+            if "429" in str(e):
+                self._record_429()
             print(f"[HL][ERROR] close_position_market failed: {e}")
             traceback.print_exc()
             return {"status": "error", "response": str(e)}
@@ -999,6 +1226,8 @@ class HLClient:
             if not self.exchange_client:
                 return {"status": "error", "response": "exchange_client not initialized"}
             
+            self._wait_for_rate_limit(priority=PRIORITY_TRADE, action="order")
+            
             # Signature: update_leverage(leverage, name, is_cross)
             response = self.exchange_client.update_leverage(
                 leverage=leverage,
@@ -1009,6 +1238,8 @@ class HLClient:
             return response
             
         except Exception as e:
+            if "429" in str(e):
+                self._record_429()
             print(f"[HL][ERROR] update_leverage failed: {e}")
             traceback.print_exc()
             return {"status": "error", "response": str(e)}
@@ -1082,6 +1313,7 @@ class HLClient:
                 }
             }
             
+            self._wait_for_rate_limit(priority=PRIORITY_TRADE, action="order")
             response = self.exchange_client.order(
                 name=symbol,
                 is_buy=is_buy,
@@ -1094,6 +1326,8 @@ class HLClient:
             return response
             
         except Exception as e:
+            if "429" in str(e):
+                self._record_429()
             print(f"[HL][ERROR] place_trigger_order failed: {e}")
             traceback.print_exc()
             return {"status": "error", "response": str(e)}
@@ -1125,6 +1359,7 @@ class HLClient:
             print(f"[HL] Canceling order symbol={symbol} oid={oid_int}")
             
             # SDK cancel signature: cancel(name, oid)
+            self._wait_for_rate_limit(priority=PRIORITY_TRADE, action="cancel")
             response = self.exchange_client.cancel(symbol, oid_int)
             
             # Check response status
@@ -1143,6 +1378,64 @@ class HLClient:
                 return True
                 
         except Exception as e:
+            if "429" in str(e):
+                self._record_429()
             print(f"[HL][ERROR] cancel_order({symbol}, {oid}) exception: {e}")
             traceback.print_exc()
             return False
+    
+    def bulk_cancel(self, cancels: list) -> dict:
+        """
+        Cancel several open orders in one signed batch action (one round trip)
+        
+        Args:
+            cancels: List of (symbol, oid) pairs
+            
+        Returns:
+            dict: {oid: True/False} per requested order (statuses come back in request order)
+        """
+        results = {}
+        cancel_requests = []
+        for symbol, oid in cancels:
+            try:
+                cancel_requests.append({"coin": symbol, "oid": int(oid)})
+            except (ValueError, TypeError):
+                print(f"[HL][ERROR] bulk_cancel - invalid OID format: {oid}")
+                results[oid] = False
+        
+        if not cancel_requests:
+            return results
+        
+        try:
+            if not self.exchange_client:
+                print("[HL][ERROR] bulk_cancel - exchange_client not initialized")
+                return {**results, **{r["oid"]: False for r in cancel_requests}}
+            
+            print(f"[HL] Canceling {len(cancel_requests)} orders in one batch")
+            
+            self._wait_for_rate_limit(priority=PRIORITY_TRADE, action="cancel", batch_length=len(cancel_requests))
+            response = self.exchange_client.bulk_cancel(cancel_requests)
+            
+            if isinstance(response, dict) and response.get("status") == "ok":
+                statuses = response.get("response", {}).get("data", {}).get("statuses", [])
+                for i, r in enumerate(cancel_requests):
+                    status = statuses[i] if i < len(statuses) else None
+                    ok = status == "success"
+                    results[r["oid"]] = ok
+                    if not ok:
+                        error = status.get("error") if isinstance(status, dict) else status
+                        print(f"[HL][FAIL] Cancel failed oid={r['oid']} error={error}")
+            else:
+                error_msg = response.get("response", "unknown_error") if isinstance(response, dict) else response
+                print(f"[HL][FAIL] Bulk cancel failed error={error_msg}")
+                results.update({r["oid"]: False for r in cancel_requests})
+            
+            return results
+            
+        except Exception as e:
+            if "429" in str(e):
+                self._record_429()
+            print(f"[HL][ERROR] bulk_cancel({len(cancel_requests)} orders) exception: {e}")
+            traceback.print_exc()
+            results.update({r["oid"]: False for r in cancel_requests})
+            return results
@@ -80,6 +80,26 @@ def calculate_htf_levels(candles_weekly: List[Dict], candles_monthly: List[Dict]
     return result
 
 
+def refresh_htf_levels(htf_data: Dict[str, Any], candles_weekly: List[Dict], candles_monthly: List[Dict]) -> Dict[str, Any]:
+    """Update a cached result with the forming week/month bars (previous bars unchanged)"""
+    result = dict(htf_data)
+    for key, candles in (("weekly", candles_weekly), ("monthly", candles_monthly)):
+        levels = htf_data.get(key)
+        if not levels or not candles:
+            continue
+        bar = candles[-1]
+        high = float(bar.get('h', bar.get('high', 0)))
+        low = float(bar.get('l', bar.get('low', 0)))
+        result[key] = {**levels, "current_high": high, "current_low": low}
+        if "range_high" in levels:
+            # The range includes the forming bar, whose high/low only extend
+            result[key]["range_high"] = max(levels["range_high"], high)
+            result[key]["range_low"] = min(levels["range_low"], low)
+    if htf_data.get("weekly") and candles_weekly:
+        result["current_price"] = float(candles_weekly[-1].get('c', candles_weekly[-1].get('close', 0)))
+    return result
+
+
 def format_htf_levels_for_prompt(symbol: str, htf_data: Dict) -> str:
     """Format HTF levels for LLM prompt"""
     if not htf_data:
@@ -306,6 +306,26 @@ def _format_recent_trades(recent_fills: list) -> str:
     return f"{summary}\n" + "\n".join(lines) if lines else "(no recent trades)"
 
 
+def _format_similar_setups(similar: dict) -> str:
+    """Format the closest past journal setups per symbol (empty when there are none)"""
+    if not similar:
+        return ""
+    
+    lines = ["SIMILAR PAST SETUPS (your closed trades with the closest entry conditions):"]
+    for symbol, data in similar.items():
+        summary = data.get("summary", {})
+        outcomes = []
+        for setup in data.get("setups", []):
+            if setup.get("pnl_pct") is None:
+                continue
+            exit_type = f" {setup['exit_type']}" if setup.get("exit_type") else ""
+            outcomes.append(f"{setup['symbol']} {setup['side']} {setup['pnl_pct']:+.1f}%{exit_type}")
+        lines.append(f"  {symbol}: {summary.get('wins', 0)}W/{summary.get('losses', 0)}L "
+                     f"avg {summary.get('avg_pnl_pct', 0):+.2f}% | {' '.join(outcomes)}")
+    
+    return "\n\n" + "\n".join(lines)
+
+
 def _get_session() -> str:
     """Get current trading session"""
     h = datetime.now(timezone.utc).hour
@@ -450,6 +470,7 @@ class LLMClient:
         # Trade history for learning
         recent_fills = state.get("recent_fills", [])
         trades_str = _format_recent_trades(recent_fills)
+        similar_str = _format_similar_setups(state.get("similar_setups", {}))
         
         # Symbol briefs
         briefs_lines = []
@@ -720,7 +741,7 @@ News: {news_str}
 {positions_str}
 
 # HISTORY
-{trades_str}
+{trades_str}{similar_str}
 
 # DECISION
 Analyze data. Return JSON ONLY.
@@ -0,0 +1,196 @@
+"""
+Loop Scheduler - Fixed-cadence main loop with fast and slow lanes
+Ticks are timed start-to-start (work time is subtracted from the wait), the
+idle part of each period runs the fast lane (positions, prices, stop checks),
+and slow-lane work is deferred or degraded when it no longer fits the budget.
+"""
+import time
+from typing import Dict, Any, Callable, Optional
+
+from config import FAST_LANE_SECONDS, SLOW_LANE_MAX_DEFER, VOLATILITY_TRIGGER_PCT
+
+RUN = "run"
+DEGRADE = "degrade"
+SKIP = "skip"
+
+
+class Lane:
+    """A slow-lane task with its own cadence and a running cost estimate"""
+
+    def __init__(self, name: str, every: float, max_defer: int = SLOW_LANE_MAX_DEFER):
+        self.name = name
+        self.every = every
+        self.max_defer = max_defer
+        self.last_run = 0.0
+        self.cost = 0.0  # EWMA of run time (seconds)
+        self.deferred = 0
+
+
+class LoopScheduler:
+    """
+    Deadline-aware scheduler for main().
+
+        sched.begin_tick(period)
+        if sched.lane_mode("vision") != SKIP: ...; sched.mark_ran("vision", seconds)
+        sched.wait(fast_lane)      # sleeps to start + period, running fast_lane meanwhile
+
+    A tick that overran its period makes the next one degraded: due slow lanes
+    are skipped (up to max_defer times in a row) and then run in degraded mode.
+    Missed deadlines are dropped rather than replayed back to back.
+    """
+
+    def __init__(self, fast_every: float = FAST_LANE_SECONDS,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.fast_every = fast_every
+        self.clock = clock
+        self.sleep = sleep
+        self.lanes: Dict[str, Lane] = {}
+        self.tick_start = clock()
+        self.period = 0.0
+        self.degraded = False
+        self.overruns = 0
+        self.last_work = 0.0
+        self._last_fast = 0.0
+
+    def add_lane(self, name: str, every: float, max_defer: int = SLOW_LANE_MAX_DEFER) -> Lane:
+        lane = self.lanes[name] = Lane(name, every, max_defer)
+        return lane
+
+    def begin_tick(self, period: float) -> None:
+        self.tick_start = self.clock()
+        self.period = period
+
+    @property
+    def deadline(self) -> float:
+        return self.tick_start + self.period
+
+    def remaining(self) -> float:
+        """Seconds left in this tick's budget"""
+        return self.deadline - self.clock()
+
+    def lane_mode(self, name: str) -> str:
+        """RUN, DEGRADE or SKIP for a slow lane this tick"""
+        lane = self.lanes[name]
+        now = self.clock()
+        if lane.last_run and now - lane.last_run < lane.every:
+            return SKIP
+        # Over budget: the last tick overran, or this lane would push the tick more
+        # than a whole period past its deadline
+        over_budget = self.degraded or (lane.cost and lane.cost > self.remaining() + self.period)
+        if not over_budget:
+            return RUN
+        if lane.last_run and lane.deferred < lane.max_defer:
+            lane.deferred += 1
+            print(f"[SCHED] {name} deferred ({lane.deferred}/{lane.max_defer}) est={lane.cost:.1f}s left={self.remaining():.1f}s")
+            return SKIP
+        return DEGRADE
+
+    def mark_ran(self, name: str, seconds: float, degraded: bool = False) -> None:
+        lane = self.lanes[name]
+        lane.last_run = self.clock()
+        lane.deferred = 0
+        if not degraded:
+            # Degraded runs are cheaper by design and would skew the estimate
+            lane.cost = seconds if not lane.cost else 0.7 * lane.cost + 0.3 * seconds
+
+    def wait(self, fast_lane: Optional[Callable[[], bool]] = None) -> float:
+        """
+        Sleep until this tick's deadline, running fast_lane every fast_every seconds.
+        fast_lane returning True ends the wait early (start the next tick now).
+
+        Returns:
+            Seconds slept
+        """
+        now = self.clock()
+        self.last_work = now - self.tick_start
+        overran = now >= self.deadline
+        if overran:
+            self.overruns += 1
+            print(f"[SCHED][WARN] tick overran budget: work={self.last_work:.1f}s period={self.period:.0f}s -> degrading next tick")
+        self.degraded = overran
+
+        slept = 0.0
+        while True:
+            now = self.clock()
+            left = self.deadline - now
+            if left <= 0:
+                break
+            if fast_lane and self.fast_every > 0 and now - self._last_fast >= self.fast_every:
+                self._last_fast = now
+                try:
+                    if fast_lane():
+                        print("[SCHED] fast lane requested an early tick")
+                        break
+                except Exception as e:
+                    print(f"[SCHED][WARN] fast lane failed: {e}")
+                continue
+            nap = left if not fast_lane or self.fast_every <= 0 else min(left, self._last_fast + self.fast_every - now)
+            if nap > 0:
+                self.sleep(nap)
+                slept += nap
+        return slept
+
+
+class FastLane:
+    """
+    Between slow ticks: refresh positions and prices, check stops.
+
+    Wakes the main loop early when a position opens/closes, a price moves more
+    than VOLATILITY_TRIGGER_PCT from the last tick, or the mark is already past
+    a position's stop (trigger missing or not fired).
+    """
+
+    def __init__(self, hl, volatility_pct: float = VOLATILITY_TRIGGER_PCT):
+        self.hl = hl
+        self.volatility_pct = volatility_pct
+        self.base_prices: Dict[str, float] = {}
+        self.positions: Dict[str, Dict[str, Any]] = {}
+        self.stops: Dict[str, Optional[float]] = {}
+        self.checks = 0
+        self._warned = set()
+
+    def sync(self, state: Dict[str, Any]) -> None:
+        """Take the slow tick's view as the reference"""
+        self.base_prices = dict(state.get("prices", {}))
+        self.positions = dict(state.get("positions", {}))
+        self.stops = {s: d.get("current_sl") for s, d in state.get("position_details", {}).items()}
+        self._warned = {s for s in self._warned if s in self.positions}
+
+    def __call__(self) -> bool:
+        if not self.hl:
+            return False
+        self.checks += 1
+        positions = self.hl.get_positions_by_symbol(strict=True)
+        if positions is None:
+            # Read failed: not evidence of a close, and an early tick would only hit the failing API harder
+            return False
+        if set(positions) != set(self.positions):
+            opened = set(positions) - set(self.positions)
+            closed = set(self.positions) - set(positions)
+            print(f"[FAST] positions changed opened={sorted(opened)} closed={sorted(closed)}")
+            return True
+
+        watch = list(dict.fromkeys(list(positions) + list(self.base_prices)))
+        prices = self.hl.get_prices(watch) if watch else {}
+        for symbol, price in prices.items():
+            base = self.base_prices.get(symbol)
+            if base and abs(price - base) / base * 100 >= self.volatility_pct:
+                print(f"[FAST] {symbol} moved {(price - base) / base * 100:+.2f}% since last tick")
+                return True
+
+        for symbol, pos in positions.items():
+            price = prices.get(symbol)
+            if not price:
+                continue
+            stop = self.stops.get(symbol)
+            if stop is None:
+                if symbol not in self._warned:
+                    self._warned.add(symbol)
+                    print(f"[FAST][WARN] {symbol} {pos.get('side')} has no stop loss")
+                continue
+            breached = price <= stop if pos.get("side") == "LONG" else price >= stop
+            if breached and symbol not in self._warned:
+                self._warned.add(symbol)
+                print(f"[FAST][WARN] {symbol} mark ${price:.4f} is past SL ${stop:.4f} with the position still open")
+                return True
+        return False
@@ -5,6 +5,7 @@ Trading bot engine with multi-symbol Hyperliquid integration and AI decisions
 import time
 import sys
 from datetime import datetime, timezone
+from typing import Optional, Tuple
 from config import (
     LOOP_INTERVAL_SECONDS,
     SYMBOL,
@@ -22,12 +23,24 @@ from config import (
     SNAPSHOT_TOP_N,
     SNAPSHOT_MODE,
     ROTATE_PER_TICK,
+    SCORING_ENGINE_ENABLED,
+    SCORING_TOP_N,
+    REPLAY_RECORD_DECISIONS,
+    REPLAY_RECORD_BOOKS,
+    VISION_LANE_SECONDS,
+    SIMILAR_SETUPS_K,
+    SIMILAR_SETUPS_SYMBOLS,
+    EXTERNAL_DATA_SECONDS,
+    ANALYSIS_POOL_ENABLED,
     print_config
 )
 from hl_client import HLClient
 from executor import execute
 from data_sources import get_all_external_data
 from reconciler import reconcile_open_trades  # v18.0: Reconcile passive exits
+from analysis_pipeline import TIMEFRAMES_CONFIG, build_market_vision, build_trigger_status, tag_actions, setup_snapshot
+from tick_profiler import get_tick_profiler
+from loop_scheduler import LoopScheduler, FastLane, RUN, DEGRADE, SKIP
 
 # v11.0: Telegram bot integration
 try:
@@ -36,6 +49,7 @@ try:
         update_telegram_state, 
         is_ai_enabled, 
         should_panic_close,
+        report_panic_result,
         get_test_trade_request,
         clear_test_trade_request,
         send_test_trade_result
@@ -54,6 +68,53 @@ except ImportError:
     print("[DASHBOARD][WARN] Dashboard API not available")
 
 
+def _close_error(resp) -> Optional[str]:
+    """Error of a market_close response, None if it went through (None response = nothing left to close)"""
+    if resp is None:
+        return None
+    if not isinstance(resp, dict) or resp.get("status") != "ok":
+        return str(resp.get("response") if isinstance(resp, dict) else resp)
+    for status in resp.get("response", {}).get("data", {}).get("statuses", []):
+        if isinstance(status, dict) and "error" in status:
+            return str(status["error"])
+    return None
+
+
+def panic_close_all(hl) -> Tuple[bool, str]:
+    """
+    Telegram /panic: cancel every open order in one batch, then close all positions.
+    
+    Returns:
+        (done, report): done is False if a read, cancel or close failed
+    """
+    done = True
+    lines = []
+    orders = hl.get_open_orders(strict=True)
+    if orders is None:
+        done = False
+        lines.append("Ordens: falha ao ler ordens abertas")
+    elif orders:
+        results = hl.bulk_cancel([(o.get("coin"), o.get("oid")) for o in orders])
+        canceled = sum(1 for ok in results.values() if ok)
+        done = done and canceled == len(orders)
+        lines.append(f"Ordens canceladas: {canceled}/{len(orders)}")
+    
+    positions = hl.get_positions_by_symbol(strict=True)
+    if positions is None:
+        done = False
+        lines.append("Posições: falha ao ler posições")
+    elif not positions:
+        lines.append("Nenhuma posição aberta")
+    for symbol in positions or {}:
+        error = _close_error(hl.close_position_market(symbol))
+        done = done and error is None
+        lines.append(f"Fechar {symbol}: {'ok' if error is None else error}")
+    
+    for line in lines:
+        print(f"[PANIC] {line}")
+    return done, "\n".join(lines)
+
+
 def main():
     """Main bot loop"""
     print("[BOOT] Engine V0 starting...")
@@ -84,6 +145,18 @@ def main():
         print(f"[BOOT][ERROR] Failed to initialize HLClient: {e}")
         print("[BOOT] Continuing without Hyperliquid connection...")
     
+    # Universe scoring engine (vectorized scoring over all perps)
+    universe_scanner = None
+    universe_screener = None
+    if hl and SCORING_ENGINE_ENABLED:
+        try:
+            from scoring_engine import UniverseScanner, UniverseScreener
+            universe_scanner = UniverseScanner(hl)
+            universe_screener = UniverseScreener()
+            print("[BOOT] Universe scoring engine enabled")
+        except Exception as e:
+            print(f"[SCORING][WARN] disabled: {e}")
+    
     # Initialize LLM client (lazy load to avoid crash)
     llm = None
     if AI_ENABLED:
@@ -127,17 +200,37 @@ def main():
     last_pos_count = 0  # v17.1: Track position count changes for triggers
     last_equity = 0.0  # Track equity changes
     rotate_offset = 0  # For ROTATE mode
-    last_external_fetch = 0  # For data_sources throttle
     external_data = {}
     last_ai_price = 0.0 # Track price for volatility trigger
     last_candle_hour = -1  # v16: Track last hour for candle close sync
 
     
+    # Per-stage tick timings (/api/metrics)
+    prof = get_tick_profiler()
+    
+    # Fixed-cadence ticks; vision and external data run as slow lanes, positions/prices/stops
+    # are checked in the fast lane while waiting for the next tick (loop_scheduler.py)
+    sched = LoopScheduler()
+    sched.add_lane("vision", VISION_LANE_SECONDS)
+    sched.add_lane("external", EXTERNAL_DATA_SECONDS)
+    fast_lane = FastLane(hl)
+    tick_period = LOOP_INTERVAL_SECONDS
+    last_vision = {}  # Vision sections reused on ticks where the lane is skipped
+    
+    # Advanced-tool cache misses in worker processes (analysis_pool.py)
+    analysis_pool = None
+    if ANALYSIS_POOL_ENABLED:
+        from analysis_pool import get_analysis_pool
+        analysis_pool = get_analysis_pool()
+        print(f"[POOL] Advanced analysis pool enabled ({analysis_pool.max_workers} workers)")
+    
     try:
         while True:
             iteration += 1
             current_time = time.time()
             print(f"\n[LOOP] tick {iteration}")
+            prof.start_tick()
+            sched.begin_tick(tick_period)
             
             # Determine snapshot symbols based on mode
             if SNAPSHOT_MODE == "ALL":
@@ -162,11 +255,20 @@ def main():
                 "live_trading": LIVE_TRADING
             }
             
+            # Panic close requested from Telegram (AI is already switched off)
+            if TELEGRAM_AVAILABLE and hl and LIVE_TRADING and should_panic_close():
+                try:
+                    report_panic_result(*panic_close_all(hl))
+                except Exception as e:
+                    print(f"[PANIC][ERROR] Panic close failed: {e}")
+                    report_panic_result(False, f"Erro: {e}")
+            
             # BLOCO 1 + 3.5: Hyperliquid integration with multi-symbol
             if hl and snapshot_symbols:
                 try:
                     # Get account summary
-                    summary = hl.get_account_summary()
+                    with prof.span("account"):
+                        summary = hl.get_account_summary()
                     state["equity"] = summary["equity"]
                     last_equity = summary["equity"]  # Keep track for fallbacks
                     state["positions_count"] = summary["positions_count"]
@@ -179,11 +281,13 @@ def main():
                         print(f"[PNL][WARN] Failed to save snapshot: {e}")
                     
                     # Get positions by symbol
-                    positions_by_symbol = hl.get_positions_by_symbol()
+                    with prof.span("positions"):
+                        positions_by_symbol = hl.get_positions_by_symbol()
                     state["positions"] = positions_by_symbol
                     
                     # Get prices for snapshot symbols
-                    prices = hl.get_prices(snapshot_symbols)
+                    with prof.span("prices"):
+                        prices = hl.get_prices(snapshot_symbols)
                     state["prices"] = prices
                     state["available_margin"] = summary["available"]  # Free collateral
                     
@@ -196,102 +300,36 @@ def main():
                     
                     # Get constraints for snapshot symbols
                     constraints_by_symbol = {}
-                    for sym in snapshot_symbols:
-                        constraints_by_symbol[sym] = hl.get_symbol_constraints(sym)
+                    with prof.span("constraints"):
+                        for sym in snapshot_symbols:
+                            constraints_by_symbol[sym] = hl.get_symbol_constraints(sym)
                     state["constraints_by_symbol"] = constraints_by_symbol
                     
                     # Get recent fills
-                    recent_fills = hl.get_recent_fills(limit=10)
+                    with prof.span("fills"):
+                        recent_fills = hl.get_recent_fills(limit=10)
                     state["recent_fills"] = recent_fills
                     
                     # v18.0: RECONCILIATION - Check for passive exits (SL/TP)
                     try:
                         from trade_journal import get_journal
-                        reconcile_open_trades(hl, get_journal())
+                        with prof.span("reconcile"):
+                            reconcile_open_trades(hl, get_journal())
                     except Exception as e:
                         print(f"[RECONCILE][WARN] Failed: {e}")
                     
                     # Get open orders (MCP-first)
-                    open_orders = hl.get_open_orders()
+                    with prof.span("open_orders"):
+                        open_orders = hl.get_open_orders()
                     state["open_orders"] = open_orders
                     state["open_orders_count"] = len(open_orders)
                     
-                    # Group open orders by symbol
-                    open_orders_by_symbol = {}
-                    for order in open_orders:
-                        coin = order.get("coin", "")
-                        if coin not in open_orders_by_symbol:
-                            open_orders_by_symbol[coin] = []
-                        open_orders_by_symbol[coin].append(order)
-                    state["open_orders_by_symbol"] = open_orders_by_symbol
-                    
-                    # Build trigger status for each position
-                    trigger_status_lines = []
-                    
-                    for pos_symbol, pos_data in positions_by_symbol.items():
-                        symbol_orders = open_orders_by_symbol.get(pos_symbol, [])
-                        has_sl = False
-                        has_tp = False
-                        sl_price = None
-                        tp_price = None
-                        
-                        entry_px = pos_data.get("entry_price", 0)
-                        mark_px = state.get("prices", {}).get(pos_symbol, entry_px)
-                        pos_side = pos_data.get("side", "LONG")
-                        pnl_pct = pos_data.get("unrealized_pnl_pct", 0)
-                        
-                        # Calculate PnL % if not provided
-                        if entry_px > 0 and mark_px > 0 and pnl_pct == 0:
-                            if pos_side == "LONG":
-                                pnl_pct = ((mark_px - entry_px) / entry_px) * 100
-                            else:
-                                pnl_pct = ((entry_px - mark_px) / entry_px) * 100
-                        
-                        for order in symbol_orders:
-                            if order.get("reduceOnly"):
-                                trigger_px = order.get("triggerPx") or order.get("trigger_px") or order.get("limitPx")
-                                if trigger_px:
-                                    trigger_px = float(trigger_px)
-                                    
-                                    # FIX: Determine if SL or TP based on trigger vs MARK price
-                                    # BE SL can be ABOVE entry (with offset), so use mark price for comparison
-                                    # For LONG: SL triggers when price DROPS to trigger_px
-                                    # For SHORT: SL triggers when price RISES to trigger_px
-                                    if pos_side == "LONG":
-                                        # For LONG, if trigger is at or below current mark - it's a SL
-                                        # (includes BE SL which is slightly above entry)
-                                        if trigger_px <= mark_px or trigger_px < entry_px * 1.005:  # 0.5% tolerance
-                                            has_sl = True
-                                            sl_price = trigger_px
-                                        else:
-                                            has_tp = True
-                                            tp_price = trigger_px
-                                    else:  # SHORT
-                                        # For SHORT, if trigger is at or above current mark - it's a SL
-                                        if trigger_px >= mark_px or trigger_px > entry_px * 0.995:  # 0.5% tolerance
-                                            has_sl = True
-                                            sl_price = trigger_px
-                                        else:
-                                            has_tp = True
-                                            tp_price = trigger_px
-                        
-                        # Build simple status line
-                        sl_str = f"SL=${sl_price:.2f}" if has_sl else "SL=None"
-                        tp_str = f"TP=${tp_price:.2f}" if has_tp else "TP=None"
-                        trigger_status_lines.append(f"  - {pos_symbol}: {sl_str} | {tp_str} | PnL={pnl_pct:.2f}%")
-                        
-                        # Store position info for LLM context
-                        if "position_details" not in state:
-                            state["position_details"] = {}
-                        state["position_details"][pos_symbol] = {
-                            "pnl_pct": pnl_pct,
-                            "entry_price": entry_px,
-                            "current_sl": sl_price,
-                            "current_tp": tp_price,
-                            "side": pos_side
-                        }
-                    
-                    state["trigger_status"] = "\n".join(trigger_status_lines) if trigger_status_lines else "(no positions)"
+                    # Group open orders by symbol + SL/TP status for each position
+                    trigger_info = build_trigger_status(positions_by_symbol, open_orders, state.get("prices", {}))
+                    state["open_orders_by_symbol"] = trigger_info["open_orders_by_symbol"]
+                    if trigger_info["position_details"]:
+                        state["position_details"] = trigger_info["position_details"]
+                    state["trigger_status"] = trigger_info["trigger_status"]
 
                     
                     # Add feedback (rejects, errors, successes)
@@ -303,325 +341,141 @@ def main():
                     state["last_successes"] = feedback.get_recent_successes(limit=10)
                     
                     # MARKET VISION: Candles + Indicators + Orderbook (Anti-Fantasy)
-                    # Resilient to import errors - graceful degradation
-                    try:
-                        from indicators import calculate_indicators
-                        indicators_available = True
-                    except ImportError as e:
-                        print(f"[VISION][WARN] indicators disabled: {e}")
-                        indicators_available = False
-                    except Exception as e:
-                        print(f"[VISION][WARN] indicators import failed: {e}")
-                        indicators_available = False
-                    
-                    # v19.0: Advanced analysis tools imports
-                    try:
-                        from fibonacci import calculate_fibonacci_levels
-                        from fvg_detector import analyze_fvg_zones
-                        from htf_levels import calculate_htf_levels
-                        from session_levels import calculate_session_levels
-                        from candle_patterns import detect_candle_patterns
-                        from pivot_points import calculate_pivot_points
-                        advanced_tools_available = True
-                    except ImportError as e:
-                        print(f"[VISION][WARN] advanced tools disabled: {e}")
-                        advanced_tools_available = False
-                    
-                    try:
-                        # v12.0: Multi-symbol candles with 7 timeframes (micro to macro)
-                        candles_by_symbol = {}
-                        indicators_by_symbol = {}
-                        
-                        # v17: Optimized timeframes for H4 swing trading (removed 1m/5m noise)
-                        # v17.3: Added Monthly for macro regime identification
-                        TIMEFRAMES_CONFIG = {
-                            "15m": 60,  # 15 hours - entry precision
-                            "1h": 60,   # 2.5 days - swing structure
-                            "4h": 60,   # 10 days - intermediate trend
-                            "1d": 90,   # 3 months - primary trend
-                            "1w": 52,   # 1 year - macro context
-                            "1M": 24    # 2 years - regime/cycle
-                        }
-                        
-                        # v14.0: Optimized scan (Limit 4 symbols, priority to active positions, request spacing)
-                        active_symbols = list(positions_by_symbol.keys())
-                        scan_candidates = []
+                    # Slow lane: runs on its own cadence, degraded (no funnel/advanced tools) when over budget
+                    vision_mode = sched.lane_mode("vision")
+                    if vision_mode == SKIP:
+                        state.update(last_vision)
+                    else:
+                        vision_started = time.time()
+                        keys_before = set(state)
+                        try:
+                            # v12.0: Multi-symbol candles with 7 timeframes (micro to macro)
+                            from scoring_engine import (
+                                briefs_from_indicators, top_briefs, rank_candidates, select_deep_scan,
+                                WEIGHT_INFO, WEIGHT_CANDLES
+                            )
                         
-                        # Add active positions first
-                        for s in active_symbols:
-                            if s in snapshot_symbols and s not in scan_candidates:
-                                scan_candidates.append(s)
+                            # v14.0: Optimized scan (priority to active positions, request spacing)
+                            active_symbols = list(positions_by_symbol.keys())
+                            scan_candidates = []
                         
-                        # v17: Fill remaining slots with top snapshot symbols (limit 2 total for cost)
-                        for s in snapshot_symbols:
-                            if len(scan_candidates) >= 2:
-                                break
-                            if s not in scan_candidates:
-                                scan_candidates.append(s)
-                                
-                        print(f"[VISION] Scanning {len(scan_candidates)} symbols: {scan_candidates}")
-
-                        for symbol in scan_candidates:
-                            candles_by_symbol[symbol] = {}
-                            
-                            # Fetch all timeframes
-                            for tf, limit in TIMEFRAMES_CONFIG.items():
+                            # Funnel stage 1: cheap screen of the whole universe from one asset-context snapshot
+                            universe_screen = {}
+                            spent_weight = 0
+                            if universe_screener and vision_mode == RUN:
                                 try:
-                                    # Request spacing to prevent 429
-                                    time.sleep(0.1) 
-                                    candles = hl.get_candles(symbol, tf, limit=limit)
-                                    candles_by_symbol[symbol][tf] = candles if candles else []
+                                    with prof.span("scoring"):
+                                        universe_screen = universe_screener.screen(hl.get_asset_contexts())
+                                    spent_weight += WEIGHT_INFO
                                 except Exception as e:
-                                    print(f"[VISION][WARN] Failed to get {tf} candles for {symbol}: {e}")
-                                    candles_by_symbol[symbol][tf] = []
-                            
-                            # Calculate indicators from 15m if available
-                            symbol_15m = candles_by_symbol[symbol].get("15m", [])
-                            if indicators_available and symbol_15m:
+                                    print(f"[FUNNEL][WARN] screener failed: {e}")
+                        
+                            # Technical score for the whole universe (candles refreshed for the best screened first)
+                            universe_briefs = {}
+                            if universe_scanner and vision_mode == RUN:
                                 try:
-                                    indicators_by_symbol[symbol] = calculate_indicators(symbol_15m)
+                                    with prof.span("scoring"):
+                                        universe_briefs = universe_scanner.scan(priority=active_symbols + list(universe_screen)[:SCORING_TOP_N])
+                                    spent_weight += universe_scanner.last_fetch_count * WEIGHT_CANDLES
                                 except Exception as e:
-                                    print(f"[VISION][WARN] indicators calc failed for {symbol}: {e}")
-                                    indicators_by_symbol[symbol] = {}
-                            else:
-                                indicators_by_symbol[symbol] = {}
-                        
-                        state["candles_by_symbol"] = candles_by_symbol
-                        state["indicators_by_symbol"] = indicators_by_symbol
+                                    print(f"[SCORING][WARN] universe scan failed: {e}")
                         
-                        # Orderbook for scan candidates
-                        orderbook_by_symbol = {}
-                        for symbol in scan_candidates:
-                            time.sleep(0.1)
-                            orderbook_by_symbol[symbol] = hl.get_orderbook(symbol, depth=5)
-                        state["orderbook_by_symbol"] = orderbook_by_symbol
-                        
-                        # Funding info for scan candidates
-                        funding_by_symbol = {}
-                        for symbol in scan_candidates:
-                            time.sleep(0.1)
-                            funding_by_symbol[symbol] = hl.get_funding_info(symbol)
-                        state["funding_by_symbol"] = funding_by_symbol
+                            if universe_screen or universe_briefs:
+                                # Funnel stage 2: deep scan the top K, K sized to the remaining weight budget
+                                ranked = rank_candidates(universe_screen, universe_briefs)
+                                scan_candidates, budget_left = select_deep_scan(
+                                    hl, ranked + snapshot_symbols, TIMEFRAMES_CONFIG, active_symbols, spent_weight
+                                )
+                                print(f"[FUNNEL] screened={len(universe_screen)} deep_scan={len(scan_candidates)} budget_left={budget_left}")
+                            else:
+                                # Fallback: positions first, then the first snapshot symbols (limit 2 total for cost)
+                                for s in active_symbols:
+                                    if s in snapshot_symbols and s not in scan_candidates:
+                                        scan_candidates.append(s)
+                                for s in snapshot_symbols:
+                                    if len(scan_candidates) >= 2:
+                                        break
+                                    if s not in scan_candidates:
+                                        scan_candidates.append(s)
                         
-                        # v19.0: Calculate Fibonacci and FVG for scan candidates
-                        if advanced_tools_available:
-                            fibonacci_by_symbol = {}
-                            fvg_by_symbol = {}
-                            
-                            for symbol in scan_candidates:
-                                symbol_candles = candles_by_symbol.get(symbol, {})
-                                
-                                # Use 4h candles for Fibonacci (best for swing trading)
-                                candles_4h = symbol_candles.get("4h", [])
-                                if candles_4h:
-                                    fibonacci_by_symbol[symbol] = calculate_fibonacci_levels(candles_4h)
+                            state["universe_screen"] = dict(list(universe_screen.items())[:SCORING_TOP_N])
                                 
-                                # Use 1h candles for FVG (more recent gaps)
-                                candles_1h = symbol_candles.get("1h", [])
-                                if candles_1h:
-                                    fvg_by_symbol[symbol] = analyze_fvg_zones(candles_1h)
-                            
-                            state["fibonacci_by_symbol"] = fibonacci_by_symbol
-                            state["fvg_by_symbol"] = fvg_by_symbol
-                            
-                            # v19.1: Additional advanced tools
-                            htf_levels_by_symbol = {}
-                            session_levels_by_symbol = {}
-                            patterns_by_symbol = {}
-                            pivots_by_symbol = {}
-                            
+                            print(f"[VISION] Scanning {len(scan_candidates)} symbols: {scan_candidates}")
+
+                            # Candles, indicators, orderbook, funding and v19 advanced tools (analysis_pipeline.py)
+                            vision_timings = {}
+                            state.update(build_market_vision(hl, scan_candidates, TIMEFRAMES_CONFIG, timings=vision_timings,
+                                                             advanced=vision_mode == RUN, pool=analysis_pool))
+                            prof.record_many(vision_timings)
+                            indicators_by_symbol = state["indicators_by_symbol"]
+                            if REPLAY_RECORD_BOOKS:
+                                from replay import record_event
+                                record_event("books", state["orderbook_by_symbol"])
+                        
+                            # v11.0: BUILD REAL SYMBOL BRIEFS WITH VARIED SCORING
+                            # Scan candidates use their full indicator set; every other symbol takes
+                            # the universe engine's score instead of the "no data" default
                             for symbol in scan_candidates:
-                                symbol_candles = candles_by_symbol.get(symbol, {})
-                                
-                                # HTF Levels (Weekly/Monthly highs/lows)
-                                weekly_candles = symbol_candles.get("1w", [])
-                                monthly_candles = symbol_candles.get("1M", [])
-                                if weekly_candles or monthly_candles:
-                                    htf_levels_by_symbol[symbol] = calculate_htf_levels(weekly_candles, monthly_candles)
-                                
-                                # Session Levels (Asia/London/NY)
-                                candles_1h = symbol_candles.get("1h", [])
-                                if candles_1h:
-                                    session_levels_by_symbol[symbol] = calculate_session_levels(candles_1h)
-                                
-                                # Candle Patterns (from 4H for swing trading)
-                                candles_4h = symbol_candles.get("4h", [])
-                                if candles_4h:
-                                    patterns_by_symbol[symbol] = detect_candle_patterns(candles_4h)
-                                
-                                # Pivot Points (Daily and Weekly)
-                                candles_1d = symbol_candles.get("1d", [])
-                                if candles_1d:
-                                    pivots_by_symbol[symbol] = {
-                                        "daily": calculate_pivot_points(candles_1d, "daily"),
-                                        "weekly": calculate_pivot_points(weekly_candles, "weekly") if weekly_candles else {}
-                                    }
-                            
-                            state["htf_levels_by_symbol"] = htf_levels_by_symbol
-                            state["session_levels_by_symbol"] = session_levels_by_symbol
-                            state["patterns_by_symbol"] = patterns_by_symbol
-                            state["pivots_by_symbol"] = pivots_by_symbol
-                            
-                            print(f"[VISION] Calculated all advanced tools for {len(scan_candidates)} symbols")
+                                if symbol not in state["prices"] and symbol in universe_briefs:
+                                    state["prices"][symbol] = universe_briefs[symbol]["price"]
+                            brief_symbols = list(dict.fromkeys(snapshot_symbols + scan_candidates))
+                            symbol_briefs = briefs_from_indicators(brief_symbols, state["prices"], indicators_by_symbol)
+                            top_universe = top_briefs(universe_briefs, SCORING_TOP_N)
+                            for symbol, brief in universe_briefs.items():
+                                if symbol in symbol_briefs:
+                                    if symbol_briefs[symbol]["trend"] == "UNKNOWN":
+                                        symbol_briefs[symbol] = brief
+                                elif symbol in top_universe:
+                                    symbol_briefs[symbol] = brief
                         
-                        # v11.0: BUILD REAL SYMBOL BRIEFS WITH VARIED SCORING
-                        symbol_briefs = {}
-                        for symbol in snapshot_symbols:
-                            price = state["prices"].get(symbol, 0)
-                            ind = indicators_by_symbol.get(symbol, {})
-                            
-                            # Get real indicator values (correct keys from indicators.py)
-                            ema_9 = ind.get("ema_9", 0)
-                            ema_21 = ind.get("ema_21", 0)
-                            ema_50 = ind.get("ema_50", 0)
-                            rsi = ind.get("rsi_14", 50)  # FIX: was "rsi", should be "rsi_14"
-                            macd_hist = ind.get("macd_hist", 0)
-                            atr_pct = ind.get("atr_pct", 0)
-                            trend_str = ind.get("trend", "neutral")
-                            relative_volume = ind.get("relative_volume", 1.0)
-                            
-                            # Multi-factor scoring (0-100)
-                            score = 50  # Base score
-                            reasons = []
-                            
-                            if price > 0 and ema_21 > 0:
-                                # Factor 1: EMA alignment (+/- 15 points)
-                                if ema_9 > ema_21 > ema_50:
-                                    score += 15
-                                    trend = "UP_STRONG"
-                                    reasons.append("EMA aligned bullish")
-                                elif ema_9 > ema_21:
-                                    score += 8
-                                    trend = "UP"
-                                    reasons.append("EMA9>21")
-                                elif ema_9 < ema_21 < ema_50:
-                                    score += 15  # Good for shorts too
-                                    trend = "DOWN_STRONG"
-                                    reasons.append("EMA aligned bearish")
-                                elif ema_9 < ema_21:
-                                    score += 8
-                                    trend = "DOWN"
-                                    reasons.append("EMA9<21")
-                                else:
-                                    trend = "RANGE"
-                                    reasons.append("Consolidating")
-                                
-                                # Factor 2: RSI - NEUTRAL scoring (just note extreme values)
-                                # v13.0: No penalty for overbought/oversold - AI decides if it's opportunity or risk
-                                if rsi > 70:
-                                    score += 5  # Extreme = interesting, not penalty
-                                    reasons.append("RSI>70")
-                                elif rsi > 60:
-                                    score += 5
-                                    reasons.append("RSI bullish")
-                                elif rsi < 30:
-                                    score += 5  # Extreme = interesting, not penalty
-                                    reasons.append("RSI<30")
-                                elif rsi < 40:
-                                    score += 5
-                                    reasons.append("RSI bearish")
-                                else:
-                                    score += 0  # Neutral zone
-                                
-                                # Factor 3: MACD confirmation
-                                # v14.0: Context-aware MACD - Differentiate Reversal vs Pullback
-                                if macd_hist > 0 and trend in ["UP", "UP_STRONG"]:
-                                    score += 10
-                                    reasons.append("MACD+")
-                                elif macd_hist < 0 and trend in ["DOWN", "DOWN_STRONG"]:
-                                    score += 10
-                                    reasons.append("MACD-")
-                                # PULLBACK LOGIC: Strong trend + opposing MACD = Pullback Opportunity (Not Divergence)
-                                elif macd_hist < 0 and trend == "UP_STRONG":
-                                    score += 8  # High score for bullish pullback
-                                    reasons.append("Bullish Pullback")
-                                elif macd_hist > 0 and trend == "DOWN_STRONG":
-                                    score += 8  # High score for bearish pullback
-                                    reasons.append("Bearish Pullback")
-                                else:
-                                    score += 0  # weak or unclear divergence
-                                    reasons.append("Building")
-                                
-                                # Factor 4: Volume boost (+10 for high volume - more interesting)
-                                if relative_volume > 1.5:
-                                    score += 10
-                                    reasons.append("high vol")
-                                elif relative_volume > 1.2:
-                                    score += 5
-                                    reasons.append("vol+")
-                                
-                                # Factor 5: Volatility - HIGH ATR = more opportunity, not penalty
-                                # v13.0: AI decides if volatility is good or bad
-                                if atr_pct > 3.0:
-                                    score += 5
-                                    reasons.append("volatile")
-                                
-                                # Factor 6: Micro-conviction variance (prevents flat scores)
-                                # RSI distance from 50 (normalized to range -2 to +2)
-                                score += abs(rsi - 50) * 0.05  # Further from 50 = more interesting
-
-                                # Clamp score
-                                score = max(0, min(100, score))
-                                momentum = "STRONG" if rsi > 60 or rsi < 40 else "NEUTRAL"
-                            else:
-                                trend = "UNKNOWN"
-                                momentum = "UNKNOWN"
-                                score = 25  # Unknown gets low score, not 50
-                                reasons.append("no data")
-                            
-                            symbol_briefs[symbol] = {
-                                "price": round(price, 2) if price < 1000 else round(price, 0),
-                                "trend": trend,
-                                "momentum": momentum,
-                                "rsi": round(rsi, 1),
-                                "score": round(score, 1),
-                                "reason": " + ".join(reasons[:2]) if reasons else ""
+                            state["market"] = {
+                                "macro": external_data.get("macro", {}),
+                                "btc_dominance": external_data.get("market", {}).get("btc_dominance", 0),
+                                "fear_greed": external_data.get("fear_greed", {}).get("value", 50),
+                                "market_cap": external_data.get("market", {}).get("market_cap", 0),
+                                "top_symbols": list(universe_briefs.keys())[:8] if universe_briefs else [s for s in snapshot_symbols[:8]]
                             }
                         
-                        state["market"] = {
-                            "macro": external_data.get("macro", {}),
-                            "btc_dominance": external_data.get("market", {}).get("btc_dominance", 0),
-                            "fear_greed": external_data.get("fear_greed", {}).get("value", 50),
-                            "market_cap": external_data.get("market", {}).get("market_cap", 0),
-                            "top_symbols": [s for s in snapshot_symbols[:8]]
-                        }
-                        
-                        state["symbol_briefs"] = symbol_briefs
+                            state["symbol_briefs"] = symbol_briefs
                         
-                        # v11.0: PROOF LOG with varied scores
-                        top_symbols = sorted(symbol_briefs.items(), key=lambda x: x[1].get("score", 50), reverse=True)[:5]
-                        bottom_symbols = sorted(symbol_briefs.items(), key=lambda x: x[1].get("score", 50))[:3]
-                        top_str = " ".join([f"{s}:{int(b.get('score', 50))}" for s, b in top_symbols])
-                        bottom_str = " ".join([f"{s}:{int(b.get('score', 50))}" for s, b in bottom_symbols])
+                            # v11.0: PROOF LOG with varied scores
+                            top_symbols = sorted(symbol_briefs.items(), key=lambda x: x[1].get("score", 50), reverse=True)[:5]
+                            bottom_symbols = sorted(symbol_briefs.items(), key=lambda x: x[1].get("score", 50))[:3]
+                            top_str = " ".join([f"{s}:{int(b.get('score', 50))}" for s, b in top_symbols])
+                            bottom_str = " ".join([f"{s}:{int(b.get('score', 50))}" for s, b in bottom_symbols])
                         
-                        # Check for flat scores warning
-                        all_scores = [b["score"] for b in symbol_briefs.values()]
-                        scores_flat = len(set(all_scores)) <= 2
+                            # Check for flat scores warning
+                            all_scores = [b["score"] for b in symbol_briefs.values()]
+                            scores_flat = len(set(all_scores)) <= 2
                         
-                        if scores_flat:
-                            print(f"[SCAN][WARN] scores_flat detected -> check indicator pipeline")
-                            print(f"[SCAN][DEBUG] All scores: {all_scores}")
-                            if symbols:
-                                first_sym = symbols[0]
-                                first_brief = symbol_briefs.get(first_sym, {})
-                                print(f"[SCAN][DEBUG] {first_sym} detail: RSI={first_brief.get('rsi', '?')}, trend={first_brief.get('trend', '?')}, price=${first_brief.get('price', 0):.2f}")
-                        print(f"[SCAN] top5=[{top_str}] bottom3=[{bottom_str}]")
+                            if scores_flat:
+                                print(f"[SCAN][WARN] scores_flat detected -> check indicator pipeline")
+                                print(f"[SCAN][DEBUG] All scores: {all_scores}")
+                                if symbols:
+                                    first_sym = symbols[0]
+                                    first_brief = symbol_briefs.get(first_sym, {})
+                                    print(f"[SCAN][DEBUG] {first_sym} detail: RSI={first_brief.get('rsi', '?')}, trend={first_brief.get('trend', '?')}, price=${first_brief.get('price', 0):.2f}")
+                            print(f"[SCAN] top5=[{top_str}] bottom3=[{bottom_str}]")
 
                         
-                    except Exception as e:
-                        print(f"[VISION][ERROR] market data failed: {e}")
-                        import traceback
-                        traceback.print_exc()
-                        # Continue without vision data - don't crash
+                        except Exception as e:
+                            print(f"[VISION][ERROR] market data failed: {e}")
+                            import traceback
+                            traceback.print_exc()
+                            # Continue without vision data - don't crash
+                        last_vision = {k: v for k, v in state.items() if k not in keys_before}
+                        sched.mark_ran("vision", time.time() - vision_started, degraded=vision_mode == DEGRADE)
                     
-                    # v12.7: Fetch external data (F&G, News, Macro) - Throttle to 5 mins
-                    if current_time - last_external_fetch > 300:
+                    # v12.7: Fetch external data (F&G, News, Macro) - slow lane, every EXTERNAL_DATA_SECONDS
+                    if sched.lane_mode("external") != SKIP:
+                        external_started = time.time()
                         try:
                             print("[DATA] Fetching external market data (F&G, Macro, News)...")
-                            external_data = get_all_external_data()
-                            last_external_fetch = current_time
+                            with prof.span("external"):
+                                external_data = get_all_external_data()
                         except Exception as e:
                             print(f"[DATA][ERROR] Failed to fetch external data: {e}")
+                        sched.mark_ran("external", time.time() - external_started)
                     
                     state["market_data"] = external_data
                     
@@ -633,7 +487,8 @@ def main():
                     
                     # v11.0: Sync state to Telegram
                     if TELEGRAM_AVAILABLE:
-                        update_telegram_state(state)
+                        with prof.span("telegram"):
+                            update_telegram_state(state)
                     
                     # v12.6: Sync state to Dashboard API
                     if dashboard_api:
@@ -661,22 +516,23 @@ def main():
                             top_syms = [s for s, b in sorted(state.get("symbol_briefs", {}).items(), 
                                                               key=lambda x: x[1].get("score", 0), reverse=True)[:5]]
                             
-                            update_dashboard_state({
-                                "account": {
-                                    "equity": summary["equity"],
-                                    "balance": summary.get("balance", summary["equity"]),
-                                    "buying_power": state.get("buying_power", 0),
-                                    "positions_count": summary["positions_count"]
-                                },
-                                "positions": dashboard_positions,
-                                "market": {
-                                    "fear_greed": external_data.get("fear_greed", {}).get("value"),
-                                    "btc_dominance": external_data.get("market", {}).get("btc_dominance", 0),
-                                    "top_symbols": top_syms,
-                                    "macro": external_data.get("macro", {}),
-                                    "news": external_data.get("news", [])[:5]
-                                }
-                            })
+                            with prof.span("dashboard"):
+                                update_dashboard_state({
+                                    "account": {
+                                        "equity": summary["equity"],
+                                        "balance": summary.get("balance", summary["equity"]),
+                                        "buying_power": state.get("buying_power", 0),
+                                        "positions_count": summary["positions_count"]
+                                    },
+                                    "positions": dashboard_positions,
+                                    "market": {
+                                        "fear_greed": external_data.get("fear_greed", {}).get("value"),
+                                        "btc_dominance": external_data.get("market", {}).get("btc_dominance", 0),
+                                        "top_symbols": top_syms,
+                                        "macro": external_data.get("macro", {}),
+                                        "news": external_data.get("news", [])[:5]
+                                    }
+                                })
                         except Exception as e:
                             pass  # Silent fail for dashboard
 
@@ -767,8 +623,28 @@ def main():
                     
                     if should_call_ai:
                         try:
+                            # Closest past setups of the best analyzed symbols (journal kNN)
+                            if SIMILAR_SETUPS_K > 0:
+                                try:
+                                    from trade_journal import get_similar_setups_for_ai
+                                    briefs = state.get("symbol_briefs", {})
+                                    analyzed = sorted(state.get("indicators_by_symbol", {}),
+                                                      key=lambda s: briefs.get(s, {}).get("score", 0), reverse=True)
+                                    with prof.span("similar_setups"):
+                                        state["similar_setups"] = get_similar_setups_for_ai(
+                                            {s: setup_snapshot(state, s) for s in analyzed[:SIMILAR_SETUPS_SYMBOLS]},
+                                            k=SIMILAR_SETUPS_K)
+                                except Exception as e:
+                                    print(f"[JOURNAL][WARN] Similar setups failed: {e}")
+                            
                             # Get AI decision
-                            decision = llm.decide(state)
+                            with prof.span("llm"):
+                                decision = llm.decide(state)
+                            
+                            # Keep the raw decision so replay.py can re-run it offline
+                            if REPLAY_RECORD_DECISIONS:
+                                from replay import record_event
+                                record_event("decisions", decision)
                             
                             # Store last decision with timestamp for Telegram
                             # Store last decision with timestamp for Telegram
@@ -801,39 +677,11 @@ def main():
                             # Execute actions from LLM
                             actions = decision.get("actions", [])
                             if actions:
-                                # Tag all actions as coming from LLM
-                                for action in actions:
-                                    action["source"] = "LLM"
-                                    
-                                    # INJECT MARKET DATA FOR TRADE JOURNAL
-                                    sym = action.get("symbol")
-                                    if sym:
-                                        # 1. Indicators
-                                        inds = state.get("indicators_by_symbol", {}).get(sym, {})
-                                        action["_rsi"] = inds.get("rsi_14", 50)
-                                        action["_trend"] = inds.get("trend", "UNKNOWN")
-                                        action["_bos"] = inds.get("bos_status", "UNKNOWN") # check key in executor (it expects _bos)
-                                        action["_choch"] = inds.get("choch_detected", False)
-                                        action["_atr_pct"] = inds.get("atr_pct", 0)
-                                        action["_relative_volume"] = inds.get("relative_volume", 1.0)
-                                        
-                                        # 2. Funding/OI
-                                        funding = state.get("funding_by_symbol", {}).get(sym, {})
-                                        if isinstance(funding, dict):
-                                            # HL API usually returns string values
-                                            try:
-                                                action["_funding_rate"] = float(funding.get("fundingRate", 0))
-                                                action["_open_interest"] = float(funding.get("openInterest", 0))
-                                            except:
-                                                pass
-                                    
-                                    # 3. Decision Context
-                                    if "reason" not in action:
-                                        action["reason"] = decision.get("summary", "AI Decision")
-                                    if "confidence" not in action:
-                                        action["confidence"] = decision.get("confidence", 0)
+                                # Tag all actions as coming from LLM (+ market data for the trade journal)
+                                tag_actions(actions, decision, state)
 
-                                execute(actions, live_trading=LIVE_TRADING, hl_client=hl)
+                                with prof.span("execute"):
+                                    execute(actions, live_trading=LIVE_TRADING, hl_client=hl)
                             
                             # Log actions to dashboard
                             if dashboard_api:
@@ -949,26 +797,33 @@ def main():
                             "leverage": int(pos.get("leverage", 1)),
                         })
                     
-                    update_dashboard_state({
-                        "account": {
-                            "equity": state.get("equity", 0),
-                            "buying_power": state.get("available_margin", 0),  # Real Available Margin
-                            "positions_count": len(state.get("positions", {}))
-                        },
-                        "positions": formatted_positions,
-                        "market": state.get("market", {})
-                    })
+                    with prof.span("dashboard"):
+                        update_dashboard_state({
+                            "account": {
+                                "equity": state.get("equity", 0),
+                                "buying_power": state.get("available_margin", 0),  # Real Available Margin
+                                "positions_count": len(state.get("positions", {}))
+                            },
+                            "positions": formatted_positions,
+                            "market": state.get("market", {}),
+                            "tick_metrics": prof.summary(),  # Up to the previous tick
+                            "rate_limit": hl.get_rate_limit_stats() if hl else {}
+                        })
                 except Exception as e:
                     print(f"[DASHBOARD][ERROR] {e}")
             
             # Smart Sleep: Dynamic interval based on activity
             # Does NOT increase AI costs (AI interval is separate), but improves local risk management
-            sleep_time = LOOP_INTERVAL_SECONDS
+            tick_period = LOOP_INTERVAL_SECONDS
             if state.get("positions_count", 0) > 0:
-                sleep_time = max(5, LOOP_INTERVAL_SECONDS // 2)
+                tick_period = max(5, LOOP_INTERVAL_SECONDS // 2)
+            sched.period = tick_period  # Cadence is start-to-start: work time comes out of the wait
                 
-            print(f"[LOOP] Sleeping {sleep_time}s... (Positions: {state.get('positions_count', 0)})")
-            time.sleep(sleep_time)
+            prof.end_tick()
+            print(f"[LOOP] tick {iteration} {prof.log_line()}")
+            print(f"[LOOP] Next tick in {max(0, sched.remaining()):.1f}s (period {tick_period}s, Positions: {state.get('positions_count', 0)})")
+            fast_lane.sync(state)
+            sched.wait(fast_lane)
             
     except KeyboardInterrupt:
         print("\n[SHUTDOWN] Received interrupt signal")
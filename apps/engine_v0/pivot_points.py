@@ -57,18 +57,7 @@ def calculate_pivot_points(candles: List[Dict], period: str = "daily") -> Dict[s
         s3 = low - 2 * (high - pivot)
         
         # Determine current price position
-        if current_price > r2:
-            position = "ABOVE_R2"
-        elif current_price > r1:
-            position = "ABOVE_R1"
-        elif current_price > pivot:
-            position = "ABOVE_PIVOT"
-        elif current_price > s1:
-            position = "BELOW_PIVOT"
-        elif current_price > s2:
-            position = "BELOW_S1"
-        else:
-            position = "BELOW_S2"
+        position = _pivot_position(current_price, pivot, r1, r2, s1, s2)
         
         return {
             "period": period,
@@ -88,6 +77,32 @@ def calculate_pivot_points(candles: List[Dict], period: str = "daily") -> Dict[s
         return {}
 
 
+def _pivot_position(current_price: float, pivot: float, r1: float, r2: float, s1: float, s2: float) -> str:
+    """Bucket of the current price among the pivot levels"""
+    if current_price > r2:
+        return "ABOVE_R2"
+    elif current_price > r1:
+        return "ABOVE_R1"
+    elif current_price > pivot:
+        return "ABOVE_PIVOT"
+    elif current_price > s1:
+        return "BELOW_PIVOT"
+    elif current_price > s2:
+        return "BELOW_S1"
+    return "BELOW_S2"
+
+
+def refresh_pivot_price(pivots: Dict[str, Any], current_price: float) -> Dict[str, Any]:
+    """Re-derive the position of a cached pivot result for the current price"""
+    if not pivots or "pivot" not in pivots:
+        return pivots
+    return {
+        **pivots,
+        "current_price": round(current_price, 2),
+        "position": _pivot_position(current_price, pivots["pivot"], pivots["r1"], pivots["r2"], pivots["s1"], pivots["s2"])
+    }
+
+
 def format_pivots_for_prompt(symbol: str, daily_pivots: Dict, weekly_pivots: Dict) -> str:
     """Format pivot points for LLM prompt"""
     lines = []
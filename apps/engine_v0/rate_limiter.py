@@ -0,0 +1,388 @@
+"""
+Rate Limiter - Hyperliquid request weight budget for HLClient
+Tracks the rolling per-minute REST weight (info and exchange requests share the
+1200/min per-IP budget), keeps a reserve that only orders/cancels may use, and
+follows the address-based action budget reported by userRateLimit.
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Callable, Tuple
+
+from config import (
+    RATE_LIMIT_WEIGHT_PER_MINUTE,
+    RATE_LIMIT_HEADROOM_PCT,
+    RATE_LIMIT_TRADE_RESERVE_PCT,
+    RATE_LIMIT_SYNC_SECONDS
+)
+
+# Info request weights (Hyperliquid docs: 2 for the light ones, 20 for everything else)
+INFO_WEIGHTS = {
+    "l2Book": 2,
+    "allMids": 2,
+    "clearinghouseState": 2,
+    "orderStatus": 2,
+    "spotClearinghouseState": 2,
+    "exchangeStatus": 2,
+    "userRole": 60
+}
+DEFAULT_INFO_WEIGHT = 20
+
+# Extra weight per N items in the response
+ITEM_WEIGHT_PER = {
+    "candleSnapshot": 60,
+    "userFills": 20,
+    "userFillsByTime": 20,
+    "historicalOrders": 20,
+    "recentTrades": 20,
+    "fundingHistory": 20,
+    "userFunding": 20,
+    "twapHistory": 20
+}
+
+# Priorities (lower wins): trading actions are never queued behind reads
+PRIORITY_TRADE = 0    # Orders, cancels, leverage
+PRIORITY_ACCOUNT = 1  # Positions, open orders, fills
+PRIORITY_MARKET = 2   # Candles, books, mids, meta
+PRIORITY_NAMES = {PRIORITY_TRADE: "trade", PRIORITY_ACCOUNT: "account", PRIORITY_MARKET: "market"}
+
+ADDRESS_LIMITED_GAP = 10.0  # Seconds between actions once the address budget is spent
+WINDOW_SECONDS = 60.0
+_POLL = 0.25  # Re-check interval while a higher priority is waiting
+
+
+def info_weight(request_type: str, items: int = 0) -> int:
+    """Weight of an info request (items = length of the response for the per-item surcharge)"""
+    weight = INFO_WEIGHTS.get(request_type, DEFAULT_INFO_WEIGHT)
+    per = ITEM_WEIGHT_PER.get(request_type)
+    return weight + (items // per if per and items else 0)
+
+
+def exchange_weight(batch_length: int = 1) -> int:
+    """Weight of an exchange action (1 + 1 per 40 orders/cancels in a batch)"""
+    return 1 + batch_length // 40
+
+
+class WeightLimiter:
+    """
+    Rolling-window weight budget.
+
+        limiter.acquire(info_weight("l2Book"), PRIORITY_MARKET)   # blocks until it fits
+        snapshot = info.l2_snapshot("BTC")
+        limiter.record(info_weight("candleSnapshot", len(candles)) - info_weight("candleSnapshot"))
+
+    Market reads may fill the budget up to (capacity - reserve), account reads up
+    to (capacity - reserve / 2), trading actions up to capacity. While a higher
+    priority is waiting, lower priorities hold back. A 429 pauses everything with
+    exponential backoff (our view of the IP budget was wrong).
+    weight_per_minute=0 disables waiting (stats only).
+    """
+
+    def __init__(self, weight_per_minute: int = RATE_LIMIT_WEIGHT_PER_MINUTE,
+                 headroom_pct: float = RATE_LIMIT_HEADROOM_PCT,
+                 trade_reserve_pct: float = RATE_LIMIT_TRADE_RESERVE_PCT,
+                 sync_seconds: float = RATE_LIMIT_SYNC_SECONDS,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.weight_per_minute = weight_per_minute
+        self.capacity = weight_per_minute * (1 - headroom_pct / 100)
+        reserve = weight_per_minute * trade_reserve_pct / 100
+        self._ceilings = {
+            PRIORITY_TRADE: self.capacity,
+            PRIORITY_ACCOUNT: self.capacity - reserve / 2,
+            PRIORITY_MARKET: self.capacity - reserve
+        }
+        self.sync_seconds = sync_seconds
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._events = deque()  # (time, weight) inside the window
+        self._used = 0.0
+        self._waiting = {p: 0 for p in PRIORITY_NAMES}
+        self._blocked_until = 0.0
+        self._backoff = 0.0
+        self._last_429 = 0.0
+        # Address-based action budget (userRateLimit)
+        self.actions_used: Optional[int] = None
+        self.actions_cap: Optional[int] = None
+        self._last_action = 0.0
+        self.last_sync: Optional[float] = None
+        # Stats
+        self.rate_limited = 0
+        self._stats = {p: {"requests": 0, "weight": 0, "waits": 0, "wait_s": 0.0} for p in PRIORITY_NAMES}
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - WINDOW_SECONDS
+        while self._events and self._events[0][0] <= cutoff:
+            self._used -= self._events.popleft()[1]
+
+    def _delay(self, weight: int, priority: int, action: Optional[str], now: float) -> Tuple[float, bool]:
+        """(seconds until this request may go, whether it is waiting on the weight budget)"""
+        if now < self._blocked_until:
+            return self._blocked_until - now, False
+        if action and self.actions_cap is not None:
+            cap = self.actions_cap if action != "cancel" else min(self.actions_cap + 100000, self.actions_cap * 2)
+            if self.actions_used >= cap and now - self._last_action < ADDRESS_LIMITED_GAP:
+                return self._last_action + ADDRESS_LIMITED_GAP - now, False
+        if any(self._waiting[p] for p in PRIORITY_NAMES if p < priority):
+            return _POLL, False
+        ceiling = self._ceilings[priority]
+        if self._used + weight <= ceiling or not self._events:
+            return 0.0, False
+        # Wait for enough of the oldest weight to leave the window
+        need = self._used + weight - ceiling
+        freed = 0.0
+        for t, w in self._events:
+            freed += w
+            if freed >= need:
+                return max(0.0, t + WINDOW_SECONDS - now), True
+        return WINDOW_SECONDS, True
+
+    def acquire(self, weight: int, priority: int = PRIORITY_MARKET, action: Optional[str] = None) -> float:
+        """
+        Block until the request fits the budget, then charge it.
+
+        Args:
+            weight: Request weight (info_weight / exchange_weight)
+            priority: PRIORITY_TRADE / PRIORITY_ACCOUNT / PRIORITY_MARKET
+            action: "order" or "cancel" for exchange actions (address budget)
+
+        Returns:
+            Seconds waited
+        """
+        waited = 0.0
+        queued = False  # Counted in _waiting (holds back lower priorities) while short of budget
+        try:
+            while True:
+                with self._lock:
+                    now = self.clock()
+                    self._expire(now)
+                    delay, budget = self._delay(weight, priority, action, now) if self.weight_per_minute else (0.0, False)
+                    if delay <= 0:
+                        self._charge(weight, now)
+                        break
+                    if budget and not queued:
+                        self._waiting[priority] += 1
+                        queued = True
+                self.sleep(delay)
+                waited += delay
+        finally:
+            if queued:
+                with self._lock:
+                    self._waiting[priority] -= 1
+
+        with self._lock:
+            stats = self._stats[priority]
+            stats["requests"] += 1
+            stats["weight"] += weight
+            if waited:
+                stats["waits"] += 1
+                stats["wait_s"] += waited
+            if action:
+                self._last_action = self.clock()
+                if self.actions_used is not None:
+                    self.actions_used += 1
+        return waited
+
+    def _charge(self, weight: float, now: float) -> None:
+        if weight:
+            self._events.append((now, weight))
+            self._used += weight
+
+    def record(self, weight: float) -> None:
+        """Charge weight known only after the response (per-item surcharges)"""
+        if weight > 0:
+            with self._lock:
+                self._charge(weight, self.clock())
+
+    def on_429(self) -> float:
+        """A request was rate limited: pause all traffic. Returns the pause in seconds."""
+        with self._lock:
+            now = self.clock()
+            if now - self._last_429 > WINDOW_SECONDS:
+                self._backoff = 0.0
+            self._backoff = min(30.0, max(1.0, self._backoff * 2))
+            self._last_429 = now
+            self._blocked_until = now + self._backoff
+            self.rate_limited += 1
+            return self._backoff
+
+    def sync_due(self) -> bool:
+        return self.sync_seconds > 0 and (self.last_sync is None or self.clock() - self.last_sync >= self.sync_seconds)
+
+    def sync(self, user_rate_limit: Dict[str, Any]) -> None:
+        """Adopt the address budget from an info.user_rate_limit() response ({} = just mark the attempt)"""
+        with self._lock:
+            self.last_sync = self.clock()
+            try:
+                if "nRequestsCap" in user_rate_limit:
+                    self.actions_used = int(user_rate_limit.get("nRequestsUsed", 0))
+                    self.actions_cap = int(user_rate_limit["nRequestsCap"])
+            except (TypeError, ValueError):
+                pass
+
+    def used(self) -> float:
+        """Weight charged in the last minute"""
+        with self._lock:
+            self._expire(self.clock())
+            return self._used
+
+    def remaining(self, priority: int = PRIORITY_MARKET) -> float:
+        """Weight a request of this priority could still spend right now without waiting (inf if disabled)"""
+        if not self.weight_per_minute:
+            return float("inf")
+        with self._lock:
+            now = self.clock()
+            if now < self._blocked_until:
+                return 0.0
+            self._expire(now)
+            return max(0.0, self._ceilings[priority] - self._used)
+
+    def stats(self) -> Dict[str, Any]:
+        used = self.used()
+        with self._lock:
+            return {
+                "window_weight": round(used, 1),
+                "capacity": round(self.capacity, 1),
+                "utilization": round(used / self.capacity, 3) if self.capacity else 0,
+                "rate_limited": self.rate_limited,
+                "backoff_s": round(max(0.0, self._blocked_until - self.clock()), 2),
+                "address_budget": {"used": self.actions_used, "cap": self.actions_cap},
+                "by_priority": {
+                    PRIORITY_NAMES[p]: {**s, "wait_s": round(s["wait_s"], 3)} for p, s in self._stats.items()
+                }
+            }
+
+
+def render_prometheus(stats: Dict[str, Any]) -> str:
+    """Prometheus gauges/counters from WeightLimiter.stats() output"""
+    lines = [
+        "# HELP hl_rate_limit_window_weight Request weight charged in the last minute",
+        "# TYPE hl_rate_limit_window_weight gauge",
+        f"hl_rate_limit_window_weight {stats.get('window_weight', 0)}",
+        "# HELP hl_rate_limit_capacity Usable request weight per minute",
+        "# TYPE hl_rate_limit_capacity gauge",
+        f"hl_rate_limit_capacity {stats.get('capacity', 0)}",
+        "# HELP hl_rate_limited_total Requests rejected with 429",
+        "# TYPE hl_rate_limited_total counter",
+        f"hl_rate_limited_total {stats.get('rate_limited', 0)}",
+        "# HELP hl_rate_limit_wait_seconds_total Time spent waiting for budget",
+        "# TYPE hl_rate_limit_wait_seconds_total counter"
+    ]
+    for name, s in stats.get("by_priority", {}).items():
+        lines.append(f'hl_rate_limit_wait_seconds_total{{priority="{name}"}} {s["wait_s"]}')
+    lines.append("")
+    return "\n".join(lines)
+
+
+# Shared instance (one IP budget per process)
+_limiter: Optional[WeightLimiter] = None
+
+
+def get_rate_limiter() -> WeightLimiter:
+    """Get the global WeightLimiter instance"""
+    global _limiter
+    if _limiter is None:
+        _limiter = WeightLimiter()
+    return _limiter
+
+
+def _bench(argv) -> int:
+    """Simulated-clock run against exchange_sim's 1200/min budget: weight used per minute, 429s, waits"""
+    import argparse
+    import contextlib
+    import io
+    from exchange_sim import SimRateLimiter, create_simulator, sim_hl_client
+
+    parser = argparse.ArgumentParser(description="Rate limiter benchmark (simulated clock)")
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--order-every", type=int, default=10, help="One order + cancel per N read rounds")
+    args = parser.parse_args(argv)
+
+    class LegacyGap:
+        """The previous policy: 200ms between requests, 1s sleeps for 10s after a 429"""
+
+        def __init__(self, clock, sleep):
+            self.clock, self.sleep = clock, sleep
+            self.capacity, self._last, self._last_429 = 0, 0.0, -100.0
+            self.rate_limited = 0
+
+        def acquire(self, weight, priority=PRIORITY_MARKET, action=None):
+            now = self.clock()
+            wait = 1.0 if now - self._last_429 < 10 else max(0.0, self._last + 0.2 - now)
+            self.sleep(wait)
+            self._last = self.clock()
+            return wait
+
+        def record(self, weight):
+            pass
+
+        def on_429(self):
+            self._last_429 = self.clock()
+            self.rate_limited += 1
+            return 1.0
+
+        def sync_due(self):
+            return False
+
+        def used(self):
+            return 0
+
+    def run(label: str, make_limiter) -> None:
+        t = [0.0]
+        clock = lambda: t[0]
+
+        def sleep(seconds):
+            t[0] += max(seconds, 0.001)
+
+        info, exchange, sim = create_simulator({"BTC": 60000.0, "ETH": 3000.0, "SOL": 150.0},
+                                               starting_balance=1_000_000, clock=lambda: 1.7e9 + t[0],
+                                               rate_limiter=SimRateLimiter(weight_per_minute=1200, clock=clock))
+        limiter = make_limiter(clock, sleep)
+        hl = sim_hl_client(info, exchange, limiter)
+        order_waits = []
+        rounds = 0
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            while t[0] < args.minutes * 60:
+                rounds += 1
+                # Market data (caches dropped so every call reaches the exchange)
+                for coin in ("BTC", "ETH", "SOL"):
+                    hl._orderbook_cache.clear()
+                    hl.get_orderbook(coin)
+                hl._asset_ctx_cache = None
+                hl.get_asset_contexts()
+                hl.get_prices(["BTC", "ETH", "SOL"])
+                # Account
+                hl.get_account_summary()
+                hl.get_open_orders()
+                hl.get_recent_fills()
+                if rounds % args.order_every == 0:
+                    t0 = t[0]
+                    response = hl.place_trigger_order("ETH", False, 2000, 0.01)
+                    statuses = (response.get("response") or {}).get("data", {}).get("statuses", []) \
+                        if isinstance(response.get("response"), dict) else []
+                    resting = statuses[0].get("resting") if statuses and isinstance(statuses[0], dict) else None
+                    if resting:
+                        hl.cancel_order("ETH", resting["oid"])
+                    order_waits.append(t[0] - t0)
+                sleep(0)
+        minutes = t[0] / 60
+        served = sum(s["weight"] for s in limiter.stats()["by_priority"].values()) if hasattr(limiter, "stats") else None
+        print(f"[RATE][BENCH] {label:<14} rounds/min={rounds / minutes:6.1f} "
+              f"429s={sim.rate_limiter.rejected:<4} "
+              + (f"weight/min={served / minutes:6.0f} " if served is not None else "")
+              + f"order+cancel wait p50={sorted(order_waits)[len(order_waits) // 2] if order_waits else 0:.2f}s "
+              f"max={max(order_waits) if order_waits else 0:.2f}s")
+        if hasattr(limiter, "stats"):
+            for name, s in limiter.stats()["by_priority"].items():
+                print(f"[RATE][BENCH]   {name:<8} requests={s['requests']:<6} weight={s['weight']:<7} waits={s['waits']:<5} wait_s={s['wait_s']:.1f}")
+
+    run("legacy 200ms", LegacyGap)
+    run("weight budget", lambda clock, sleep: WeightLimiter(clock=clock, sleep=sleep))
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        sys.exit(_bench(sys.argv[2:]))
+    print("usage: python rate_limiter.py bench [--minutes N] [--order-every K]")
@@ -0,0 +1,668 @@
+"""
+Replay Engine - Deterministic backtests of the engine decision pipeline
+Feeds archived candles (and recorded books/decisions) through a simulated HLClient
+on a simulated clock, running the same vision -> scoring -> decide -> execute path
+as main.py. Reports PnL, ticks/second and per-stage timings.
+
+    python replay.py --symbols BTC,ETH --start 2025-01-01 --end 2025-04-01 --decider rule
+"""
+import os
+import sys
+import json
+import time
+import bisect
+import contextlib
+import numpy as np
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+from candle_archive import INTERVAL_MS, get_candle_archive
+from analysis_pipeline import TIMEFRAMES_CONFIG, build_market_vision, build_trigger_status, tag_actions, stage_timer
+
+_DATA_DIR = os.environ.get("DATA_VOLUME_PATH", os.path.join(os.path.dirname(__file__), "data"))
+REPLAY_DIR = os.path.join(_DATA_DIR, "replay")
+
+
+# ============================================================
+# RECORDING (live engine side)
+# ============================================================
+
+def record_event(kind: str, payload: Any, now_ms: Optional[int] = None) -> None:
+    """
+    Append a timestamped event to data/replay/{kind}.jsonl (decisions, books).
+    Never raises - recording must not affect the live loop.
+    """
+    try:
+        os.makedirs(REPLAY_DIR, exist_ok=True)
+        line = json.dumps({"t": now_ms or int(time.time() * 1000), "payload": payload}, default=str)
+        with open(os.path.join(REPLAY_DIR, f"{kind}.jsonl"), "a") as f:
+            f.write(line + "\n")
+    except Exception as e:
+        print(f"[REPLAY][WARN] record {kind} failed: {e}")
+
+
+def load_events(path: str) -> List[Dict[str, Any]]:
+    """Read a recorded JSONL file, sorted by time"""
+    events = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    events.sort(key=lambda e: e.get("t", 0))
+    return events
+
+
+# ============================================================
+# SIMULATED MARKET + ACCOUNT
+# ============================================================
+
+class ReplayMarket:
+    """
+    Archived candles served as of a simulated clock.
+
+    Only data visible at `now_ms` is returned: closed bars of each interval plus
+    the forming bar aggregated from closed base-interval bars (no look-ahead).
+    """
+
+    def __init__(self, symbols: List[str], intervals: List[str], base_interval: str = "15m", archive=None):
+        archive = archive or get_candle_archive()
+        self.base_interval = base_interval
+        self.base_ms = INTERVAL_MS[base_interval]
+        self.data: Dict[tuple, np.ndarray] = {}
+        for symbol in symbols:
+            for interval in set(intervals) | {base_interval}:
+                # Copy out of the memmap: replay touches every row many times
+                self.data[(symbol, interval)] = np.array(archive.load(symbol, interval))
+
+    def base(self, symbol: str) -> np.ndarray:
+        return self.data[(symbol, self.base_interval)]
+
+    def _closed_base(self, symbol: str, now_ms: int) -> int:
+        """Number of base bars closed at now_ms"""
+        return int(np.searchsorted(self.base(symbol)["t"], now_ms - self.base_ms, side="right"))
+
+    def price(self, symbol: str, now_ms: int) -> float:
+        n = self._closed_base(symbol, now_ms)
+        return float(self.base(symbol)["c"][n - 1]) if n else 0.0
+
+    def candles(self, symbol: str, interval: str, limit: int, now_ms: int) -> List[Dict[str, Any]]:
+        records = self.data.get((symbol, interval))
+        if records is None or not len(records):
+            return []
+        t = records["t"]
+        idx = int(np.searchsorted(t, now_ms, side="right"))  # Bars opened at or before now
+        if idx == 0:
+            return []
+        step = INTERVAL_MS.get(interval, self.base_ms)
+        last_open = int(t[idx - 1])
+        last_close = int(t[idx]) if idx < len(t) else last_open + step
+        closed = records[max(0, idx - 1 - limit):idx - 1] if last_close > now_ms else records[max(0, idx - limit):idx]
+
+        out = [
+            {"t": int(r["t"]), "T": int(r["t"]) + step - 1, "s": symbol, "i": interval,
+             "o": float(r["o"]), "h": float(r["h"]), "l": float(r["l"]), "c": float(r["c"]),
+             "v": float(r["v"]), "n": int(r["n"])}
+            for r in closed
+        ]
+        if last_close > now_ms:
+            # Forming bar from the base bars closed so far
+            base = self.base(symbol)
+            lo = int(np.searchsorted(base["t"], last_open, side="left"))
+            hi = self._closed_base(symbol, now_ms)
+            if hi > lo:
+                part = base[lo:hi]
+                out.append({
+                    "t": last_open, "T": last_open + step - 1, "s": symbol, "i": interval,
+                    "o": float(part["o"][0]), "h": float(part["h"].max()), "l": float(part["l"].min()),
+                    "c": float(part["c"][-1]), "v": float(part["v"].sum()), "n": int(part["n"].sum())
+                })
+        return out[-limit:] if limit else out
+
+
+class PaperBook:
+    """Positions, SL/TP triggers and fills for the replay account (cross margin, taker fills)"""
+
+    def __init__(self, starting_equity: float = 1000.0, fee_rate: float = 0.00045, slippage_bps: float = 2.0):
+        self.starting_equity = starting_equity
+        self.cash = starting_equity
+        self.fee_rate = fee_rate
+        self.slippage = slippage_bps / 10000
+        self.positions: Dict[str, Dict[str, Any]] = {}
+        self.fills: List[Dict[str, Any]] = []
+        self.trades: List[float] = []  # Realized PnL per closed position
+        self.fees = 0.0
+        self.peak_equity = starting_equity
+        self.max_drawdown_pct = 0.0
+        self._oid = 0
+
+    # ---------- account views ----------
+    def equity(self, prices: Dict[str, float]) -> float:
+        return self.cash + sum(self._upnl(sym, pos, prices.get(sym, pos["entry_price"]))
+                               for sym, pos in self.positions.items())
+
+    def margin_used(self, prices: Dict[str, float]) -> float:
+        return sum(pos["size"] * prices.get(sym, pos["entry_price"]) / pos["leverage"]
+                   for sym, pos in self.positions.items())
+
+    @staticmethod
+    def _upnl(symbol: str, pos: Dict[str, Any], price: float) -> float:
+        sign = 1 if pos["side"] == "LONG" else -1
+        return sign * (price - pos["entry_price"]) * pos["size"]
+
+    def mark(self, prices: Dict[str, float]) -> None:
+        equity = self.equity(prices)
+        self.peak_equity = max(self.peak_equity, equity)
+        if self.peak_equity > 0:
+            self.max_drawdown_pct = max(self.max_drawdown_pct, (self.peak_equity - equity) / self.peak_equity * 100)
+
+    def open_orders(self) -> List[Dict[str, Any]]:
+        """SL/TP as Hyperliquid-style reduce-only trigger orders"""
+        orders = []
+        for sym, pos in self.positions.items():
+            close_side = "A" if pos["side"] == "LONG" else "B"
+            for kind in ("sl", "tp"):
+                if pos.get(kind):
+                    orders.append({
+                        "coin": sym, "side": close_side, "sz": str(pos["size"]), "limitPx": str(pos[kind]),
+                        "triggerPx": str(pos[kind]), "reduceOnly": True, "oid": pos[f"{kind}_oid"],
+                        "orderType": "Stop Market" if kind == "sl" else "Take Profit Market"
+                    })
+        return orders
+
+    # ---------- fills ----------
+    def _fill(self, symbol: str, is_buy: bool, size: float, px: float, now_ms: int, closed_pnl: float, direction: str):
+        fee = size * px * self.fee_rate
+        self.fees += fee
+        self.cash -= fee
+        self._oid += 1
+        self.fills.insert(0, {
+            "coin": symbol, "px": str(px), "sz": str(size), "side": "B" if is_buy else "A",
+            "time": now_ms, "closedPnl": str(closed_pnl), "fee": str(fee), "dir": direction, "oid": self._oid
+        })
+        del self.fills[200:]
+
+    def _close(self, symbol: str, fraction: float, px: float, now_ms: int, reason: str) -> None:
+        pos = self.positions.get(symbol)
+        if not pos:
+            return
+        size = pos["size"] * min(1.0, max(0.0, fraction))
+        if size <= 0:
+            return
+        pnl = self._upnl(symbol, {**pos, "size": size}, px)
+        self.cash += pnl
+        pos["realized"] = pos.get("realized", 0.0) + pnl
+        self._fill(symbol, pos["side"] == "SHORT", size, px, now_ms, pnl, f"Close {pos['side'].title()} ({reason})")
+        pos["size"] -= size
+        if pos["size"] <= 1e-12:
+            self.trades.append(pos["realized"])
+            del self.positions[symbol]
+
+    def _market_px(self, price: float, is_buy: bool) -> float:
+        return price * (1 + self.slippage) if is_buy else price * (1 - self.slippage)
+
+    def apply(self, actions: List[Dict[str, Any]], prices: Dict[str, float], now_ms: int) -> None:
+        """Apply sanitized executor actions at current prices"""
+        for action in actions:
+            action_type = action.get("type", "")
+            symbol = action.get("symbol", "")
+            price = prices.get(symbol, 0)
+            pos = self.positions.get(symbol)
+
+            if action_type in ("PLACE_ORDER", "ADD_TO_POSITION") and price > 0:
+                side = str(action.get("side", "")).upper()
+                side = "LONG" if side in ("LONG", "BUY") else "SHORT" if side in ("SHORT", "SELL") else ""
+                size = float(action.get("size") or 0)
+                leverage = max(1, int(action.get("leverage") or 1))
+                if not side or size <= 0:
+                    continue
+                # Margin check (same rule as executor._pre_check_order)
+                available = self.equity(prices) - self.margin_used(prices)
+                if size * price / leverage > available:
+                    continue
+                if pos and pos["side"] != side:
+                    self._close(symbol, 1.0, self._market_px(price, side == "LONG"), now_ms, "Flip")
+                    pos = None
+                px = self._market_px(price, side == "LONG")
+                if pos:
+                    total = pos["size"] + size
+                    pos["entry_price"] = (pos["entry_price"] * pos["size"] + px * size) / total
+                    pos["size"] = total
+                else:
+                    self._oid += 2
+                    pos = self.positions[symbol] = {
+                        "side": side, "size": size, "entry_price": px, "leverage": leverage,
+                        "sl": None, "tp": None, "sl_oid": self._oid - 1, "tp_oid": self._oid, "realized": 0.0
+                    }
+                self._fill(symbol, side == "LONG", size, px, now_ms, 0.0, f"Open {side.title()}")
+                if action.get("stop_loss"):
+                    pos["sl"] = float(action["stop_loss"])
+                if action.get("take_profit"):
+                    pos["tp"] = float(action["take_profit"])
+
+            elif action_type == "CLOSE_POSITION" and pos:
+                pct = float(action.get("pct") or 1.0)
+                self._close(symbol, pct / 100 if pct > 1 else pct, self._market_px(price, pos["side"] == "SHORT"), now_ms, "AI")
+
+            elif action_type == "CLOSE_PARTIAL" and pos:
+                pct = float(action.get("pct") or 0.5)
+                self._close(symbol, pct / 100 if pct > 1 else pct, self._market_px(price, pos["side"] == "SHORT"), now_ms, "AI Partial")
+
+            elif action_type == "SET_STOP_LOSS" and pos:
+                stop = action.get("stop_price") or action.get("stop_loss") or action.get("price")
+                if stop:
+                    pos["sl"] = float(stop)
+
+            elif action_type == "SET_TAKE_PROFIT" and pos:
+                tp = action.get("tp_price") or action.get("take_profit") or action.get("price")
+                if tp:
+                    pos["tp"] = float(tp)
+
+            elif action_type == "MOVE_STOP_TO_BREAKEVEN" and pos:
+                pos["sl"] = pos["entry_price"]
+
+            elif action_type in ("CANCEL_ALL", "CANCEL_ALL_ORDERS"):
+                for sym, p in self.positions.items():
+                    if not symbol or sym == symbol:
+                        p["sl"] = p["tp"] = None
+
+    def on_bar(self, symbol: str, bar: np.void, now_ms: int) -> None:
+        """Trigger SL/TP inside a bar (SL checked first; gaps fill at the open)"""
+        pos = self.positions.get(symbol)
+        if not pos:
+            return
+        o, h, l = float(bar["o"]), float(bar["h"]), float(bar["l"])
+        long = pos["side"] == "LONG"
+        sl, tp = pos.get("sl"), pos.get("tp")
+        if sl and ((long and l <= sl) or (not long and h >= sl)):
+            px = min(o, sl) if long else max(o, sl)
+            self._close(symbol, 1.0, px, now_ms, "Stop Loss")
+        elif tp and ((long and h >= tp) or (not long and l <= tp)):
+            px = max(o, tp) if long else min(o, tp)
+            self._close(symbol, 1.0, px, now_ms, "Take Profit")
+
+
+class ReplayHLClient:
+    """
+    Drop-in for the HLClient read methods used by the decision pipeline,
+    serving ReplayMarket data and the PaperBook account as of the clock.
+    """
+
+    def __init__(self, market: ReplayMarket, book: PaperBook, symbols: List[str], books: Optional[List[Dict]] = None):
+        self.market = market
+        self.book = book
+        self.symbols = symbols
+        self.now_ms = 0
+        self.wallet_address = "replay"
+        self.info_client = None
+        self.exchange_client = None
+        self._last_429_time = 0
+        # Recorded orderbooks: {symbol: ([t...], [book...])}
+        self._books: Dict[str, tuple] = {}
+        for event in books or []:
+            for sym, ob in (event.get("payload") or {}).items():
+                times, snaps = self._books.setdefault(sym, ([], []))
+                times.append(event["t"])
+                snaps.append(ob)
+
+    # ---------- market data ----------
+    def get_prices(self, symbols: list) -> dict:
+        return {s: p for s in symbols if (p := self.market.price(s, self.now_ms)) > 0}
+
+    def get_last_price(self, symbol: str) -> Optional[float]:
+        return self.market.price(symbol, self.now_ms) or None
+
+    def get_candles(self, symbol: str, interval: str, limit: int = 100) -> list:
+        return self.market.candles(symbol, interval, limit, self.now_ms)
+
+    def is_candles_cached(self, symbol: str, interval: str) -> bool:
+        return True
+
+    def is_orderbook_cached(self, symbol: str) -> bool:
+        return True
+
+    def get_orderbook(self, symbol: str, depth: int = 10) -> dict:
+        recorded = self._books.get(symbol)
+        if recorded:
+            i = bisect.bisect_right(recorded[0], self.now_ms) - 1
+            if i >= 0:
+                return recorded[1][i]
+        # Synthetic book: 1bp levels around the last price
+        price = self.market.price(symbol, self.now_ms)
+        if price <= 0:
+            return {}
+        bids = [[price * (1 - 0.0001 * (i + 1)), 1.0] for i in range(depth)]
+        asks = [[price * (1 + 0.0001 * (i + 1)), 1.0] for i in range(depth)]
+        return {"bids": bids, "asks": asks, "spread": asks[0][0] - bids[0][0], "imbalance": 1.0}
+
+    def get_funding_info(self, symbol: str) -> dict:
+        price = self.market.price(symbol, self.now_ms)
+        return {"funding_rate": 0.0, "mark_price": price, "open_interest": 0.0} if price else {}
+
+    def get_asset_contexts(self) -> Dict[str, Dict[str, float]]:
+        return {s: {"mark_price": p, "mid_price": p, "prev_day_price": p, "funding": 0.0,
+                    "open_interest": 0.0, "day_volume_usd": 0.0, "premium": 0.0}
+                for s, p in self.get_prices(self.symbols).items()}
+
+    def get_symbol_constraints(self, symbol: str) -> dict:
+        return {"szDecimals": 5, "maxLeverage": 50, "onlyIsolated": False, "tickSz": 0.01, "pxDecimals": 2}
+
+    def get_meta_cached(self, ttl_seconds: int = 300) -> Optional[dict]:
+        return {"universe": [{"name": s, "szDecimals": 5, "maxLeverage": 50} for s in self.symbols]}
+
+    # ---------- account ----------
+    def _prices(self) -> Dict[str, float]:
+        return self.get_prices(list(self.book.positions) or self.symbols)
+
+    def get_account_summary(self) -> Dict[str, Any]:
+        prices = self._prices()
+        equity = self.book.equity(prices)
+        margin = self.book.margin_used(prices)
+        return {"equity": equity, "available": max(0.0, equity - margin), "margin": margin,
+                "positions_count": len(self.book.positions)}
+
+    def get_positions(self) -> List[Dict[str, Any]]:
+        prices = self._prices()
+        return [{"coin": sym, "size": pos["size"] if pos["side"] == "LONG" else -pos["size"],
+                 "entry_price": pos["entry_price"],
+                 "unrealized_pnl": PaperBook._upnl(sym, pos, prices.get(sym, pos["entry_price"])),
+                 "leverage": pos["leverage"]}
+                for sym, pos in self.book.positions.items()]
+
+    def get_positions_by_symbol(self, strict: bool = False) -> dict:
+        return {p["coin"]: {"size": abs(p["size"]), "side": "LONG" if p["size"] > 0 else "SHORT",
+                            "entry_price": p["entry_price"], "unrealized_pnl": p["unrealized_pnl"],
+                            "leverage": p["leverage"]}
+                for p in self.get_positions()}
+
+    def get_account_state(self) -> Dict[str, Any]:
+        summary = self.get_account_summary()
+        return {
+            "marginSummary": {"accountValue": str(summary["equity"]), "totalMarginUsed": str(summary["margin"])},
+            "withdrawable": str(summary["available"]),
+            "assetPositions": [{"position": {"coin": p["coin"], "szi": str(p["size"]), "entryPx": str(p["entry_price"]),
+                                             "unrealizedPnl": str(p["unrealized_pnl"]),
+                                             "leverage": {"value": p["leverage"]}}}
+                               for p in self.get_positions()]
+        }
+
+    def get_open_orders(self, strict: bool = False) -> list:
+        return self.book.open_orders()
+
+    def get_recent_fills(self, limit: int = 10) -> list:
+        return self.book.fills[:limit]
+
+
+# ============================================================
+# DECIDERS - anything with decide(state) -> {"actions", "summary", "confidence"}
+# ============================================================
+
+class RuleDecider:
+    """
+    Deterministic stand-in for the LLM: trade strong universe-engine scores,
+    ATR-based SL, 2R TP, fixed fractional risk, exit when the trend flips.
+    """
+
+    def __init__(self, long_score: float = 70, short_score: float = 30, risk_pct: float = 1.0,
+                 atr_mult: float = 2.0, reward_r: float = 2.0, leverage: int = 5):
+        self.long_score = long_score
+        self.short_score = short_score
+        self.risk_pct = risk_pct
+        self.atr_mult = atr_mult
+        self.reward_r = reward_r
+        self.leverage = leverage
+
+    def decide(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        actions = []
+        positions = state.get("positions", {})
+        equity = state.get("equity", 0)
+        for symbol, brief in state.get("symbol_briefs", {}).items():
+            price = state.get("prices", {}).get(symbol, 0)
+            inds = state.get("indicators_by_symbol", {}).get(symbol, {})
+            atr_pct = float(inds.get("atr_pct", 0) or 0)
+            score = brief.get("score", 50)
+            trend = brief.get("trend", "UNKNOWN")
+            pos = positions.get(symbol)
+
+            if pos:
+                flipped = (pos["side"] == "LONG" and trend.startswith("DOWN")) or \
+                          (pos["side"] == "SHORT" and trend.startswith("UP"))
+                if flipped:
+                    actions.append({"type": "CLOSE_POSITION", "symbol": symbol, "reason": f"trend flipped {trend}"})
+                continue
+
+            if price <= 0 or atr_pct <= 0 or equity <= 0:
+                continue
+            side = "LONG" if score >= self.long_score else "SHORT" if score <= self.short_score else None
+            if not side:
+                continue
+            stop_dist = price * atr_pct / 100 * self.atr_mult
+            size = (equity * self.risk_pct / 100) / stop_dist
+            sign = 1 if side == "LONG" else -1
+            actions.append({
+                "type": "PLACE_ORDER", "symbol": symbol, "side": side, "size": round(size, 5),
+                "orderType": "MARKET", "leverage": self.leverage,
+                "stop_loss": price - sign * stop_dist, "take_profit": price + sign * stop_dist * self.reward_r,
+                "reason": f"score {score} {trend}"
+            })
+        return {"actions": actions, "summary": f"rule: {len(actions)} actions", "confidence": 0.5 if actions else 0}
+
+
+class RecordedDecider:
+    """Replays decisions recorded by the live engine (data/replay/decisions.jsonl, REPLAY_RECORD_DECISIONS=true)"""
+
+    def __init__(self, path: str):
+        self.events = load_events(path)
+        self._times = [e["t"] for e in self.events]
+        self._last_ms = 0
+
+    def decide(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        now_ms = state.get("_now_ms", 0)
+        lo = bisect.bisect_right(self._times, self._last_ms)
+        hi = bisect.bisect_right(self._times, now_ms)
+        self._last_ms = now_ms
+        actions, summary, confidence = [], "", 0
+        for event in self.events[lo:hi]:
+            decision = event.get("payload") or {}
+            actions.extend(json.loads(json.dumps(decision.get("actions", []))))
+            summary = decision.get("summary", summary)
+            confidence = decision.get("confidence", confidence)
+        return {"actions": actions, "summary": summary, "confidence": confidence}
+
+
+# ============================================================
+# REPLAY ENGINE
+# ============================================================
+
+class ReplayEngine:
+    """
+    Steps the simulated clock one base bar at a time and runs the decision
+    pipeline at each close. Deterministic for a given archive + decider.
+    """
+
+    def __init__(self, symbols: List[str], start_ms: int, end_ms: int, decider,
+                 base_interval: str = "15m", timeframes: Dict[str, int] = TIMEFRAMES_CONFIG,
+                 starting_equity: float = 1000.0, decide_every: int = 1, books: Optional[List[Dict]] = None,
+                 quiet: bool = True, archive=None):
+        self.symbols = symbols
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.decider = decider
+        self.timeframes = timeframes
+        self.decide_every = max(1, decide_every)
+        self.quiet = quiet
+        self.market = ReplayMarket(symbols, list(timeframes), base_interval, archive)
+        self.book = PaperBook(starting_equity)
+        self.hl = ReplayHLClient(self.market, self.book, symbols, books)
+        self.timings: Dict[str, float] = {}
+        self.ticks = 0
+        self.decisions = 0
+
+    def _clock(self) -> List[int]:
+        """Base-bar close times inside [start, end] where any symbol has a bar"""
+        step = self.market.base_ms
+        opens = set()
+        for symbol in self.symbols:
+            t = self.market.base(symbol)["t"]
+            opens.update(t[(t >= self.start_ms) & (t + step <= self.end_ms)].tolist())
+        return [t + step for t in sorted(opens)]
+
+    def _tick(self, now_ms: int) -> None:
+        from executor import execute, _sanitize_actions
+        from scoring_engine import briefs_from_indicators
+
+        hl = self.hl
+        with stage_timer(self.timings, "state"):
+            summary = hl.get_account_summary()
+            positions_by_symbol = hl.get_positions_by_symbol()
+            prices = hl.get_prices(self.symbols)
+            open_orders = hl.get_open_orders()
+            state = {
+                "time": datetime.fromtimestamp(now_ms / 1000, tz=timezone.utc).isoformat(),
+                "_now_ms": now_ms,
+                "equity": summary["equity"],
+                "positions_count": summary["positions_count"],
+                "positions": positions_by_symbol,
+                "prices": prices,
+                "symbols": self.symbols,
+                "snapshot_symbols": self.symbols,
+                "live_trading": False,
+                "available_margin": summary["available"],
+                "leverage": 40,
+                "buying_power": summary["available"] * 40,
+                "constraints_by_symbol": {s: hl.get_symbol_constraints(s) for s in self.symbols},
+                "recent_fills": hl.get_recent_fills(limit=10),
+                "open_orders": open_orders,
+                "open_orders_count": len(open_orders),
+                "last_rejects": [], "last_errors": [], "last_successes": []
+            }
+            trigger_info = build_trigger_status(positions_by_symbol, open_orders, prices)
+            state["open_orders_by_symbol"] = trigger_info["open_orders_by_symbol"]
+            state["position_details"] = trigger_info["position_details"]
+            state["trigger_status"] = trigger_info["trigger_status"]
+
+        with stage_timer(self.timings, "vision"):
+            state.update(build_market_vision(hl, self.symbols, self.timeframes, request_spacing=0,
+                                             now_ms=now_ms, timings=self.timings))
+
+        with stage_timer(self.timings, "scoring"):
+            state["symbol_briefs"] = briefs_from_indicators(self.symbols, prices, state["indicators_by_symbol"])
+            state["market"] = {"top_symbols": list(state["symbol_briefs"])[:8]}
+            state["market_data"] = {}
+
+        if self.ticks % self.decide_every == 0:
+            with stage_timer(self.timings, "decide"):
+                decision = self.decider.decide(state) or {}
+            self.decisions += 1
+            actions = decision.get("actions", [])
+            if actions:
+                tag_actions(actions, decision, state)
+                with stage_timer(self.timings, "execute"):
+                    sanitized = _sanitize_actions([dict(a) for a in actions], hl)
+                    execute(actions, live_trading=False, hl_client=hl)
+                with stage_timer(self.timings, "book"):
+                    self.book.apply(sanitized, prices, now_ms)
+
+    def run(self) -> Dict[str, Any]:
+        """Run the whole window and return the report"""
+        clock = self._clock()
+        step = self.market.base_ms
+        devnull = open(os.devnull, "w") if self.quiet else None
+        t0 = time.perf_counter()
+        try:
+            for now_ms in clock:
+                self.hl.now_ms = now_ms
+                # Triggers first: the bar that just closed may have hit SL/TP
+                with stage_timer(self.timings, "book"):
+                    for symbol in self.symbols:
+                        base = self.market.base(symbol)
+                        i = int(np.searchsorted(base["t"], now_ms - step, side="left"))
+                        if i < len(base) and int(base["t"][i]) == now_ms - step:
+                            self.book.on_bar(symbol, base[i], now_ms)
+                with contextlib.redirect_stdout(devnull) if devnull else contextlib.nullcontext():
+                    self._tick(now_ms)
+                self.book.mark(self.hl._prices())
+                self.ticks += 1
+        finally:
+            if devnull:
+                devnull.close()
+        wall = time.perf_counter() - t0
+        return self.report(wall)
+
+    def report(self, wall_seconds: float) -> Dict[str, Any]:
+        prices = self.hl._prices()
+        final_equity = self.book.equity(prices)
+        trades = self.book.trades
+        wins = [p for p in trades if p > 0]
+        ticks = max(1, self.ticks)
+        return {
+            "symbols": self.symbols,
+            "start": datetime.fromtimestamp(self.start_ms / 1000, tz=timezone.utc).isoformat(),
+            "end": datetime.fromtimestamp(self.end_ms / 1000, tz=timezone.utc).isoformat(),
+            "ticks": self.ticks,
+            "decisions": self.decisions,
+            "wall_seconds": round(wall_seconds, 2),
+            "ticks_per_second": round(self.ticks / wall_seconds, 1) if wall_seconds > 0 else 0,
+            "pnl": {
+                "starting_equity": self.book.starting_equity,
+                "final_equity": round(final_equity, 2),
+                "return_pct": round((final_equity / self.book.starting_equity - 1) * 100, 2),
+                "realized_pnl": round(sum(trades), 2),
+                "fees": round(self.book.fees, 2),
+                "trades": len(trades),
+                "win_rate": round(len(wins) / len(trades) * 100, 1) if trades else 0,
+                "max_drawdown_pct": round(self.book.max_drawdown_pct, 2),
+                "open_positions": len(self.book.positions)
+            },
+            "stage_ms_per_tick": {k: round(v / ticks * 1000, 3) for k, v in sorted(self.timings.items())}
+        }
+
+
+def _parse_date(value: str) -> int:
+    """YYYY-MM-DD (UTC) or epoch ms -> ms"""
+    if value.isdigit():
+        return int(value)
+    return int(datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _main(argv: List[str]) -> int:
+    """CLI entry point"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Replay archived candles through the decision pipeline")
+    parser.add_argument("--symbols", required=True, help="Comma-separated coins, e.g. BTC,ETH")
+    parser.add_argument("--start", required=True, help="YYYY-MM-DD (UTC) or epoch ms")
+    parser.add_argument("--end", default=None, help="YYYY-MM-DD (UTC) or epoch ms (default: now)")
+    parser.add_argument("--decider", default="rule", help="rule | llm | recorded:<decisions.jsonl>")
+    parser.add_argument("--decide-every", type=int, default=1, help="Call the decider every N base bars")
+    parser.add_argument("--equity", type=float, default=1000.0, help="Starting equity (USD)")
+    parser.add_argument("--books", default=None, help="Recorded orderbooks JSONL (default: synthetic)")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline logs")
+    args = parser.parse_args(argv)
+
+    if args.decider == "rule":
+        decider = RuleDecider()
+    elif args.decider == "llm":
+        from llm_client import LLMClient
+        decider = LLMClient()
+    elif args.decider.startswith("recorded:"):
+        decider = RecordedDecider(args.decider.split(":", 1)[1])
+    else:
+        parser.error(f"unknown decider {args.decider}")
+
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    end_ms = _parse_date(args.end) if args.end else int(time.time() * 1000)
+    engine = ReplayEngine(
+        symbols, _parse_date(args.start), end_ms, decider,
+        starting_equity=args.equity, decide_every=args.decide_every,
+        books=load_events(args.books) if args.books else None, quiet=not args.verbose
+    )
+    print(f"[REPLAY] {symbols} {args.start} -> {args.end or 'now'} decider={args.decider}")
+    print(json.dumps(engine.run(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
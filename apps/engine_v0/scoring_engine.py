@@ -0,0 +1,549 @@
+"""
+Scoring Engine - Vectorized multi-factor scoring for the whole perp universe
+Computes the symbol_briefs factors (EMA alignment, RSI, MACD pullback,
+relative volume, ATR) for every symbol at once on batched numpy arrays,
+instead of one pandas pass per symbol.
+
+Also hosts the candidate funnel: a cheap screener over one metaAndAssetCtxs
+snapshot ranks the universe, and only the top K (K sized to the remaining
+API weight budget) get the full multi-TF deep scan.
+"""
+import time
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
+
+from config import (
+    SCORING_WEIGHT_PER_MIN,
+    SCORING_FETCH_BUDGET,
+    SCORING_TOP_N,
+    DEEP_SCAN_MAX_K,
+    DEEP_SCAN_WEIGHT_PER_MIN,
+    VISION_LANE_SECONDS
+)
+
+# Timeframes kept per symbol for universe scoring (bars per symbol)
+SCORING_TIMEFRAMES = {
+    "15m": 60,  # Primary: same TF the per-symbol indicators use
+    "1h": 60    # Confirmation trend
+}
+
+_TF_SECONDS = {"15m": 900, "1h": 3600}
+
+# Minimum bars before a symbol gets scored (matches indicators.py)
+MIN_BARS = 20
+
+
+# ============================================================
+# VECTORIZED INDICATORS - arrays are (symbols, bars), NaN-padded on the left
+# ============================================================
+
+def candles_to_matrix(candle_lists: List[List[Dict[str, Any]]], length: int) -> Dict[str, np.ndarray]:
+    """
+    Stack candle lists into right-aligned (N, length) OHLCV arrays.
+
+    Shorter histories are NaN-padded on the left so the last column is always
+    the latest bar.
+    """
+    n = len(candle_lists)
+    out = {k: np.full((n, length), np.nan) for k in ("o", "h", "l", "c", "v")}
+    for i, candles in enumerate(candle_lists):
+        rows = candles[-length:]
+        if not rows:
+            continue
+        for k in out:
+            out[k][i, length - len(rows):] = [float(c.get(k, np.nan)) for c in rows]
+    return out
+
+
+def ema(x: np.ndarray, span: int) -> np.ndarray:
+    """EMA along the bar axis (pandas ewm(adjust=False), seeded at the first valid bar)"""
+    alpha = 2.0 / (span + 1.0)
+    out = np.empty_like(x)
+    prev = x[:, 0].copy()
+    out[:, 0] = prev
+    for t in range(1, x.shape[1]):
+        cur = x[:, t]
+        prev = np.where(np.isnan(prev), cur, alpha * cur + (1 - alpha) * prev)
+        out[:, t] = prev
+    return out
+
+
+def compute_factors(m: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Scoring factors for the last bar of every row.
+
+    Same definitions as indicators.calculate_indicators (SMA-based RSI/ATR,
+    MACD 12/26/9, EMA50 falls back to EMA21 with < 50 bars).
+    """
+    close, high, low, vol = m["c"], m["h"], m["l"], m["v"]
+    bars = np.sum(~np.isnan(close), axis=1)
+
+    ema_9 = ema(close, 9)[:, -1]
+    ema_21 = ema(close, 21)[:, -1]
+    ema_50 = np.where(bars >= 50, ema(close, 50)[:, -1], ema_21)
+
+    # RSI (14, simple rolling means like indicators.py)
+    delta = np.diff(close, axis=1)
+    gain = np.where(delta > 0, delta, 0.0)[:, -14:].mean(axis=1)
+    loss = np.where(delta < 0, -delta, 0.0)[:, -14:].mean(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - 100 / (1 + gain / loss)
+    rsi = np.where(np.isnan(rsi), 50.0, rsi)
+
+    # MACD histogram (12, 26, 9)
+    macd_line = ema(close, 12) - ema(close, 26)
+    macd_hist = (macd_line - ema(macd_line, 9))[:, -1]
+
+    # ATR (14) as % of price
+    prev_close = np.concatenate([np.full((close.shape[0], 1), np.nan), close[:, :-1]], axis=1)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    atr = true_range[:, -14:].mean(axis=1)
+    last_close = close[:, -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        atr_pct = np.where(last_close > 0, atr / last_close * 100, 0.0)
+        volume_ma = vol[:, -20:].mean(axis=1)
+        relative_volume = np.where(volume_ma > 0, vol[:, -1] / volume_ma, 1.0)
+
+    valid = (bars >= MIN_BARS) & ~np.isnan(last_close)
+    return {
+        "ema_9": np.nan_to_num(ema_9),
+        "ema_21": np.nan_to_num(ema_21),
+        "ema_50": np.nan_to_num(ema_50),
+        "rsi": rsi,
+        "macd_hist": np.nan_to_num(macd_hist),
+        "atr_pct": np.nan_to_num(atr_pct),
+        "relative_volume": np.nan_to_num(relative_volume, nan=1.0),
+        "last_close": np.nan_to_num(last_close),
+        "valid": valid
+    }
+
+
+# ============================================================
+# SCORING - one vectorized pass, identical rules to the v14 per-symbol loop
+# ============================================================
+
+_TRENDS = np.array(["UP_STRONG", "UP", "DOWN_STRONG", "DOWN", "RANGE", "UNKNOWN"])
+
+
+def score_factors(f: Dict[str, np.ndarray], prices: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Multi-factor score (0-100) for every row.
+
+    Returns arrays: score, trend_idx (into _TRENDS), plus boolean reason masks.
+    """
+    e9, e21, e50 = f["ema_9"], f["ema_21"], f["ema_50"]
+    rsi, hist = f["rsi"], f["macd_hist"]
+    has_data = f["valid"] & (prices > 0) & (e21 > 0)
+
+    # Factor 1: EMA alignment
+    up_strong = (e9 > e21) & (e21 > e50)
+    down_strong = (e9 < e21) & (e21 < e50)
+    up = (e9 > e21) & ~up_strong
+    down = (e9 < e21) & ~down_strong
+    trend_idx = np.select([up_strong, up, down_strong, down], [0, 1, 2, 3], default=4)
+    score = 50 + np.select([up_strong | down_strong, up | down], [15, 8], default=0)
+
+    # Factor 2: RSI - extremes are interesting, no penalty
+    rsi_hot = (rsi > 60) | (rsi < 40)
+    score = score + np.where(rsi_hot, 5, 0)
+
+    # Factor 3: MACD confirmation / pullback in strong trend
+    uptrend = up_strong | up
+    downtrend = down_strong | down
+    macd_confirm = ((hist > 0) & uptrend) | ((hist < 0) & downtrend)
+    bull_pullback = ~macd_confirm & (hist < 0) & up_strong
+    bear_pullback = ~macd_confirm & (hist > 0) & down_strong
+    score = score + np.where(macd_confirm, 10, np.where(bull_pullback | bear_pullback, 8, 0))
+
+    # Factor 4: Volume boost
+    rv = f["relative_volume"]
+    score = score + np.select([rv > 1.5, rv > 1.2], [10, 5], default=0)
+
+    # Factor 5: Volatility
+    score = score + np.where(f["atr_pct"] > 3.0, 5, 0)
+
+    # Factor 6: Micro-conviction variance
+    score = np.clip(score + np.abs(rsi - 50) * 0.05, 0, 100)
+
+    return {
+        "score": np.where(has_data, score, 25.0),
+        "trend_idx": np.where(has_data, trend_idx, 5),
+        "has_data": has_data,
+        "macd_confirm": macd_confirm,
+        "bull_pullback": bull_pullback,
+        "bear_pullback": bear_pullback
+    }
+
+
+def _reason(i: int, f: Dict[str, np.ndarray], s: Dict[str, np.ndarray]) -> str:
+    """First two scoring reasons, same wording as before"""
+    if not s["has_data"][i]:
+        return "no data"
+    trend = _TRENDS[s["trend_idx"][i]]
+    reasons = [{
+        "UP_STRONG": "EMA aligned bullish", "UP": "EMA9>21",
+        "DOWN_STRONG": "EMA aligned bearish", "DOWN": "EMA9<21"
+    }.get(trend, "Consolidating")]
+
+    rsi = f["rsi"][i]
+    if rsi > 70:
+        reasons.append("RSI>70")
+    elif rsi > 60:
+        reasons.append("RSI bullish")
+    elif rsi < 30:
+        reasons.append("RSI<30")
+    elif rsi < 40:
+        reasons.append("RSI bearish")
+
+    if len(reasons) < 2:
+        if s["macd_confirm"][i]:
+            reasons.append("MACD+" if trend in ("UP", "UP_STRONG") else "MACD-")
+        elif s["bull_pullback"][i]:
+            reasons.append("Bullish Pullback")
+        elif s["bear_pullback"][i]:
+            reasons.append("Bearish Pullback")
+        else:
+            reasons.append("Building")
+    return " + ".join(reasons[:2])
+
+
+def build_briefs(symbols: List[str], f: Dict[str, np.ndarray], prices: np.ndarray,
+                 extra: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Score all rows and format symbol_briefs, ordered best score first.
+
+    Args:
+        symbols: Row labels
+        f: Factor arrays (compute_factors output or equivalent)
+        prices: Current prices aligned with symbols
+        extra: Optional extra per-row string arrays copied into each brief
+    """
+    s = score_factors(f, prices)
+    order = np.argsort(-s["score"], kind="stable")
+    briefs = {}
+    for i in order:
+        price = float(prices[i])
+        rsi = float(f["rsi"][i])
+        has_data = bool(s["has_data"][i])
+        brief = {
+            "price": round(price, 2) if price < 1000 else round(price, 0),
+            "trend": str(_TRENDS[s["trend_idx"][i]]),
+            "momentum": ("STRONG" if rsi > 60 or rsi < 40 else "NEUTRAL") if has_data else "UNKNOWN",
+            "rsi": round(rsi, 1),
+            "score": round(float(s["score"][i]), 1),
+            "reason": _reason(i, f, s)
+        }
+        if extra:
+            for key, column in extra.items():
+                brief[key] = str(column[i])
+        briefs[symbols[i]] = brief
+    return briefs
+
+
+def briefs_from_indicators(symbols: List[str], prices: Dict[str, float],
+                           indicators_by_symbol: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """symbol_briefs from per-symbol calculate_indicators() dicts (scan candidates)"""
+    rows = [indicators_by_symbol.get(sym, {}) for sym in symbols]
+    f = {
+        "ema_9": np.array([r.get("ema_9", 0) for r in rows], dtype=float),
+        "ema_21": np.array([r.get("ema_21", 0) for r in rows], dtype=float),
+        "ema_50": np.array([r.get("ema_50", 0) for r in rows], dtype=float),
+        "rsi": np.array([r.get("rsi_14", 50) for r in rows], dtype=float),
+        "macd_hist": np.array([r.get("macd_hist", 0) for r in rows], dtype=float),
+        "atr_pct": np.array([r.get("atr_pct", 0) for r in rows], dtype=float),
+        "relative_volume": np.array([r.get("relative_volume", 1.0) for r in rows], dtype=float),
+        "valid": np.array([bool(r) for r in rows])
+    }
+    f["rsi"] = np.where(np.isnan(f["rsi"]), 50.0, f["rsi"])
+    price_arr = np.array([prices.get(sym, 0) for sym in symbols], dtype=float)
+    return build_briefs(symbols, f, price_arr)
+
+
+# ============================================================
+# UNIVERSE SCANNER - keeps batched candles for every perp, refreshed on a budget
+# ============================================================
+
+class UniverseScanner:
+    """
+    Scores the entire Hyperliquid perp universe every tick.
+
+    Candles are refreshed incrementally: each refresh fetches at most
+    fetch_budget stale (symbol, timeframe) series, stalest first, and a series
+    only goes stale once a new bar has closed. Scoring always runs over
+    everything held in memory.
+
+    The budget comes from SCORING_WEIGHT_PER_MIN and the refresh cadence, so
+    the burst of stale series at every bar boundary is spread over several
+    refreshes instead of blowing through the per-IP weight limit.
+    """
+
+    def __init__(self, hl, fetch_budget: Optional[int] = None, interval_seconds: float = VISION_LANE_SECONDS):
+        """
+        Args:
+            hl: HLClient
+            fetch_budget: Series per refresh (default: derived from the weight budget)
+            interval_seconds: Seconds between refreshes (the vision lane cadence)
+        """
+        self.hl = hl
+        if fetch_budget is None:
+            fetch_budget = scoring_fetch_budget(SCORING_WEIGHT_PER_MIN, interval_seconds)
+            if SCORING_FETCH_BUDGET:
+                fetch_budget = min(fetch_budget, SCORING_FETCH_BUDGET)
+        self.fetch_budget = fetch_budget
+        self._candles: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._fetched_at: Dict[Tuple[str, str], float] = {}
+        self.last_scan_ms = 0.0
+        self.last_fetch_count = 0
+
+    def universe(self) -> List[str]:
+        """Tradable perp names from (cached) meta"""
+        meta = self.hl.get_meta_cached() if self.hl else None
+        if not meta:
+            return []
+        return [a["name"] for a in meta.get("universe", []) if a.get("name") and not a.get("isDelisted")]
+
+    def refresh(self, symbols: List[str], priority: Optional[List[str]] = None) -> int:
+        """
+        Fetch stale candle series within the per-refresh budget.
+
+        Args:
+            symbols: Universe to keep warm
+            priority: Symbols refreshed first (e.g. open positions)
+
+        Returns:
+            Number of series fetched
+        """
+        now = time.time()
+        priority = set(priority or [])
+        stale = []
+        for sym in symbols:
+            for tf in SCORING_TIMEFRAMES:
+                key = (sym, tf)
+                fetched = self._fetched_at.get(key, 0)
+                bar = _TF_SECONDS[tf]
+                if int(fetched // bar) < int(now // bar):
+                    stale.append((sym not in priority, fetched, key))
+        stale.sort()
+
+        fetched_count = 0
+        for _, _, key in stale[:self.fetch_budget]:
+            sym, tf = key
+            try:
+                candles = self.hl.get_candles(sym, tf, limit=SCORING_TIMEFRAMES[tf])
+            except Exception as e:
+                print(f"[SCORING][WARN] {sym} {tf} candles failed: {e}")
+                candles = None
+            # Mark as attempted either way so one bad symbol doesn't eat the budget every tick
+            self._fetched_at[key] = now
+            if candles:
+                self._candles[key] = candles
+            fetched_count += 1
+        return fetched_count
+
+    def score(self, symbols: List[str], prices: Dict[str, float]) -> Dict[str, Dict[str, Any]]:
+        """
+        Ranked symbol_briefs for every symbol with enough 15m history.
+
+        Args:
+            symbols: Universe
+            prices: Current mids (falls back to the last 15m close)
+        """
+        t0 = time.time()
+        ready = [s for s in symbols if len(self._candles.get((s, "15m"), [])) >= MIN_BARS]
+        if not ready:
+            return {}
+
+        primary = candles_to_matrix([self._candles[(s, "15m")] for s in ready], SCORING_TIMEFRAMES["15m"])
+        f = compute_factors(primary)
+
+        confirm = candles_to_matrix([self._candles.get((s, "1h"), []) for s in ready], SCORING_TIMEFRAMES["1h"])
+        f_1h = compute_factors(confirm)
+        trend_1h = np.where(
+            ~f_1h["valid"], "UNKNOWN",
+            np.where(f_1h["ema_9"] > f_1h["ema_21"], "UP", np.where(f_1h["ema_9"] < f_1h["ema_21"], "DOWN", "RANGE"))
+        )
+
+        price_arr = np.array([prices.get(s, 0) for s in ready], dtype=float)
+        price_arr = np.where(price_arr > 0, price_arr, f["last_close"])
+
+        briefs = build_briefs(ready, f, price_arr, extra={"trend_1h": trend_1h})
+        self.last_scan_ms = (time.time() - t0) * 1000
+        return briefs
+
+    def scan(self, priority: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Refresh within budget and score the full universe (best first)"""
+        symbols = self.universe()
+        if not symbols:
+            return {}
+        fetched = self.refresh(symbols, priority)
+        self.last_fetch_count = fetched
+        prices = self.hl.get_prices(symbols)
+        briefs = self.score(symbols, prices)
+        print(f"[SCORING] universe={len(symbols)} scored={len(briefs)} fetched={fetched} "
+              f"score_time={self.last_scan_ms:.1f}ms")
+        return briefs
+
+
+def top_briefs(briefs: Dict[str, Dict[str, Any]], n: int = SCORING_TOP_N) -> Dict[str, Dict[str, Any]]:
+    """First n entries of ranked briefs (dicts keep ranking order)"""
+    return dict(list(briefs.items())[:n])
+
+
+# ============================================================
+# CANDIDATE FUNNEL - stage 1 screener + stage 2 deep-scan sizing
+# ============================================================
+
+# Hyperliquid info weights (docs): light endpoints 2, most others 20,
+# candleSnapshot +1 per 60 candles returned
+WEIGHT_LIGHT = 2
+WEIGHT_INFO = 20
+WEIGHT_CANDLES = 21
+
+
+def scoring_fetch_budget(weight_per_min: float, interval_seconds: float) -> int:
+    """Candle series one refresh may fetch to stay within weight_per_min at this cadence"""
+    return max(1, int(weight_per_min * interval_seconds / 60 // WEIGHT_CANDLES))
+
+
+def _pct_rank(x: np.ndarray) -> np.ndarray:
+    """Percentile rank in [0, 1] (ties share the lower rank)"""
+    if len(x) <= 1:
+        return np.ones_like(x, dtype=float)
+    return np.searchsorted(np.sort(x), x, side="left") / (len(x) - 1)
+
+
+class UniverseScreener:
+    """
+    Stage 1: rank every perp from a single asset-context snapshot.
+
+    Factors (percentile ranks, so units don't matter):
+    - 24h notional volume (liquidity / attention)
+    - |24h move| from prevDayPx
+    - |OI change| since the previous screen
+    - |funding| (crowded positioning)
+    """
+
+    WEIGHTS = {"volume": 0.35, "move": 0.30, "oi_change": 0.20, "funding": 0.15}
+
+    def __init__(self, min_volume_usd: float = 100_000):
+        self.min_volume_usd = min_volume_usd
+        self._prev_oi: Dict[str, float] = {}
+
+    def screen(self, contexts: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+        """
+        Args:
+            contexts: HLClient.get_asset_contexts() output
+
+        Returns:
+            {symbol: {screen_score, move_24h_pct, oi_change_pct, funding_pct, volume_usd}},
+            best first. Illiquid symbols (< min_volume_usd) are skipped.
+        """
+        symbols = [s for s, c in contexts.items() if c["day_volume_usd"] >= self.min_volume_usd and c["mark_price"] > 0]
+        if not symbols:
+            return {}
+
+        volume = np.array([contexts[s]["day_volume_usd"] for s in symbols])
+        mark = np.array([contexts[s]["mark_price"] for s in symbols])
+        prev = np.array([contexts[s]["prev_day_price"] for s in symbols])
+        oi = np.array([contexts[s]["open_interest"] for s in symbols])
+        prev_oi = np.array([self._prev_oi.get(s, contexts[s]["open_interest"]) for s in symbols])
+        funding = np.array([contexts[s]["funding"] for s in symbols])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            move = np.where(prev > 0, (mark - prev) / prev * 100, 0.0)
+            oi_change = np.where(prev_oi > 0, (oi - prev_oi) / prev_oi * 100, 0.0)
+
+        score = 100 * (
+            self.WEIGHTS["volume"] * _pct_rank(volume)
+            + self.WEIGHTS["move"] * _pct_rank(np.abs(move))
+            + self.WEIGHTS["oi_change"] * _pct_rank(np.abs(oi_change))
+            + self.WEIGHTS["funding"] * _pct_rank(np.abs(funding))
+        )
+
+        self._prev_oi = {s: contexts[s]["open_interest"] for s in contexts}
+
+        ranked = {}
+        for i in np.argsort(-score, kind="stable"):
+            ranked[symbols[i]] = {
+                "screen_score": round(float(score[i]), 1),
+                "move_24h_pct": round(float(move[i]), 2),
+                "oi_change_pct": round(float(oi_change[i]), 3),
+                "funding_pct": round(float(funding[i]) * 100, 4),
+                "volume_usd": round(float(volume[i]), 0)
+            }
+        return ranked
+
+
+def rank_candidates(screen: Dict[str, Dict[str, float]],
+                    universe_briefs: Dict[str, Dict[str, Any]]) -> List[str]:
+    """
+    Merge stage-1 screen with the technical universe score.
+
+    Symbols with both get the mean of the two scores; screen-only symbols keep
+    their screen score. Returns symbols best first.
+    """
+    combined = {}
+    for sym, row in screen.items():
+        brief = universe_briefs.get(sym)
+        combined[sym] = (row["screen_score"] + brief["score"]) / 2 if brief else row["screen_score"]
+    for sym, brief in universe_briefs.items():
+        combined.setdefault(sym, brief["score"])
+    return sorted(combined, key=lambda s: combined[s], reverse=True)
+
+
+def deep_scan_cost(hl, symbol: str, timeframes: Dict[str, int]) -> int:
+    """API weight a deep scan of symbol would spend right now (cached series are free)"""
+    cost = sum(0 if hl.is_candles_cached(symbol, tf) else WEIGHT_CANDLES for tf in timeframes)
+    cost += 0 if hl.is_orderbook_cached(symbol) else WEIGHT_LIGHT
+    return cost
+
+
+def select_deep_scan(hl, ranked: List[str], timeframes: Dict[str, int], reserved: List[str],
+                     spent_weight: int = 0, max_k: int = DEEP_SCAN_MAX_K,
+                     interval_seconds: float = VISION_LANE_SECONDS) -> Tuple[List[str], int]:
+    """
+    Stage 2 sizing: pick the top K ranked symbols whose deep scan fits this run's budget.
+
+    The budget is the scan's share of the weight per minute over one run of the
+    vision lane, capped by what the rate limiter actually has left in its
+    rolling minute (other traffic and earlier runs included).
+
+    Args:
+        hl: HLClient (for cache state, limiter budget and recent 429s)
+        ranked: Candidates best first
+        timeframes: Deep-scan TIMEFRAMES_CONFIG
+        reserved: Symbols always scanned (open positions) - charged first, never dropped
+        spent_weight: Weight already used this run (universe refresh, screener)
+        max_k: Upper bound on scanned symbols
+        interval_seconds: Seconds between runs (the vision lane cadence)
+
+    Returns:
+        (symbols to deep scan, budget left)
+    """
+    budget = int(DEEP_SCAN_WEIGHT_PER_MIN * interval_seconds / 60) - spent_weight
+    # Back off hard after a recent 429
+    if time.time() - getattr(hl, "_last_429_time", 0) < 60:
+        budget //= 4
+    if hasattr(hl, "get_rate_limit_remaining"):
+        remaining = hl.get_rate_limit_remaining()
+        if remaining < budget:
+            budget = int(remaining)
+
+    selected = []
+    for sym in reserved:
+        if sym not in selected:
+            selected.append(sym)
+            budget -= deep_scan_cost(hl, sym, timeframes)
+
+    for sym in ranked:
+        if len(selected) >= max(max_k, len(reserved)):
+            break
+        if sym in selected:
+            continue
+        cost = deep_scan_cost(hl, sym, timeframes)
+        # Always allow at least one non-position candidate so the AI sees fresh opportunities
+        if cost > budget and len(selected) > len(reserved):
+            continue
+        selected.append(sym)
+        budget -= cost
+    return selected, budget
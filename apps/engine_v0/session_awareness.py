@@ -66,6 +66,20 @@ SESSIONS = {
 }
 
 
+def session_for_hour(hour: int) -> str:
+    """Session name for a UTC hour"""
+    # Check for overlap first (most important)
+    if 13 <= hour < 16:
+        return "OVERLAP_LONDON_NY"
+    elif 0 <= hour < 8:
+        return "ASIA"
+    elif 8 <= hour < 13:
+        return "LONDON"
+    elif 13 <= hour < 21:
+        return "NEW_YORK"
+    return "QUIET"  # 21 <= hour < 24
+
+
 def get_current_session() -> Dict[str, Any]:
     """
     Get the current trading session with context.
@@ -75,18 +89,7 @@ def get_current_session() -> Dict[str, Any]:
     """
     now = datetime.now(timezone.utc)
     current_hour = now.hour
-    
-    # Check for overlap first (most important)
-    if 13 <= current_hour < 16:
-        session_name = "OVERLAP_LONDON_NY"
-    elif 0 <= current_hour < 8:
-        session_name = "ASIA"
-    elif 8 <= current_hour < 13:
-        session_name = "LONDON"
-    elif 13 <= current_hour < 21:
-        session_name = "NEW_YORK"
-    else:  # 21 <= current_hour < 24
-        session_name = "QUIET"
+    session_name = session_for_hour(current_hour)
     
     session = SESSIONS[session_name]
     
@@ -5,7 +5,7 @@ AI interprets significance - NO hardcoded trading rules
 """
 
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 
 # Session hours in UTC
@@ -16,17 +16,21 @@ SESSIONS = {
 }
 
 
-def calculate_session_levels(candles_1h: List[Dict]) -> Dict[str, Any]:
+def calculate_session_levels(candles_1h: List[Dict], now: Optional[datetime] = None) -> Dict[str, Any]:
     """
     Calculate session highs/lows from 1H candles.
     
+    Args:
+        candles_1h: 1H candles
+        now: Reference time (UTC). Defaults to the wall clock; replay passes its simulated clock.
+    
     Returns:
         Dict with high/low for each session today
     """
     if not candles_1h or len(candles_1h) < 24:
         return {}
     
-    now = datetime.now(timezone.utc)
+    now = now or datetime.now(timezone.utc)
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     
     result = {}
@@ -79,6 +83,31 @@ def calculate_session_levels(candles_1h: List[Dict]) -> Dict[str, Any]:
     return result
 
 
+def refresh_session_levels(session_data: Dict[str, Any], candles_1h: List[Dict]) -> Dict[str, Any]:
+    """Update a cached result (same hour) with the forming 1H candle"""
+    if not session_data or not candles_1h:
+        return session_data
+    bar = candles_1h[-1]
+    current_price = float(bar.get('c', bar.get('close', 0)))
+    bar_high = float(bar.get('h', bar.get('high', 0)))
+    bar_low = float(bar.get('l', bar.get('low', 0)))
+    
+    result = {}
+    for session_name, s in session_data.items():
+        if not isinstance(s, dict):
+            continue
+        s = dict(s)
+        if s.get("active"):
+            # The forming candle belongs to the active session
+            s["high"] = max(s["high"], bar_high)
+            s["low"] = min(s["low"], bar_low)
+            s["range"] = s["high"] - s["low"] if s["high"] and s["low"] else 0
+        s["price_position"] = "ABOVE" if current_price > s["high"] else "BELOW" if current_price < s["low"] else "WITHIN"
+        result[session_name] = s
+    result["current_price"] = current_price
+    return result
+
+
 def format_session_levels_for_prompt(symbol: str, session_data: Dict) -> str:
     """Format session levels for LLM prompt"""
     if not session_data:
@@ -13,6 +13,7 @@ from config import (
     ENABLE_TELEGRAM,
     TELEGRAM_BOT_TOKEN,
     TELEGRAM_ADMIN_IDS,
+    TELEGRAM_CHAT_ID,
     TG_CHAT_MODEL,
     AI_TEMPERATURE
 )
@@ -58,6 +59,31 @@ def clear_test_trade_request():
         del _bot_state["test_trade_request"]
 
 
+# Engine ticks that retry an incomplete /panic before giving up
+PANIC_MAX_ATTEMPTS = 5
+
+
+def report_panic_result(done: bool, report: str):
+    """
+    Engine side: queue the /panic outcome for the chat that confirmed it.
+    An incomplete run (failed read, cancel or close) re-arms the request so
+    the next tick retries, up to PANIC_MAX_ATTEMPTS runs.
+    """
+    attempt = _bot_state.get("panic_attempts", 0) + 1
+    retry = not done and attempt < PANIC_MAX_ATTEMPTS
+    _bot_state["panic_attempts"] = attempt if retry else 0
+    _bot_state["panic_close_all"] = retry
+    if done:
+        status = "✅ PANIC concluído"
+    elif retry:
+        status = f"⚠️ PANIC incompleto - nova tentativa ({attempt + 1}/{PANIC_MAX_ATTEMPTS}) no próximo tick"
+    else:
+        status = "❌ PANIC incompleto após várias tentativas - verifique manualmente"
+    chat_id = _bot_state.get("panic_chat_id") or TELEGRAM_CHAT_ID
+    if chat_id:
+        _bot_state["panic_result"] = {"chat_id": chat_id, "text": f"{status}\n\n{report}"}
+
+
 def send_test_trade_result(chat_id: int, result_text: str):
     """Send test trade result back to Telegram user"""
     _bot_state["test_trade_result"] = {
@@ -166,6 +192,14 @@ class TelegramBot:
                             print(f"[TG][ERROR] Failed to send test trade result: {e}")
                             del _bot_state["test_trade_result"]  # Clear anyway to avoid spam
                     
+                    # Panic outcome (plain text: the report carries raw exchange errors)
+                    result = _bot_state.pop("panic_result", None)
+                    if result:
+                        try:
+                            await app.bot.send_message(chat_id=result["chat_id"], text=result["text"])
+                        except Exception as e:
+                            print(f"[TG][ERROR] Failed to send panic result: {e}")
+                    
                     # Check for daily summary (21h BRT = 00:00 UTC)
                     current_time = datetime.now(timezone.utc)
                     if current_time.timestamp() - last_daily_check > 60:  # Check once per minute
@@ -517,6 +551,8 @@ class TelegramBot:
         elif data == "confirm_panic":
             if is_admin(update.effective_user.id):
                 _bot_state["ai_enabled"] = False
+                _bot_state["panic_chat_id"] = update.effective_chat.id
+                _bot_state["panic_attempts"] = 0
                 _bot_state["panic_close_all"] = True
                 await query.edit_message_text("🚨 PANIC ATIVADO - IA OFF + Fechando posições...")
                 print("[TG][PANIC] Panic mode activated by user")
@@ -0,0 +1,154 @@
+"""
+Tick Profiler - Per-stage wall time of the main loop
+Spans are kept in a rolling window per stage (p50/p95/p99) plus cumulative
+sum/count, published with the dashboard state and served on /api/metrics
+as JSON or Prometheus text.
+"""
+import math
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+from config import TICK_PROFILE_WINDOW
+
+TICK_STAGE = "tick"  # Whole iteration (work only, sleep excluded)
+
+
+def _percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+
+class TickProfiler:
+    """
+    Span tracer for the main loop.
+
+        prof.start_tick()
+        with prof.span("positions"):
+            positions = hl.get_positions_by_symbol()
+        prof.end_tick()
+
+    Repeated spans with the same name inside one tick are added together, so a
+    stage that runs per symbol is reported once per tick.
+    """
+
+    def __init__(self, window: int = TICK_PROFILE_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {}
+        self._sum: Dict[str, float] = {}
+        self._count: Dict[str, int] = {}
+        self._current: Dict[str, float] = {}
+        self._tick_start: Optional[float] = None
+        self.ticks = 0
+        self.last_tick: Dict[str, float] = {}
+
+    def start_tick(self) -> None:
+        self._current = {}
+        self._tick_start = time.perf_counter()
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add a duration to the current tick (or straight to the stats outside a tick)"""
+        if self._tick_start is None:
+            self._observe(name, seconds)
+        else:
+            self._current[name] = self._current.get(name, 0.0) + seconds
+
+    def record_many(self, timings: Dict[str, float]) -> None:
+        """Merge a {stage: seconds} dict (analysis_pipeline.stage_timer output)"""
+        for name, seconds in timings.items():
+            self.record(name, seconds)
+
+    @contextmanager
+    def span(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - t0)
+
+    def end_tick(self) -> Dict[str, float]:
+        """Close the tick and fold its spans into the rolling stats. Returns the tick's spans."""
+        if self._tick_start is None:
+            return {}
+        self._current[TICK_STAGE] = time.perf_counter() - self._tick_start
+        self._tick_start = None
+        for name, seconds in self._current.items():
+            self._observe(name, seconds)
+        self.ticks += 1
+        self.last_tick = self._current
+        return self._current
+
+    def _observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(seconds)
+            self._sum[name] = self._sum.get(name, 0.0) + seconds
+            self._count[name] = self._count.get(name, 0) + 1
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-friendly stats (milliseconds), slowest stage first"""
+        with self._lock:
+            snapshot = {name: sorted(samples) for name, samples in self._samples.items()}
+            sums = dict(self._sum)
+            counts = dict(self._count)
+        stages = {}
+        for name, values in snapshot.items():
+            stages[name] = {
+                "count": counts[name],
+                "sum_s": round(sums[name], 6),
+                "last_ms": round(self.last_tick.get(name, values[-1] if values else 0) * 1000, 2),
+                "mean_ms": round(sum(values) / len(values) * 1000, 2) if values else 0,
+                "p50_ms": round(_percentile(values, 50) * 1000, 2),
+                "p95_ms": round(_percentile(values, 95) * 1000, 2),
+                "p99_ms": round(_percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2) if values else 0
+            }
+        stages = dict(sorted(stages.items(), key=lambda kv: kv[1]["p50_ms"], reverse=True))
+        return {"ticks": self.ticks, "window": self.window, "updated_ms": int(time.time() * 1000), "stages": stages}
+
+    def log_line(self, top: int = 5) -> str:
+        """One-line breakdown of the last tick for the [LOOP] log"""
+        spans = sorted(((n, s) for n, s in self.last_tick.items() if n != TICK_STAGE), key=lambda kv: kv[1], reverse=True)
+        parts = " ".join(f"{n}={s * 1000:.0f}ms" for n, s in spans[:top])
+        return f"total={self.last_tick.get(TICK_STAGE, 0) * 1000:.0f}ms {parts}"
+
+
+def render_prometheus(summary: Dict[str, Any]) -> str:
+    """Prometheus text exposition (summary type) from TickProfiler.summary() output"""
+    lines = [
+        "# HELP engine_tick_stage_seconds Wall time per main loop stage",
+        "# TYPE engine_tick_stage_seconds summary"
+    ]
+    for name, s in summary.get("stages", {}).items():
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+            lines.append(f'engine_tick_stage_seconds{{stage="{label}",quantile="{quantile}"}} {s[key] / 1000:.6f}')
+        lines.append(f'engine_tick_stage_seconds_sum{{stage="{label}"}} {s["sum_s"]:.6f}')
+        lines.append(f'engine_tick_stage_seconds_count{{stage="{label}"}} {s["count"]}')
+    lines += [
+        "# HELP engine_ticks_total Main loop iterations completed",
+        "# TYPE engine_ticks_total counter",
+        f"engine_ticks_total {summary.get('ticks', 0)}",
+        ""
+    ]
+    return "\n".join(lines)
+
+
+# Shared instance
+_profiler: Optional[TickProfiler] = None
+
+
+def get_tick_profiler() -> TickProfiler:
+    """Get the global TickProfiler instance"""
+    global _profiler
+    if _profiler is None:
+        _profiler = TickProfiler()
+    return _profiler
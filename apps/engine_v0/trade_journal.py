@@ -9,12 +9,24 @@ from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
 from threading import Lock
 
+from fills_analytics import RollingAnalytics, WINDOWS_MS
+from trade_similarity import SimilarTradeIndex, summarize
+
 # Journal file path - Use environment variable for Railway Volume persistence
 # Fallback to local path for development
 _DATA_DIR = os.environ.get("DATA_VOLUME_PATH", os.path.join(os.path.dirname(__file__), "data"))
 JOURNAL_FILE = os.path.join(_DATA_DIR, "trade_journal.json")
 
 
+def journal_file_signature() -> Optional[tuple]:
+    """(inode, mtime_ns, size) of the journal file, None if missing; changes on every save"""
+    try:
+        st = os.stat(JOURNAL_FILE)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
 class TradeJournal:
     """
     Trade Journal for structured trade logging.
@@ -39,7 +51,11 @@ class TradeJournal:
         
         self._trades: Dict[str, Dict] = {}  # trade_id -> trade data
         self._open_trades: Dict[str, str] = {}  # symbol -> trade_id (for quick lookup)
+        self.analytics = RollingAnalytics()  # Closed trades by exit time, updated in record_exit
+        self.similar = SimilarTradeIndex()  # Closed trades by entry conditions (kNN)
         self._file_lock = Lock()
+        self.version = 0  # Bumped on every save or reload (dashboard uses it for ETags)
+        self._file_signature = None  # Journal file as last loaded/saved by this process
         
         # Ensure data directory exists
         os.makedirs(os.path.dirname(JOURNAL_FILE), exist_ok=True)
@@ -50,34 +66,83 @@ class TradeJournal:
         print(f"[JOURNAL] Initialized with {len(self._trades)} trades, {len(self._open_trades)} open")
     
     def _load(self):
-        """Load journal from file"""
+        """Load journal from file (indexes are rebuilt aside and swapped in; on failure the current state is kept)"""
         try:
             if os.path.exists(JOURNAL_FILE):
+                signature = journal_file_signature()
                 with open(JOURNAL_FILE, 'r') as f:
                     data = json.load(f)
-                    self._trades = data.get("trades", {})
-                    
-                    # Rebuild open trades index
-                    self._open_trades = {}
-                    for trade_id, trade in self._trades.items():
-                        if trade.get("status") == "OPEN":
-                            self._open_trades[trade["symbol"]] = trade_id
-                    
-                    print(f"[JOURNAL] Loaded {len(self._trades)} trades from disk")
+                trades = data.get("trades", {})
+                
+                # Rebuild open trades index and rolling stats
+                open_trades = {}
+                analytics = RollingAnalytics()
+                similar = SimilarTradeIndex()
+                for trade_id, trade in trades.items():
+                    if trade.get("status") == "OPEN":
+                        open_trades[trade["symbol"]] = trade_id
+                    elif trade.get("result"):
+                        self._track_closed(trade, analytics)
+                        similar.add(trade)
+                
+                self._trades, self._open_trades = trades, open_trades
+                self.analytics, self.similar = analytics, similar
+                self._file_signature = signature
+                print(f"[JOURNAL] Loaded {len(self._trades)} trades from disk")
         except Exception as e:
             print(f"[JOURNAL][ERROR] Failed to load: {e}")
-            self._trades = {}
-            self._open_trades = {}
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Reload when another process saved the journal since this one last read
+        or wrote it (dashboard reader workers; the engine is the only writer).
+        
+        Returns:
+            True if the journal was reloaded
+        """
+        signature = journal_file_signature()
+        if signature is None or signature == self._file_signature:
+            return False
+        with self._file_lock:
+            if signature == self._file_signature:
+                return False
+            self._load()
+            self.version += 1
+        return True
+    
+    def _track_closed(self, trade: Dict, analytics: Optional[RollingAnalytics] = None):
+        """Fold a closed trade into the rolling stats (keyed by exit time)"""
+        result = trade["result"]
+        entry = trade.get("entry") or {}
+        timestamp = (trade.get("exit") or {}).get("timestamp") or entry.get("timestamp")
+        try:
+            time_ms = int(datetime.fromisoformat(str(timestamp).replace('Z', '+00:00')).timestamp() * 1000)
+        except (TypeError, ValueError):
+            time_ms = 0
+        (analytics or self.analytics).add(
+            time_ms,
+            trade.get("symbol", ""),
+            pnl=result.get("pnl_usd") or 0,
+            volume=abs((entry.get("size") or 0) * (entry.get("price") or 0)),
+            duration_min=result.get("duration_minutes"),
+            return_pct=result.get("pnl_pct"),
+            closing=True
+        )
     
     def _save(self):
         """Save journal to file"""
         try:
             with self._file_lock:
-                with open(JOURNAL_FILE, 'w') as f:
+                # Temp + rename: dashboard workers reload the file and must never see it half written
+                tmp_path = f"{JOURNAL_FILE}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w') as f:
                     json.dump({
                         "trades": self._trades,
                         "last_updated": datetime.now(timezone.utc).isoformat()
                     }, f, indent=2, default=str)
+                os.replace(tmp_path, JOURNAL_FILE)
+                self._file_signature = journal_file_signature()
+                self.version += 1
         except Exception as e:
             print(f"[JOURNAL][ERROR] Failed to save: {e}")
     
@@ -218,6 +283,8 @@ class TradeJournal:
         
         # Remove from open trades
         del self._open_trades[symbol]
+        self._track_closed(trade)
+        self.similar.add(trade)
         self._save()
         
         win_emoji = "[WIN]" if pnl_usd > 0 else "[LOSS]"
@@ -254,14 +321,17 @@ class TradeJournal:
     
     def get_stats(self) -> Dict[str, Any]:
         """
-        Calculate trading statistics.
+        Trading statistics, read from the rolling aggregates (no scan).
         
         Returns:
-            Dict with win_rate, avg_pnl, total_trades, etc.
+            Dict with win_rate, avg_pnl, total_trades, profit_factor,
+            and 24h/7d/30d windows
         """
-        closed_trades = [t for t in self._trades.values() if t.get("result")]
+        windows = self.analytics.summary()
+        t = windows["all"]
+        closed = t["trades"]
         
-        if not closed_trades:
+        if not closed:
             return {
                 "total_trades": len(self._trades),
                 "open_trades": len(self._open_trades),
@@ -271,29 +341,51 @@ class TradeJournal:
                 "total_pnl_usd": 0,
                 "avg_duration_minutes": 0,
                 "best_trade_pct": 0,
-                "worst_trade_pct": 0
+                "worst_trade_pct": 0,
+                "profit_factor": None,
+                "windows": {name: windows[name] for name in WINDOWS_MS}
             }
         
-        wins = [t for t in closed_trades if t["result"]["win"]]
-        
-        pnl_list = [t["result"]["pnl_pct"] for t in closed_trades]
-        pnl_usd_list = [t["result"]["pnl_usd"] for t in closed_trades]
-        duration_list = [t["result"]["duration_minutes"] for t in closed_trades]
-        
         return {
             "total_trades": len(self._trades),
             "open_trades": len(self._open_trades),
-            "closed_trades": len(closed_trades),
-            "wins": len(wins),
-            "losses": len(closed_trades) - len(wins),
-            "win_rate": round(len(wins) / len(closed_trades) * 100, 1),
-            "avg_pnl_pct": round(sum(pnl_list) / len(pnl_list), 2),
-            "total_pnl_usd": round(sum(pnl_usd_list), 2),
-            "avg_duration_minutes": round(sum(duration_list) / len(duration_list), 1),
-            "best_trade_pct": round(max(pnl_list), 2),
-            "worst_trade_pct": round(min(pnl_list), 2)
+            "closed_trades": closed,
+            "wins": t["wins"],
+            "losses": closed - t["wins"],
+            "win_rate": round(t["wins"] / closed * 100, 1),
+            "avg_pnl_pct": round(t["avg_return_pct"] or 0, 2),
+            "total_pnl_usd": round(t["pnl"], 2),
+            "avg_duration_minutes": round(t["avg_duration_minutes"] or 0, 1),
+            "best_trade_pct": round(t["best_return_pct"] or 0, 2),
+            "worst_trade_pct": round(t["worst_return_pct"] or 0, 2),
+            "profit_factor": t["profit_factor"],  # None when there are no losing trades
+            "windows": {name: windows[name] for name in WINDOWS_MS}
         }
     
+    def find_similar(
+        self,
+        market_snapshot: Dict[str, Any],
+        k: int = 5,
+        symbol: Optional[str] = None,
+        side: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Closed trades whose entry conditions were closest to the current ones.
+        
+        Args:
+            market_snapshot: Current conditions (same fields as record_entry's snapshot)
+            k: Number of trades to return
+            symbol: Only trades of this symbol (None = any)
+            side: Only "LONG" or "SHORT" trades (None = both)
+            
+        Returns:
+            Outcomes of the k nearest trades, nearest first
+        """
+        snapshot = self._sanitize_snapshot(market_snapshot)
+        # Neutral confidence: only the market tags of the setup are compared
+        tags = self._generate_tags(side or "", 0.7, snapshot)
+        return self.similar.query(snapshot, tags, k=k, symbol=symbol, side=side)
+    
     def export_csv(self) -> str:
         """Export journal to CSV format string"""
         headers = [
@@ -350,7 +442,8 @@ class TradeJournal:
             "ema_trend": snapshot.get("trend", "UNKNOWN"),
             "bos_status": snapshot.get("bos_status", "UNKNOWN"),
             "choch_detected": snapshot.get("choch_detected", False),
-            "atr_pct": snapshot.get("atr_pct", 0)
+            "atr_pct": snapshot.get("atr_pct", 0),
+            "fear_greed": snapshot.get("fear_greed")
         }
     
     def _generate_tags(self, side: str, confidence: float, snapshot: Dict) -> List[str]:
@@ -460,7 +553,7 @@ def get_recent_trades_for_ai(limit: int = 10) -> Dict[str, Any]:
         Dict with recent trades summary and per-symbol performance
     """
     j = get_journal()
-    all_trades = j.get_all_trades(limit=50)  # Get more for stats
+    all_trades = j.get_all_trades(limit=limit)
     stats = j.get_stats()
     
     # Format recent trades (last N)
@@ -485,38 +578,17 @@ def get_recent_trades_for_ai(limit: int = 10) -> Dict[str, Any]:
             "reason": entry.get("reason", "")[:100]  # Truncate
         })
     
-    # Per-symbol performance (last 24h)
-    from datetime import datetime, timezone, timedelta
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
-    
+    # Per-symbol performance (trades closed in the last 24h, from the rolling stats)
     symbol_stats = {}
-    for trade in all_trades:
-        symbol = trade.get("symbol")
-        result = trade.get("result")
-        entry_time = trade.get("entry", {}).get("timestamp", "")
-        
-        if not result or not entry_time:
-            continue
-            
-        try:
-            trade_time = datetime.fromisoformat(entry_time.replace('Z', '+00:00'))
-            if trade_time < cutoff:
-                continue
-        except:
-            continue
-        
-        if symbol not in symbol_stats:
-            symbol_stats[symbol] = {"trades": 0, "wins": 0, "total_pnl": 0}
-        
-        symbol_stats[symbol]["trades"] += 1
-        if result.get("win"):
-            symbol_stats[symbol]["wins"] += 1
-        symbol_stats[symbol]["total_pnl"] += result.get("pnl_usd", 0)
-    
-    # Calculate win rate per symbol
-    for sym, data in symbol_stats.items():
-        data["win_rate"] = round(data["wins"] / data["trades"] * 100, 1) if data["trades"] > 0 else 0
-        data["total_pnl"] = round(data["total_pnl"], 2)
+    for symbol, windows in j.analytics.by_coin().items():
+        day = windows["24h"]
+        if day["trades"]:
+            symbol_stats[symbol] = {
+                "trades": day["trades"],
+                "wins": day["wins"],
+                "total_pnl": round(day["pnl"], 2),
+                "win_rate": round(day["win_rate"], 1)
+            }
     
     return {
         "overall_stats": {
@@ -532,3 +604,39 @@ def get_recent_trades_for_ai(limit: int = 10) -> Dict[str, Any]:
         "recent_trades": recent
     }
 
+
+def get_similar_setups_for_ai(snapshots: Dict[str, Dict[str, Any]], k: int = 5) -> Dict[str, Any]:
+    """
+    The AI's own closest past setups for each symbol it is about to decide on.
+    
+    Args:
+        snapshots: {symbol: current market snapshot (record_entry schema)}
+        k: Similar trades per symbol
+        
+    Returns:
+        {symbol: {"summary": win rate / avg PnL of the neighbours, "setups": [...]}},
+        empty while the journal has no closed trades
+    """
+    j = get_journal()
+    if not len(j.similar):
+        return {}
+    
+    result = {}
+    for symbol, snapshot in snapshots.items():
+        setups = j.find_similar(snapshot, k=k)
+        if setups:
+            result[symbol] = {
+                "summary": summarize(setups),
+                "setups": [
+                    {
+                        "symbol": s["symbol"],
+                        "side": s["side"],
+                        "pnl_pct": s["pnl_pct"],
+                        "exit_type": s["exit_type"],
+                        "duration_min": s["duration_min"],
+                        "distance": s["distance"]
+                    }
+                    for s in setups
+                ]
+            }
+    return result
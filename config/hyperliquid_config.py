@@ -30,6 +30,45 @@ ACCOUNT_ADDRESS = os.getenv("HYPERLIQUID_ACCOUNT_ADDRESS", "")
 DEFAULT_SLIPPAGE = float(os.getenv("HYPERLIQUID_DEFAULT_SLIPPAGE", "0.01"))  # 1% default
 MAX_RETRY_ATTEMPTS = int(os.getenv("HYPERLIQUID_MAX_RETRY_ATTEMPTS", "3"))
 REQUEST_TIMEOUT = int(os.getenv("HYPERLIQUID_REQUEST_TIMEOUT", "30"))  # seconds
+MAX_CONCURRENT_REQUESTS = int(os.getenv("HYPERLIQUID_MAX_CONCURRENT_REQUESTS", "8"))  # SDK calls in flight at once
+
+# Client-side execution algorithms (tools/execution_tools.py)
+EXEC_MAX_SLIPPAGE_BPS = float(os.getenv("HYPERLIQUID_EXEC_MAX_SLIPPAGE_BPS", "10"))  # Child orders never cross further than this from mid
+EXEC_SLICE_SECONDS = float(os.getenv("HYPERLIQUID_EXEC_SLICE_SECONDS", "30"))  # Default spacing between TWAP/VWAP/POV slices
+EXEC_POLL_SECONDS = float(os.getenv("HYPERLIQUID_EXEC_POLL_SECONDS", "2"))  # Iceberg resting-order checks
+EXEC_MIN_CHILD_NOTIONAL = float(os.getenv("HYPERLIQUID_EXEC_MIN_CHILD_NOTIONAL", "10"))  # Exchange minimum order value (USD)
+
+# Local closed-candle cache for MarketTools (same file layout as the engine's candle archive; empty = off)
+CANDLE_CACHE_PATH = os.getenv("HYPERLIQUID_CANDLE_CACHE_PATH", os.path.join(
+    os.path.expanduser("~"), ".cache", "hyperliquid-mcp", "candles"))
+
+# Shared read-tool result cache (server.py): seconds each tool's result is reused, 0 = never cached
+RESULT_CACHE_ENABLED = os.getenv("HYPERLIQUID_RESULT_CACHE_ENABLED", "true").lower() == "true"
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("HYPERLIQUID_RESULT_CACHE_MAX_ENTRIES", "1000"))
+RESULT_CACHE_TTLS = {
+    "get_all_mids": 1.0,
+    "get_l2_orderbook": 1.0,
+    "get_candles": 10.0,
+    "get_funding_rates": 30.0,
+    "get_asset_contexts": 5.0,
+    "get_user_state": 3.0,  # Account reads are also dropped after every trading tool
+    "get_positions": 3.0,
+    "get_open_orders": 3.0,
+    # Per-account reads of get_multi_account_overview
+    "sub_accounts": 60.0,
+    "account_state": 3.0,
+    "account_open_orders": 3.0,
+    "account_fills": 10.0
+}
+# Overrides as "tool=seconds,tool=seconds" (e.g. "get_all_mids=0.5,get_candles=30")
+for _item in filter(None, os.getenv("HYPERLIQUID_RESULT_CACHE_TTLS", "").split(",")):
+    _tool, _, _seconds = _item.partition("=")
+    RESULT_CACHE_TTLS[_tool.strip()] = float(_seconds)
+
+# Disk snapshot of perp/spot meta so the SDK clients start without fetching it (empty = off)
+META_CACHE_PATH = os.getenv("HYPERLIQUID_META_CACHE_PATH", os.path.join(
+    os.path.expanduser("~"), ".cache", "hyperliquid-mcp", "meta"))
+META_CACHE_MAX_AGE_HOURS = float(os.getenv("HYPERLIQUID_META_CACHE_MAX_AGE_HOURS", "24"))  # Older snapshots are refetched
 
 
 def validate_config() -> tuple[bool, Optional[str]]:
@@ -75,4 +114,5 @@ def get_config_summary() -> str:
 - Default Slippage: {DEFAULT_SLIPPAGE * 100}%
 - Max Retry Attempts: {MAX_RETRY_ATTEMPTS}
 - Request Timeout: {REQUEST_TIMEOUT}s
+- Max Concurrent Requests: {MAX_CONCURRENT_REQUESTS}
 """
@@ -1,27 +1,34 @@
 """MCP Server for Hyperliquid Trading Platform."""
 import os
 import logging
-from typing import Dict, Any, Optional, List
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Union
 from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from mcp.server.fastmcp import FastMCP, Context
-from hyperliquid.info import Info
-from hyperliquid.exchange import Exchange
-from eth_account import Account
 
-from tools import TradingTools, AccountTools, MarketTools, WebSocketTools
+from tools.async_client import LazyClient, shutdown_executor
+from tools.client_factory import create_clients
+from tools.result_cache import ResultCache, cached_tool, invalidates, MARKET, ACCOUNT
 from config.hyperliquid_config import (
     API_URL,
     WS_URL,
     PRIVATE_KEY,
     ACCOUNT_ADDRESS,
     NETWORK,
+    META_CACHE_PATH,
+    META_CACHE_MAX_AGE_HOURS,
+    RESULT_CACHE_ENABLED,
+    RESULT_CACHE_MAX_ENTRIES,
+    RESULT_CACHE_TTLS,
     validate_config,
     get_config_summary
 )
 
+if TYPE_CHECKING:
+    from tools import TradingTools, AccountTools, MarketTools, WebSocketTools, ExecutionTools, SnapshotTools
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -32,21 +39,73 @@ logger = logging.getLogger(__name__)
 
 @dataclass
 class AppContext:
-    """Application context with tool instances and SDK clients."""
-    info_client: Info
-    exchange_client: Exchange
-    trading_tools: TradingTools
-    account_tools: AccountTools
-    market_tools: MarketTools
-    websocket_tools: WebSocketTools
+    """
+    Application context with SDK clients and tool groups.
+
+    The SDK clients are LazyClients and each tool group is created (and its
+    module imported) the first time a tool of that group is called.
+    """
+    info_client: LazyClient
+    exchange_client: LazyClient
+    result_cache: Optional[ResultCache]
     account_address: str
     network: str
+    _tools: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    def _tool(self, name: str, build) -> Any:
+        tool = self._tools.get(name)
+        if tool is None:
+            tool = self._tools[name] = build()
+            logger.info(f"{name} initialized")
+        return tool
+
+    @property
+    def trading_tools(self) -> "TradingTools":
+        from tools.trading_tools import TradingTools
+        return self._tool("trading_tools", lambda: TradingTools(
+            self.exchange_client, self.info_client, self.account_address))
+
+    @property
+    def account_tools(self) -> "AccountTools":
+        from tools.account_tools import AccountTools
+        return self._tool("account_tools", lambda: AccountTools(
+            self.info_client, self.account_address, self.result_cache))
+
+    @property
+    def market_tools(self) -> "MarketTools":
+        from tools.market_tools import MarketTools
+        return self._tool("market_tools", lambda: MarketTools(self.info_client, self.account_address))
+
+    @property
+    def websocket_tools(self) -> "WebSocketTools":
+        from tools.websocket_tools import WebSocketTools
+        return self._tool("websocket_tools", lambda: WebSocketTools(WS_URL, self.account_address))
+
+    @property
+    def execution_tools(self) -> "ExecutionTools":
+        from tools.execution_tools import ExecutionTools
+        cache = self.result_cache
+        # Running algos drop the cached account reads whenever a child order changes the account
+        return self._tool("execution_tools", lambda: ExecutionTools(
+            self.exchange_client, self.info_client, self.account_address,
+            on_account_change=(lambda: cache.invalidate(ACCOUNT)) if cache else None))
+
+    @property
+    def snapshot_tools(self) -> "SnapshotTools":
+        from tools.snapshot_tools import SnapshotTools
+        return self._tool("snapshot_tools", lambda: SnapshotTools(
+            self.market_tools, self.account_tools, self.result_cache))
 
 
 # Global variable to store application context
 app_context: Optional[AppContext] = None
 
 
+def _result_cache() -> Optional[ResultCache]:
+    """Shared read-tool cache (None before startup or when disabled)"""
+    return app_context.result_cache if app_context is not None else None
+
+
 @asynccontextmanager
 async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
     """
@@ -54,10 +113,10 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
 
     This function:
     1. Validates environment configuration
-    2. Initializes Hyperliquid Info and Exchange clients
-    3. Creates tool instances
-    4. Yields application context
-    5. Handles cleanup on shutdown
+    2. Sets up lazy Hyperliquid Info and Exchange clients (built on first use,
+       from the disk meta snapshot when there is one)
+    3. Yields application context (tool groups are created on first use)
+    4. Handles cleanup on shutdown
     """
     # Validate configuration
     is_valid, error_message = validate_config()
@@ -68,41 +127,26 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
     logger.info(get_config_summary())
 
     try:
-        # Initialize Hyperliquid SDK clients
-        logger.info(f"Initializing Hyperliquid clients for {NETWORK}...")
-
-        # Info client for reading market data and account info
-        info_client = Info(API_URL, skip_ws=True)
-
-        # Exchange client for trading operations
-        # Create wallet from private key for signing transactions
-        wallet = Account.from_key(PRIVATE_KEY)
-        exchange_client = Exchange(
-            wallet=wallet,
-            base_url=API_URL,
-            account_address=ACCOUNT_ADDRESS
+        # Info client for reading market data and account info, Exchange client
+        # for trading operations (signs with the private key). Neither touches
+        # the network until the first tool call.
+        info_client, exchange_client = create_clients(
+            API_URL, PRIVATE_KEY, ACCOUNT_ADDRESS,
+            meta_cache_path=META_CACHE_PATH,
+            meta_max_age_hours=META_CACHE_MAX_AGE_HOURS
         )
-
-        logger.info(f"Connected to Hyperliquid {NETWORK}")
+        logger.info(f"Hyperliquid {NETWORK} clients will connect on first use")
         logger.info(f"Account: {ACCOUNT_ADDRESS[:6]}...{ACCOUNT_ADDRESS[-4:]}")
 
-        # Initialize tool instances
-        trading_tools = TradingTools(exchange_client, info_client, ACCOUNT_ADDRESS)
-        account_tools = AccountTools(info_client, ACCOUNT_ADDRESS)
-        market_tools = MarketTools(info_client, ACCOUNT_ADDRESS)
-        websocket_tools = WebSocketTools(WS_URL, ACCOUNT_ADDRESS)
-
-        logger.info("All tools initialized successfully")
+        # Shared cache for read tools; trading tools and running algos drop its account entries
+        result_cache = ResultCache(RESULT_CACHE_TTLS, RESULT_CACHE_MAX_ENTRIES) if RESULT_CACHE_ENABLED else None
 
         # Create and store application context globally
         global app_context
         app_context = AppContext(
             info_client=info_client,
             exchange_client=exchange_client,
-            trading_tools=trading_tools,
-            account_tools=account_tools,
-            market_tools=market_tools,
-            websocket_tools=websocket_tools,
+            result_cache=result_cache,
             account_address=ACCOUNT_ADDRESS,
             network=NETWORK
         )
@@ -117,7 +161,11 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
     finally:
         # Cleanup on shutdown
         logger.info("Shutting down Hyperliquid MCP Server...")
-        # Add any cleanup logic here (close connections, etc.)
+        # Stop running execution algos (pulls their resting child orders)
+        if app_context is not None and "execution_tools" in app_context._tools:
+            await app_context.execution_tools.shutdown()
+        # Release the blocking-call executor threads
+        shutdown_executor()
 
 
 # Create MCP server
@@ -129,10 +177,11 @@ mcp = FastMCP(
 
 
 # ============================================================================
-# TRADING TOOLS (9 methods)
+# TRADING TOOLS (10 methods)
 # ============================================================================
 
 @mcp.tool()
+@invalidates(_result_cache, ACCOUNT)
 async def place_order(
     coin: str,
     is_buy: bool,
@@ -177,6 +226,7 @@ async def place_order(
 
 
 @mcp.tool()
+@invalidates(_result_cache, ACCOUNT)
 async def place_batch_orders(
     orders: List[Dict[str, Any]],
     ctx: Context = None
@@ -206,6 +256,7 @@ async def place_batch_orders(
 
 
 @mcp.tool()
+@invalidates(_result_cache, ACCOUNT)
 async def cancel_order(
     coin: str,
     order_id: Optional[int] = None,
@@ -235,6 +286,32 @@ async def cancel_order(
 
 
 @mcp.tool()
+@invalidates(_result_cache, ACCOUNT)
+async def cancel_batch_orders(
+    cancels: List[Dict[str, Any]],
+    ctx: Context = None
+) -> List[Dict[str, Any]]:
+    """
+    Cancel multiple orders in a single batch request.
+
+    Args:
+        cancels: List of cancel dictionaries, each containing:
+            - coin: str
+            - order_id: int (optional if cloid provided)
+            - cloid: str (optional if order_id provided)
+
+    Returns:
+        List of result dictionaries, one per cancel (in input order)
+    """
+    # Use global app_context
+    if ctx: ctx.info(f"Canceling batch of {len(cancels)} orders")
+
+    result = await app_context.trading_tools.cancel_batch_orders(cancels)
+    return result
+
+
+@mcp.tool()
+@invalidates(_result_cache, ACCOUNT)
 async def cancel_all_orders(
     coin: Optional[str] = None,
     ctx: Context = None
@@ -259,6 +336,7 @@ async def cancel_all_orders(
 
 
 @mcp.tool()
+@invalidates(_result_cache, ACCOUNT)
 async def modify_order(
     coin: str,
     order_id: int,
@@ -294,6 +372,7 @@ async def modify_order(
 
 
 @mcp.tool()
+@invalidates(_result_cache, ACCOUNT)
 async def place_twap_order(
     coin: str,
     is_buy: bool,
@@ -332,6 +411,7 @@ async def place_twap_order(
 
 
 @mcp.tool()
+@invalidates(_result_cache, ACCOUNT)
 async def adjust_leverage(
     coin: str,
     leverage: int,
@@ -365,6 +445,7 @@ async def adjust_leverage(
 
 
 @mcp.tool()
+@invalidates(_result_cache, ACCOUNT)
 async def modify_isolated_margin(
     coin: str,
     amount: float,
@@ -427,10 +508,11 @@ async def update_dead_mans_switch(
 
 
 # ============================================================================
-# ACCOUNT TOOLS (8 methods)
+# ACCOUNT TOOLS (10 methods)
 # ============================================================================
 
 @mcp.tool()
+@cached_tool(_result_cache, ACCOUNT)
 async def get_user_state(
     ctx: Context = None
 ) -> Dict[str, Any]:
@@ -454,6 +536,7 @@ async def get_user_state(
 
 
 @mcp.tool()
+@cached_tool(_result_cache, ACCOUNT)
 async def get_open_orders(
     coin: Optional[str] = None,
     ctx: Context = None
@@ -475,6 +558,7 @@ async def get_open_orders(
 
 
 @mcp.tool()
+@cached_tool(_result_cache, ACCOUNT)
 async def get_positions(
     ctx: Context = None
 ) -> Dict[str, Any]:
@@ -498,6 +582,8 @@ async def get_positions(
 async def get_user_fills(
     coin: Optional[str] = None,
     limit: int = 100,
+    compact: bool = False,
+    stats: bool = False,
     ctx: Context = None
 ) -> Dict[str, Any]:
     """
@@ -506,6 +592,8 @@ async def get_user_fills(
     Args:
         coin: Optional coin symbol to filter fills
         limit: Maximum number of fills to return (max 2000)
+        compact: Return columns (dt seconds after t0, side, px, sz, fee, pnl) and a per-coin summary
+        stats: Add rolling 24h/7d/30d/all-time trade stats (win rate, profit factor, PnL, fees)
 
     Returns:
         List of fills with trade details including price, size, fees, PnL
@@ -513,7 +601,7 @@ async def get_user_fills(
     # Use global app_context
     if ctx: ctx.info(f"Fetching user fills{f' for {coin}' if coin else ''} (limit={limit})")
 
-    result = await app_context.account_tools.get_user_fills(coin, limit)
+    result = await app_context.account_tools.get_user_fills(coin, limit, compact, stats)
     return result
 
 
@@ -521,6 +609,7 @@ async def get_user_fills(
 async def get_historical_orders(
     coin: Optional[str] = None,
     limit: int = 100,
+    stats: bool = False,
     ctx: Context = None
 ) -> Dict[str, Any]:
     """
@@ -529,6 +618,7 @@ async def get_historical_orders(
     Args:
         coin: Optional coin symbol to filter orders
         limit: Maximum number of orders to return
+        stats: Add rolling 24h/7d/30d/all-time trade stats (win rate, profit factor, PnL, fees)
 
     Returns:
         List of historical orders with status (filled, open, partially_filled)
@@ -536,7 +626,31 @@ async def get_historical_orders(
     # Use global app_context
     if ctx: ctx.info(f"Fetching historical orders{f' for {coin}' if coin else ''} (limit={limit})")
 
-    result = await app_context.account_tools.get_historical_orders(coin, limit)
+    result = await app_context.account_tools.get_historical_orders(coin, limit, stats)
+    return result
+
+
+@mcp.tool()
+async def get_trade_stats(
+    coin: Optional[str] = None,
+    by_coin: bool = False,
+    ctx: Context = None
+) -> Dict[str, Any]:
+    """
+    Get trading performance over 24h, 7d, 30d and all-time from the account's fills.
+
+    Args:
+        coin: Stats of one coin (default: all coins together)
+        by_coin: Also return the windows of every coin traded
+
+    Returns:
+        Per window: trades, wins, losses, win_rate, pnl, profit_factor, fees,
+        volume, avg_duration_minutes, best/worst trade PnL
+    """
+    # Use global app_context
+    if ctx: ctx.info(f"Fetching trade stats{f' for {coin}' if coin else ''}")
+
+    result = await app_context.account_tools.get_trade_stats(coin, by_coin)
     return result
 
 
@@ -578,6 +692,39 @@ async def get_subaccounts(
     return result
 
 
+@mcp.tool()
+async def get_multi_account_overview(
+    addresses: Optional[List[str]] = None,
+    include_orders: bool = True,
+    include_fills: bool = False,
+    fills_limit: int = 50,
+    ctx: Context = None
+) -> Dict[str, Any]:
+    """
+    Get state, positions and open orders of several accounts at once, with an aggregated risk view.
+
+    Args:
+        addresses: Accounts to include (default: the configured account and all its sub-accounts)
+        include_orders: Include open orders of every account
+        include_fills: Include recent fills of every account (compact format)
+        fills_limit: Fills kept per account
+
+    Returns:
+        Per-account summaries, net/gross exposure per coin across accounts,
+        totals (equity, margin, gross leverage) and risk flags
+    """
+    # Use global app_context
+    if ctx: ctx.info(f"Fetching multi-account overview ({len(addresses) if addresses else 'all sub-accounts'})")
+
+    result = await app_context.account_tools.get_multi_account_overview(
+        addresses=addresses,
+        include_orders=include_orders,
+        include_fills=include_fills,
+        fills_limit=fills_limit
+    )
+    return result
+
+
 @mcp.tool()
 async def get_rate_limit_status(
     ctx: Context = None
@@ -600,10 +747,11 @@ async def get_rate_limit_status(
 
 
 # ============================================================================
-# MARKET TOOLS (6 methods)
+# MARKET TOOLS (8 methods)
 # ============================================================================
 
 @mcp.tool()
+@cached_tool(_result_cache, MARKET)
 async def get_all_mids(
     ctx: Context = None
 ) -> Dict[str, float]:
@@ -617,15 +765,16 @@ async def get_all_mids(
     # Use global app_context
     if ctx: ctx.info("Fetching all mid prices")
 
-    # Note: This is NOT async in the tool class
-    result = app_context.market_tools.get_all_mids()
+    result = await app_context.market_tools.get_all_mids()
     return result
 
 
 @mcp.tool()
+@cached_tool(_result_cache, MARKET)
 async def get_l2_orderbook(
     coin: str,
     depth: int = 20,
+    compact: bool = False,
     ctx: Context = None
 ) -> Dict[str, Any]:
     """
@@ -634,6 +783,7 @@ async def get_l2_orderbook(
     Args:
         coin: Symbol to get order book for (e.g., "BTC", "ETH")
         depth: Number of price levels per side (max 20)
+        compact: Return px/sz columns per side plus a spread/imbalance summary
 
     Returns:
         Order book with bids, asks, spread, volumes, and liquidity metrics
@@ -641,18 +791,21 @@ async def get_l2_orderbook(
     # Use global app_context
     if ctx: ctx.info(f"Fetching L2 orderbook for {coin} (depth={depth})")
 
-    # Note: This is NOT async in the tool class
-    result = app_context.market_tools.get_l2_orderbook(coin, depth)
+    result = await app_context.market_tools.get_l2_orderbook(coin, depth, compact)
     return result
 
 
 @mcp.tool()
+@cached_tool(_result_cache, MARKET)
 async def get_candles(
     coin: str,
     interval: str = "1h",
     limit: int = 100,
+    raw: bool = False,
+    compact: bool = False,
+    max_points: Optional[int] = None,
     ctx: Context = None
-) -> List[Dict[str, Any]]:
+) -> Union[List[Any], Dict[str, Any]]:
     """
     Get historical candle (OHLCV) data.
 
@@ -660,15 +813,59 @@ async def get_candles(
         coin: Symbol to get candles for (e.g., "BTC", "ETH")
         interval: Candle interval - "1m", "5m", "15m", "1h", "4h", "1d"
         limit: Number of candles to return (max 5000)
+        raw: Return compact numeric rows [t, o, h, l, c, v, n] instead of dicts
+        compact: Return columns o/h/l/c/v/n with a shared time base (t0 + step) and a summary
+        max_points: With compact, merge bars so at most this many are returned
 
     Returns:
         List of candles with timestamp, open, high, low, close, volume
+        (a single columnar dict when compact=True)
     """
     # Use global app_context
     if ctx: ctx.info(f"Fetching {limit} {interval} candles for {coin}")
 
-    # Note: This is NOT async in the tool class
-    result = app_context.market_tools.get_candles(coin, interval, limit)
+    result = await app_context.market_tools.get_candles(coin, interval, limit, raw, compact, max_points)
+    return result
+
+
+@mcp.tool()
+async def get_candle_history(
+    coin: str,
+    interval: str = "15m",
+    start_time: Optional[int] = None,
+    end_time: Optional[int] = None,
+    cursor: Optional[int] = None,
+    page_size: int = 5000,
+    format: str = "columnar",
+    ctx: Context = None
+) -> Dict[str, Any]:
+    """
+    Get long candle history one page at a time (served from the local candle cache when possible).
+
+    Args:
+        coin: Symbol (e.g., "BTC")
+        interval: Candle interval - "1m", "5m", "15m", "1h", "4h", "1d", ...
+        start_time: First candle open time in ms (default: one page before end_time)
+        end_time: Last candle open time in ms (default: now)
+        cursor: next_cursor from the previous page
+        page_size: Candles per page (max 5000)
+        format: "columnar" (one list per column) or "rows" ([t, o, h, l, c, v, n])
+
+    Returns:
+        Page data with columns, count and next_cursor (None on the last page)
+    """
+    # Use global app_context
+    if ctx: ctx.info(f"Fetching {interval} candle history for {coin} (cursor={cursor})")
+
+    result = await app_context.market_tools.get_candle_history(
+        coin=coin,
+        interval=interval,
+        start_time=start_time,
+        end_time=end_time,
+        cursor=cursor,
+        page_size=page_size,
+        format=format
+    )
     return result
 
 
@@ -691,12 +888,12 @@ async def get_recent_trades(
     # Use global app_context
     if ctx: ctx.info(f"Fetching {limit} recent trades for {coin}")
 
-    # Note: This is NOT async in the tool class
-    result = app_context.market_tools.get_recent_trades(coin, limit)
+    result = await app_context.market_tools.get_recent_trades(coin, limit)
     return result
 
 
 @mcp.tool()
+@cached_tool(_result_cache, MARKET)
 async def get_funding_rates(
     ctx: Context = None
 ) -> List[Dict[str, Any]]:
@@ -713,12 +910,12 @@ async def get_funding_rates(
     # Use global app_context
     if ctx: ctx.info("Fetching funding rates for all perpetuals")
 
-    # Note: This is NOT async in the tool class
-    result = app_context.market_tools.get_funding_rates()
+    result = await app_context.market_tools.get_funding_rates()
     return result
 
 
 @mcp.tool()
+@cached_tool(_result_cache, MARKET)
 async def get_asset_contexts(
     coin: str,
     ctx: Context = None
@@ -738,8 +935,44 @@ async def get_asset_contexts(
     # Use global app_context
     if ctx: ctx.info(f"Fetching asset contexts for {coin}")
 
-    # Note: This is NOT async in the tool class
-    result = app_context.market_tools.get_asset_contexts(coin)
+    result = await app_context.market_tools.get_asset_contexts(coin)
+    return result
+
+
+@mcp.tool()
+async def get_market_snapshot(
+    coins: List[str],
+    facets: Optional[List[str]] = None,
+    candle_interval: str = "1h",
+    candle_limit: int = 24,
+    book_depth: int = 5,
+    ctx: Context = None
+) -> Dict[str, Any]:
+    """
+    Get prices, contexts, order books, candles, positions and open orders for several coins in one call.
+
+    Args:
+        coins: Symbols to include (e.g., ["BTC", "ETH", "SOL"], max 20)
+        facets: Any of "price", "context", "book", "candles", "position", "orders"
+                (default: price, context, book, position)
+        candle_interval: Interval of the "candles" facet - "1m", "5m", "15m", "1h", "4h", "1d"
+        candle_limit: Candles per coin for the "candles" facet
+        book_depth: Order book levels per side (1-20)
+
+    Returns:
+        Compact per-coin payload ({coin: {mid, context, book, candles, position, orders}})
+        plus any per-facet errors
+    """
+    # Use global app_context
+    if ctx: ctx.info(f"Fetching market snapshot for {coins} (facets={facets})")
+
+    result = await app_context.snapshot_tools.get_market_snapshot(
+        coins=coins,
+        facets=facets,
+        candle_interval=candle_interval,
+        candle_limit=candle_limit,
+        book_depth=book_depth
+    )
     return result
 
 
@@ -901,6 +1134,105 @@ async def get_active_subscriptions(
         }
 
 
+# ============================================================================
+# EXECUTION TOOLS (3 methods)
+# ============================================================================
+
+@mcp.tool()
+@invalidates(_result_cache, ACCOUNT)
+async def start_execution_algo(
+    coin: str,
+    is_buy: bool,
+    size: float,
+    algo: str = "twap",
+    duration_minutes: float = 10,
+    slices: Optional[int] = None,
+    max_slippage_bps: Optional[float] = None,
+    limit_price: Optional[float] = None,
+    display_size: Optional[float] = None,
+    participation_pct: float = 10.0,
+    reduce_only: bool = False,
+    ctx: Context = None
+) -> Dict[str, Any]:
+    """
+    Work a large order with a client-side execution algo instead of one market sweep.
+
+    Child orders are sized to the book depth within max_slippage_bps of the
+    mid; the algo runs in the background (see get_execution_status).
+
+    Args:
+        coin: Trading pair symbol
+        is_buy: True for buy, False for sell
+        size: Total (parent) size
+        algo: "twap" (equal slices), "vwap" (intraday volume profile),
+            "iceberg" (post-only at the touch) or "pov" (percentage of volume)
+        duration_minutes: Schedule horizon
+        slices: Number of slices (default one every 30s)
+        max_slippage_bps: Worst child price vs mid (default 10 bps)
+        limit_price: Optional hard limit for every child
+        display_size: Iceberg visible size (default size / 10)
+        participation_pct: POV share of market volume (default 10%)
+        reduce_only: Children may only reduce the position
+
+    Returns:
+        algo_id and the initial progress snapshot (arrival price, one-shot sweep cost)
+    """
+    # Use global app_context
+    if ctx: ctx.info(f"Starting {algo} execution: {size} {coin} over {duration_minutes}m")
+
+    result = await app_context.execution_tools.start_execution(
+        coin=coin,
+        is_buy=is_buy,
+        size=size,
+        algo=algo,
+        duration_minutes=duration_minutes,
+        slices=slices,
+        max_slippage_bps=max_slippage_bps,
+        limit_price=limit_price,
+        display_size=display_size,
+        participation_pct=participation_pct,
+        reduce_only=reduce_only
+    )
+    return result
+
+
+@mcp.tool()
+async def get_execution_status(
+    algo_id: Optional[str] = None,
+    ctx: Context = None
+) -> Dict[str, Any]:
+    """
+    Progress of client-side execution algos.
+
+    Args:
+        algo_id: One algo (if None, summarizes every tracked algo)
+
+    Returns:
+        Filled/remaining size, child orders and implementation shortfall vs the arrival price
+    """
+    return await app_context.execution_tools.get_execution_status(algo_id)
+
+
+@mcp.tool()
+@invalidates(_result_cache, ACCOUNT)
+async def cancel_execution_algo(
+    algo_id: str,
+    ctx: Context = None
+) -> Dict[str, Any]:
+    """
+    Stop a running execution algo. Fills so far are kept; a resting child order is canceled.
+
+    Args:
+        algo_id: Algo returned by start_execution_algo
+
+    Returns:
+        Final progress snapshot
+    """
+    if ctx: ctx.info(f"Canceling execution {algo_id}")
+
+    return await app_context.execution_tools.cancel_execution(algo_id)
+
+
 # ============================================================================
 # RESOURCES
 # ============================================================================
@@ -911,6 +1243,15 @@ def get_hyperliquid_config() -> str:
     return get_config_summary()
 
 
+@mcp.resource("cache://stats")
+def get_result_cache_stats() -> str:
+    """Hit/miss counters of the shared read-tool cache."""
+    cache = _result_cache()
+    if cache is None:
+        return "Result cache disabled"
+    return "\n".join(f"{key}: {value}" for key, value in cache.stats().items())
+
+
 @mcp.resource("guide://trading")
 def get_trading_guide() -> str:
     """Guide for trading on Hyperliquid."""
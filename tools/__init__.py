@@ -1,12 +1,29 @@
-"""Tools package for Hyperliquid MCP Server."""
-from .trading_tools import TradingTools
-from .account_tools import AccountTools
-from .market_tools import MarketTools
-from .websocket_tools import WebSocketTools
-
-__all__ = [
-    'TradingTools',
-    'AccountTools',
-    'MarketTools',
-    'WebSocketTools'
-]
+"""Tools package for Hyperliquid MCP Server.
+
+Exports are resolved on first access, so importing one submodule (or the
+package) does not pull in numpy, websockets and the SDK up front.
+"""
+import importlib
+
+_EXPORTS = {
+    'TradingTools': '.trading_tools',
+    'AccountTools': '.account_tools',
+    'MarketTools': '.market_tools',
+    'WebSocketTools': '.websocket_tools',
+    'ExecutionTools': '.execution_tools',
+    'SnapshotTools': '.snapshot_tools',
+    'AsyncHyperliquidClient': '.async_client',
+    'LazyClient': '.async_client',
+    'ResultCache': '.result_cache'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
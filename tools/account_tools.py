@@ -5,14 +5,22 @@ This module provides comprehensive account querying capabilities including:
 - Account state and balances
 - Open orders and positions
 - Trade history and fills
+- Rolling trade statistics (24h/7d/30d/all-time, per coin)
 - Portfolio analytics
+- Multi-account (master + sub-accounts) risk overview
 - Rate limit monitoring
 """
 
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Callable, Awaitable
 from datetime import datetime, timezone
+import asyncio
 import logging
 
+from .async_client import AsyncHyperliquidClient
+from .compact import compact_fills
+from .fills_analytics import FillsAnalytics
+from .result_cache import ResultCache, ACCOUNT
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,16 +32,47 @@ class AccountTools:
     and portfolio analytics with proper error handling and formatting.
     """
 
-    def __init__(self, info_client, account_address: str):
+    def __init__(self, info_client, account_address: str, result_cache: Optional[ResultCache] = None,
+                 fill_analytics: Optional[Dict[str, FillsAnalytics]] = None):
         """
         Initialize AccountTools with Hyperliquid Info client.
 
         Args:
             info_client: Hyperliquid Info API client instance
             account_address: Ethereum address of the account to query
+            result_cache: Optional shared cache for per-account reads (fills, overview)
+            fill_analytics: Rolling fill analytics per address (shared with for_account copies)
         """
-        self.info = info_client
+        self.info = AsyncHyperliquidClient(info_client)
         self.account = account_address
+        self.result_cache = result_cache
+        self.fill_analytics = fill_analytics if fill_analytics is not None else {}
+
+    def for_account(self, address: str) -> "AccountTools":
+        """AccountTools bound to another address, sharing this client, cache and fill analytics"""
+        return AccountTools(self.info, address, self.result_cache, self.fill_analytics)
+
+    async def _read_fills(self) -> List[Dict[str, Any]]:
+        """Raw userFills of this account (through the shared cache when there is one)"""
+        if self.result_cache is None:
+            return await self.info.user_fills(self.account)
+        return await self.result_cache.get_or_call(
+            "account_fills", {"address": self.account}, lambda: self.info.user_fills(self.account), ACCOUNT)
+
+    def _ingest_fills(self, user_fills: Optional[List[Dict[str, Any]]]) -> FillsAnalytics:
+        """This account's rolling analytics, with fills not seen before folded in"""
+        analytics = self.fill_analytics.get(self.account)
+        if analytics is None:
+            analytics = self.fill_analytics[self.account] = FillsAnalytics()
+        analytics.ingest(user_fills or [])
+        return analytics
+
+    @staticmethod
+    def _analytics_coin(analytics: FillsAnalytics, coin: Optional[str]) -> Optional[str]:
+        """Stored spelling of a coin filter (e.g. "kpepe" -> "kPEPE")"""
+        if not coin:
+            return None
+        return next((c for c in analytics.coins if c.upper() == coin.upper()), coin)
 
     def _format_timestamp(self, timestamp_ms: int) -> str:
         """
@@ -85,7 +124,7 @@ class AccountTools:
                 - error: Error message if failed
         """
         try:
-            user_state = self.info.user_state(self.account)
+            user_state = await self.info.user_state(self.account)
 
             if not user_state:
                 return {
@@ -159,7 +198,7 @@ class AccountTools:
                 - error: Error message if failed
         """
         try:
-            open_orders = self.info.open_orders(self.account)
+            open_orders = await self.info.open_orders(self.account)
 
             if not open_orders:
                 return {
@@ -229,7 +268,7 @@ class AccountTools:
                 - error: Error message if failed
         """
         try:
-            user_state = self.info.user_state(self.account)
+            user_state = await self.info.user_state(self.account)
 
             if not user_state:
                 return {
@@ -296,13 +335,16 @@ class AccountTools:
                 "error": f"Failed to get positions: {str(e)}"
             }
 
-    async def get_user_fills(self, coin: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+    async def get_user_fills(self, coin: Optional[str] = None, limit: int = 100,
+                             compact: bool = False, stats: bool = False) -> Dict[str, Any]:
         """
         Get recent trade fills, optionally filtered by coin.
 
         Args:
             coin: Optional coin symbol to filter fills
             limit: Maximum number of fills to return (max 2000)
+            compact: Return oldest-first columns and a per-coin summary instead of per-fill dicts
+            stats: Add the rolling 24h/7d/30d/all-time trade stats (of the coin, if given)
 
         Returns:
             Dict containing:
@@ -314,7 +356,9 @@ class AccountTools:
             # Ensure limit doesn't exceed API maximum
             limit = min(limit, 2000)
 
-            user_fills = self.info.user_fills(self.account)
+            user_fills = await self._read_fills()
+            analytics = self._ingest_fills(user_fills)
+            extra = {"stats": analytics.summary(self._analytics_coin(analytics, coin))} if stats else {}
 
             if not user_fills:
                 return {
@@ -323,11 +367,21 @@ class AccountTools:
                         "fills": [],
                         "total_count": 0,
                         "filtered_by_coin": coin,
-                        "limit": limit
+                        "limit": limit,
+                        **extra
                     },
                     "error": None
                 }
 
+            if compact:
+                selected = [f for f in user_fills
+                            if not coin or f.get("coin", "").upper() == coin.upper()][:limit]
+                return {
+                    "success": True,
+                    "data": {**compact_fills(selected), **extra},
+                    "error": None
+                }
+
             formatted_fills = []
             total_fees = 0.0
             total_volume = 0.0
@@ -376,7 +430,8 @@ class AccountTools:
                     "total_fees": total_fees,
                     "total_volume": total_volume,
                     "filtered_by_coin": coin,
-                    "limit": limit
+                    "limit": limit,
+                    **extra
                 },
                 "error": None
             }
@@ -389,13 +444,15 @@ class AccountTools:
                 "error": f"Failed to get user fills: {str(e)}"
             }
 
-    async def get_historical_orders(self, coin: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+    async def get_historical_orders(self, coin: Optional[str] = None, limit: int = 100,
+                                    stats: bool = False) -> Dict[str, Any]:
         """
         Get historical orders with their status.
 
         Args:
             coin: Optional coin symbol to filter orders
             limit: Maximum number of orders to return
+            stats: Add the rolling 24h/7d/30d/all-time trade stats (of the coin, if given)
 
         Returns:
             Dict containing:
@@ -412,8 +469,9 @@ class AccountTools:
             open_orders = open_orders_result.get("data", {}).get("orders", []) if open_orders_result.get("success") else []
 
             # Get fills to identify completed orders
-            fills_result = await self.get_user_fills(coin, limit * 2)  # Get more fills to find unique orders
-            fills = fills_result.get("data", {}).get("fills", []) if fills_result.get("success") else []
+            fills_result = await self.get_user_fills(coin, limit * 2, stats=stats)  # Get more fills to find unique orders
+            fills_data = fills_result.get("data", {}) if fills_result.get("success") else {}
+            fills = fills_data.get("fills", [])
 
             # Build order history from fills
             orders_map = {}
@@ -488,7 +546,8 @@ class AccountTools:
                         "partially_filled": partially_filled_count
                     },
                     "filtered_by_coin": coin,
-                    "limit": limit
+                    "limit": limit,
+                    **({"stats": fills_data.get("stats")} if stats else {})
                 },
                 "error": None
             }
@@ -501,6 +560,51 @@ class AccountTools:
                 "error": f"Failed to get historical orders: {str(e)}"
             }
 
+    async def get_trade_stats(self, coin: Optional[str] = None, by_coin: bool = False) -> Dict[str, Any]:
+        """
+        Get win rate, profit factor, PnL, fees, volume and holding time over
+        24h, 7d, 30d and all-time.
+
+        Fills are folded into per-account running aggregates once, so repeated
+        calls only ingest the fills that arrived since the last read. All-time
+        starts at the oldest fill of the first read (the API serves the latest 2000).
+
+        Args:
+            coin: Stats of one coin (default: all coins together)
+            by_coin: Also return the windows of every coin traded
+
+        Returns:
+            Dict containing:
+                - success: Boolean indicating success
+                - data: windows {"all", "24h", "7d", "30d"} of trades, wins, losses,
+                  win_rate, pnl, profit_factor, fees, volume, avg_duration_minutes,
+                  best/worst; by_coin when requested
+                - error: Error message if failed
+        """
+        try:
+            analytics = self._ingest_fills(await self._read_fills())
+            data = {
+                "account": self.account,
+                "coin": self._analytics_coin(analytics, coin),
+                "fills_ingested": analytics.count,
+                "windows": analytics.summary(self._analytics_coin(analytics, coin))
+            }
+            if by_coin:
+                data["by_coin"] = analytics.by_coin()
+            return {
+                "success": True,
+                "data": data,
+                "error": None
+            }
+
+        except Exception as e:
+            logger.error(f"Error getting trade stats for {self.account}: {e}")
+            return {
+                "success": False,
+                "data": None,
+                "error": f"Failed to get trade stats: {str(e)}"
+            }
+
     async def get_portfolio_value(self) -> Dict[str, Any]:
         """
         Get comprehensive portfolio value and PnL analysis.
@@ -599,62 +703,50 @@ class AccountTools:
                 - error: Error message if failed
         """
         try:
-            # Note: Check if Hyperliquid SDK has subaccounts method
-            # This is a placeholder implementation
-
-            # Try to get subaccounts info
-            try:
-                # Attempt to call subaccounts method if it exists
-                subaccounts_data = self.info.subaccounts(self.account)
-
-                if not subaccounts_data:
-                    return {
-                        "success": True,
-                        "data": {
-                            "subaccounts": [],
-                            "total_count": 0,
-                            "note": "No subaccounts found or feature not available"
-                        },
-                        "error": None
-                    }
-
-                formatted_subaccounts = []
-                total_value = 0.0
-
-                for subaccount in subaccounts_data:
-                    account_value = self._safe_float(subaccount.get("accountValue"))
-                    total_value += account_value
-
-                    formatted_subaccounts.append({
-                        "subaccount_address": subaccount.get("address"),
-                        "account_value": account_value,
-                        "positions_count": len(subaccount.get("positions", [])),
-                        "margin_used": self._safe_float(subaccount.get("marginUsed")),
-                        "withdrawable": self._safe_float(subaccount.get("withdrawable"))
-                    })
+            subaccounts_data = await self.info.query_sub_accounts(self.account)
 
-                return {
-                    "success": True,
-                    "data": {
-                        "subaccounts": formatted_subaccounts,
-                        "total_count": len(formatted_subaccounts),
-                        "total_value_all_subaccounts": total_value
-                    },
-                    "error": None
-                }
-
-            except AttributeError:
-                # Subaccounts method doesn't exist
+            if not subaccounts_data:
                 return {
                     "success": True,
                     "data": {
                         "subaccounts": [],
                         "total_count": 0,
-                        "note": "Subaccounts feature not available in current SDK version"
+                        "note": "No subaccounts found"
                     },
                     "error": None
                 }
 
+            formatted_subaccounts = []
+            total_value = 0.0
+
+            for subaccount in subaccounts_data:
+                state = subaccount.get("clearinghouseState") or {}
+                margin_summary = state.get("marginSummary", {})
+                account_value = self._safe_float(margin_summary.get("accountValue"))
+                total_value += account_value
+
+                formatted_subaccounts.append({
+                    "subaccount_address": subaccount.get("subAccountUser"),
+                    "name": subaccount.get("name"),
+                    "account_value": account_value,
+                    "positions_count": sum(
+                        1 for p in state.get("assetPositions", [])
+                        if self._safe_float(p.get("position", {}).get("szi"))
+                    ),
+                    "margin_used": self._safe_float(margin_summary.get("totalMarginUsed")),
+                    "withdrawable": self._safe_float(state.get("withdrawable"))
+                })
+
+            return {
+                "success": True,
+                "data": {
+                    "subaccounts": formatted_subaccounts,
+                    "total_count": len(formatted_subaccounts),
+                    "total_value_all_subaccounts": total_value
+                },
+                "error": None
+            }
+
         except Exception as e:
             logger.error(f"Error getting subaccounts for {self.account}: {e}")
             return {
@@ -663,6 +755,199 @@ class AccountTools:
                 "error": f"Failed to get subaccounts: {str(e)}"
             }
 
+    async def get_multi_account_overview(
+        self,
+        addresses: Optional[List[str]] = None,
+        include_orders: bool = True,
+        include_fills: bool = False,
+        fills_limit: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Get state, positions, open orders and (optionally) fills of several
+        accounts at once, merged into one risk view.
+
+        All accounts are read concurrently through the shared executor, so N
+        accounts cost about one round trip of latency. Without addresses, the
+        master account and all its sub-accounts are used; their states come
+        with the sub-account listing, so only orders/fills need extra reads.
+
+        Args:
+            addresses: Accounts to include (default: this account + its sub-accounts)
+            include_orders: Read open orders of every account
+            include_fills: Read recent fills of every account
+            fills_limit: Fills kept per account
+
+        Returns:
+            Dict containing:
+                - success: Boolean indicating success
+                - data: accounts (per-account summary), exposure (net/gross per coin),
+                  totals and risk flags across accounts, api_requests made
+                - error: Error message if failed
+        """
+        try:
+            requests_made = 0
+
+            async def read(kind: str, address: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+                async def counted():
+                    nonlocal requests_made
+                    requests_made += 1
+                    return await fetch()
+
+                if self.result_cache is None:
+                    return await counted()
+                return await self.result_cache.get_or_call(kind, {"address": address}, counted, ACCOUNT)
+
+            names: Dict[str, Optional[str]] = {}
+            states: Dict[str, Any] = {}
+            if not addresses:
+                subaccounts = await read("sub_accounts", self.account,
+                                         lambda: self.info.query_sub_accounts(self.account)) or []
+                addresses = [self.account] + [sub.get("subAccountUser") for sub in subaccounts]
+                for sub in subaccounts:
+                    names[sub.get("subAccountUser")] = sub.get("name")
+                    if sub.get("clearinghouseState"):
+                        states[sub.get("subAccountUser")] = sub["clearinghouseState"]
+            addresses = list(dict.fromkeys(a for a in addresses if a))
+
+            async def load(address: str) -> Dict[str, Any]:
+                jobs = {}
+                if address not in states:
+                    jobs["state"] = read("account_state", address, lambda: self.info.user_state(address))
+                if include_orders:
+                    jobs["orders"] = read("account_open_orders", address, lambda: self.info.open_orders(address))
+                if include_fills:
+                    jobs["fills"] = read("account_fills", address, lambda: self.info.user_fills(address))
+                results = dict(zip(jobs, await asyncio.gather(*jobs.values(), return_exceptions=True)))
+                if "state" not in jobs:
+                    results["state"] = states[address]
+                return results
+
+            loaded = await asyncio.gather(*(load(a) for a in addresses))
+
+            accounts = []
+            exposure: Dict[str, Dict[str, float]] = {}
+            totals = {"account_value": 0.0, "margin_used": 0.0, "withdrawable": 0.0,
+                      "unrealized_pnl": 0.0, "gross_notional": 0.0, "open_orders": 0}
+            errors = {}
+            for address, results in zip(addresses, loaded):
+                failed = {k: str(v) for k, v in results.items() if isinstance(v, BaseException)}
+                if failed:
+                    errors[address] = failed
+                state = results.get("state")
+                if isinstance(state, BaseException) or not state:
+                    continue
+
+                summary = self._summarize_account(address, names.get(address), state)
+                orders = results.get("orders")
+                if include_orders and not isinstance(orders, BaseException):
+                    summary["open_orders"] = [
+                        {
+                            "coin": o.get("coin"),
+                            "side": o.get("side"),
+                            "price": self._safe_float(o.get("limitPx")),
+                            "size": self._safe_float(o.get("sz")),
+                            "order_id": o.get("oid"),
+                            "reduce_only": o.get("reduceOnly", False)
+                        }
+                        for o in orders or []
+                    ]
+                    totals["open_orders"] += len(summary["open_orders"])
+                fills = results.get("fills")
+                if include_fills and not isinstance(fills, BaseException):
+                    summary["recent_fills"] = compact_fills((fills or [])[:fills_limit])
+
+                for position in summary["positions"]:
+                    coin_exposure = exposure.setdefault(position["coin"], {"net_notional": 0.0, "gross_notional": 0.0, "accounts": 0})
+                    signed = position["notional"] if position["side"] == "long" else -position["notional"]
+                    coin_exposure["net_notional"] += signed
+                    coin_exposure["gross_notional"] += position["notional"]
+                    coin_exposure["accounts"] += 1
+
+                for key in ("account_value", "margin_used", "withdrawable", "unrealized_pnl", "gross_notional"):
+                    totals[key] += summary[key]
+                accounts.append(summary)
+
+            equity = totals["account_value"]
+            risk_flags = []
+            for summary in accounts:
+                if summary["margin_utilization_pct"] > 80:
+                    risk_flags.append(f"{summary['label']}: margin utilization {summary['margin_utilization_pct']:.1f}%")
+                for position in summary["positions"]:
+                    distance = position.get("liquidation_distance_pct")
+                    if distance is not None and distance < 10:
+                        risk_flags.append(f"{summary['label']}: {position['coin']} {distance:.1f}% from liquidation")
+            for coin, coin_exposure in exposure.items():
+                if abs(coin_exposure["net_notional"]) < coin_exposure["gross_notional"]:
+                    risk_flags.append(f"{coin}: offsetting positions across accounts")
+
+            return {
+                "success": True,
+                "data": {
+                    "accounts": accounts,
+                    "exposure": dict(sorted(exposure.items(), key=lambda kv: -kv[1]["gross_notional"])),
+                    "totals": {
+                        **totals,
+                        "accounts": len(accounts),
+                        "margin_utilization_pct": (totals["margin_used"] / equity * 100) if equity > 0 else 0,
+                        "gross_leverage": (totals["gross_notional"] / equity) if equity > 0 else 0,
+                        "net_notional": sum(e["net_notional"] for e in exposure.values())
+                    },
+                    "risk_flags": risk_flags,
+                    "errors": errors or None,
+                    "api_requests": requests_made,
+                    "timestamp": datetime.now(timezone.utc).isoformat()
+                },
+                "error": None
+            }
+
+        except Exception as e:
+            logger.error(f"Error getting multi-account overview for {self.account}: {e}")
+            return {
+                "success": False,
+                "data": None,
+                "error": f"Failed to get multi-account overview: {str(e)}"
+            }
+
+    def _summarize_account(self, address: str, name: Optional[str], state: Dict[str, Any]) -> Dict[str, Any]:
+        """Compact per-account view from a raw clearinghouse state"""
+        margin_summary = state.get("marginSummary", {})
+        account_value = self._safe_float(margin_summary.get("accountValue"))
+        margin_used = self._safe_float(margin_summary.get("totalMarginUsed"))
+
+        positions = []
+        for asset in state.get("assetPositions", []):
+            position = asset.get("position", {})
+            size = self._safe_float(position.get("szi"))
+            if size == 0:
+                continue
+            notional = abs(self._safe_float(position.get("positionValue")))
+            mark = notional / abs(size)
+            liquidation = self._safe_float(position.get("liquidationPx"))
+            positions.append({
+                "coin": position.get("coin", "Unknown"),
+                "side": "long" if size > 0 else "short",
+                "size": abs(size),
+                "entry_price": self._safe_float(position.get("entryPx")),
+                "notional": notional,
+                "unrealized_pnl": self._safe_float(position.get("unrealizedPnl")),
+                "leverage": self._safe_float(position.get("leverage", {}).get("value", 1)),
+                "liquidation_price": liquidation,
+                "liquidation_distance_pct": (abs(mark - liquidation) / mark * 100) if liquidation and mark else None
+            })
+
+        return {
+            "address": address,
+            "name": name,
+            "label": name or f"{address[:6]}...{address[-4:]}",
+            "account_value": account_value,
+            "margin_used": margin_used,
+            "withdrawable": self._safe_float(state.get("withdrawable")),
+            "margin_utilization_pct": (margin_used / account_value * 100) if account_value > 0 else 0,
+            "unrealized_pnl": sum(p["unrealized_pnl"] for p in positions),
+            "gross_notional": sum(p["notional"] for p in positions),
+            "positions": positions
+        }
+
     async def get_rate_limit_status(self) -> Dict[str, Any]:
         """
         Get current rate limit usage and status.
@@ -682,7 +967,7 @@ class AccountTools:
 
             try:
                 # Attempt to get rate limit info if available
-                rate_limit_data = self.info.user_rate_limit(self.account)
+                rate_limit_data = await self.info.user_rate_limit(self.account)
 
                 if not rate_limit_data:
                     # Return estimated rate limit info
@@ -0,0 +1,208 @@
+"""
+Async Hyperliquid Client Layer
+
+The Hyperliquid Python SDK (Info/Exchange) is synchronous: every call blocks
+for a full HTTP round trip. Calling it directly from the MCP tool coroutines
+stalls the event loop, so concurrent tool calls and the WebSocket listener
+end up serialized behind each other.
+
+This module offloads SDK calls to a shared, bounded thread pool and exposes
+them as awaitables:
+
+    info = AsyncHyperliquidClient(Info(API_URL, skip_ws=True))
+    state = await info.user_state(address)
+
+Clients can also be given as a LazyClient, which is built on the executor the
+first time one of its methods is awaited.
+
+Exchange calls are the exception to the parallelism: the SDK signs every action
+with the current time in ms as its nonce, so two orders signed in the same
+millisecond collide and the exchange rejects one. Each signing client gets its
+own single-worker executor, which runs its calls one at a time in order; Info
+calls stay on the shared pool.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from config.hyperliquid_config import MAX_CONCURRENT_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_serial_executors: Dict[int, tuple] = {}  # id(client) -> (client, executor)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Get the shared executor used for blocking Hyperliquid calls.
+
+    Its worker count bounds how many SDK requests are in flight at once;
+    extra calls queue without blocking the event loop.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=MAX_CONCURRENT_REQUESTS,
+                    thread_name_prefix="hl-client"
+                )
+                logger.info(f"Hyperliquid offload executor started ({MAX_CONCURRENT_REQUESTS} workers)")
+    return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking callable on the shared executor and await its result.
+
+    Args:
+        func: Synchronous callable
+        *args, **kwargs: Arguments forwarded to func
+
+    Returns:
+        Whatever func returns (exceptions propagate to the caller)
+    """
+    return await _run_on(get_executor(), func, *args, **kwargs)
+
+
+async def _run_on(executor: ThreadPoolExecutor, func: Callable[..., Any], *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+def get_serial_executor(client: Any) -> ThreadPoolExecutor:
+    """
+    Get the single-worker executor of a signing client.
+
+    Every AsyncHyperliquidClient wrapping the same Exchange shares it, so
+    actions from different tools (an execution algo and a manual order)
+    are signed one after another and never share a nonce.
+    """
+    with _executor_lock:
+        entry = _serial_executors.get(id(client))
+        if entry is None:
+            # Keep the client referenced so its id cannot be reused
+            entry = _serial_executors[id(client)] = (
+                client,
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix="hl-exchange")
+            )
+        return entry[1]
+
+
+def shutdown_executor(wait: bool = False) -> None:
+    """Stop the shared and per-client executors (called on server shutdown)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait, cancel_futures=True)
+            _executor = None
+        for _, executor in _serial_executors.values():
+            executor.shutdown(wait=wait, cancel_futures=True)
+        _serial_executors.clear()
+
+
+def signs_actions(client: Any) -> bool:
+    """Whether the client signs exchange actions (Exchange) rather than only reading (Info)"""
+    if isinstance(client, LazyClient):
+        return client.signs_actions
+    return hasattr(client, "wallet")
+
+
+class LazyClient:
+    """
+    SDK client built on first use.
+
+    Constructing Info/Exchange fetches meta over the network, so the server
+    starts with LazyClients and AsyncHyperliquidClient builds them on the
+    executor when the first call arrives. Plain attribute access resolves
+    synchronously.
+    """
+
+    def __init__(self, factory: Callable[[], Any], name: str, signs_actions: bool = False):
+        """
+        Args:
+            factory: Zero-argument callable returning the real client
+            name: Label for logs
+            signs_actions: The client is an Exchange (its calls are serialized)
+        """
+        self._factory = factory
+        self._name = name
+        self.signs_actions = signs_actions
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._client is not None
+
+    def get(self) -> Any:
+        """Return the client, building it on the first call"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    started = time.perf_counter()
+                    self._client = self._factory()
+                    logger.info(f"{self._name} client ready in {time.perf_counter() - started:.2f}s")
+        return self._client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+    def __repr__(self) -> str:
+        return f"LazyClient({self._name}, ready={self.ready})"
+
+
+class AsyncHyperliquidClient:
+    """
+    Awaitable facade over a synchronous SDK client (Info or Exchange).
+
+    Method calls are proxied: ``await client.all_mids()`` runs
+    ``Info.all_mids()`` on the shared executor. Plain attributes are
+    returned as-is. The wrapped client stays available as ``.sync``.
+    Calls on a signing client (Exchange) run one at a time, see
+    get_serial_executor.
+    """
+
+    def __init__(self, client: Any):
+        """
+        Initialize the async facade.
+
+        Args:
+            client: Hyperliquid Info or Exchange instance (or an existing
+                AsyncHyperliquidClient, which is unwrapped)
+        """
+        if isinstance(client, AsyncHyperliquidClient):
+            client = client.sync
+        self.sync = client
+        self._executor = get_serial_executor(client) if signs_actions(client) else None
+
+    def __getattr__(self, name: str) -> Any:
+        client = self.sync
+        executor = self._executor or get_executor()
+        if isinstance(client, LazyClient) and not client.ready:
+            # First call: build the client on the executor too, never on the event loop
+            async def _build_and_call(*args, **kwargs):
+                return await _run_on(executor, lambda: getattr(client.get(), name)(*args, **kwargs))
+
+            return _build_and_call
+
+        attr = getattr(client, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def _call(*args, **kwargs):
+            return await _run_on(executor, attr, *args, **kwargs)
+
+        return _call
+
+    def __repr__(self) -> str:
+        return f"AsyncHyperliquidClient({type(self.sync).__name__})"
+
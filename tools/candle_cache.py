@@ -0,0 +1,142 @@
+"""
+Local Candle Cache
+
+Closed candles never change, so MarketTools keeps them on disk and only asks
+the API for the part of a window it has not seen yet. Files use the engine's
+candle archive layout ({root}/{interval}/{coin}.bin, fixed 56-byte records
+read through numpy memmap), so both can point at the same directory.
+
+Each file holds one contiguous run of bars: windows that extend it at either
+end are merged, windows that do not touch it are served but not stored.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional, Any, Tuple
+
+import numpy as np
+
+# Same record layout as apps/engine_v0/candle_archive.py
+RECORD_DTYPE = np.dtype([
+    ("t", "<i8"),
+    ("o", "<f8"),
+    ("h", "<f8"),
+    ("l", "<f8"),
+    ("c", "<f8"),
+    ("v", "<f8"),
+    ("n", "<i8")
+])
+
+COLUMNS = list(RECORD_DTYPE.names)
+
+INTERVAL_MS = {
+    "1m": 60 * 1000,
+    "3m": 3 * 60 * 1000,
+    "5m": 5 * 60 * 1000,
+    "15m": 15 * 60 * 1000,
+    "30m": 30 * 60 * 1000,
+    "1h": 60 * 60 * 1000,
+    "2h": 2 * 60 * 60 * 1000,
+    "4h": 4 * 60 * 60 * 1000,
+    "8h": 8 * 60 * 60 * 1000,
+    "12h": 12 * 60 * 60 * 1000,
+    "1d": 24 * 60 * 60 * 1000,
+    "3d": 3 * 24 * 60 * 60 * 1000,
+    "1w": 7 * 24 * 60 * 60 * 1000
+}
+
+MAX_CANDLES_PER_REQUEST = 5000  # Hyperliquid candleSnapshot cap
+
+
+def candles_to_records(candles: List[Dict[str, Any]]) -> np.ndarray:
+    """API candle dicts -> sorted, de-duplicated record array (no per-row datetime work)"""
+    records = np.array([
+        (int(c["t"]), float(c["o"]), float(c["h"]), float(c["l"]), float(c["c"]),
+         float(c["v"]), int(c.get("n", 0) or 0))
+        for c in candles
+    ], dtype=RECORD_DTYPE)
+    if len(records) < 2:
+        return records
+    records = records[np.argsort(records["t"], kind="stable")]
+    keep = np.append(records["t"][1:] != records["t"][:-1], True)
+    return records[keep]
+
+
+def records_to_columns(records: np.ndarray) -> Dict[str, List[Any]]:
+    """Record array -> {"t": [...], "o": [...], ...} (one tolist() per column)"""
+    return {name: records[name].tolist() for name in COLUMNS}
+
+
+def records_to_rows(records: np.ndarray) -> List[List[Any]]:
+    """Record array -> [[t, o, h, l, c, v, n], ...]"""
+    return [list(row) for row in records.tolist()]
+
+
+class CandleCache:
+    """On-disk closed-candle store, one contiguous record file per (coin, interval)"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _path(self, coin: str, interval: str) -> str:
+        safe = coin.replace("/", "_").replace(":", "_")
+        return os.path.join(self.root, interval, f"{safe}.bin")
+
+    def _lock(self, coin: str, interval: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault((coin, interval), threading.Lock())
+
+    def load(self, coin: str, interval: str, start_ms: Optional[int] = None,
+             end_ms: Optional[int] = None) -> np.ndarray:
+        """Read-only memmap of cached records with start_ms <= t <= end_ms (empty if none)"""
+        path = self._path(coin, interval)
+        try:
+            count = os.path.getsize(path) // RECORD_DTYPE.itemsize
+        except OSError:
+            count = 0
+        if count == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(count,))
+        lo = 0 if start_ms is None else int(np.searchsorted(records["t"], start_ms, side="left"))
+        hi = count if end_ms is None else int(np.searchsorted(records["t"], end_ms, side="right"))
+        return records[lo:hi]
+
+    def coverage(self, coin: str, interval: str) -> Optional[Tuple[int, int]]:
+        """(first, last) cached open time, or None"""
+        records = self.load(coin, interval)
+        if not len(records):
+            return None
+        return int(records["t"][0]), int(records["t"][-1])
+
+    def merge(self, coin: str, interval: str, new: np.ndarray) -> bool:
+        """
+        Add closed bars if they overlap or touch the cached run.
+
+        Returns:
+            True if stored (False when the block would leave a gap)
+        """
+        if not len(new):
+            return False
+        step = INTERVAL_MS[interval]
+        path = self._path(coin, interval)
+        with self._lock(coin, interval):
+            existing = self.load(coin, interval)
+            if len(existing):
+                first, last = int(existing["t"][0]), int(existing["t"][-1])
+                if int(new["t"][0]) > last + step or int(new["t"][-1]) < first - step:
+                    return False
+                merged = np.concatenate([np.asarray(existing), new])
+                merged = merged[np.argsort(merged["t"], kind="stable")]
+                merged = merged[np.append(merged["t"][1:] != merged["t"][:-1], True)]
+            else:
+                merged = new
+            del existing
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(merged.tobytes())
+            os.replace(tmp_path, path)
+            return True
@@ -0,0 +1,207 @@
+"""
+Lazy Hyperliquid SDK Clients
+
+The SDK's Info constructor fetches spot meta and perp meta, and Exchange
+builds a second Info that fetches them again, which is four round trips
+before the first tool call. create_clients returns LazyClients that build
+both on first use from one shared meta, read from a disk snapshot when one
+is available. A snapshot served from disk is refreshed in the background and
+the fresh perp meta is applied to the live clients.
+
+    python -m tools.client_factory --runs 5   # startup benchmark
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .async_client import LazyClient
+
+logger = logging.getLogger(__name__)
+
+
+class MetaSnapshot:
+    """meta + spotMeta for one API host, fetched once and kept on disk"""
+
+    def __init__(self, api_url: str, cache_path: Optional[str], max_age_hours: float = 24.0):
+        """
+        Args:
+            api_url: Hyperliquid API base URL
+            cache_path: Snapshot directory (empty/None = always fetch)
+            max_age_hours: Snapshots older than this are not used
+        """
+        self.api_url = api_url
+        self.path = os.path.join(cache_path, api_url.split("//")[-1].replace("/", "_") + ".json") if cache_path else None
+        self.max_age_s = max_age_hours * 3600
+        self.from_disk = False
+        self._data: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """(meta, spot_meta), from disk when fresh enough, else from the API"""
+        with self._lock:
+            if self._data is None:
+                self._data = self._load()
+                self.from_disk = self._data is not None
+                if self._data is None:
+                    self._data = self._fetch()
+                    self._save(self._data)
+            return self._data["meta"], self._data["spot_meta"]
+
+    def refresh(self) -> Dict[str, Any]:
+        """Fetch from the API and overwrite the snapshot"""
+        data = self._fetch()
+        self._save(data)
+        with self._lock:
+            self._data = data
+        return data["meta"]
+
+    def _fetch(self) -> Dict[str, Any]:
+        from hyperliquid.api import API
+
+        api = API(self.api_url)
+        return {
+            "saved_at": time.time(),
+            "meta": api.post("/info", {"type": "meta"}),
+            "spot_meta": api.post("/info", {"type": "spotMeta"})
+        }
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        if not self.path:
+            return None
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - data.get("saved_at", 0) > self.max_age_s or "meta" not in data or "spot_meta" not in data:
+            return None
+        return data
+
+    def _save(self, data: Dict[str, Any]) -> None:
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save meta snapshot to {self.path}: {e}")
+
+
+def create_clients(api_url: str, private_key: str, account_address: str,
+                   meta_cache_path: Optional[str] = None,
+                   meta_max_age_hours: float = 24.0) -> Tuple[LazyClient, LazyClient]:
+    """
+    (info, exchange) LazyClients sharing one MetaSnapshot.
+
+    SDK and eth_account imports happen inside the factories, so they cost
+    nothing until the first call that needs them.
+    """
+    snapshot = MetaSnapshot(api_url, meta_cache_path, meta_max_age_hours)
+    refresh_started = threading.Event()
+
+    def build_info():
+        from hyperliquid.info import Info
+
+        meta, spot_meta = snapshot.get()
+        info = Info(api_url, skip_ws=True, meta=meta, spot_meta=spot_meta)
+        _refresh_in_background()
+        return info
+
+    def build_exchange():
+        from eth_account import Account
+        from hyperliquid.exchange import Exchange
+
+        meta, spot_meta = snapshot.get()
+        exchange = Exchange(
+            wallet=Account.from_key(private_key),
+            base_url=api_url,
+            account_address=account_address,
+            meta=meta,
+            spot_meta=spot_meta
+        )
+        _refresh_in_background()
+        return exchange
+
+    info_client = LazyClient(build_info, "Info")
+    exchange_client = LazyClient(build_exchange, "Exchange", signs_actions=True)
+
+    def _refresh_in_background():
+        # A disk snapshot may predate a new listing: refetch once and update whatever is built
+        if not snapshot.from_disk or refresh_started.is_set():
+            return
+        refresh_started.set()
+
+        def run():
+            try:
+                meta = snapshot.refresh()
+                if info_client.ready:
+                    info_client.get().set_perp_meta(meta, 0)
+                if exchange_client.ready:
+                    exchange_client.get().info.set_perp_meta(meta, 0)
+                logger.info("Meta snapshot refreshed")
+            except Exception as e:
+                logger.warning(f"Meta snapshot refresh failed: {e}")
+
+        threading.Thread(target=run, name="hl-meta-refresh", daemon=True).start()
+
+    return info_client, exchange_client
+
+
+def _benchmark(runs: int) -> None:
+    """Cold-process startup: server import, lifespan up to ready, first market call (cold/warm meta)"""
+    import statistics
+    import subprocess
+    import sys
+    import tempfile
+
+    probe = """
+import asyncio, time
+t0 = time.perf_counter()
+import server
+t1 = time.perf_counter()
+
+async def main():
+    async with server.app_lifespan(server.mcp) as ctx:
+        t2 = time.perf_counter()
+        await ctx.market_tools.get_all_mids()
+        t3 = time.perf_counter()
+    print(f"{t1 - t0:.4f} {t2 - t1:.4f} {t3 - t2:.4f}")
+
+asyncio.run(main())
+"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for label, keep_cache in (("cold meta", False), ("warm meta", True)):
+            samples = []
+            for i in range(runs):
+                if not keep_cache or i == 0:
+                    for name in os.listdir(cache_dir):
+                        os.remove(os.path.join(cache_dir, name))
+                env = dict(os.environ, HYPERLIQUID_META_CACHE_PATH=cache_dir)
+                out = subprocess.run([sys.executable, "-c", probe], cwd=root, env=env,
+                                     capture_output=True, text=True)
+                if out.returncode != 0:
+                    print(out.stderr.strip().splitlines()[-1] if out.stderr else "probe failed")
+                    return
+                samples.append([float(x) for x in out.stdout.split()[-3:]])
+            if keep_cache:
+                samples = samples[1:] or samples  # First run only wrote the snapshot
+            cols = list(zip(*samples))
+            print(f"{label:>9}: import {statistics.median(cols[0]) * 1000:7.1f}ms  "
+                  f"lifespan {statistics.median(cols[1]) * 1000:6.1f}ms  "
+                  f"first call {statistics.median(cols[2]) * 1000:7.1f}ms  (median of {len(samples)})")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="MCP server startup benchmark (needs credentials and network)")
+    parser.add_argument("--runs", type=int, default=5)
+    _benchmark(parser.parse_args().runs)
@@ -0,0 +1,190 @@
+"""
+Compact Encodings for MCP Tool Output
+
+Per-row dicts with ISO timestamps and repeated keys cost many tokens per
+number. These helpers encode the same data as columns with a shared time base
+(t0 + step, explicit offsets only when the series has gaps) and prices rounded
+to the exchange's 5 significant figures, with optional downsampling and a
+summary block, so a reader can often stop at the summary.
+"""
+
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+PRICE_SIG_FIGS = 5  # Hyperliquid prices carry at most 5 significant figures
+MAX_PRICE_DECIMALS = 6
+SIZE_DECIMALS = 6
+
+
+def sig_decimals(value: float, sig: int = PRICE_SIG_FIGS, cap: int = MAX_PRICE_DECIMALS) -> int:
+    """Decimals that keep sig significant figures of value"""
+    if not value or not math.isfinite(value):
+        return 0
+    return max(0, min(cap, sig - 1 - int(math.floor(math.log10(abs(value))))))
+
+
+def round_column(values, decimals: int) -> List[Any]:
+    """Rounded list (ints when decimals is 0)"""
+    rounded = np.round(np.asarray(values, dtype=float), decimals)
+    return rounded.astype(np.int64).tolist() if decimals == 0 else rounded.tolist()
+
+
+def encode_times(times_ms, step_ms: int, unit_ms: Optional[int] = None) -> Dict[str, Any]:
+    """
+    {"t0", "step"} for a regular series. When it has gaps, "i" lists every
+    offset from t0 in units of unit_ms (default step_ms, given as "unit" otherwise).
+    """
+    times = np.asarray(times_ms, dtype=np.int64)
+    if not len(times):
+        return {"t0": None, "step": step_ms}
+    encoded = {"t0": int(times[0]), "step": step_ms}
+    if np.any(np.diff(times) != step_ms):
+        unit_ms = unit_ms or step_ms
+        encoded["i"] = ((times - times[0]) // unit_ms).tolist()
+        if unit_ms != step_ms:
+            encoded["unit"] = unit_ms
+    return encoded
+
+
+def downsample_ohlcv(records: np.ndarray, max_points: int) -> np.ndarray:
+    """Merge consecutive bars into at most max_points (o first, h max, l min, c last, v/n summed)"""
+    n = len(records)
+    if not max_points or n <= max_points:
+        return records
+    k = math.ceil(n / max_points)
+    starts = np.arange(0, n, k)
+    ends = np.minimum(starts + k, n) - 1
+    merged = np.empty(len(starts), dtype=records.dtype)
+    merged["t"] = records["t"][starts]
+    merged["o"] = records["o"][starts]
+    merged["h"] = np.maximum.reduceat(records["h"], starts)
+    merged["l"] = np.minimum.reduceat(records["l"], starts)
+    merged["c"] = records["c"][ends]
+    merged["v"] = np.add.reduceat(records["v"], starts)
+    merged["n"] = np.add.reduceat(records["n"], starts)
+    return merged
+
+
+def ohlcv_summary(records: np.ndarray, decimals: int) -> Dict[str, Any]:
+    """One-line view of a candle window"""
+    if not len(records):
+        return {"bars": 0}
+    first, last = float(records["o"][0]), float(records["c"][-1])
+    volume = float(records["v"].sum())
+    typical = (records["h"] + records["l"] + records["c"]) / 3
+    return {
+        "bars": int(len(records)),
+        "open": round(first, decimals),
+        "close": round(last, decimals),
+        "high": round(float(records["h"].max()), decimals),
+        "low": round(float(records["l"].min()), decimals),
+        "change_pct": round((last / first - 1) * 100, 3) if first else None,
+        "range_pct": round((float(records["h"].max()) / float(records["l"].min()) - 1) * 100, 3)
+        if records["l"].min() > 0 else None,
+        "volume": round(volume, 4),
+        "vwap": round(float((typical * records["v"]).sum() / volume), decimals) if volume else None
+    }
+
+
+def compact_candles(records: np.ndarray, interval: str, step_ms: int,
+                    max_points: Optional[int] = None, decimals: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Candle records (candle_cache.RECORD_DTYPE) -> columnar payload.
+
+        {"format": "compact", "interval", "t0", "step", ["i"], "decimals",
+         "o": [...], "h": [...], "l": [...], "c": [...], "v": [...], "n": [...], "summary": {...}}
+    """
+    if decimals is None:
+        decimals = sig_decimals(float(records["c"][-1])) if len(records) else 0
+    summary = ohlcv_summary(records, decimals)
+    bars = downsample_ohlcv(records, max_points) if max_points else records
+    bucket = math.ceil(len(records) / len(bars)) if len(bars) else 1
+
+    result = {"format": "compact", "interval": interval}
+    result.update(encode_times(bars["t"], step_ms * bucket, step_ms))
+    result["decimals"] = decimals
+    for name in ("o", "h", "l", "c"):
+        result[name] = round_column(bars[name], decimals)
+    result["v"] = round_column(bars["v"], 4)
+    result["n"] = bars["n"].tolist()
+    if bucket > 1:
+        result["downsampled_from"] = int(len(records))
+    result["summary"] = summary
+    return result
+
+
+def compact_book(book: Dict[str, Any], decimals: Optional[int] = None) -> Dict[str, Any]:
+    """
+    get_l2_orderbook result -> {"bids": {"px": [...], "sz": [...]}, "asks": {...}, "summary": {...}}
+    """
+    if decimals is None:
+        decimals = sig_decimals(book.get("mid_price") or book.get("best_bid") or 0)
+    bid_volume, ask_volume = book.get("bid_volume", 0.0), book.get("ask_volume", 0.0)
+    total = bid_volume + ask_volume
+
+    def side(levels):
+        return {
+            "px": round_column([px for px, _ in levels], decimals),
+            "sz": round_column([sz for _, sz in levels], SIZE_DECIMALS)
+        }
+
+    return {
+        "format": "compact",
+        "coin": book.get("coin"),
+        "time": book.get("timestamp"),
+        "decimals": decimals,
+        "bids": side(book.get("bids", [])),
+        "asks": side(book.get("asks", [])),
+        "summary": {
+            "mid": round(book.get("mid_price", 0.0), decimals + 1),
+            "spread_bps": round(book.get("spread_bps", 0.0), 3),
+            "bid_volume": round(bid_volume, SIZE_DECIMALS),
+            "ask_volume": round(ask_volume, SIZE_DECIMALS),
+            "imbalance": round((bid_volume - ask_volume) / total, 4) if total else 0.0
+        }
+    }
+
+
+def compact_fills(fills: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Raw API fills -> oldest-first columns with times as seconds after t0 and
+    a per-coin summary (count, bought/sold size, volume, fees, closed PnL).
+    """
+    fills = sorted(fills, key=lambda f: f.get("time", 0))
+    coins = sorted({f.get("coin", "") for f in fills})
+    t0 = int(fills[0].get("time", 0)) if fills else None
+
+    summary: Dict[str, Dict[str, float]] = {}
+    columns: Dict[str, List[Any]] = {k: [] for k in ("dt", "coin", "side", "px", "sz", "fee", "pnl", "oid")}
+    for f in fills:
+        coin = f.get("coin", "")
+        px, sz = float(f.get("px", 0)), float(f.get("sz", 0))
+        fee, pnl = float(f.get("fee", 0) or 0), float(f.get("closedPnl", 0) or 0)
+        columns["dt"].append(round((int(f.get("time", 0)) - t0) / 1000, 3))
+        columns["coin"].append(coins.index(coin) if len(coins) > 1 else None)
+        columns["side"].append(f.get("side"))
+        columns["px"].append(round(px, sig_decimals(px)))
+        columns["sz"].append(round(sz, SIZE_DECIMALS))
+        columns["fee"].append(round(fee, 6))
+        columns["pnl"].append(round(pnl, 6))
+        columns["oid"].append(f.get("oid"))
+
+        s = summary.setdefault(coin, {"fills": 0, "bought": 0.0, "sold": 0.0, "volume": 0.0, "fees": 0.0, "closed_pnl": 0.0})
+        s["fills"] += 1
+        s["bought" if f.get("side") == "B" else "sold"] += sz
+        s["volume"] += px * sz
+        s["fees"] += fee
+        s["closed_pnl"] += pnl
+
+    if len(coins) <= 1:
+        del columns["coin"]
+    return {
+        "format": "compact",
+        "t0": t0,
+        "coins": coins,
+        "count": len(fills),
+        **columns,
+        "summary": {coin: {k: round(v, 6) for k, v in s.items()} for coin, s in summary.items()}
+    }
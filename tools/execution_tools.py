@@ -0,0 +1,628 @@
+"""
+Hyperliquid Client-Side Execution Algorithms
+
+Runs parent orders as asyncio tasks that work them into the market in child
+orders instead of sweeping the book in one go:
+
+- twap: equal slices spread over the duration
+- vwap: slices weighted by the coin's intraday volume profile (last 7 days)
+- iceberg: a post-only order at the touch showing only display_size
+- pov: each slice trades a percentage of the volume printed since the start
+
+Every aggressive child is an IOC limit sized to the depth available within
+max_slippage_bps of the mid, so a thin book stretches the schedule instead
+of the price. Progress, child fills and implementation shortfall (vs the
+arrival mid) are kept per algo id and exposed through the MCP tools.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Any, Set, Tuple
+
+from config.hyperliquid_config import (
+    EXEC_MAX_SLIPPAGE_BPS,
+    EXEC_SLICE_SECONDS,
+    EXEC_POLL_SECONDS,
+    EXEC_MIN_CHILD_NOTIONAL
+)
+
+from .async_client import AsyncHyperliquidClient
+
+logger = logging.getLogger(__name__)
+
+ALGOS = ("twap", "vwap", "iceberg", "pov")
+MAX_CONSECUTIVE_ERRORS = 5
+MAX_FINISHED_KEPT = 50
+
+
+def round_size(size: float, sz_decimals: int) -> float:
+    """Floor a size to the asset's size decimals"""
+    factor = 10 ** sz_decimals
+    return int(size * factor + 1e-9) / factor
+
+
+def round_price(price: float, sz_decimals: int) -> float:
+    """Perp price rules: at most 5 significant figures and 6 - szDecimals decimals"""
+    if price >= 100_000:
+        return float(round(price))
+    return round(float(f"{price:.5g}"), max(0, 6 - sz_decimals))
+
+
+def book_levels(snapshot: Dict[str, Any]) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+    """(bids, asks) as [(px, sz)] best first from an l2_snapshot response"""
+    levels = (snapshot or {}).get("levels") or [[], []]
+    bids = [(float(l["px"]), float(l["sz"])) for l in levels[0]]
+    asks = [(float(l["px"]), float(l["sz"])) for l in levels[1]] if len(levels) > 1 else []
+    return bids, asks
+
+
+def slice_against_book(levels: List[Tuple[float, float]], mid: float, is_buy: bool,
+                       size: float, max_slippage_bps: float) -> Tuple[float, Optional[float]]:
+    """
+    Largest child up to size that the book fills within max_slippage_bps of mid.
+
+    Args:
+        levels: Opposite side of the book (asks for a buy), best first
+        mid: Current mid price
+        is_buy: Side of the child
+        size: Wanted size
+        max_slippage_bps: Worst price allowed, in bps from mid
+
+    Returns:
+        (child size, IOC limit price reaching it) - (0, None) when nothing is in range
+    """
+    cap = mid * (1 + max_slippage_bps / 10000) if is_buy else mid * (1 - max_slippage_bps / 10000)
+    available = 0.0
+    limit_px = None
+    for px, sz in levels:
+        if (px > cap) if is_buy else (px < cap):
+            break
+        available += sz
+        limit_px = px
+        if available >= size:
+            break
+    return min(size, available), limit_px
+
+
+def sweep_cost_bps(levels: List[Tuple[float, float]], mid: float, is_buy: bool, size: float) -> Optional[float]:
+    """Cost vs mid of taking size in one market order (None if the visible book is too thin)"""
+    left = size
+    cost = 0.0
+    for px, sz in levels:
+        take = min(left, sz)
+        cost += take * px
+        left -= take
+        if left <= 0:
+            avg = cost / size
+            return round((avg - mid) / mid * 10000 * (1 if is_buy else -1), 2)
+    return None
+
+
+def volume_profile_weights(candles: List[Dict[str, Any]], slice_times: List[float]) -> List[float]:
+    """
+    Share of the parent for each slice from the average volume per hour of day.
+    Falls back to equal weights when there is no history.
+    """
+    by_hour: Dict[int, List[float]] = {}
+    for c in candles or []:
+        hour = datetime.utcfromtimestamp(int(c["t"]) / 1000).hour
+        by_hour.setdefault(hour, []).append(float(c.get("v", 0) or 0))
+    profile = {h: sum(v) / len(v) for h, v in by_hour.items() if v}
+    weights = [profile.get(datetime.utcfromtimestamp(t).hour, 0.0) for t in slice_times]
+    total = sum(weights)
+    if total <= 0:
+        return [1.0 / len(slice_times)] * len(slice_times)
+    return [w / total for w in weights]
+
+
+class ParentOrder:
+    """State of one running (or finished) execution algo"""
+
+    def __init__(self, algo: str, coin: str, is_buy: bool, size: float, duration_s: float,
+                 slices: int, max_slippage_bps: float, sz_decimals: int, reduce_only: bool = False,
+                 limit_price: Optional[float] = None, display_size: Optional[float] = None,
+                 participation_pct: float = 10.0):
+        self.algo_id = f"{algo}_{uuid.uuid4().hex[:10]}"
+        self.algo = algo
+        self.coin = coin
+        self.is_buy = is_buy
+        self.size = size
+        self.duration_s = duration_s
+        self.slices = slices
+        self.max_slippage_bps = max_slippage_bps
+        self.sz_decimals = sz_decimals
+        self.reduce_only = reduce_only
+        self.limit_price = limit_price
+        self.display_size = display_size
+        self.participation_pct = participation_pct
+
+        self.status = "running"
+        self.error: Optional[str] = None
+        self.started_at = time.time()
+        self.ended_at: Optional[float] = None
+        self.arrival_px: Optional[float] = None
+        self.last_mid: Optional[float] = None
+        self.sweep_cost_bps: Optional[float] = None
+        self.filled = 0.0
+        self.notional = 0.0
+        self.fees = 0.0
+        self.fee_pending_oids: Set[int] = set()  # IOC children whose fees are not booked yet
+        self.children: List[Dict[str, Any]] = []
+        self.resting_oid: Optional[int] = None
+        self.resting_since_ms = 0
+        self.errors_in_row = 0
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def remaining(self) -> float:
+        return max(0.0, round_size(self.size - self.filled, self.sz_decimals))
+
+    def record_fill(self, size: float, price: float, fee: float = 0.0) -> None:
+        self.filled += size
+        self.notional += size * price
+        self.fees += fee
+
+    def shortfall(self) -> Dict[str, Any]:
+        """
+        Implementation shortfall vs the arrival mid (positive = cost).
+        Unfilled size is marked at the latest mid (opportunity cost).
+        """
+        if not self.arrival_px:
+            return {}
+        sign = 1 if self.is_buy else -1
+        avg_px = self.notional / self.filled if self.filled else None
+        execution_usd = sign * (self.notional - self.filled * self.arrival_px)
+        mark = self.last_mid or self.arrival_px
+        opportunity_usd = sign * (mark - self.arrival_px) * self.remaining
+        paper = self.size * self.arrival_px
+        return {
+            "arrival_px": self.arrival_px,
+            "avg_fill_px": round(avg_px, 8) if avg_px else None,
+            "execution_cost_bps": round(execution_usd / (self.filled * self.arrival_px) * 10000, 2) if self.filled else None,
+            "execution_cost_usd": round(execution_usd, 4),
+            "opportunity_cost_usd": round(opportunity_usd, 4),
+            "fees_usd": round(self.fees, 4),
+            "fees_pending_children": len(self.fee_pending_oids),
+            "total_shortfall_usd": round(execution_usd + opportunity_usd + self.fees, 4),
+            "total_shortfall_bps": round((execution_usd + opportunity_usd + self.fees) / paper * 10000, 2) if paper else None,
+            "sweep_cost_bps": self.sweep_cost_bps
+        }
+
+    def to_dict(self, children: int = 20) -> Dict[str, Any]:
+        elapsed = (self.ended_at or time.time()) - self.started_at
+        return {
+            "algo_id": self.algo_id,
+            "algo": self.algo,
+            "coin": self.coin,
+            "side": "buy" if self.is_buy else "sell",
+            "status": self.status,
+            "size": self.size,
+            "filled": round(self.filled, self.sz_decimals),
+            "remaining": self.remaining,
+            "progress_pct": round(self.filled / self.size * 100, 2) if self.size else 0,
+            "elapsed_seconds": round(elapsed, 1),
+            "duration_seconds": self.duration_s,
+            "child_orders": len(self.children),
+            "recent_children": self.children[-children:] if children else [],
+            "resting_oid": self.resting_oid,
+            "shortfall": self.shortfall(),
+            "error": self.error,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+
+class ExecutionTools:
+    """
+    Client-side execution algorithms (TWAP, VWAP, iceberg, POV).
+
+    Parent orders run as asyncio tasks on the server's event loop; SDK calls
+    go through AsyncHyperliquidClient so a running algo never blocks other
+    tool calls. Use start_execution, get_execution_status and cancel_execution.
+    """
+
+    def __init__(self, exchange_client, info_client, account_address: str,
+                 on_account_change: Optional[Callable[[], Any]] = None):
+        """
+        Initialize the execution engine.
+
+        Args:
+            exchange_client: Hyperliquid Exchange client instance
+            info_client: Hyperliquid Info client instance
+            account_address: Ethereum address of the trading account
+            on_account_change: Called whenever a child order is placed, filled or pulled
+        """
+        self.exchange = AsyncHyperliquidClient(exchange_client)
+        self.info = AsyncHyperliquidClient(info_client)
+        self.account = account_address
+        self.poll_seconds = EXEC_POLL_SECONDS
+        self.on_account_change = on_account_change
+        self._algos: Dict[str, ParentOrder] = {}
+        self._sz_decimals: Dict[str, int] = {}
+
+    async def start_execution(
+        self,
+        coin: str,
+        is_buy: bool,
+        size: float,
+        algo: str = "twap",
+        duration_minutes: float = 10,
+        slices: Optional[int] = None,
+        max_slippage_bps: Optional[float] = None,
+        limit_price: Optional[float] = None,
+        display_size: Optional[float] = None,
+        participation_pct: float = 10.0,
+        reduce_only: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Start a client-side execution algo for a parent order.
+
+        Args:
+            coin: Trading pair symbol
+            is_buy: True for buy, False for sell
+            size: Parent order size
+            algo: "twap", "vwap", "iceberg" or "pov"
+            duration_minutes: Horizon of the schedule (iceberg/pov stop here if not filled)
+            slices: Number of slices (default: one every EXEC_SLICE_SECONDS)
+            max_slippage_bps: Worst child price vs mid (default EXEC_MAX_SLIPPAGE_BPS)
+            limit_price: Optional hard price limit for every child
+            display_size: Iceberg visible size (default size / 10)
+            participation_pct: POV share of market volume
+            reduce_only: Children may only reduce the position
+
+        Returns:
+            Dict containing:
+                - success: bool
+                - algo_id: str (use with get_execution_status / cancel_execution)
+                - status: initial progress snapshot
+                - error: str (if failed)
+        """
+        try:
+            algo = (algo or "").lower()
+            if algo not in ALGOS:
+                raise ValueError(f"Unknown algo '{algo}', expected one of {', '.join(ALGOS)}")
+            if size <= 0:
+                raise ValueError(f"Size must be positive, got {size}")
+            if duration_minutes <= 0:
+                raise ValueError(f"Duration must be positive, got {duration_minutes}")
+            if algo == "pov" and not 0 < participation_pct <= 100:
+                raise ValueError(f"participation_pct must be in (0, 100], got {participation_pct}")
+
+            sz_decimals = await self._get_sz_decimals(coin)
+            duration_s = duration_minutes * 60
+            if not slices:
+                slices = max(1, int(round(duration_s / EXEC_SLICE_SECONDS)))
+
+            parent = ParentOrder(
+                algo, coin, is_buy, round_size(size, sz_decimals), duration_s, int(slices),
+                max_slippage_bps if max_slippage_bps is not None else EXEC_MAX_SLIPPAGE_BPS,
+                sz_decimals, reduce_only=reduce_only, limit_price=limit_price,
+                display_size=display_size or size / 10, participation_pct=participation_pct
+            )
+            if parent.size <= 0:
+                raise ValueError(f"Size {size} rounds to zero at {sz_decimals} size decimals")
+
+            # Arrival price and what a single market order would have cost
+            bids, asks = book_levels(await self.info.l2_snapshot(coin))
+            if not bids or not asks:
+                raise ValueError(f"No order book for {coin}")
+            parent.arrival_px = parent.last_mid = (bids[0][0] + asks[0][0]) / 2
+            parent.sweep_cost_bps = sweep_cost_bps(asks if is_buy else bids, parent.arrival_px, is_buy, parent.size)
+
+            self._prune()
+            self._algos[parent.algo_id] = parent
+            parent.task = asyncio.get_running_loop().create_task(self._run(parent))
+            logger.info(f"Execution {parent.algo_id} started: {'buy' if is_buy else 'sell'} "
+                        f"{parent.size} {coin} over {duration_minutes}m")
+
+            return {
+                "success": True,
+                "algo_id": parent.algo_id,
+                "status": parent.to_dict(children=0),
+                "timestamp": datetime.utcnow().isoformat()
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Execution start failed: {str(e)}",
+                "coin": coin,
+                "timestamp": datetime.utcnow().isoformat()
+            }
+
+    async def get_execution_status(self, algo_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Progress, child fills and implementation shortfall of execution algos.
+
+        Args:
+            algo_id: One algo (None = summary of every tracked algo)
+
+        Returns:
+            Dict containing:
+                - success: bool
+                - execution: dict (one algo) or executions: list (all)
+                - error: str (if not found)
+        """
+        if algo_id is None:
+            return {
+                "success": True,
+                "executions": [p.to_dict(children=0) for p in self._algos.values()],
+                "running": sum(1 for p in self._algos.values() if p.status == "running"),
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        parent = self._algos.get(algo_id)
+        if not parent:
+            return {
+                "success": False,
+                "error": f"Unknown algo_id {algo_id}",
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        return {"success": True, "execution": parent.to_dict(), "timestamp": datetime.utcnow().isoformat()}
+
+    async def cancel_execution(self, algo_id: str) -> Dict[str, Any]:
+        """
+        Stop an execution algo; its resting child (if any) is canceled and fills so far are kept.
+
+        Args:
+            algo_id: Algo to stop
+
+        Returns:
+            Dict containing:
+                - success: bool
+                - execution: final progress snapshot
+                - error: str (if not found or already finished)
+        """
+        parent = self._algos.get(algo_id)
+        if not parent:
+            return {"success": False, "error": f"Unknown algo_id {algo_id}",
+                    "timestamp": datetime.utcnow().isoformat()}
+        if parent.status != "running" or not parent.task:
+            return {"success": False, "error": f"Execution already {parent.status}",
+                    "execution": parent.to_dict(children=0), "timestamp": datetime.utcnow().isoformat()}
+
+        parent.task.cancel()
+        try:
+            await parent.task
+        except asyncio.CancelledError:
+            pass
+        return {"success": True, "execution": parent.to_dict(), "timestamp": datetime.utcnow().isoformat()}
+
+    async def shutdown(self) -> None:
+        """Cancel every running algo (server shutdown)"""
+        for parent in list(self._algos.values()):
+            if parent.status == "running" and parent.task:
+                await self.cancel_execution(parent.algo_id)
+
+    # ---------- internals ----------
+
+    def _prune(self) -> None:
+        finished = [p for p in self._algos.values() if p.status != "running"]
+        for parent in sorted(finished, key=lambda p: p.started_at)[:max(0, len(finished) - MAX_FINISHED_KEPT)]:
+            del self._algos[parent.algo_id]
+
+    async def _get_sz_decimals(self, coin: str) -> int:
+        if coin not in self._sz_decimals:
+            meta = await self.info.meta()
+            for asset in meta.get("universe", []):
+                self._sz_decimals[asset["name"]] = int(asset.get("szDecimals", 0))
+            if coin not in self._sz_decimals:
+                raise ValueError(f"Unknown coin {coin}")
+        return self._sz_decimals[coin]
+
+    async def _book(self, parent: ParentOrder) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+        bids, asks = book_levels(await self.info.l2_snapshot(parent.coin))
+        if bids and asks:
+            parent.last_mid = (bids[0][0] + asks[0][0]) / 2
+        return bids, asks
+
+    def _min_size(self, parent: ParentOrder) -> float:
+        """Smallest child the exchange accepts at the current mid"""
+        return EXEC_MIN_CHILD_NOTIONAL / parent.last_mid if parent.last_mid else 0.0
+
+    def _child_failed(self, parent: ParentOrder, error: str) -> None:
+        parent.errors_in_row += 1
+        if parent.errors_in_row >= MAX_CONSECUTIVE_ERRORS:
+            raise RuntimeError(f"{parent.errors_in_row} consecutive child errors, last: {error}")
+
+    async def _run(self, parent: ParentOrder) -> None:
+        try:
+            if parent.algo == "iceberg":
+                await self._run_iceberg(parent)
+            else:
+                await self._run_sliced(parent)
+            parent.status = "completed" if parent.remaining < max(self._min_size(parent), 10 ** -parent.sz_decimals) else "expired"
+        except asyncio.CancelledError:
+            parent.status = "canceled"
+            await self._pull_resting(parent)
+        except Exception as e:
+            parent.status = "failed"
+            parent.error = str(e)
+            logger.error(f"Execution {parent.algo_id} failed: {e}")
+            await self._pull_resting(parent)
+        finally:
+            await self._collect_fees(parent)
+            parent.ended_at = time.time()
+            logger.info(f"Execution {parent.algo_id} {parent.status}: filled {parent.filled}/{parent.size} "
+                        f"shortfall={parent.shortfall().get('total_shortfall_bps')}bps")
+
+    async def _run_sliced(self, parent: ParentOrder) -> None:
+        """TWAP / VWAP / POV: aggressive IOC children towards a cumulative target"""
+        interval = parent.duration_s / parent.slices
+        weights = [1.0 / parent.slices] * parent.slices
+        if parent.algo == "vwap":
+            now_ms = int(time.time() * 1000)
+            candles = await self.info.candles_snapshot(parent.coin, "1h", now_ms - 7 * 24 * 3600 * 1000, now_ms)
+            weights = volume_profile_weights(candles, [parent.started_at + i * interval for i in range(parent.slices)])
+
+        pov_base = await self._volume_mark(parent) if parent.algo == "pov" else None
+        cumulative = 0.0
+        for i in range(parent.slices):
+            if parent.algo == "pov":
+                traded = await self._volume_mark(parent) - pov_base
+                target = min(parent.size, traded * parent.participation_pct / 100)
+            else:
+                cumulative += weights[i]
+                target = parent.size if i == parent.slices - 1 else parent.size * cumulative
+
+            await self._take(parent, target)
+            if parent.remaining < max(self._min_size(parent), 10 ** -parent.sz_decimals):
+                break
+            if i < parent.slices - 1:
+                await asyncio.sleep(max(0.0, parent.started_at + (i + 1) * interval - time.time()))
+
+    async def _volume_mark(self, parent: ParentOrder) -> float:
+        """Cumulative 1m volume since the start minute (POV compares two marks)"""
+        start_ms = int(parent.started_at // 60) * 60 * 1000
+        candles = await self.info.candles_snapshot(parent.coin, "1m", start_ms, int(time.time() * 1000))
+        return sum(float(c.get("v", 0) or 0) for c in candles or [])
+
+    async def _take(self, parent: ParentOrder, target: float) -> None:
+        """Send one IOC child for (target - filled), capped by book depth within the slippage band"""
+        want = round_size(target - parent.filled, parent.sz_decimals)
+        if want <= 0:
+            return
+        bids, asks = await self._book(parent)
+        if not bids or not asks:
+            return
+        child, limit_px = slice_against_book(asks if parent.is_buy else bids, parent.last_mid,
+                                             parent.is_buy, want, parent.max_slippage_bps)
+        if parent.limit_price and limit_px:
+            limit_px = min(limit_px, parent.limit_price) if parent.is_buy else max(limit_px, parent.limit_price)
+        child = round_size(child, parent.sz_decimals)
+        if child <= 0 or not limit_px or child * parent.last_mid < EXEC_MIN_CHILD_NOTIONAL:
+            # Too small (or no depth in range): carry it over to the next slice
+            return
+
+        limit_px = round_price(limit_px, parent.sz_decimals)
+        record = {"time": datetime.utcnow().isoformat(), "size": child, "limit_px": limit_px, "tif": "Ioc"}
+        parent.children.append(record)
+        try:
+            response = await self.exchange.order(parent.coin, parent.is_buy, child, limit_px,
+                                                 {"limit": {"tif": "Ioc"}}, reduce_only=parent.reduce_only)
+        except Exception as e:
+            record["error"] = str(e)
+            self._child_failed(parent, str(e))
+            return
+        self._account_changed()
+
+        status = self._first_status(response)
+        if "filled" in status:
+            filled = float(status["filled"].get("totalSz", 0))
+            avg_px = float(status["filled"].get("avgPx", 0))
+            oid = status["filled"].get("oid")
+            parent.record_fill(filled, avg_px)
+            parent.errors_in_row = 0
+            record.update({"filled": filled, "avg_px": avg_px, "oid": oid})
+            if oid is not None:
+                # The order response carries no fee: book it from the account's fills
+                parent.fee_pending_oids.add(oid)
+                await self._collect_fees(parent)
+        else:
+            error = status.get("error", "IOC child did not fill")
+            record["error"] = error
+            if "could not immediately match" not in error:
+                self._child_failed(parent, error)
+
+    async def _run_iceberg(self, parent: ParentOrder) -> None:
+        """Post display_size at the touch, re-post as it fills or the touch moves away"""
+        deadline = parent.started_at + parent.duration_s
+        while time.time() < deadline:
+            bids, asks = await self._book(parent)
+            if not bids or not asks:
+                await asyncio.sleep(self.poll_seconds)
+                continue
+            min_size = self._min_size(parent)
+            if parent.remaining < min_size:
+                break
+
+            px = bids[0][0] if parent.is_buy else asks[0][0]
+            if parent.limit_price:
+                px = min(px, parent.limit_price) if parent.is_buy else max(px, parent.limit_price)
+            px = round_price(px, parent.sz_decimals)
+            show = round_size(min(max(parent.display_size, min_size), parent.remaining), parent.sz_decimals)
+
+            record = {"time": datetime.utcnow().isoformat(), "size": show, "limit_px": px, "tif": "Alo"}
+            parent.children.append(record)
+            try:
+                response = await self.exchange.order(parent.coin, parent.is_buy, show, px,
+                                                     {"limit": {"tif": "Alo"}}, reduce_only=parent.reduce_only)
+            except Exception as e:
+                record["error"] = str(e)
+                self._child_failed(parent, str(e))
+                await asyncio.sleep(self.poll_seconds)
+                continue
+            self._account_changed()
+            status = self._first_status(response)
+            if "resting" not in status:
+                record["error"] = status.get("error", "Post-only child rejected")
+                self._child_failed(parent, record["error"])
+                await asyncio.sleep(self.poll_seconds)
+                continue
+
+            parent.errors_in_row = 0
+            oid = parent.resting_oid = record["oid"] = status["resting"]["oid"]
+            parent.resting_since_ms = int(time.time() * 1000) - 1000
+            while time.time() < deadline:
+                await asyncio.sleep(self.poll_seconds)
+                state = await self.info.query_order_by_oid(self.account, oid)
+                if state.get("status") != "order" or state.get("order", {}).get("status") != "open":
+                    break
+                bids, asks = await self._book(parent)
+                touch = bids[0][0] if parent.is_buy and bids else (asks[0][0] if asks else px)
+                if (touch > px) if parent.is_buy else (touch < px):
+                    if not parent.limit_price or ((touch <= parent.limit_price) if parent.is_buy else (touch >= parent.limit_price)):
+                        break  # Market moved away: re-post at the new touch
+            record["filled"] = await self._pull_resting(parent)
+
+    def _account_changed(self) -> None:
+        if self.on_account_change is not None:
+            self.on_account_change()
+
+    async def _pull_resting(self, parent: ParentOrder) -> float:
+        """Cancel the resting iceberg child (if any) and book its fills; returns the filled size"""
+        oid = parent.resting_oid
+        if oid is None:
+            return 0.0
+        parent.resting_oid = None
+        try:
+            await self.exchange.cancel(parent.coin, oid)
+        except Exception as e:
+            logger.warning(f"Execution {parent.algo_id}: cancel of resting oid {oid} failed: {e}")
+        self._account_changed()
+
+        fills = await self.info.user_fills_by_time(self.account, parent.resting_since_ms)
+        filled = 0.0
+        for fill in fills or []:
+            if fill.get("oid") == oid:
+                sz = float(fill.get("sz", 0))
+                parent.record_fill(sz, float(fill.get("px", 0)), float(fill.get("fee", 0) or 0))
+                filled += sz
+        return filled
+
+    async def _collect_fees(self, parent: ParentOrder) -> None:
+        """Book the fees of filled IOC children from the account's fills (retried later if not indexed yet)"""
+        if not parent.fee_pending_oids:
+            return
+        try:
+            fills = await self.info.user_fills_by_time(self.account, int(parent.started_at * 1000) - 1000)
+        except Exception as e:
+            logger.warning(f"Execution {parent.algo_id}: fee lookup failed: {e}")
+            return
+        booked = set()
+        for fill in fills or []:
+            oid = fill.get("oid")
+            if oid in parent.fee_pending_oids:
+                parent.fees += float(fill.get("fee", 0) or 0)
+                booked.add(oid)
+        parent.fee_pending_oids -= booked
+
+    @staticmethod
+    def _first_status(response: Any) -> Dict[str, Any]:
+        if not isinstance(response, dict) or response.get("status") != "ok":
+            error = response.get("response") if isinstance(response, dict) else response
+            return {"error": str(error or "Order failed")}
+        statuses = response.get("response", {}).get("data", {}).get("statuses", [])
+        status = statuses[0] if statuses else {}
+        return status if isinstance(status, dict) else {"error": str(status)}
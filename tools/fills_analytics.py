@@ -0,0 +1,356 @@
+"""
+Rolling Fill Analytics for MCP Account Tools
+
+Fills are ingested once into compact columns and folded into running
+aggregates per coin for all-time, 30d, 7d and 24h, so win rate, profit
+factor, PnL, fees and holding time are reads instead of scans.
+
+Also used by the engine (apps/engine_v0/fills_analytics.py loads this file
+by path), so it must stay free of imports from this repository.
+"""
+
+import time
+import threading
+from array import array
+from collections import deque
+from typing import Dict, Any, Optional, List, Tuple
+
+_DAY_MS = 86_400_000
+WINDOWS_MS = {"24h": _DAY_MS, "7d": 7 * _DAY_MS, "30d": 30 * _DAY_MS}
+ALL_TIME = "all"
+_TOTAL = None  # Aggregate key for all coins together
+_NAN = float("nan")
+
+
+class _Agg:
+    """Running sums for one (window, coin); expired events are subtracted back out"""
+
+    __slots__ = ("fills", "trades", "wins", "losses", "profit", "loss", "fees", "volume",
+                 "duration_sum", "duration_count", "return_sum", "return_count")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def apply(self, sign: int, pnl: float, fee: float, volume: float,
+              duration: float, ret: float, closing: bool):
+        self.fills += sign
+        if not self.fills:
+            self.reset()  # Window emptied: drop float residue instead of subtracting it
+            return
+        self.fees += sign * fee
+        self.volume += sign * volume
+        if duration == duration:  # Not NaN
+            self.duration_sum += sign * duration
+            self.duration_count += sign
+        if not closing:
+            return
+        self.trades += sign
+        if pnl > 0:
+            self.wins += sign
+            self.profit += sign * pnl
+        elif pnl < 0:
+            self.losses += sign
+            self.loss -= sign * pnl
+        if ret == ret:
+            self.return_sum += sign * ret
+            self.return_count += sign
+
+
+class _Extremes:
+    """Best/worst PnL and return inside a sliding window (monotonic deques of (index, value))"""
+
+    __slots__ = ("best", "worst", "best_ret", "worst_ret")
+
+    def __init__(self):
+        self.best, self.worst = deque(), deque()
+        self.best_ret, self.worst_ret = deque(), deque()
+
+    @staticmethod
+    def _push(dq: deque, i: int, value: float, sign: int):
+        while dq and sign * dq[-1][1] <= sign * value:
+            dq.pop()
+        dq.append((i, value))
+
+    def push(self, i: int, pnl: float, ret: float):
+        self._push(self.best, i, pnl, 1)
+        self._push(self.worst, i, pnl, -1)
+        if ret == ret:
+            self._push(self.best_ret, i, ret, 1)
+            self._push(self.worst_ret, i, ret, -1)
+
+    def expire(self, i: int):
+        # Indices expire in order, so an expiring index can only be at the front
+        for dq in (self.best, self.worst, self.best_ret, self.worst_ret):
+            if dq and dq[0][0] == i:
+                dq.popleft()
+
+    def values(self) -> Tuple[Optional[float], ...]:
+        return tuple(dq[0][1] if dq else None for dq in (self.best, self.worst, self.best_ret, self.worst_ret))
+
+
+class _AllTimeExtremes:
+    """Same interface as _Extremes for the window that never expires"""
+
+    __slots__ = ("best", "worst", "best_ret", "worst_ret")
+
+    def __init__(self):
+        self.best = self.worst = self.best_ret = self.worst_ret = None
+
+    def push(self, i: int, pnl: float, ret: float):
+        self.best = pnl if self.best is None else max(self.best, pnl)
+        self.worst = pnl if self.worst is None else min(self.worst, pnl)
+        if ret == ret:
+            self.best_ret = ret if self.best_ret is None else max(self.best_ret, ret)
+            self.worst_ret = ret if self.worst_ret is None else min(self.worst_ret, ret)
+
+    def expire(self, i: int):
+        pass
+
+    def values(self) -> Tuple[Optional[float], ...]:
+        return self.best, self.worst, self.best_ret, self.worst_ret
+
+
+class _Window:
+    __slots__ = ("span", "head", "aggs", "extremes")
+
+    def __init__(self, span: Optional[int]):
+        self.span = span  # None = all-time
+        self.head = 0     # First event still inside the window
+        self.aggs: Dict[Optional[str], _Agg] = {}
+        self.extremes: Dict[Optional[str], Any] = {}
+
+    def slot(self, key: Optional[str]) -> Tuple[_Agg, Any]:
+        agg = self.aggs.get(key)
+        if agg is None:
+            agg = self.aggs[key] = _Agg()
+            self.extremes[key] = _Extremes() if self.span else _AllTimeExtremes()
+        return agg, self.extremes[key]
+
+
+class RollingAnalytics:
+    """
+    Trade statistics over all-time / 30d / 7d / 24h, in total and per coin.
+
+    - add() appends one event to the columns and updates every window in O(1)
+    - windows are advanced lazily on read: events that fell out are subtracted,
+      so each event is added and expired once per window (amortized O(1))
+    - best/worst per window come from monotonic deques, never from a scan
+    - events older than the newest one are buffered and trigger a single
+      re-sort on the next read (rare: fills arrive in time order)
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._late: List[tuple] = []
+        self._reset()
+
+    def _reset(self):
+        self._coins: List[str] = []
+        self._coin_ids: Dict[str, int] = {}
+        # Columns, one row per event
+        self._time = array("q")
+        self._coin = array("I")
+        self._pnl = array("d")
+        self._fee = array("d")
+        self._volume = array("d")
+        self._duration = array("d")
+        self._return = array("d")
+        self._closing = array("b")
+        self._windows = {ALL_TIME: _Window(None)}
+        self._windows.update({name: _Window(span) for name, span in WINDOWS_MS.items()})
+
+    @property
+    def count(self) -> int:
+        """Events ingested"""
+        return len(self._time) + len(self._late)
+
+    @property
+    def coins(self) -> List[str]:
+        """Coins seen, in order of first event"""
+        with self._lock:
+            self._settle()
+            return list(self._coins)
+
+    def add(self, time_ms: int, coin: str, pnl: float = 0.0, fee: float = 0.0, volume: float = 0.0,
+            duration_min: Optional[float] = None, return_pct: Optional[float] = None,
+            closing: Optional[bool] = None):
+        """
+        Ingest one event.
+
+        Args:
+            time_ms: Event time (fills: fill time, journal: exit time)
+            coin: Symbol
+            pnl: Realized PnL (USD)
+            fee: Fee paid
+            volume: Notional traded
+            duration_min: Holding time, on the event that closed the position
+            return_pct: Return of the closed trade in %
+            closing: Counts as a trade for win rate / profit factor (default: pnl != 0)
+        """
+        event = (int(time_ms), coin, float(pnl), float(fee), float(volume),
+                 _NAN if duration_min is None else float(duration_min),
+                 _NAN if return_pct is None else float(return_pct),
+                 pnl != 0 if closing is None else bool(closing))
+        with self._lock:
+            if self._late or (self._time and event[0] < self._time[-1]):
+                self._late.append(event)
+            else:
+                self._append(*event)
+
+    def _append(self, time_ms, coin, pnl, fee, volume, duration, ret, closing):
+        cid = self._coin_ids.get(coin)
+        if cid is None:
+            cid = self._coin_ids[coin] = len(self._coins)
+            self._coins.append(coin)
+        i = len(self._time)
+        self._time.append(time_ms)
+        self._coin.append(cid)
+        self._pnl.append(pnl)
+        self._fee.append(fee)
+        self._volume.append(volume)
+        self._duration.append(duration)
+        self._return.append(ret)
+        self._closing.append(closing)
+        for window in self._windows.values():
+            for key in (_TOTAL, coin):
+                agg, extremes = window.slot(key)
+                agg.apply(1, pnl, fee, volume, duration, ret, closing)
+                if closing:
+                    extremes.push(i, pnl, ret)
+
+    def _settle(self):
+        """Merge late events: rebuild once from the time-sorted columns"""
+        if not self._late:
+            return
+        events = [
+            (self._time[i], self._coins[self._coin[i]], self._pnl[i], self._fee[i], self._volume[i],
+             self._duration[i], self._return[i], bool(self._closing[i]))
+            for i in range(len(self._time))
+        ] + self._late
+        events.sort(key=lambda e: e[0])
+        self._late = []
+        self._reset()
+        for event in events:
+            self._append(*event)
+
+    def _advance(self, now_ms: int):
+        for window in self._windows.values():
+            if window.span is None:
+                continue
+            cutoff = now_ms - window.span
+            n = len(self._time)
+            while window.head < n and self._time[window.head] < cutoff:
+                i = window.head
+                coin = self._coins[self._coin[i]]
+                for key in (_TOTAL, coin):
+                    agg, extremes = window.slot(key)
+                    agg.apply(-1, self._pnl[i], self._fee[i], self._volume[i],
+                              self._duration[i], self._return[i], self._closing[i])
+                    extremes.expire(i)
+                window.head += 1
+
+    @staticmethod
+    def _summary(agg: _Agg, extremes) -> Dict[str, Any]:
+        best, worst, best_ret, worst_ret = extremes.values()
+        trades = agg.trades
+        return {
+            "fills": agg.fills,
+            "trades": trades,
+            "wins": agg.wins,
+            "losses": agg.losses,
+            "win_rate": round(agg.wins / trades * 100, 2) if trades else 0,
+            "profit": round(agg.profit, 6),
+            "loss": round(agg.loss, 6),
+            "pnl": round(agg.profit - agg.loss, 6),
+            "profit_factor": round(agg.profit / agg.loss, 4) if agg.loss > 0 else None,
+            "fees": round(agg.fees, 6),
+            "volume": round(agg.volume, 2),
+            "avg_duration_minutes": round(agg.duration_sum / agg.duration_count, 1) if agg.duration_count else None,
+            "avg_return_pct": round(agg.return_sum / agg.return_count, 4) if agg.return_count else None,
+            "best": best,
+            "worst": worst,
+            "best_return_pct": best_ret,
+            "worst_return_pct": worst_ret
+        }
+
+    def summary(self, coin: Optional[str] = None, now_ms: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        {"all": stats, "24h": stats, "7d": stats, "30d": stats} for one coin (None = all coins).
+        """
+        with self._lock:
+            self._settle()
+            self._advance(int(time.time() * 1000) if now_ms is None else now_ms)
+            return {name: self._summary(*window.slot(coin)) for name, window in self._windows.items()}
+
+    def by_coin(self, now_ms: Optional[int] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """{coin: {"all": stats, "24h": stats, ...}} for every coin seen"""
+        with self._lock:
+            self._settle()
+            self._advance(int(time.time() * 1000) if now_ms is None else now_ms)
+            return {
+                coin: {name: self._summary(*window.slot(coin)) for name, window in self._windows.items()}
+                for coin in self._coins
+            }
+
+
+def _fill_float(fill: dict, key: str) -> float:
+    try:
+        return float(fill.get(key) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class FillsAnalytics(RollingAnalytics):
+    """
+    RollingAnalytics fed with raw Hyperliquid fills.
+
+    Holding time is measured from the fill that opened a flat position
+    (startPosition == 0) to the fill that brings it back to flat.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._open_time: Dict[str, int] = {}  # coin -> time the current position was opened
+        self._last_time = -1
+        self._last_tids = set()
+
+    def add_fill(self, fill: dict):
+        """Ingest one fill (no deduplication: callers that re-read fills use ingest())"""
+        coin = fill.get("coin", "")
+        time_ms = int(fill.get("time", 0))
+        px, sz = _fill_float(fill, "px"), _fill_float(fill, "sz")
+        duration = None
+        try:
+            start = float(fill.get("startPosition", "nan"))
+            signed = sz if str(fill.get("side", "")).upper() == "B" else -sz
+            if start == 0:
+                self._open_time[coin] = time_ms
+            elif abs(start + signed) < 1e-12 and coin in self._open_time:
+                duration = (time_ms - self._open_time.pop(coin)) / 60000
+        except (TypeError, ValueError):
+            pass
+        self.add(time_ms, coin, pnl=_fill_float(fill, "closedPnl"), fee=_fill_float(fill, "fee"),
+                 volume=abs(px * sz), duration_min=duration)
+
+    def ingest(self, fills: List[dict]) -> int:
+        """
+        Ingest the fills not seen yet from a newest-N read (e.g. userFills).
+
+        Fills older than the newest ingested millisecond are skipped, and fills
+        sharing that millisecond are told apart by tid. Returns count added.
+        """
+        added = 0
+        for fill in sorted(fills, key=lambda f: (int(f.get("time", 0)), int(f.get("tid", 0) or 0))):
+            time_ms, tid = int(fill.get("time", 0)), fill.get("tid")
+            if time_ms < self._last_time or (time_ms == self._last_time and tid in self._last_tids):
+                continue
+            if time_ms > self._last_time:
+                self._last_time, self._last_tids = time_ms, set()
+            self._last_tids.add(tid)
+            self.add_fill(fill)
+            added += 1
+        return added
@@ -10,9 +10,27 @@ Provides comprehensive market data access including:
 - Asset contexts and open interest
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, AsyncIterator, Tuple
 from datetime import datetime
 import logging
+import time
+
+import numpy as np
+
+from config.hyperliquid_config import CANDLE_CACHE_PATH
+
+from .async_client import AsyncHyperliquidClient, run_blocking
+from .candle_cache import (
+    CandleCache,
+    COLUMNS,
+    INTERVAL_MS,
+    MAX_CANDLES_PER_REQUEST,
+    RECORD_DTYPE,
+    candles_to_records,
+    records_to_columns,
+    records_to_rows
+)
+from .compact import compact_book, compact_candles
 
 logger = logging.getLogger(__name__)
 
@@ -28,21 +46,25 @@ class MarketTools:
     - Analyzing trading volume and liquidity
     """
 
-    def __init__(self, info_client, account_address: Optional[str] = None):
+    def __init__(self, info_client, account_address: Optional[str] = None,
+                 candle_cache_path: Optional[str] = CANDLE_CACHE_PATH):
         """
         Initialize market data tools.
 
         Args:
             info_client: Hyperliquid Info client for reading market data
             account_address: Optional account address for personalized data
+            candle_cache_path: Directory of the local closed-candle cache (empty/None = off)
         """
-        self.info = info_client
+        self.info = AsyncHyperliquidClient(info_client)
         self.account_address = account_address
+        self.candle_cache = CandleCache(candle_cache_path) if candle_cache_path else None
+        self._api_floor: Dict[Tuple[str, str], int] = {}  # Oldest open time the API still serves
         self.logger = logging.getLogger(__name__)
 
         self.logger.info("MarketTools initialized")
 
-    def get_all_mids(self) -> Dict[str, float]:
+    async def get_all_mids(self) -> Dict[str, float]:
         """
         Get mid prices for all available coins
 
@@ -55,7 +77,7 @@ class MarketTools:
         """
         try:
             self.logger.debug("Fetching all mid prices")
-            mids = self.info.all_mids()
+            mids = await self.info.all_mids()
 
             if not mids:
                 self.logger.warning("No mid prices returned from API")
@@ -74,10 +96,11 @@ class MarketTools:
             self.logger.error(f"Error fetching mid prices: {e}")
             raise Exception(f"Failed to get mid prices: {str(e)}")
 
-    def get_l2_orderbook(
+    async def get_l2_orderbook(
         self,
         coin: str,
-        depth: int = 20
+        depth: int = 20,
+        compact: bool = False
     ) -> Dict[str, Any]:
         """
         Get Level 2 order book snapshot for a coin
@@ -85,6 +108,7 @@ class MarketTools:
         Args:
             coin: Symbol to get order book for (e.g., "BTC", "ETH")
             depth: Number of price levels per side (max 20)
+            compact: Return px/sz columns per side plus a summary (see tools/compact.py)
 
         Returns:
             Dictionary containing:
@@ -105,14 +129,14 @@ class MarketTools:
 
         try:
             self.logger.debug(f"Fetching L2 orderbook for {coin} with depth {depth}")
-            snapshot = self.info.l2_snapshot(coin)
+            snapshot = await self.info.l2_snapshot(coin)
 
             if not snapshot:
                 raise Exception(f"No orderbook data returned for {coin}")
 
-            # Extract and limit depth
-            bids = snapshot.get("levels", [[[], []]])[0][:depth]
-            asks = snapshot.get("levels", [[[], []]])[1][:depth]
+            # Extract and limit depth (the API sends {"px", "sz", "n"} levels)
+            bids = [self._level(level) for level in snapshot.get("levels", [[], []])[0][:depth]]
+            asks = [self._level(level) for level in snapshot.get("levels", [[], []])[1][:depth]]
 
             # Calculate metrics
             best_bid = float(bids[0][0]) if bids else 0.0
@@ -142,18 +166,27 @@ class MarketTools:
             }
 
             self.logger.info(f"Retrieved L2 orderbook for {coin}: mid={mid_price}, spread={spread:.4f}")
-            return result
+            return compact_book(result) if compact else result
 
         except Exception as e:
             self.logger.error(f"Error fetching L2 orderbook for {coin}: {e}")
             raise Exception(f"Failed to get orderbook for {coin}: {str(e)}")
 
-    def get_candles(
+    @staticmethod
+    def _level(level: Any) -> Tuple[float, float]:
+        if isinstance(level, dict):
+            return float(level["px"]), float(level["sz"])
+        return float(level[0]), float(level[1])
+
+    async def get_candles(
         self,
         coin: str,
         interval: str = "1h",
-        limit: int = 100
-    ) -> List[Dict[str, Any]]:
+        limit: int = 100,
+        raw: bool = False,
+        compact: bool = False,
+        max_points: Optional[int] = None
+    ) -> Any:
         """
         Get historical candle (OHLCV) data
 
@@ -161,6 +194,9 @@ class MarketTools:
             coin: Symbol to get candles for (e.g., "BTC", "ETH")
             interval: Candle interval - "1m", "5m", "15m", "1h", "4h", "1d"
             limit: Number of candles to return (max 5000)
+            raw: Return numeric rows [t, o, h, l, c, v, n] without per-row formatting
+            compact: Return one dict of columns with a shared time base and a summary
+            max_points: With compact, merge bars so at most this many are returned
 
         Returns:
             List of candle dictionaries with:
@@ -172,6 +208,7 @@ class MarketTools:
             - close: Close price
             - volume: Trading volume
             - num_trades: Number of trades (if available)
+            (or plain rows when raw=True, or a columnar dict when compact=True)
 
         Raises:
             ValueError: If interval is invalid
@@ -184,32 +221,37 @@ class MarketTools:
         if limit <= 0 or limit > 5000:
             raise ValueError("Limit must be between 1 and 5000")
 
+        if max_points is not None and max_points <= 0:
+            raise ValueError("max_points must be positive")
+
         try:
             self.logger.debug(f"Fetching {limit} candles for {coin} at {interval} interval")
-            candles = self.info.candles_snapshot(coin, interval, limit)
+            end_ms = int(time.time() * 1000)
+            records, _ = await self._load_window(coin, interval, end_ms - limit * INTERVAL_MS[interval], end_ms)
+            records = records[-limit:]
+
+            if compact:
+                return compact_candles(records, interval, INTERVAL_MS[interval], max_points)
 
-            if not candles:
+            if not len(records):
                 self.logger.warning(f"No candle data returned for {coin}")
                 return []
 
-            result = []
-            for candle in candles:
-                # Parse candle data
-                candle_dict = {
-                    "timestamp": datetime.fromtimestamp(candle["t"] / 1000).isoformat(),
-                    "time_ms": candle["t"],
-                    "open": float(candle["o"]),
-                    "high": float(candle["h"]),
-                    "low": float(candle["l"]),
-                    "close": float(candle["c"]),
-                    "volume": float(candle["v"]),
-                }
-
-                # Add number of trades if available
-                if "n" in candle:
-                    candle_dict["num_trades"] = candle["n"]
+            if raw:
+                return records_to_rows(records)
 
-                result.append(candle_dict)
+            result = []
+            for t, o, h, l, c, v, n in records.tolist():
+                result.append({
+                    "timestamp": datetime.fromtimestamp(t / 1000).isoformat(),
+                    "time_ms": t,
+                    "open": o,
+                    "high": h,
+                    "low": l,
+                    "close": c,
+                    "volume": v,
+                    "num_trades": n
+                })
 
             self.logger.info(f"Retrieved {len(result)} candles for {coin}")
             return result
@@ -218,7 +260,180 @@ class MarketTools:
             self.logger.error(f"Error fetching candles for {coin}: {e}")
             raise Exception(f"Failed to get candles for {coin}: {str(e)}")
 
-    def get_recent_trades(
+    async def iter_candles(
+        self,
+        coin: str,
+        interval: str,
+        start_time: int,
+        end_time: Optional[int] = None,
+        chunk_size: int = MAX_CANDLES_PER_REQUEST,
+        as_numpy: bool = False
+    ) -> AsyncIterator[Any]:
+        """
+        Stream candle history as columnar chunks, walking time windows.
+
+        Only one chunk is held at a time, so long ranges (e.g. a year of 15m
+        bars) stay low-memory. Closed bars come from the local cache; the API
+        is only asked for what the cache does not cover yet.
+
+        Args:
+            coin: Symbol (e.g., "BTC")
+            interval: Candle interval (see INTERVAL_MS)
+            start_time: First open time (ms)
+            end_time: Last open time (ms, default now)
+            chunk_size: Bars per chunk (max 5000, one API request at most)
+            as_numpy: Yield the numpy record array instead of column lists
+
+        Yields:
+            {"coin", "interval", "count", "t": [...], "o": [...], "h", "l", "c", "v", "n"}
+        """
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Invalid interval. Must be one of: {list(INTERVAL_MS)}")
+        step = INTERVAL_MS[interval]
+        chunk_size = max(1, min(chunk_size, MAX_CANDLES_PER_REQUEST))
+        end_time = min(end_time or int(time.time() * 1000), int(time.time() * 1000))
+
+        cursor = start_time
+        while cursor <= end_time:
+            window_end = min(end_time, cursor + chunk_size * step - 1)
+            records, _ = await self._load_window(coin, interval, cursor, window_end)
+            cursor = window_end + 1
+            if not len(records):
+                continue
+            if as_numpy:
+                yield records
+            else:
+                yield {"coin": coin, "interval": interval, "count": len(records), **records_to_columns(records)}
+
+    async def get_candle_history(
+        self,
+        coin: str,
+        interval: str = "15m",
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        cursor: Optional[int] = None,
+        page_size: int = MAX_CANDLES_PER_REQUEST,
+        format: str = "columnar"
+    ) -> Dict[str, Any]:
+        """
+        One page of candle history; pass next_cursor back to get the following page.
+
+        Args:
+            coin: Symbol (e.g., "BTC")
+            interval: Candle interval (see INTERVAL_MS)
+            start_time: First open time (ms, default page_size bars before end_time)
+            end_time: Last open time (ms, default now)
+            cursor: next_cursor from the previous page (overrides start_time)
+            page_size: Bars per page (max 5000)
+            format: "columnar" ({"t": [...], "o": [...], ...}) or "rows" ([[t, o, h, l, c, v, n], ...])
+
+        Returns:
+            Dictionary containing:
+            - columns: Column names (t, o, h, l, c, v, n)
+            - data: Columnar dict or row list
+            - count: Bars in this page
+            - cached: Bars served from the local cache
+            - next_cursor: Start of the next page (None on the last page)
+        """
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Invalid interval. Must be one of: {list(INTERVAL_MS)}")
+        if format not in ("columnar", "rows"):
+            raise ValueError("Format must be 'columnar' or 'rows'")
+
+        try:
+            step = INTERVAL_MS[interval]
+            page_size = max(1, min(page_size, MAX_CANDLES_PER_REQUEST))
+            now_ms = int(time.time() * 1000)
+            end_time = min(end_time or now_ms, now_ms)
+            start = cursor if cursor is not None else (start_time if start_time is not None
+                                                       else end_time - page_size * step)
+            window_end = min(end_time, start + page_size * step - 1)
+
+            records, cached = await self._load_window(coin, interval, start, window_end)
+            data = records_to_columns(records) if format == "columnar" else records_to_rows(records)
+
+            return {
+                "coin": coin,
+                "interval": interval,
+                "format": format,
+                "columns": COLUMNS,
+                "data": data,
+                "count": len(records),
+                "cached": cached,
+                "start_time": start,
+                "end_time": window_end,
+                "next_cursor": window_end + 1 if window_end < end_time else None,
+                "timestamp": datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            self.logger.error(f"Error fetching candle history for {coin}: {e}")
+            raise Exception(f"Failed to get candle history for {coin}: {str(e)}")
+
+    async def _fetch_records(self, coin: str, interval: str, start_ms: int, end_ms: int) -> np.ndarray:
+        """API candles with start_ms <= t <= end_ms, one request per 5000 bars"""
+        step = INTERVAL_MS[interval]
+        parts = []
+        cursor = start_ms
+        while cursor <= end_ms:
+            window_end = min(end_ms, cursor + MAX_CANDLES_PER_REQUEST * step - 1)
+            candles = await self.info.candles_snapshot(coin, interval, cursor, window_end)
+            if candles:
+                parts.append(candles_to_records(candles))
+            cursor = window_end + 1
+        if not parts:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        records = np.concatenate(parts) if len(parts) > 1 else parts[0]
+        return records[(records["t"] >= start_ms) & (records["t"] <= end_ms)]
+
+    async def _load_window(self, coin: str, interval: str, start_ms: int, end_ms: int) -> Tuple[np.ndarray, int]:
+        """
+        Records for [start_ms, end_ms]: cached bars plus API fetches for the
+        uncovered edges. Fetched closed bars are added to the cache.
+
+        Returns:
+            (records, number of bars served from the cache)
+        """
+        if not self.candle_cache:
+            return await self._fetch_records(coin, interval, start_ms, end_ms), 0
+
+        step = INTERVAL_MS[interval]
+        now_ms = int(time.time() * 1000)
+        key = (coin, interval)
+        coverage = self.candle_cache.coverage(coin, interval)
+        from_cache = len(self.candle_cache.load(coin, interval, start_ms, end_ms)) if coverage else 0
+
+        ranges = []
+        if coverage is None:
+            ranges.append((start_ms, end_ms))
+        else:
+            first, last = coverage
+            floor = self._api_floor.get(key)
+            if start_ms <= first - step and (floor is None or floor < first):
+                ranges.append((start_ms, min(end_ms, first - 1)))
+            if end_ms >= last + step:
+                ranges.append((max(start_ms, last + step), end_ms))
+
+        fetched = [await self._fetch_records(coin, interval, lo, hi) for lo, hi in ranges]
+        if coverage is not None and ranges and ranges[0][1] < coverage[0] and not len(fetched[0]):
+            # The API has nothing older than the cache: stop asking this session
+            self._api_floor[key] = coverage[0]
+
+        for records in fetched:
+            closed = records[records["t"] + step <= now_ms]  # Never store the forming bar
+            if len(closed):
+                await run_blocking(self.candle_cache.merge, coin, interval, closed)
+
+        cached = np.asarray(self.candle_cache.load(coin, interval, start_ms, end_ms))
+        fetched = [r for r in fetched if len(r)]
+        if not fetched:
+            return cached, from_cache
+        merged = np.concatenate([cached] + fetched)
+        merged = merged[np.argsort(merged["t"], kind="stable")]
+        merged = merged[np.append(merged["t"][1:] != merged["t"][:-1], True)]
+        return merged, from_cache
+
+    async def get_recent_trades(
         self,
         coin: str,
         limit: int = 50
@@ -247,7 +462,7 @@ class MarketTools:
 
         try:
             self.logger.debug(f"Fetching {limit} recent trades for {coin}")
-            trades = self.info.recent_trades(coin)
+            trades = await self.info.recent_trades(coin)
 
             if not trades:
                 self.logger.warning(f"No trade data returned for {coin}")
@@ -283,7 +498,7 @@ class MarketTools:
             self.logger.error(f"Error fetching recent trades for {coin}: {e}")
             raise Exception(f"Failed to get recent trades for {coin}: {str(e)}")
 
-    def get_funding_rates(self) -> List[Dict[str, Any]]:
+    async def get_funding_rates(self) -> List[Dict[str, Any]]:
         """
         Get current funding rates for all perpetual contracts
 
@@ -302,7 +517,7 @@ class MarketTools:
         """
         try:
             self.logger.debug("Fetching funding rates for all perpetuals")
-            meta = self.info.meta()
+            meta = await self.info.meta()
 
             if not meta or "universe" not in meta:
                 raise Exception("No metadata returned from API")
@@ -345,7 +560,7 @@ class MarketTools:
             self.logger.error(f"Error fetching funding rates: {e}")
             raise Exception(f"Failed to get funding rates: {str(e)}")
 
-    def get_asset_contexts(self, coin: str) -> Dict[str, Any]:
+    async def get_asset_contexts(self, coin: str) -> Dict[str, Any]:
         """
         Get comprehensive asset context and market conditions
 
@@ -371,7 +586,7 @@ class MarketTools:
         """
         try:
             self.logger.debug(f"Fetching asset contexts for {coin}")
-            data = self.info.meta_and_asset_ctxs()
+            data = await self.info.meta_and_asset_ctxs()
 
             if not data:
                 raise Exception("No data returned from API")
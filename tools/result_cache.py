@@ -0,0 +1,186 @@
+"""
+Shared Result Cache for MCP Read Tools
+
+Claude sessions often call the same read tool back to back with the same
+arguments. ResultCache keeps each result for a per-tool TTL and coalesces
+concurrent identical calls into one API request (single-flight).
+
+Entries are tagged with a scope ("market" or "account"). Trading tools
+invalidate the account scope, and a read that was already in flight when
+the invalidation happened is returned to its callers but not stored.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MARKET = "market"
+ACCOUNT = "account"
+
+
+class ResultCache:
+    """
+    TTL + single-flight cache keyed by (tool, arguments).
+
+        result = await cache.get_or_call("get_all_mids", {}, fetch)
+        cache.invalidate(ACCOUNT)
+    """
+
+    def __init__(self, ttls: Dict[str, float], max_entries: int = 1000,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ttls: Seconds to keep each tool's results (tools not listed are not cached)
+            max_entries: Upper bound on stored results
+            clock: Time source
+        """
+        self.ttls = dict(ttls)
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: Dict[Tuple, Tuple[float, str, Any]] = {}  # key -> (expires, scope, result)
+        self._inflight: Dict[Tuple, Tuple[str, asyncio.Future]] = {}  # key -> (scope, future)
+        self._generation: Dict[str, int] = {MARKET: 0, ACCOUNT: 0}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(tool: str, arguments: Dict[str, Any]) -> Tuple:
+        return (tool, repr(sorted(arguments.items())))
+
+    async def get_or_call(self, tool: str, arguments: Dict[str, Any],
+                          fetch: Callable[[], Awaitable[Any]], scope: str = MARKET) -> Any:
+        """
+        Cached result of fetch() for (tool, arguments).
+
+        Exceptions and error results ({"success": False} / {"error": ...}) are
+        passed through without being stored.
+        """
+        ttl = self.ttls.get(tool, 0)
+        if ttl <= 0:
+            return await fetch()
+
+        key = self.make_key(tool, arguments)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > self.clock():
+                self.hits += 1
+                return entry[2]
+            del self._entries[key]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending[1])
+
+        self.misses += 1
+        generation = self._generation[scope]
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (scope, future)
+        try:
+            result = await fetch()
+        except BaseException as e:
+            self._release(key, future)
+            if not future.done():
+                future.set_exception(e)
+                future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+
+        self._release(key, future)
+        future.set_result(result)
+        if self._generation[scope] == generation and self._cacheable(result):
+            self._store(key, (self.clock() + ttl, scope, result))
+        return result
+
+    def invalidate(self, scope: Optional[str] = None) -> int:
+        """
+        Drop stored results (and detach in-flight reads) of a scope, or everything.
+
+        Returns:
+            Number of stored results dropped
+        """
+        scopes = [scope] if scope else list(self._generation)
+        for s in scopes:
+            self._generation[s] = self._generation.get(s, 0) + 1
+        dropped = [k for k, (_, s, _) in self._entries.items() if s in scopes]
+        for key in dropped:
+            del self._entries[key]
+        # In-flight reads keep serving their current waiters; new callers start a fresh request
+        self._inflight = {k: v for k, v in self._inflight.items() if v[0] not in scopes}
+        self.invalidations += 1
+        return len(dropped)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "hit_rate": round((self.hits + self.coalesced) / total, 3) if total else 0
+        }
+
+    # ---------- internals ----------
+
+    def _release(self, key: Tuple, future: asyncio.Future) -> None:
+        pending = self._inflight.get(key)
+        if pending is not None and pending[1] is future:
+            del self._inflight[key]
+
+    @staticmethod
+    def _cacheable(result: Any) -> bool:
+        if isinstance(result, dict):
+            return result.get("success", True) is not False and not result.get("error")
+        return result is not None
+
+    def _store(self, key: Tuple, entry: Tuple[float, str, Any]) -> None:
+        if len(self._entries) >= self.max_entries:
+            now = self.clock()
+            for k in [k for k, e in self._entries.items() if e[0] <= now]:
+                del self._entries[k]
+            while len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]  # Oldest insertion first
+        self._entries[key] = entry
+
+
+def cached_tool(get_cache: Callable[[], Optional[ResultCache]], scope: str = MARKET):
+    """
+    Decorator for MCP tool functions: serve repeated calls from the shared cache.
+
+    The tool's own signature is kept (FastMCP builds the schema from it); the
+    ctx argument is not part of the key.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache = get_cache()
+            if cache is None or args:
+                return await func(*args, **kwargs)
+            arguments = {k: v for k, v in kwargs.items() if k != "ctx"}
+            return await cache.get_or_call(func.__name__, arguments, lambda: func(**kwargs), scope)
+
+        return wrapper
+    return decorator
+
+
+def invalidates(get_cache: Callable[[], Optional[ResultCache]], scope: str = ACCOUNT):
+    """Decorator for write tools: drop the scope's cached reads once the call returns"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                cache = get_cache()
+                if cache is not None:
+                    cache.invalidate(scope)
+
+        return wrapper
+    return decorator
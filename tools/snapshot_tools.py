@@ -0,0 +1,209 @@
+"""
+Composite Market Snapshot Tool
+
+One call that gathers the mids, asset contexts, order books, candles,
+positions and open orders of several coins. Upstream requests are shared:
+a single all_mids and meta_and_asset_ctxs for every coin, one user_state and
+one open_orders for the account, and per-coin book/candle requests run
+concurrently. Reads go through the shared ResultCache (under the same keys
+as the individual tools) when one is given.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .result_cache import ResultCache, MARKET, ACCOUNT
+
+logger = logging.getLogger(__name__)
+
+FACETS = ["price", "context", "book", "candles", "position", "orders"]
+DEFAULT_FACETS = ["price", "context", "book", "position"]
+MAX_SNAPSHOT_COINS = 20
+BOOK_FETCH_DEPTH = 20  # Same arguments as a default get_l2_orderbook call, so cached books are shared
+
+
+class SnapshotTools:
+    """
+    Multi-coin, multi-facet market view built on MarketTools and AccountTools.
+    """
+
+    def __init__(self, market_tools, account_tools, result_cache: Optional[ResultCache] = None):
+        """
+        Initialize snapshot tools.
+
+        Args:
+            market_tools: MarketTools instance
+            account_tools: AccountTools instance
+            result_cache: Optional shared read-tool cache
+        """
+        self.market = market_tools
+        self.account = account_tools
+        self.cache = result_cache
+
+    async def get_market_snapshot(
+        self,
+        coins: List[str],
+        facets: Optional[List[str]] = None,
+        candle_interval: str = "1h",
+        candle_limit: int = 24,
+        book_depth: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Get a compact snapshot of several coins in one call.
+
+        Args:
+            coins: Symbols (e.g., ["BTC", "ETH"]), at most MAX_SNAPSHOT_COINS
+            facets: Any of "price", "context", "book", "candles", "position", "orders"
+                    (default: price, context, book, position)
+            candle_interval: Interval of the "candles" facet
+            candle_limit: Candles per coin for the "candles" facet
+            book_depth: Levels per side kept in the "book" facet (1-20)
+
+        Returns:
+            Dict containing:
+                - success: Boolean indicating success
+                - data: {coin: {facet: ...}}; candles in the compact columnar encoding
+                - errors: {facet or "facet:coin": message} for reads that failed
+        """
+        coins = list(dict.fromkeys(c.strip().upper() for c in coins if c and c.strip()))
+        facets = list(dict.fromkeys(facets or DEFAULT_FACETS))
+        unknown = [f for f in facets if f not in FACETS]
+        if not coins or len(coins) > MAX_SNAPSHOT_COINS:
+            return self._error(f"Give between 1 and {MAX_SNAPSHOT_COINS} coins")
+        if unknown:
+            return self._error(f"Unknown facets {unknown}. Must be any of: {FACETS}")
+        if not 1 <= book_depth <= BOOK_FETCH_DEPTH:
+            return self._error(f"book_depth must be between 1 and {BOOK_FETCH_DEPTH}")
+
+        # Every upstream request is created once and awaited together
+        jobs: Dict[str, Awaitable[Any]] = {}
+        if "price" in facets:
+            jobs["mids"] = self._read("get_all_mids", {}, self.market.get_all_mids)
+        if "context" in facets:
+            jobs["ctxs"] = self.market.info.meta_and_asset_ctxs()
+        if "position" in facets:
+            jobs["positions"] = self._read("get_positions", {}, self.account.get_positions, ACCOUNT)
+        if "orders" in facets:
+            jobs["orders"] = self._read("get_open_orders", {"coin": None},
+                                        lambda: self.account.get_open_orders(None), ACCOUNT)
+        for coin in coins:
+            if "book" in facets:
+                jobs[f"book:{coin}"] = self._read(
+                    "get_l2_orderbook", {"coin": coin, "depth": BOOK_FETCH_DEPTH, "compact": False},
+                    lambda coin=coin: self.market.get_l2_orderbook(coin, BOOK_FETCH_DEPTH))
+            if "candles" in facets:
+                jobs[f"candles:{coin}"] = self._read(
+                    "get_candles", {"coin": coin, "interval": candle_interval, "limit": candle_limit,
+                                    "raw": False, "compact": True, "max_points": None},
+                    lambda coin=coin: self.market.get_candles(coin, candle_interval, candle_limit, compact=True))
+
+        results = dict(zip(jobs, await asyncio.gather(*jobs.values(), return_exceptions=True)))
+        errors = {}
+        for key, value in results.items():
+            if isinstance(value, BaseException):
+                errors[key] = str(value)
+            elif isinstance(value, dict) and value.get("success") is False:
+                errors[key] = value.get("error")
+
+        data: Dict[str, Dict[str, Any]] = {coin: {} for coin in coins}
+        if "price" in facets and "mids" not in errors:
+            for coin in coins:
+                mid = results["mids"].get(coin)
+                data[coin]["mid"] = float(mid) if mid is not None else None
+        if "context" in facets and "ctxs" not in errors:
+            contexts = self._contexts(results["ctxs"], coins)
+            for coin in coins:
+                data[coin]["context"] = contexts.get(coin)
+        if "position" in facets and "positions" not in errors:
+            by_coin = {p["coin"]: p for p in results["positions"]["data"]["positions"]}
+            for coin in coins:
+                p = by_coin.get(coin)
+                data[coin]["position"] = {
+                    "side": p["side"],
+                    "size": p["size"],
+                    "entry_price": p["entry_price"],
+                    "unrealized_pnl": p["unrealized_pnl"],
+                    "roe_pct": p["roe_pct"],
+                    "leverage": p["leverage"],
+                    "liquidation_price": p["liquidation_price"]
+                } if p else None
+        if "orders" in facets and "orders" not in errors:
+            for coin in coins:
+                data[coin]["orders"] = [
+                    {
+                        "order_id": o["order_id"],
+                        "side": o["side"],
+                        "price": o["price"],
+                        "size": o["remaining_size"],
+                        "order_type": o["order_type"],
+                        "reduce_only": o["reduce_only"]
+                    }
+                    for o in results["orders"]["data"]["orders"] if o["coin"].upper() == coin
+                ]
+        for coin in coins:
+            book = results.get(f"book:{coin}")
+            if book is not None and f"book:{coin}" not in errors:
+                bid_volume = sum(sz for _, sz in book["bids"][:book_depth])
+                ask_volume = sum(sz for _, sz in book["asks"][:book_depth])
+                data[coin]["book"] = {
+                    "best_bid": book["best_bid"],
+                    "best_ask": book["best_ask"],
+                    "spread_bps": round(book["spread_bps"], 3),
+                    "bids": book["bids"][:book_depth],
+                    "asks": book["asks"][:book_depth],
+                    "imbalance": round((bid_volume - ask_volume) / (bid_volume + ask_volume), 4)
+                    if bid_volume + ask_volume else 0.0
+                }
+            candles = results.get(f"candles:{coin}")
+            if candles is not None and f"candles:{coin}" not in errors:
+                data[coin]["candles"] = candles
+
+        logger.info(f"Market snapshot: {len(coins)} coins, facets={facets}, {len(jobs)} reads, {len(errors)} failed")
+        return {
+            "success": True,
+            "data": data,
+            "errors": errors or None,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    async def _read(self, tool: str, arguments: Dict[str, Any],
+                    fetch: Callable[[], Awaitable[Any]], scope: str = MARKET) -> Any:
+        if self.cache is None:
+            return await fetch()
+        return await self.cache.get_or_call(tool, arguments, fetch, scope)
+
+    @staticmethod
+    def _contexts(meta_and_ctxs: Any, coins: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Compact per-coin context from one meta_and_asset_ctxs response"""
+        meta, ctxs = meta_and_ctxs[0], meta_and_ctxs[1]
+        wanted = set(coins)
+        result = {}
+        for asset, ctx in zip(meta.get("universe", []), ctxs):
+            name = asset.get("name")
+            if name not in wanted:
+                continue
+            mark = float(ctx.get("markPx") or 0)
+            prev_day = float(ctx.get("prevDayPx") or 0)
+            open_interest = float(ctx.get("openInterest") or 0)
+            result[name] = {
+                "mark_price": mark,
+                "oracle_price": float(ctx.get("oraclePx") or 0),
+                "funding_rate": float(ctx.get("funding") or 0) * 100,  # Hourly, in %
+                "premium": float(ctx.get("premium") or 0),
+                "open_interest": open_interest,
+                "open_interest_usd": open_interest * mark,
+                "volume_24h": float(ctx.get("dayNtlVlm") or 0),
+                "change_24h_pct": round((mark / prev_day - 1) * 100, 3) if prev_day else None,
+                "max_leverage": asset.get("maxLeverage")
+            }
+        return result
+
+    @staticmethod
+    def _error(message: str) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "error": message,
+            "timestamp": datetime.utcnow().isoformat()
+        }
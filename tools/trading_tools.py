@@ -13,6 +13,10 @@ from typing import Dict, List, Optional, Any, Union
 import time
 from datetime import datetime, timedelta
 
+from hyperliquid.utils.types import Cloid
+
+from .async_client import AsyncHyperliquidClient
+
 
 class TradingTools:
     """
@@ -36,8 +40,8 @@ class TradingTools:
             info_client: Hyperliquid Info client instance
             account_address: Ethereum address of the trading account
         """
-        self.exchange = exchange_client
-        self.info = info_client
+        self.exchange = AsyncHyperliquidClient(exchange_client)
+        self.info = AsyncHyperliquidClient(info_client)
         self.account = account_address
 
     async def place_order(
@@ -106,7 +110,7 @@ class TradingTools:
                 order_params["cloid"] = cloid
 
             # Execute order
-            response = self.exchange.order(
+            response = await self.exchange.order(
                 coin=coin,
                 is_buy=is_buy,
                 sz=size,
@@ -248,7 +252,7 @@ class TradingTools:
                     })
 
             # Execute batch order
-            batch_response = self.exchange.bulk_orders(validated_orders)
+            batch_response = await self.exchange.bulk_orders(validated_orders)
 
             # Parse results
             results = []
@@ -297,6 +301,116 @@ class TradingTools:
                 "timestamp": datetime.utcnow().isoformat()
             }]
 
+    async def cancel_batch_orders(self, cancels: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Cancel multiple orders in a single signed batch request.
+
+        Orders identified by order_id are sent as one bulk cancel and orders
+        identified by cloid as one bulk cancel-by-cloid, so any number of
+        cancels costs at most two round trips.
+
+        Args:
+            cancels: List of cancel dictionaries, each containing:
+                - coin: str
+                - order_id: int (optional if cloid provided)
+                - cloid: str (optional if order_id provided)
+
+        Returns:
+            List of result dictionaries in input order, each containing:
+                - success: bool
+                - order_id: int / cloid: str
+                - coin: str
+                - status: str ("canceled" if successful)
+                - error: str (if failed)
+                - order_index: int (position in batch)
+
+        Example:
+            cancels = [
+                {"coin": "BTC", "order_id": 123456},
+                {"coin": "ETH", "cloid": "0x00000000000000000000000000000001"}
+            ]
+            results = await cancel_batch_orders(cancels)
+        """
+        try:
+            if not cancels:
+                return [{
+                    "success": False,
+                    "error": "No orders provided",
+                    "timestamp": datetime.utcnow().isoformat()
+                }]
+
+            results: List[Optional[Dict[str, Any]]] = [None] * len(cancels)
+            by_oid = []
+            by_cloid = []
+
+            def result(idx: int, error: Optional[str] = None) -> Dict[str, Any]:
+                cancel = cancels[idx]
+                entry = {
+                    "success": error is None,
+                    "order_id": cancel.get("order_id"),
+                    "cloid": cancel.get("cloid"),
+                    "coin": cancel.get("coin"),
+                    "order_index": idx,
+                    "timestamp": datetime.utcnow().isoformat()
+                }
+                if error is None:
+                    entry["status"] = "canceled"
+                else:
+                    entry["error"] = error
+                return entry
+
+            # Validate and split by identifier type
+            for idx, cancel in enumerate(cancels):
+                try:
+                    coin = cancel.get("coin")
+                    order_id = cancel.get("order_id")
+                    cloid = cancel.get("cloid")
+
+                    if not coin or not (order_id or cloid):
+                        raise ValueError("Missing required fields: coin and order_id or cloid")
+
+                    if order_id:
+                        by_oid.append((idx, {"coin": coin, "oid": int(order_id)}))
+                    else:
+                        by_cloid.append((idx, {"coin": coin, "cloid": Cloid.from_str(str(cloid))}))
+
+                except Exception as e:
+                    results[idx] = result(idx, str(e))
+
+            # One signed action per identifier type
+            for group, send in ((by_oid, self.exchange.bulk_cancel),
+                                (by_cloid, self.exchange.bulk_cancel_by_cloid)):
+                if not group:
+                    continue
+                try:
+                    response = await send([request for _, request in group])
+                except Exception as e:
+                    response = {"status": "err", "response": str(e)}
+
+                if response and response.get("status") == "ok":
+                    statuses = response.get("response", {}).get("data", {}).get("statuses", [])
+                    for pos, (idx, _) in enumerate(group):
+                        status = statuses[pos] if pos < len(statuses) else {"error": "No status returned"}
+                        if status == "success":
+                            results[idx] = result(idx)
+                        else:
+                            error = status.get("error") if isinstance(status, dict) else str(status)
+                            results[idx] = result(idx, error or "Cancellation failed")
+                else:
+                    # Whole batch rejected
+                    error = response.get("response", "Batch cancel failed") if response else "Batch cancel failed"
+                    for idx, _ in group:
+                        results[idx] = result(idx, str(error))
+
+            return results
+
+        except Exception as e:
+            return [{
+                "success": False,
+                "error": f"Batch cancel execution failed: {str(e)}",
+                "timestamp": datetime.utcnow().isoformat()
+            }]
+
     async def cancel_order(
         self,
         coin: str,
@@ -335,7 +449,7 @@ class TradingTools:
                 cancel_params["cloid"] = cloid
 
             # Execute cancellation
-            response = self.exchange.cancel(
+            response = await self.exchange.cancel(
                 coin=coin,
                 oid=order_id if order_id else None,
                 **({
@@ -400,7 +514,7 @@ class TradingTools:
         """
         try:
             # Get all open orders
-            open_orders_response = self.info.open_orders(self.account)
+            open_orders_response = await self.info.open_orders(self.account)
 
             if not open_orders_response:
                 return {
@@ -428,40 +542,32 @@ class TradingTools:
                     "timestamp": datetime.utcnow().isoformat()
                 }
 
-            # Cancel all matching orders
+            # Cancel all matching orders in one batch
+            results = await self.cancel_batch_orders([
+                {"coin": order.get("coin"), "order_id": order.get("oid")}
+                for order in orders_to_cancel
+            ])
+            if len(results) != len(orders_to_cancel):
+                # Batch-level failure: one error entry for every order
+                results = results[:1] * len(orders_to_cancel)
+
             canceled_orders = []
             failed_cancellations = []
 
-            for order in orders_to_cancel:
-                try:
-                    order_coin = order.get("coin")
-                    order_id = order.get("oid")
-
-                    cancel_response = self.exchange.cancel(
-                        coin=order_coin,
-                        oid=order_id
-                    )
-
-                    if cancel_response and cancel_response.get("status") == "ok":
-                        canceled_orders.append({
-                            "coin": order_coin,
-                            "order_id": order_id,
-                            "side": order.get("side"),
-                            "size": order.get("sz"),
-                            "price": order.get("limitPx")
-                        })
-                    else:
-                        failed_cancellations.append({
-                            "coin": order_coin,
-                            "order_id": order_id,
-                            "error": cancel_response.get("response", "Unknown error")
-                        })
-
-                except Exception as e:
+            for order, res in zip(orders_to_cancel, results):
+                if res.get("success"):
+                    canceled_orders.append({
+                        "coin": order.get("coin"),
+                        "order_id": order.get("oid"),
+                        "side": order.get("side"),
+                        "size": order.get("sz"),
+                        "price": order.get("limitPx")
+                    })
+                else:
                     failed_cancellations.append({
                         "coin": order.get("coin"),
                         "order_id": order.get("oid"),
-                        "error": str(e)
+                        "error": res.get("error", "Unknown error")
                     })
 
             return {
@@ -534,7 +640,7 @@ class TradingTools:
                 modify_params["sz"] = new_size
 
             # Execute modification
-            response = self.exchange.modify_order(
+            response = await self.exchange.modify_order(
                 coin=coin,
                 oid=order_id,
                 **({
@@ -644,7 +750,7 @@ class TradingTools:
             }
 
             # Execute TWAP order
-            response = self.exchange.twap_order(
+            response = await self.exchange.twap_order(
                 coin=coin,
                 is_buy=is_buy,
                 sz=total_size,
@@ -736,7 +842,7 @@ class TradingTools:
                 raise ValueError(f"Leverage {leverage}x exceeds typical maximum of 50x")
 
             # Execute leverage update
-            response = self.exchange.update_leverage(
+            response = await self.exchange.update_leverage(
                 coin=coin,
                 leverage=leverage,
                 is_cross=is_cross
@@ -815,7 +921,7 @@ class TradingTools:
                 raise ValueError(f"Amount must be positive, got {amount}")
 
             # Execute margin update
-            response = self.exchange.update_isolated_margin(
+            response = await self.exchange.update_isolated_margin(
                 coin=coin,
                 is_buy=is_add,
                 ntli=amount  # Note: ntli = notional transfer leverage isolated
@@ -893,7 +999,7 @@ class TradingTools:
                 )
 
             # Execute dead man's switch update
-            response = self.exchange.update_dead_mans_switch(
+            response = await self.exchange.update_dead_mans_switch(
                 timeout=delay_seconds
             )
 